@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+"""Almacenes de datos por grupo de hoteles (multiples inquilinos).
+Created on Wed Oct 21 19:26:48 2026
+
+@author: Efrén Alejandro
+
+Un Almacen lleva el directorio de datos y el backend ("json" o "arbol")
+de un grupo de hoteles. Se activa en el contexto actual (contextvars:
+cada hilo y cada tarea asyncio tiene el suyo) y las entidades, el
+validador y las herramientas lo usan en lugar de persistencia.DATA_DIR:
+
+    grupo_a = Almacen("/srv/grupo_a")
+    grupo_b = Almacen("/srv/grupo_b", backend="arbol")
+    with grupo_a:
+        Hotel.crear(datos)
+    grupo_b.ejecutar(Hotel.buscar, "CAM123456ABC")
+
+Sin almacen activo se usan persistencia.DATA_DIR y persistencia.BACKEND.
+
+threading.Thread no copia el contexto: un hilo creado dentro de
+`with grupo_a:` empieza sin almacen y lee y escribe en
+persistencia.DATA_DIR. El hilo debe entrar al almacen o correr en una
+copia del contexto:
+
+    with grupo_a:
+        contexto = contextvars.copy_context()
+        hilo = threading.Thread(target=contexto.run,
+                                args=(Hotel.crear, datos))
+
+o bien threading.Thread(target=grupo_a.ejecutar, args=(Hotel.crear,
+datos)). Las tareas asyncio y loop.run_in_executor si copian el
+contexto. Los trabajadores de lotes.py y escritura_diferida.py entran
+explicitamente al almacen donde se crearon.
+Las caches (indices, busqueda, snapshots, arboles abiertos, calendarios
+de tarifas, claves de idempotencia) se indexan por ruta de archivo, asi
+cada almacen tiene las suyas y un proceso puede atender varios grupos a
+la vez sin recargarlas ni mezclarlas.
+"""
+import contextvars
+import os
+
+
+BACKENDS = ("json", "arbol")
+
+# Pila de almacenes activos del contexto, el ultimo es el vigente
+_ACTIVOS = contextvars.ContextVar("almacenes", default=())
+
+
+class Almacen:
+    """Directorio de datos y backend de un grupo de hoteles."""
+
+    def __init__(self, data_dir, backend="json"):
+        if backend not in BACKENDS:
+            raise ValueError(f"Backend invalido: {backend}")
+        self.data_dir = os.path.abspath(data_dir)
+        self.backend = backend
+
+    def __repr__(self):
+        return f"Almacen({self.data_dir!r}, backend={self.backend!r})"
+
+    def __enter__(self):
+        _ACTIVOS.set(_ACTIVOS.get() + (self,))
+        return self
+
+    def __exit__(self, *_):
+        _ACTIVOS.set(_ACTIVOS.get()[:-1])
+        return False
+
+    def ruta(self, nombre_archivo):
+        """Retorna la ruta de un archivo de entidad del almacen."""
+        return os.path.join(self.data_dir, nombre_archivo)
+
+    def ejecutar(self, funcion, *args, **kwargs):
+        """Llama a la funcion con este almacen activo."""
+        with self:
+            return funcion(*args, **kwargs)
+
+
+def actual():
+    """Retorna el almacen activo en el contexto o None."""
+    activos = _ACTIVOS.get()
+    return activos[-1] if activos else None
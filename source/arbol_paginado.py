@@ -0,0 +1,771 @@
+# -*- coding: utf-8 -*-
+"""Archivo llave-valor paginado con arbol B+ para los almacenes de entidad.
+Created on Wed Oct 21 15:22:37 2026
+
+@author: Efrén Alejandro
+
+Uso:
+    python arbol_paginado.py importar clientes.json [--datos DIR]
+    python arbol_paginado.py exportar clientes.json [--datos DIR]
+
+Con persistencia.usar_backend("arbol") (o HOTELES_BACKEND=arbol) cada
+entidad se guarda en <archivo>.btree en lugar del JSON. El archivo se
+divide en paginas de TAMANO_PAGINA bytes:
+
+    pagina 0   encabezado: magia, tamano de pagina, raiz, primera pagina
+               libre, total de paginas y de registros
+    hoja       llaves ordenadas con su registro JSON, enlazada con la
+               hoja anterior y la siguiente para recorridos por rango
+    interna    llaves separadoras y paginas hijas
+    desborde   registros mas grandes que un cuarto de pagina
+    libre      paginas liberadas, en una lista que se reutiliza
+
+buscar lee O(log N) paginas y crear/eliminar escriben la hoja, y solo
+al dividir o vaciar una hoja sus ancestros. Las paginas decodificadas se
+guardan en una cache LRU. Las hojas no se rebalancean al eliminar; una
+hoja vacia se libera y se quita de su padre.
+
+El archivo no tiene bitacora: un proceso que muere a media escritura
+puede dejarlo inconsistente, y solo un proceso debe escribirlo a la vez.
+"""
+import contextlib
+import json
+import os
+import struct
+import sys
+import threading
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from collections.abc import MutableMapping
+
+
+MAGIA = b"HOTBTR01"
+EXTENSION = ".btree"
+TAMANO_PAGINA = 4096
+CAPACIDAD_CACHE = 256
+
+_ENCABEZADO = struct.Struct("<8sIIIIQ")
+_HOJA = struct.Struct("<BHII")
+_INTERNA = struct.Struct("<BH")
+_DESBORDE = struct.Struct("<BII")
+_LIBRE = struct.Struct("<BI")
+_ENTRADA = struct.Struct("<HI")
+_LARGO = struct.Struct("<H")
+_PAGINA = struct.Struct("<I")
+
+_TIPO_LIBRE, _TIPO_HOJA, _TIPO_INTERNA, _TIPO_DESBORDE = 0, 1, 2, 3
+_BIT_DESBORDE = 1 << 31
+
+
+class _Hoja:
+    """Pagina hoja: llaves y valores ordenados."""
+
+    def __init__(self, llaves=None, valores=None, anterior=0, siguiente=0):
+        self.llaves = llaves or []
+        # bytes del registro o (pagina, largo) si esta en desborde
+        self.valores = valores or []
+        self.anterior = anterior
+        self.siguiente = siguiente
+
+    def tamano(self):
+        """Bytes que ocupa la hoja serializada."""
+        return _HOJA.size + sum(
+            _ENTRADA.size + len(llave)
+            + (len(valor) if isinstance(valor, bytes) else 8)
+            for llave, valor in zip(self.llaves, self.valores)
+        )
+
+    def serializar(self):
+        """Retorna los bytes de la hoja."""
+        partes = [_HOJA.pack(_TIPO_HOJA, len(self.llaves), self.anterior,
+                             self.siguiente)]
+        for llave, valor in zip(self.llaves, self.valores):
+            llave = llave.encode("utf-8")
+            if isinstance(valor, bytes):
+                partes.append(_ENTRADA.pack(len(llave), len(valor)))
+                partes += [llave, valor]
+            else:
+                partes.append(_ENTRADA.pack(len(llave), _BIT_DESBORDE))
+                partes += [llave, struct.pack("<II", *valor)]
+        return b"".join(partes)
+
+
+class _Interna:
+    """Pagina interna: n llaves separadoras y n + 1 hijas."""
+
+    def __init__(self, llaves=None, hijos=None):
+        self.llaves = llaves or []
+        self.hijos = hijos or []
+
+    def tamano(self):
+        """Bytes que ocupa la pagina serializada."""
+        return (_INTERNA.size + _PAGINA.size * len(self.hijos)
+                + sum(_LARGO.size + len(llave) for llave in self.llaves))
+
+    def serializar(self):
+        """Retorna los bytes de la pagina interna."""
+        partes = [_INTERNA.pack(_TIPO_INTERNA, len(self.llaves))]
+        partes += [_PAGINA.pack(hijo) for hijo in self.hijos]
+        for llave in self.llaves:
+            llave = llave.encode("utf-8")
+            partes += [_LARGO.pack(len(llave)), llave]
+        return b"".join(partes)
+
+
+def _llaves_texto(datos, desplazamiento, cantidad):
+    """Decodifica llaves con prefijo de largo; retorna (llaves, fin)."""
+    llaves = []
+    for _ in range(cantidad):
+        (largo,) = _LARGO.unpack_from(datos, desplazamiento)
+        desplazamiento += _LARGO.size
+        llaves.append(
+            datos[desplazamiento:desplazamiento + largo].decode("utf-8")
+        )
+        desplazamiento += largo
+    return llaves, desplazamiento
+
+
+def _deserializar(datos):
+    """Convierte los bytes de una pagina en _Hoja o _Interna."""
+    tipo = datos[0]
+    if tipo == _TIPO_HOJA:
+        _, cantidad, anterior, siguiente = _HOJA.unpack_from(datos)
+        hoja = _Hoja(anterior=anterior, siguiente=siguiente)
+        posicion = _HOJA.size
+        for _ in range(cantidad):
+            largo_llave, largo = _ENTRADA.unpack_from(datos, posicion)
+            posicion += _ENTRADA.size
+            hoja.llaves.append(
+                datos[posicion:posicion + largo_llave].decode("utf-8")
+            )
+            posicion += largo_llave
+            if largo & _BIT_DESBORDE:
+                hoja.valores.append(struct.unpack_from("<II", datos,
+                                                       posicion))
+                posicion += 8
+            else:
+                hoja.valores.append(bytes(datos[posicion:posicion + largo]))
+                posicion += largo
+        return hoja
+    if tipo == _TIPO_INTERNA:
+        _, cantidad = _INTERNA.unpack_from(datos)
+        hijos = list(struct.unpack_from(f"<{cantidad + 1}I", datos,
+                                        _INTERNA.size))
+        llaves, _ = _llaves_texto(
+            datos, _INTERNA.size + _PAGINA.size * (cantidad + 1), cantidad
+        )
+        return _Interna(llaves, hijos)
+    raise ValueError(f"Tipo de pagina invalido: {tipo}")
+
+
+class _Encabezado:
+    """Pagina 0: tamano de pagina, raiz, primera libre y totales."""
+
+    __slots__ = ("tamano_pagina", "raiz", "libre", "paginas", "registros")
+
+    def __init__(self, tamano_pagina, raiz=1, libre=0, paginas=2,
+                 registros=0):
+        self.tamano_pagina = tamano_pagina
+        self.raiz = raiz
+        self.libre = libre
+        self.paginas = paginas
+        self.registros = registros
+
+    @classmethod
+    def deserializar(cls, datos, ruta):
+        """Decodifica el encabezado; lanza ValueError si no es un arbol."""
+        magia, *campos = _ENCABEZADO.unpack(datos)
+        if magia != MAGIA:
+            raise ValueError(f"{ruta} no es un arbol paginado.")
+        return cls(*campos)
+
+    def serializar(self):
+        """Convierte el encabezado a bytes."""
+        return _ENCABEZADO.pack(MAGIA, self.tamano_pagina, self.raiz,
+                                self.libre, self.paginas, self.registros)
+
+
+class _Paginador:
+    """Lectura y escritura de paginas con cache LRU de nodos."""
+
+    def __init__(self, archivo, tamano_pagina, capacidad_cache):
+        self.archivo = archivo
+        self.tamano_pagina = tamano_pagina
+        self.capacidad_cache = capacidad_cache
+        self.lecturas = 0
+        self.escrituras = 0
+        self._cache = OrderedDict()
+        self._sucias = set()
+
+    def leer_bytes(self, pagina):
+        """Lee los bytes crudos de una pagina."""
+        self.lecturas += 1
+        self.archivo.seek(pagina * self.tamano_pagina)
+        return self.archivo.read(self.tamano_pagina)
+
+    def escribir_bytes(self, pagina, datos):
+        """Escribe los bytes de una pagina completando con ceros."""
+        if len(datos) > self.tamano_pagina:
+            raise ValueError(f"La pagina {pagina} excede el tamano.")
+        self.escrituras += 1
+        self.archivo.seek(pagina * self.tamano_pagina)
+        self.archivo.write(datos.ljust(self.tamano_pagina, b"\0"))
+
+    def nodo(self, pagina):
+        """Retorna el nodo de la pagina usando la cache."""
+        nodo = self._cache.get(pagina)
+        if nodo is not None:
+            self._cache.move_to_end(pagina)
+            return nodo
+        nodo = _deserializar(self.leer_bytes(pagina))
+        self._guardar_en_cache(pagina, nodo)
+        return nodo
+
+    def _guardar_en_cache(self, pagina, nodo):
+        """Agrega un nodo a la cache, desalojando el menos usado."""
+        self._cache[pagina] = nodo
+        self._cache.move_to_end(pagina)
+        while len(self._cache) > self.capacidad_cache:
+            vieja, desalojado = self._cache.popitem(last=False)
+            if vieja in self._sucias:
+                self.escribir_bytes(vieja, desalojado.serializar())
+                self._sucias.discard(vieja)
+
+    def poner(self, pagina, nodo):
+        """Marca un nodo como modificado."""
+        self._guardar_en_cache(pagina, nodo)
+        self._sucias.add(pagina)
+
+    def descartar(self, pagina):
+        """Quita la pagina de la cache sin escribirla."""
+        self._cache.pop(pagina, None)
+        self._sucias.discard(pagina)
+
+    def escribir_sucias(self):
+        """Escribe las paginas modificadas en orden."""
+        for pagina in sorted(self._sucias):
+            self.escribir_bytes(pagina, self._cache[pagina].serializar())
+        self._sucias.clear()
+
+    def vaciar(self):
+        """Descarta la cache y trunca el archivo."""
+        self._cache.clear()
+        self._sucias.clear()
+        self.archivo.truncate(0)
+
+
+class ArbolPaginado:
+    """Arbol B+ de llaves de texto a bytes sobre un archivo paginado."""
+
+    def __init__(self, ruta, tamano_pagina=TAMANO_PAGINA,
+                 capacidad_cache=CAPACIDAD_CACHE):
+        self.ruta = ruta
+        self._candado = threading.RLock()
+        existe = os.path.exists(ruta) and os.path.getsize(ruta) > 0
+        # pylint: disable=consider-using-with
+        archivo = open(ruta, "r+b" if existe else "w+b")
+        self.inodo = os.fstat(archivo.fileno()).st_ino
+        try:
+            self._encabezado = (
+                _Encabezado.deserializar(archivo.read(_ENCABEZADO.size), ruta)
+                if existe else _Encabezado(tamano_pagina)
+            )
+        except ValueError:
+            archivo.close()
+            raise
+        self._paginador = _Paginador(
+            archivo, self._encabezado.tamano_pagina, capacidad_cache
+        )
+        if not existe:
+            self._paginador.poner(1, _Hoja())
+            self.sincronizar()
+
+    @property
+    def tamano_pagina(self):
+        """Tamano en bytes de cada pagina."""
+        return self._encabezado.tamano_pagina
+
+    @property
+    def max_llave(self):
+        """Bytes maximos de una llave."""
+        return self.tamano_pagina // 8
+
+    @property
+    def max_valor(self):
+        """Bytes maximos de un valor en linea; los mayores se desbordan."""
+        return self.tamano_pagina // 4
+
+    @property
+    def lecturas(self):
+        """Paginas leidas del archivo."""
+        return self._paginador.lecturas
+
+    @property
+    def escrituras(self):
+        """Paginas escritas al archivo."""
+        return self._paginador.escrituras
+
+    # ------------------------------------------------------------------
+    # Paginas
+    # ------------------------------------------------------------------
+    def _asignar(self):
+        """Retorna una pagina libre, reutilizando las liberadas."""
+        encabezado = self._encabezado
+        if encabezado.libre:
+            pagina = encabezado.libre
+            _, encabezado.libre = _LIBRE.unpack_from(
+                self._paginador.leer_bytes(pagina)
+            )
+            return pagina
+        pagina = encabezado.paginas
+        encabezado.paginas += 1
+        return pagina
+
+    def _liberar(self, pagina):
+        """Agrega la pagina a la lista de paginas libres."""
+        self._paginador.descartar(pagina)
+        self._paginador.escribir_bytes(
+            pagina, _LIBRE.pack(_TIPO_LIBRE, self._encabezado.libre)
+        )
+        self._encabezado.libre = pagina
+
+    def _escribir_desborde(self, valor):
+        """Guarda un valor grande en paginas de desborde."""
+        capacidad = self.tamano_pagina - _DESBORDE.size
+        trozos = [valor[i:i + capacidad]
+                  for i in range(0, len(valor), capacidad)]
+        paginas = [self._asignar() for _ in trozos]
+        for i, trozo in enumerate(trozos):
+            siguiente = paginas[i + 1] if i + 1 < len(paginas) else 0
+            self._paginador.escribir_bytes(paginas[i], _DESBORDE.pack(
+                _TIPO_DESBORDE, siguiente, len(trozo)
+            ) + trozo)
+        return (paginas[0], len(valor))
+
+    def _leer_desborde(self, referencia):
+        """Lee un valor guardado en paginas de desborde."""
+        pagina, _ = referencia
+        partes = []
+        while pagina:
+            datos = self._paginador.leer_bytes(pagina)
+            _, pagina, largo = _DESBORDE.unpack_from(datos)
+            partes.append(datos[_DESBORDE.size:_DESBORDE.size + largo])
+        return b"".join(partes)
+
+    def _liberar_desborde(self, referencia):
+        """Libera las paginas de desborde de un valor."""
+        pagina, _ = referencia
+        while pagina:
+            _, siguiente, _ = _DESBORDE.unpack_from(
+                self._paginador.leer_bytes(pagina)
+            )
+            self._liberar(pagina)
+            pagina = siguiente
+
+    def sincronizar(self):
+        """Escribe las paginas modificadas y el encabezado."""
+        with self._candado:
+            self._paginador.escribir_sucias()
+            self._paginador.escribir_bytes(0, self._encabezado.serializar())
+            self._paginador.archivo.flush()
+
+    @contextlib.contextmanager
+    def retenido(self):
+        """Sincroniza el arbol y lo retiene mientras dura el bloque."""
+        with self._candado:
+            if not self._paginador.archivo.closed:
+                self.sincronizar()
+            yield self
+
+    def cerrar(self):
+        """Sincroniza y cierra el archivo."""
+        if not self._paginador.archivo.closed:
+            self.sincronizar()
+            self._paginador.archivo.close()
+
+    # ------------------------------------------------------------------
+    # Operaciones
+    # ------------------------------------------------------------------
+    def __len__(self):
+        return self._encabezado.registros
+
+    def __contains__(self, llave):
+        return self.obtener(llave) is not None
+
+    def _descender(self, llave):
+        """Retorna el camino [(pagina, nodo, indice hijo)] hasta la hoja."""
+        camino = []
+        pagina = self._encabezado.raiz
+        nodo = self._paginador.nodo(pagina)
+        while isinstance(nodo, _Interna):
+            indice = bisect_right(nodo.llaves, llave)
+            camino.append((pagina, nodo, indice))
+            pagina = nodo.hijos[indice]
+            nodo = self._paginador.nodo(pagina)
+        camino.append((pagina, nodo, None))
+        return camino
+
+    def _valor(self, valor):
+        """Retorna los bytes de un valor en linea o en desborde."""
+        return valor if isinstance(valor, bytes) else \
+            self._leer_desborde(valor)
+
+    def obtener(self, llave):
+        """Retorna los bytes de la llave o None si no existe."""
+        with self._candado:
+            _, hoja, _ = self._descender(llave)[-1]
+            indice = bisect_left(hoja.llaves, llave)
+            if indice < len(hoja.llaves) and hoja.llaves[indice] == llave:
+                return self._valor(hoja.valores[indice])
+            return None
+
+    def poner(self, llave, valor, sincronizar=True):
+        """Inserta o reemplaza el valor (bytes) de la llave."""
+        if len(llave.encode("utf-8")) > self.max_llave:
+            raise ValueError(f"Llave demasiado larga: {llave}")
+        with self._candado:
+            if len(valor) > self.max_valor:
+                valor = self._escribir_desborde(valor)
+            camino = self._descender(llave)
+            pagina, hoja, _ = camino[-1]
+            indice = bisect_left(hoja.llaves, llave)
+            if indice < len(hoja.llaves) and hoja.llaves[indice] == llave:
+                if not isinstance(hoja.valores[indice], bytes):
+                    self._liberar_desborde(hoja.valores[indice])
+                hoja.valores[indice] = valor
+            else:
+                hoja.llaves.insert(indice, llave)
+                hoja.valores.insert(indice, valor)
+                self._encabezado.registros += 1
+            self._paginador.poner(pagina, hoja)
+            if hoja.tamano() > self.tamano_pagina:
+                self._dividir(camino)
+            if sincronizar:
+                self.sincronizar()
+
+    def _dividir_nodo(self, nodo):
+        """Divide un nodo lleno; retorna (separador, nodo derecho)."""
+        if isinstance(nodo, _Hoja):
+            mitad = nodo.tamano() // 2
+            acumulado = _HOJA.size
+            corte = 1
+            for corte in range(1, len(nodo.llaves)):
+                acumulado += _ENTRADA.size + len(nodo.llaves[corte - 1]) + (
+                    len(nodo.valores[corte - 1])
+                    if isinstance(nodo.valores[corte - 1], bytes) else 8
+                )
+                if acumulado >= mitad:
+                    break
+            derecho = _Hoja(nodo.llaves[corte:], nodo.valores[corte:])
+            del nodo.llaves[corte:]
+            del nodo.valores[corte:]
+            return derecho.llaves[0], derecho
+        mitad = len(nodo.llaves) // 2
+        separador = nodo.llaves[mitad]
+        derecho = _Interna(nodo.llaves[mitad + 1:], nodo.hijos[mitad + 1:])
+        del nodo.llaves[mitad:]
+        del nodo.hijos[mitad + 1:]
+        return separador, derecho
+
+    def _dividir(self, camino):
+        """Divide los nodos llenos del camino desde la hoja hacia arriba."""
+        for nivel in range(len(camino) - 1, -1, -1):
+            pagina, nodo, _ = camino[nivel]
+            if nodo.tamano() <= self.tamano_pagina:
+                return
+            separador, derecho = self._dividir_nodo(nodo)
+            nueva = self._asignar()
+            if isinstance(nodo, _Hoja):
+                derecho.anterior, derecho.siguiente = pagina, nodo.siguiente
+                if nodo.siguiente:
+                    vecina = self._paginador.nodo(nodo.siguiente)
+                    vecina.anterior = nueva
+                    self._paginador.poner(nodo.siguiente, vecina)
+                nodo.siguiente = nueva
+            self._paginador.poner(pagina, nodo)
+            self._paginador.poner(nueva, derecho)
+            if nivel == 0:
+                self._encabezado.raiz = self._asignar()
+                self._paginador.poner(self._encabezado.raiz, _Interna(
+                    [separador], [pagina, nueva]
+                ))
+                return
+            padre_pagina, padre, indice = camino[nivel - 1]
+            padre.llaves.insert(indice, separador)
+            padre.hijos.insert(indice + 1, nueva)
+            self._paginador.poner(padre_pagina, padre)
+
+    def quitar(self, llave, sincronizar=True):
+        """Elimina la llave; retorna True si existia."""
+        with self._candado:
+            camino = self._descender(llave)
+            pagina, hoja, _ = camino[-1]
+            indice = bisect_left(hoja.llaves, llave)
+            if indice >= len(hoja.llaves) or hoja.llaves[indice] != llave:
+                return False
+            valor = hoja.valores.pop(indice)
+            hoja.llaves.pop(indice)
+            if not isinstance(valor, bytes):
+                self._liberar_desborde(valor)
+            self._encabezado.registros -= 1
+            self._paginador.poner(pagina, hoja)
+            if not hoja.llaves and len(camino) > 1:
+                self._quitar_vacia(camino)
+            if sincronizar:
+                self.sincronizar()
+            return True
+
+    def _quitar_vacia(self, camino):
+        """Libera la hoja vacia del camino y la quita de sus ancestros."""
+        pagina, hoja, _ = camino[-1]
+        for vecina_pagina, campo, valor in (
+                (hoja.anterior, "siguiente", hoja.siguiente),
+                (hoja.siguiente, "anterior", hoja.anterior)):
+            if vecina_pagina:
+                vecina = self._paginador.nodo(vecina_pagina)
+                setattr(vecina, campo, valor)
+                self._paginador.poner(vecina_pagina, vecina)
+        self._liberar(pagina)
+        for nivel in range(len(camino) - 2, -1, -1):
+            padre_pagina, padre, indice = camino[nivel]
+            del padre.hijos[indice]
+            if padre.llaves:
+                del padre.llaves[max(indice - 1, 0)]
+            if padre.hijos:
+                self._paginador.poner(padre_pagina, padre)
+                break
+            self._liberar(padre_pagina)
+        raiz = self._paginador.nodo(self._encabezado.raiz)
+        while isinstance(raiz, _Interna) and len(raiz.hijos) == 1:
+            vieja = self._encabezado.raiz
+            self._encabezado.raiz = raiz.hijos[0]
+            self._liberar(vieja)
+            raiz = self._paginador.nodo(self._encabezado.raiz)
+
+    def rango(self, desde=None, hasta=None):
+        """Itera (llave, bytes) con desde <= llave < hasta en orden.
+        None en desde o hasta deja ese extremo abierto.
+        """
+        with self._candado:
+            if desde is None:
+                nodo = self._paginador.nodo(self._encabezado.raiz)
+                while isinstance(nodo, _Interna):
+                    nodo = self._paginador.nodo(nodo.hijos[0])
+                hoja, indice = nodo, 0
+            else:
+                _, hoja, _ = self._descender(desde)[-1]
+                indice = bisect_left(hoja.llaves, desde)
+            while True:
+                for posicion in range(indice, len(hoja.llaves)):
+                    llave = hoja.llaves[posicion]
+                    if hasta is not None and llave >= hasta:
+                        return
+                    yield llave, self._valor(hoja.valores[posicion])
+                if not hoja.siguiente:
+                    return
+                hoja, indice = self._paginador.nodo(hoja.siguiente), 0
+
+    def vaciar(self):
+        """Elimina todos los registros y reinicia el archivo."""
+        with self._candado:
+            self._paginador.vaciar()
+            self._encabezado = _Encabezado(self.tamano_pagina)
+            self._paginador.poner(1, _Hoja())
+            self.sincronizar()
+
+
+# ruta del arbol -> ArbolPaginado abierto
+_ABIERTOS = {}
+_CANDADO = threading.Lock()
+
+
+def ruta_arbol(ruta_json):
+    """Retorna la ruta del arbol que reemplaza a un archivo JSON."""
+    return ruta_json + EXTENSION
+
+
+def abrir(ruta_json):
+    """Retorna el arbol abierto del archivo JSON, creandolo si no existe.
+    Se reabre si el archivo fue reemplazado o borrado.
+    """
+    ruta = ruta_arbol(ruta_json)
+    with _CANDADO:
+        arbol = _ABIERTOS.get(ruta)
+        if arbol is not None:
+            try:
+                vigente = os.stat(ruta).st_ino == arbol.inodo
+            except FileNotFoundError:
+                vigente = False
+            if vigente:
+                return arbol
+            arbol.cerrar()
+        os.makedirs(os.path.dirname(ruta), exist_ok=True)
+        arbol = ArbolPaginado(ruta)
+        _ABIERTOS[ruta] = arbol
+        return arbol
+
+
+def cerrar():
+    """Cierra todos los arboles abiertos."""
+    with _CANDADO:
+        for arbol in _ABIERTOS.values():
+            arbol.cerrar()
+        _ABIERTOS.clear()
+
+
+@contextlib.contextmanager
+def retenidos(rutas_json):
+    """Sincroniza y retiene los arboles abiertos de los archivos JSON.
+    Mientras dura el bloque ningun hilo del proceso los abre ni los
+    modifica, asi sus archivos se pueden copiar o reemplazar.
+    """
+    rutas = {ruta_arbol(os.path.abspath(ruta)) for ruta in rutas_json}
+    with _CANDADO, contextlib.ExitStack() as pila:
+        for ruta, arbol in _ABIERTOS.items():
+            if os.path.abspath(ruta) in rutas:
+                pila.enter_context(arbol.retenido())
+        yield
+
+
+_BORRADO = object()
+
+
+class MapeoArbol(MutableMapping):
+    """Vista tipo diccionario de un arbol para Persistencia.
+
+    Lee registros bajo demanda y acumula las escrituras hasta
+    confirmar(), que las aplica llave por llave.
+    """
+
+    def __init__(self, arbol):
+        self.arbol = arbol
+        self._pendientes = {}
+        self._leidos = {}
+
+    def __getitem__(self, llave):
+        valor = self._pendientes.get(llave, self._leidos.get(llave))
+        if valor is _BORRADO:
+            raise KeyError(llave)
+        if valor is None:
+            datos = self.arbol.obtener(llave)
+            if datos is None:
+                raise KeyError(llave)
+            valor = self._leidos[llave] = json.loads(datos)
+        return valor
+
+    def __setitem__(self, llave, valor):
+        self._pendientes[llave] = valor
+
+    def __delitem__(self, llave):
+        self[llave]  # pylint: disable=pointless-statement
+        self._pendientes[llave] = _BORRADO
+
+    def __iter__(self):
+        for llave, _ in self.items():
+            yield llave
+
+    def __len__(self):
+        if not self._pendientes:
+            return len(self.arbol)
+        return sum(1 for _ in self)
+
+    def items(self):
+        """Itera (llave, registro) en orden de llave."""
+        for llave, datos in self.arbol.rango():
+            valor = self._pendientes.get(llave, self._leidos.get(llave))
+            if valor is _BORRADO:
+                continue
+            if valor is None:
+                valor = self._leidos[llave] = json.loads(datos)
+            yield llave, valor
+        for llave, valor in self._pendientes.items():
+            if valor is not _BORRADO and llave not in self.arbol:
+                yield llave, valor
+
+    def values(self):
+        """Itera los registros en orden de llave."""
+        for _, valor in self.items():
+            yield valor
+
+    def confirmar(self, cambios=()):
+        """Escribe las altas, bajas y cambios pendientes en el arbol.
+        cambios (operacion, llave, antes, despues) cubre los registros
+        modificados en sitio; sin cambios se reescriben todos los
+        registros leidos, que pudieron modificarse en sitio.
+        """
+        finales = {} if cambios else dict(self._leidos)
+        finales.update(self._pendientes)
+        for _, llave, _, despues in cambios:
+            finales[llave] = _BORRADO if despues is None else despues
+        for llave, valor in finales.items():
+            if valor is _BORRADO:
+                self.arbol.quitar(llave, sincronizar=False)
+            else:
+                self.arbol.poner(llave, json.dumps(
+                    valor, ensure_ascii=False, separators=(",", ":")
+                ).encode("utf-8"), sincronizar=False)
+        self.arbol.sincronizar()
+        self._pendientes.clear()
+        self._leidos.clear()
+
+
+def reemplazar(ruta_json, datos):
+    """Reemplaza todo el contenido del arbol por el diccionario."""
+    arbol = abrir(ruta_json)
+    arbol.vaciar()
+    for llave in sorted(datos):
+        arbol.poner(llave, json.dumps(
+            datos[llave], ensure_ascii=False, separators=(",", ":")
+        ).encode("utf-8"), sincronizar=False)
+    arbol.sincronizar()
+    return arbol
+
+
+def importar(nombre_archivo, data_dir):
+    """Crea el arbol de un archivo JSON; retorna cuantos registros tiene."""
+    ruta_json = os.path.join(data_dir, nombre_archivo)
+    with open(ruta_json, "r", encoding="utf-8") as f:
+        datos = json.load(f)
+    return len(reemplazar(ruta_json, datos))
+
+
+def exportar(nombre_archivo, data_dir):
+    """Escribe el contenido del arbol como archivo JSON."""
+    ruta_json = os.path.join(data_dir, nombre_archivo)
+    datos = {
+        llave: json.loads(valor)
+        for llave, valor in abrir(ruta_json).rango()
+    }
+    temporal = f"{ruta_json}.{os.getpid()}.tmp"
+    with open(temporal, "w", encoding="utf-8") as f:
+        json.dump(datos, f, indent=4, ensure_ascii=False)
+    os.replace(temporal, ruta_json)
+    return len(datos)
+
+
+def main():
+    """Punto de entrada de linea de comandos."""
+    import argparse  # pylint: disable=import-outside-toplevel
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("accion", choices=("importar", "exportar"))
+    parser.add_argument("archivos", nargs="+")
+    parser.add_argument("--datos", default=None,
+                        help="Directorio de datos (por omision DATA_DIR)")
+    args = parser.parse_args()
+    if args.datos:
+        data_dir = os.path.abspath(args.datos)
+    else:
+        data_dir = os.path.join(os.path.dirname(__file__), "datos")
+    accion = importar if args.accion == "importar" else exportar
+    try:
+        for archivo in args.archivos:
+            print(f"{archivo}: {accion(archivo, data_dir)} registros")
+    except (OSError, ValueError) as e:
+        print(f"ERROR: {e}")
+        sys.exit(1)
+    finally:
+        cerrar()
+
+
+if __name__ == "__main__":
+    main()
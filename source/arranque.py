@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+"""Tiempo de arranque e importacion de los modulos del paquete.
+Created on Wed Oct 21 18:42:15 2026
+
+@author: Efrén Alejandro
+
+Cada medicion corre un interprete nuevo (arranque en frio), igual que una
+herramienta de linea de comandos o un proceso de corta vida:
+
+    python arranque.py hotel cliente [--repeticiones 20]
+    python arranque.py hotel --detalle 15
+
+medir_arranque() reporta la mediana de `python -c "import modulo"` menos
+la del interprete vacio; perfil_importacion() lee la salida de
+`python -X importtime` y lista los modulos de mayor costo acumulado.
+"""
+import os
+import subprocess
+import sys
+import time
+
+
+DIRECTORIO = os.path.dirname(os.path.abspath(__file__))
+
+
+def _correr(argumentos):
+    """Corre el interprete en el directorio del paquete."""
+    return subprocess.run(
+        [sys.executable] + argumentos, cwd=DIRECTORIO, check=True,
+        capture_output=True, text=True
+    )
+
+
+def _mediana_ms(codigo, repeticiones):
+    """Retorna la mediana en ms de correr el codigo en un interprete."""
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        _correr(["-c", codigo])
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+    tiempos.sort()
+    return tiempos[len(tiempos) // 2]
+
+
+def medir_arranque(modulos=("hotel",), repeticiones=20):
+    """Mide el arranque en frio de importar cada modulo.
+    Retorna una lista de dicts con modulo, ms_total y ms_importacion
+    (total menos el interprete vacio).
+    """
+    base = _mediana_ms("pass", repeticiones)
+    reporte = []
+    for modulo in modulos:
+        total = _mediana_ms(f"import {modulo}", repeticiones)
+        reporte.append({
+            "modulo": modulo,
+            "ms_total": round(total, 2),
+            "ms_importacion": round(total - base, 2),
+        })
+    return reporte
+
+
+def perfil_importacion(modulo, limite=15):
+    """Retorna [(nombre, us_propio, us_acumulado)] de -X importtime.
+    Ordenado por costo acumulado, a lo mas limite modulos.
+    """
+    salida = _correr(["-X", "importtime", "-c", f"import {modulo}"]).stderr
+    perfil = []
+    for linea in salida.splitlines():
+        if not linea.startswith("import time:"):
+            continue
+        propio, acumulado, nombre = linea[len("import time:"):].split("|")
+        if not propio.strip().isdigit():
+            continue
+        perfil.append((nombre.strip(), int(propio), int(acumulado)))
+    perfil.sort(key=lambda fila: fila[2], reverse=True)
+    return perfil[:limite]
+
+
+def main():
+    """Punto de entrada de linea de comandos."""
+    import argparse  # pylint: disable=import-outside-toplevel
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("modulos", nargs="*", default=["hotel"])
+    parser.add_argument("--repeticiones", type=int, default=20)
+    parser.add_argument("--detalle", type=int, default=0,
+                        help="Lista los N modulos mas costosos")
+    args = parser.parse_args()
+    for fila in medir_arranque(args.modulos, args.repeticiones):
+        print(f"{fila['modulo']:<20} total {fila['ms_total']:>8.2f} ms  "
+              f"importacion {fila['ms_importacion']:>8.2f} ms")
+        for nombre, propio, acumulado in perfil_importacion(
+                fila["modulo"], args.detalle) if args.detalle else ():
+            print(f"    {nombre:<28} {propio / 1000:>7.2f} ms propio "
+                  f"{acumulado / 1000:>7.2f} ms acumulado")
+
+
+if __name__ == "__main__":
+    main()
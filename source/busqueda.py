@@ -0,0 +1,213 @@
+# -*- coding: utf-8 -*-
+"""Busqueda de texto completo y por prefijo sobre campos de texto.
+Created on Tue Oct 20 17:02:48 2026
+
+@author: Efrén Alejandro
+
+Cada entidad con CAMPOS_TEXTO tiene un indice invertido token -> llaves
+y un trie de tokens para autocompletar. Los tokens se pliegan a
+minusculas sin acentos, asi "Pérez" y "perez" son el mismo token. El
+indice se construye en un recorrido del archivo la primera vez que se
+consulta y despues se mantiene con los cambios que reporta cada guardado.
+"""
+import heapq
+import re
+import unicodedata
+
+import persistencia
+from consulta import IndicesPorRuta
+
+
+_PALABRA = re.compile(r"\w+")
+
+
+def plegar(texto):
+    """Retorna el texto en minusculas y sin marcas diacriticas."""
+    descompuesto = unicodedata.normalize("NFKD", texto)
+    return "".join(
+        c for c in descompuesto if not unicodedata.combining(c)
+    ).casefold()
+
+
+def tokenizar(texto):
+    """Retorna la lista de tokens plegados de un texto."""
+    if not isinstance(texto, str):
+        return []
+    return _PALABRA.findall(plegar(texto))
+
+
+class _Nodo:
+    """Nodo del trie de tokens."""
+
+    __slots__ = ("hijos", "fin")
+
+    def __init__(self):
+        self.hijos = {}
+        self.fin = False
+
+
+class Trie:
+    """Trie de tokens para recorrer los que comparten un prefijo."""
+
+    def __init__(self):
+        self._raiz = _Nodo()
+
+    def agregar(self, token):
+        """Agrega un token al trie."""
+        nodo = self._raiz
+        for caracter in token:
+            siguiente = nodo.hijos.get(caracter)
+            if siguiente is None:
+                siguiente = nodo.hijos[caracter] = _Nodo()
+            nodo = siguiente
+        nodo.fin = True
+
+    def quitar(self, token):
+        """Quita un token y poda las ramas que quedan vacias."""
+        camino = [self._raiz]
+        for caracter in token:
+            nodo = camino[-1].hijos.get(caracter)
+            if nodo is None:
+                return
+            camino.append(nodo)
+        camino[-1].fin = False
+        for i in range(len(token), 0, -1):
+            if camino[i].fin or camino[i].hijos:
+                break
+            del camino[i - 1].hijos[token[i - 1]]
+
+    def con_prefijo(self, prefijo):
+        """Itera en orden alfabetico los tokens que inician con prefijo."""
+        nodo = self._raiz
+        for caracter in prefijo:
+            nodo = nodo.hijos.get(caracter)
+            if nodo is None:
+                return
+        pila = [(prefijo, nodo)]
+        while pila:
+            texto, nodo = pila.pop()
+            if nodo.fin:
+                yield texto
+            for caracter in sorted(nodo.hijos, reverse=True):
+                pila.append((texto + caracter, nodo.hijos[caracter]))
+
+
+class IndiceTexto:
+    """Indice invertido y trie sobre los campos de texto de una entidad."""
+
+    def __init__(self, campos):
+        self.campos = tuple(campos)
+        self._publicaciones = {}
+        self._tokens = {}
+        self._trie = Trie()
+
+    def __len__(self):
+        return len(self._tokens)
+
+    # ------------------------------------------------------------------
+    # Mantenimiento
+    # ------------------------------------------------------------------
+    def agregar(self, llave, registro):
+        """Indexa los campos de texto de un registro."""
+        self.quitar(llave)
+        tokens = frozenset(
+            token for campo in self.campos
+            for token in tokenizar(registro.get(campo))
+        )
+        self._tokens[llave] = tokens
+        for token in tokens:
+            llaves = self._publicaciones.get(token)
+            if llaves is None:
+                llaves = self._publicaciones[token] = set()
+                self._trie.agregar(token)
+            llaves.add(llave)
+
+    def quitar(self, llave):
+        """Quita un registro del indice."""
+        for token in self._tokens.pop(llave, ()):
+            llaves = self._publicaciones[token]
+            llaves.discard(llave)
+            if not llaves:
+                del self._publicaciones[token]
+                self._trie.quitar(token)
+
+    def aplicar(self, cambios):
+        """Aplica los cambios (operacion, llave, antes, despues)."""
+        for _, llave, _, despues in cambios:
+            if despues is None:
+                self.quitar(llave)
+            else:
+                self.agregar(llave, despues)
+
+    # ------------------------------------------------------------------
+    # Consulta
+    # ------------------------------------------------------------------
+    def _expandir(self, prefijo, tope):
+        """Retorna los tokens con el prefijo si sus llaves no exceden tope.
+        Retorna None cuando la expansion es mas cara que el tope.
+        """
+        tokens = []
+        total = 0
+        for token in self._trie.con_prefijo(prefijo):
+            total += len(self._publicaciones[token])
+            if total > tope:
+                return None
+            tokens.append(token)
+        return tokens
+
+    def buscar(self, texto, limite=20, prefijo=True):
+        """Retorna las llaves cuyos campos contienen todos los tokens.
+
+        Con prefijo=True el ultimo token se completa como prefijo, para
+        busqueda mientras se escribe. Retorna a lo mas `limite` llaves en
+        orden; sin tokens completos el orden es el de los tokens.
+        """
+        tokens = tokenizar(texto)
+        if not tokens:
+            return []
+        completos = tokens[:-1] if prefijo else tokens
+        inicio = tokens[-1]
+        if not completos:
+            resultados = {}
+            for token in self._trie.con_prefijo(inicio):
+                llaves = heapq.nsmallest(limite, self._publicaciones[token])
+                for llave in llaves:
+                    resultados[llave] = None
+                    if len(resultados) >= limite:
+                        return list(resultados)
+            return list(resultados)
+        conjuntos = sorted(
+            (self._publicaciones.get(t, set()) for t in completos),
+            key=len
+        )
+        menor = conjuntos[0]
+        if prefijo:
+            expansion = self._expandir(inicio, len(menor))
+            if expansion is not None:
+                coincidentes = set().union(
+                    *(self._publicaciones[token] for token in expansion)
+                ).intersection(*conjuntos)
+                return heapq.nsmallest(limite, coincidentes)
+        coincidentes = menor.intersection(*conjuntos[1:])
+        if prefijo:
+            coincidentes = (
+                llave for llave in coincidentes
+                if any(t.startswith(inicio) for t in self._tokens[llave])
+            )
+        return heapq.nsmallest(limite, coincidentes)
+
+
+_INDICES = IndicesPorRuta(lambda entidad: IndiceTexto(entidad.CAMPOS_TEXTO))
+
+
+def indice(entidad):
+    """Retorna el indice de texto vigente de la entidad."""
+    return _INDICES.obtener(entidad)
+
+
+def invalidar(ruta):
+    """Descarta el indice de texto de la ruta."""
+    _INDICES.invalidar(ruta)
+
+
+persistencia.observar(_INDICES.al_guardar)
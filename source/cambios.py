@@ -0,0 +1,229 @@
+# -*- coding: utf-8 -*-
+"""Flujo de cambios (CDC) de las entidades en un archivo de solo adicion.
+Created on Tue Oct 20 21:30:46 2026
+
+@author: Efrén Alejandro
+
+Se habilita con la variable de entorno HOTELES_CDC=1 o con habilitar().
+Cada guardado de Persistencia agrega al archivo cambios.log del
+directorio de datos una linea JSON por registro afectado:
+
+    {"seq": 42, "entidad": "clientes", "llave": "RFC...",
+     "operacion": "modificar", "antes": {...}, "despues": {...},
+     "ts": "2026-10-20T21:30:46.123456+00:00"}
+
+Los numeros de secuencia son consecutivos y crecientes aun con varios
+procesos: la adicion se hace con el archivo bloqueado y la secuencia se
+toma de la ultima linea. Persistencia escribe cada archivo de entidad y
+emite sus eventos dentro de bloqueado(), con el mismo candado, asi el
+orden de las secuencias es el orden en que se escribieron los archivos
+y la marca de tiempo se toma ya con el candado. Un guardado sin cambios
+por registro produce un evento "reemplazar" sin llave para que el
+consumidor vuelva a leer la entidad completa. Los consumidores leen con
+Lector desde una posicion en bytes que pueden guardar para continuar
+donde se quedaron.
+
+Si un proceso termina a mitad de una adicion queda una linea sin
+terminar al final; el siguiente emitir la descarta (con el archivo
+bloqueado nadie mas puede estar escribiendola) antes de agregar. Lector
+no consume una linea final sin terminar y reporta y salta las lineas
+intermedias que no son JSON valido.
+"""
+import contextlib
+import json
+import os
+import threading
+
+from config import ARCHIVO_CAMBIOS
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+
+HABILITADO = os.environ.get("HOTELES_CDC", "0") not in ("", "0")
+
+_CANDADO = threading.RLock()
+
+# (ruta, archivo) del flujo que el hilo tiene bloqueado en bloqueado()
+_BLOQUEADO = threading.local()
+
+# Bytes que se leen del final del archivo para hallar la ultima secuencia
+_COLA = 1 << 16
+
+
+def habilitar(valor=True):
+    """Enciende o apaga la emision de eventos en tiempo de ejecucion."""
+    global HABILITADO  # pylint: disable=global-statement
+    HABILITADO = bool(valor)
+
+
+def ruta_flujo(data_dir):
+    """Retorna la ruta del archivo de cambios de un directorio."""
+    return os.path.join(data_dir, ARCHIVO_CAMBIOS)
+
+
+def _ultima_secuencia(f):
+    """Retorna la secuencia de la ultima linea completa del archivo."""
+    fin = f.seek(0, os.SEEK_END)
+    bloque = _COLA
+    while True:
+        inicio = max(0, fin - bloque)
+        f.seek(inicio)
+        lineas = f.read(fin - inicio).splitlines()
+        if inicio > 0:
+            lineas = lineas[1:]
+        for linea in reversed(lineas):
+            try:
+                return json.loads(linea)["seq"]
+            except (ValueError, KeyError, TypeError):
+                continue
+        if inicio == 0:
+            return 0
+        bloque *= 2
+
+
+def _descartar_linea_rota(f):
+    """Trunca el archivo tras su ultimo salto de linea.
+    Retorna los bytes descartados de una adicion interrumpida.
+    """
+    fin = f.seek(0, os.SEEK_END)
+    if fin == 0:
+        return 0
+    f.seek(fin - 1)
+    if f.read(1) == b"\n":
+        return 0
+    bloque = _COLA
+    while True:
+        inicio = max(0, fin - bloque)
+        f.seek(inicio)
+        salto = f.read(fin - inicio).rfind(b"\n")
+        if salto >= 0 or inicio == 0:
+            corte = inicio + salto + 1
+            f.truncate(corte)
+            return fin - corte
+        bloque *= 2
+
+
+@contextlib.contextmanager
+def _flujo(data_dir):
+    """Retorna el archivo de cambios abierto y bloqueado.
+    Reutiliza el que el hilo ya tiene bloqueado en bloqueado().
+    """
+    ruta = ruta_flujo(data_dir)
+    actual = getattr(_BLOQUEADO, "flujo", None)
+    if actual is not None and actual[0] == ruta:
+        yield actual[1]
+        return
+    with _CANDADO, open(ruta, "a+b") as f:
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        _BLOQUEADO.flujo = (ruta, f)
+        try:
+            yield f
+        finally:
+            _BLOQUEADO.flujo = actual
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+
+@contextlib.contextmanager
+def bloqueado(data_dir):
+    """Bloquea el flujo de cambios del directorio durante el bloque.
+    Persistencia escribe los archivos y los notifica dentro, asi ningun
+    otro hilo o proceso escribe entre el archivo y sus eventos. Sin la
+    emision habilitada no hace nada.
+    """
+    with contextlib.ExitStack() as pila:
+        if HABILITADO:
+            try:
+                os.makedirs(data_dir, exist_ok=True)
+                pila.enter_context(_flujo(data_dir))
+            except OSError as e:
+                print(f"ERROR: No se pudo bloquear el flujo de cambios: {e}")
+        yield
+
+
+def emitir(data_dir, entidad, cambios):
+    """Agrega los eventos de un guardado y retorna sus secuencias."""
+    if not cambios:
+        cambios = [("reemplazar", None, None, None)]
+    # pylint: disable=import-outside-toplevel
+    from datetime import datetime, timezone
+    with _flujo(data_dir) as f:
+        ts = datetime.now(timezone.utc).isoformat()
+        _descartar_linea_rota(f)
+        secuencia = _ultima_secuencia(f)
+        lineas = []
+        for operacion, llave, antes, despues in cambios:
+            secuencia += 1
+            lineas.append(json.dumps({
+                "seq": secuencia, "entidad": entidad, "llave": llave,
+                "operacion": operacion, "antes": antes,
+                "despues": despues, "ts": ts
+            }, ensure_ascii=False).encode("utf-8") + b"\n")
+        f.write(b"".join(lineas))
+        f.flush()
+    return list(range(secuencia - len(lineas) + 1, secuencia + 1))
+
+
+def al_guardar(ruta, cambios):
+    """Emite los eventos de un guardado (observador de guardado)."""
+    if not HABILITADO:
+        return
+    nombre = os.path.basename(ruta)
+    entidad = nombre[:-5] if nombre.endswith(".json") else nombre
+    try:
+        emitir(os.path.dirname(ruta), entidad, cambios)
+    except OSError as e:
+        print(f"ERROR: No se pudieron emitir cambios de {nombre}: {e}")
+
+
+class Lector:
+    """Lee el flujo de cambios de forma incremental.
+
+    posicion es el desplazamiento en bytes hasta donde se leyo; el
+    consumidor puede guardarlo y crear otro Lector con esa posicion.
+    desde_seq descarta los eventos con secuencia menor o igual.
+    corruptas cuenta las lineas invalidas que se han saltado.
+    """
+
+    def __init__(self, data_dir, posicion=0, desde_seq=0):
+        self.ruta = ruta_flujo(data_dir)
+        self.posicion = posicion
+        self.desde_seq = desde_seq
+        self.corruptas = 0
+
+    def leer(self, maximo=None):
+        """Retorna los eventos nuevos y avanza la posicion.
+        Una linea incompleta al final se deja para la siguiente lectura;
+        una linea completa invalida se reporta en consola y se salta.
+        """
+        eventos = []
+        try:
+            f = open(self.ruta, "rb")  # pylint: disable=consider-using-with
+        except FileNotFoundError:
+            return eventos
+        with f:
+            f.seek(self.posicion)
+            for linea in f:
+                if not linea.endswith(b"\n"):
+                    break
+                inicio = self.posicion
+                self.posicion += len(linea)
+                try:
+                    evento = json.loads(linea)
+                    secuencia = evento["seq"]
+                except (ValueError, KeyError, TypeError):
+                    self.corruptas += 1
+                    print(f"ERROR: Linea de cambios invalida en el byte "
+                          f"{inicio} de {self.ruta}.")
+                    continue
+                if secuencia <= self.desde_seq:
+                    continue
+                self.desde_seq = secuencia
+                eventos.append(evento)
+                if maximo is not None and len(eventos) >= maximo:
+                    break
+        return eventos
@@ -0,0 +1,264 @@
+# -*- coding: utf-8 -*-
+"""Importacion y exportacion masiva de entidades en CSV y JSON Lines.
+Created on Tue Oct 20 11:30:05 2026
+
+@author: Efrén Alejandro
+
+Uso:
+    python carga_masiva.py importar clientes clientes.csv --lote 5000
+    python carga_masiva.py exportar hoteles hoteles.jsonl
+
+La importacion lee las filas en streaming, las valida con el constructor
+de la entidad, descarta llaves duplicadas contra las llaves en memoria y
+confirma por lotes en vez de un guardado por registro. Cada guardado
+reescribe el archivo completo, asi que el lote crece con el archivo: se
+confirma cuando los registros nuevos son al menos `lote` y al menos los
+ya guardados. Cada guardado duplica por lo menos el archivo, por lo que
+importar N filas sobre M registros serializa O(M + N) registros en total
+(a lo mas unas 2 (M + N)) en O(log N) guardados, en lugar de O(N^2 / lote).
+Las filas rechazadas se escriben en un archivo de errores JSON Lines.
+"""
+import argparse
+import contextlib
+import csv
+import json
+import sys
+
+import persistencia
+from almacen import Almacen
+from cliente import Cliente
+from hotel import Hotel
+from reservacion import Reservacion
+from tipo_cuarto import TipoCuarto
+
+
+# Entidad -> (clase, columnas CSV, conversiones de texto)
+ENTIDADES = {
+    "hoteles": (Hotel, [
+        "nombre", "nombre_fiscal", "rfc", "direccion", "estado",
+        "clasificacion", "estatus"
+    ], {}),
+    "clientes": (Cliente, [
+        "nombre", "rfc", "sexo", "compania", "forma_pago", "estatus"
+    ], {}),
+    "tipos_cuarto": (TipoCuarto, ["rfc_hotel", "tipo", "costo"],
+                     {"costo": float}),
+    "reservaciones": (Reservacion, None, {}),
+}
+
+FORMATOS = ("csv", "jsonl")
+
+
+def _formato(ruta, formato=None):
+    """Determina el formato a partir del argumento o la extension."""
+    if formato is None:
+        formato = "csv" if ruta.lower().endswith(".csv") else "jsonl"
+    if formato not in FORMATOS:
+        raise ValueError(f"Formato no soportado: {formato}")
+    return formato
+
+
+def _entidad(nombre):
+    """Retorna la configuracion de la entidad o lanza ValueError."""
+    if nombre not in ENTIDADES:
+        raise ValueError(f"Entidad desconocida: {nombre}")
+    return ENTIDADES[nombre]
+
+
+def leer_filas(ruta, formato=None):
+    """Itera (numero_de_linea, fila) de un archivo CSV o JSON Lines."""
+    formato = _formato(ruta, formato)
+    with open(ruta, "r", encoding="utf-8", newline="") as f:
+        if formato == "csv":
+            lector = csv.DictReader(f)
+            for fila in lector:
+                yield lector.line_num, fila
+            return
+        for numero, linea in enumerate(f, start=1):
+            if linea.strip():
+                try:
+                    yield numero, json.loads(linea)
+                except json.JSONDecodeError as e:
+                    yield numero, e
+
+
+def _convertir(fila, conversiones):
+    """Aplica las conversiones de tipo a los campos de texto."""
+    for campo, conversion in conversiones.items():
+        if isinstance(fila.get(campo), str):
+            fila[campo] = conversion(fila[campo])
+    return fila
+
+
+class _Errores:
+    """Archivo de errores JSON Lines que se abre en el primer rechazo."""
+
+    def __init__(self, ruta):
+        self.ruta = ruta
+        self.total = 0
+        self._archivo = None
+
+    def escribir(self, numero, error, fila):
+        """Registra una fila rechazada."""
+        self.total += 1
+        if self.ruta is None:
+            return
+        if self._archivo is None:
+            self._archivo = open(  # pylint: disable=consider-using-with
+                self.ruta, "w", encoding="utf-8"
+            )
+        self._archivo.write(json.dumps(
+            {"linea": numero, "error": error, "fila": fila},
+            ensure_ascii=False, default=str
+        ) + "\n")
+
+    def cerrar(self):
+        """Cierra el archivo de errores si se abrio."""
+        if self._archivo is not None:
+            self._archivo.close()
+
+
+def _progreso_stderr(entidad, confirmados, rechazados):
+    """Reporta el avance de una importacion en stderr."""
+    print(f"{entidad}: {confirmados} confirmados, {rechazados} rechazados",
+          file=sys.stderr)
+
+
+class OpcionesImportacion:
+    """Tamano de lote, archivo de errores y reporte de avance."""
+
+    def __init__(self, lote=1000, ruta_errores=None,
+                 progreso=_progreso_stderr):
+        self.lote = lote
+        self.ruta_errores = ruta_errores
+        self.progreso = progreso
+
+
+class _Confirmador:
+    """Registros nuevos que se guardan juntos al completar un lote."""
+
+    def __init__(self, instancia, lote):
+        self.instancia = instancia
+        self.archivo = instancia._cargar()  # pylint: disable=protected-access
+        self.lote = lote
+        self.guardados = len(self.archivo)
+        self.confirmados = 0
+        self._pendientes = []
+
+    def agregar(self, llave, datos):
+        """Agrega un registro; retorna True si con el se guardo el lote."""
+        self.archivo[llave] = datos
+        self._pendientes.append(("crear", llave, None, datos))
+        if len(self._pendientes) < max(self.lote, self.guardados):
+            return False
+        self.confirmar()
+        return True
+
+    def confirmar(self):
+        """Guarda los registros pendientes."""
+        if not self._pendientes:
+            return
+        # pylint: disable=protected-access
+        self.instancia._guardar(self.archivo, self._pendientes)
+        self.confirmados += len(self._pendientes)
+        self.guardados = len(self.archivo)
+        self._pendientes = []
+
+
+def importar(entidad, ruta, formato=None, opciones=None):
+    """Importa un archivo de filas a la entidad y retorna un resumen.
+
+    Carga el almacenamiento una vez, valida cada fila con el constructor
+    de la entidad y guarda cuando los registros nuevos son al menos
+    `opciones.lote` y al menos los ya guardados (ver el docstring del
+    modulo).
+    """
+    opciones = opciones or OpcionesImportacion()
+    cls, _, conversiones = _entidad(entidad)
+    confirmador = _Confirmador(cls.__new__(cls), opciones.lote)
+    errores = _Errores(opciones.ruta_errores)
+    try:
+        for numero, fila in leer_filas(ruta, formato):
+            if isinstance(fila, Exception):
+                errores.escribir(numero, f"JSON invalido: {fila}", None)
+                continue
+            try:
+                with contextlib.redirect_stdout(None):
+                    obj = cls(_convertir(dict(fila), conversiones))
+            except (KeyError, ValueError, TypeError) as e:
+                errores.escribir(numero, f"{type(e).__name__}: {e}", fila)
+                continue
+            if obj.id in confirmador.archivo:
+                errores.escribir(numero, f"Llave duplicada: {obj.id}", fila)
+                continue
+            # pylint: disable=protected-access
+            if confirmador.agregar(obj.id, obj._a_dict()):
+                opciones.progreso(entidad, confirmador.confirmados,
+                                  errores.total)
+        confirmador.confirmar()
+    finally:
+        errores.cerrar()
+    opciones.progreso(entidad, confirmador.confirmados, errores.total)
+    return {"confirmados": confirmador.confirmados,
+            "rechazados": errores.total}
+
+
+def exportar(entidad, ruta, formato=None):
+    """Exporta todos los registros de la entidad y retorna cuantos fueron."""
+    cls, columnas, _ = _entidad(entidad)
+    formato = _formato(ruta, formato)
+    if formato == "csv" and columnas is None:
+        raise ValueError(f"{entidad} solo se exporta como jsonl.")
+    instancia = cls.__new__(cls)
+    archivo = instancia._cargar()  # pylint: disable=protected-access
+    total = 0
+    with open(ruta, "w", encoding="utf-8", newline="") as f:
+        if formato == "csv":
+            escritor = csv.DictWriter(f, fieldnames=columnas,
+                                      extrasaction="ignore")
+            escritor.writeheader()
+            for registro in archivo.values():
+                escritor.writerow(registro)
+                total += 1
+        else:
+            for registro in archivo.values():
+                f.write(json.dumps(registro, ensure_ascii=False) + "\n")
+                total += 1
+    return total
+
+
+def main():
+    """Punto de entrada de linea de comandos."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("accion", choices=("importar", "exportar"))
+    parser.add_argument("entidad", choices=sorted(ENTIDADES))
+    parser.add_argument("ruta")
+    parser.add_argument("--formato", choices=FORMATOS, default=None)
+    parser.add_argument("--lote", type=int, default=1000,
+                        help="Registros nuevos minimos por guardado")
+    parser.add_argument("--errores", default=None,
+                        help="Archivo JSON Lines para filas rechazadas")
+    parser.add_argument("--datos", default=None,
+                        help="Directorio de datos (por omision DATA_DIR)")
+    args = parser.parse_args()
+    almacen = contextlib.nullcontext() if args.datos is None else Almacen(
+        args.datos, persistencia.backend_actual()
+    )
+    try:
+        with almacen:
+            if args.accion == "importar":
+                resumen = importar(
+                    args.entidad, args.ruta, args.formato,
+                    OpcionesImportacion(args.lote, args.errores)
+                )
+                print(json.dumps(resumen))
+            else:
+                total = exportar(args.entidad, args.ruta, args.formato)
+                print(f"{total} registros exportados a {args.ruta}")
+    except (OSError, ValueError) as e:
+        print(f"ERROR: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+# -*- coding: utf-8 -*-
+"""Snapshots inmutables de catalogos abiertos con mmap.
+Created on Tue Oct 20 20:05:34 2026
+
+@author: Efrén Alejandro
+
+Uso:
+    python catalogo_mmap.py --datos source/datos hoteles.json clientes.json
+
+Un snapshot <archivo>.snap se escribe junto al JSON y tiene tres partes:
+encabezado, tabla de llaves ordenada de ancho fijo (llave UTF-8 rellena
+con ceros, desplazamiento y longitud) y un monticulo con el JSON de cada
+registro. Se abre con mmap de solo lectura, asi todos los procesos
+comparten las mismas paginas del cache del sistema; buscar hace busqueda
+binaria en la tabla y solo decodifica el registro encontrado. El
+encabezado guarda mtime y tamano del JSON de origen: si el JSON cambio,
+el snapshot se ignora y se lee el JSON.
+"""
+import json
+import mmap
+import os
+import struct
+import sys
+
+import persistencia
+from consulta import firma_archivo
+from lector_json import leer_archivo_json
+
+
+EXTENSION = ".snap"
+MAGIA = b"HOTSNAP1"
+# magia, ancho de llave, registros, inicio del monticulo, mtime, tamano
+_ENCABEZADO = struct.Struct("<8sIIQqq")
+# desplazamiento y longitud del registro en el monticulo
+_POSICION = struct.Struct("<QI")
+
+
+def ruta_snapshot(ruta_json):
+    """Retorna la ruta del snapshot de un archivo JSON."""
+    return ruta_json + EXTENSION
+
+
+def escribir_snapshot(nombre_archivo, data_dir=None):
+    """Escribe el snapshot de un archivo JSON y retorna su ruta."""
+    data_dir = data_dir or persistencia.directorio_datos()
+    ruta_json = os.path.join(data_dir, nombre_archivo)
+    estado = os.stat(ruta_json)
+    datos = leer_archivo_json(nombre_archivo, data_dir)
+    entradas = sorted(
+        (llave.encode("utf-8"), json.dumps(
+            registro, ensure_ascii=False, separators=(",", ":")
+        ).encode("utf-8"))
+        for llave, registro in datos.items()
+    )
+    ancho = max((len(llave) for llave, _ in entradas), default=0)
+    tabla = bytearray()
+    monticulo = bytearray()
+    for llave, registro in entradas:
+        tabla += llave.ljust(ancho, b"\0")
+        tabla += _POSICION.pack(len(monticulo), len(registro))
+        monticulo += registro
+    ruta = ruta_snapshot(ruta_json)
+    temporal = ruta + ".tmp"
+    with open(temporal, "wb") as f:
+        f.write(_ENCABEZADO.pack(
+            MAGIA, ancho, len(entradas),
+            _ENCABEZADO.size + len(tabla),
+            estado.st_mtime_ns, estado.st_size
+        ))
+        f.write(tabla)
+        f.write(monticulo)
+    os.replace(temporal, ruta)
+    return ruta
+
+
+class Snapshot:
+    """Snapshot abierto con mmap de solo lectura."""
+
+    def __init__(self, ruta):
+        self.ruta = ruta
+        with open(ruta, "rb") as f:
+            self._mapa = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        (magia, self._ancho, self._total, self._monticulo,
+         mtime, tamano) = _ENCABEZADO.unpack_from(self._mapa, 0)
+        if magia != MAGIA:
+            self._mapa.close()
+            raise ValueError(f"Snapshot invalido: {ruta}")
+        self.origen = (mtime, tamano)
+        self._paso = self._ancho + _POSICION.size
+
+    def __len__(self):
+        return self._total
+
+    def __contains__(self, llave):
+        return self._indice(llave) is not None
+
+    def _llave(self, i):
+        """Retorna la llave en bytes de la posicion i de la tabla."""
+        inicio = _ENCABEZADO.size + i * self._paso
+        return self._mapa[inicio:inicio + self._ancho].rstrip(b"\0")
+
+    def _indice(self, llave):
+        """Busqueda binaria de la llave; retorna su posicion o None."""
+        buscada = llave.encode("utf-8")
+        if len(buscada) > self._ancho:
+            return None
+        bajo, alto = 0, self._total
+        while bajo < alto:
+            medio = (bajo + alto) // 2
+            if self._llave(medio) < buscada:
+                bajo = medio + 1
+            else:
+                alto = medio
+        if bajo < self._total and self._llave(bajo) == buscada:
+            return bajo
+        return None
+
+    def buscar(self, llave):
+        """Retorna el registro de la llave o None si no existe."""
+        i = self._indice(llave)
+        if i is None:
+            return None
+        inicio = _ENCABEZADO.size + i * self._paso + self._ancho
+        desplazamiento, longitud = _POSICION.unpack_from(self._mapa, inicio)
+        inicio = self._monticulo + desplazamiento
+        return json.loads(self._mapa[inicio:inicio + longitud])
+
+    def llaves(self):
+        """Itera las llaves en orden."""
+        for i in range(self._total):
+            yield self._llave(i).decode("utf-8")
+
+    def cerrar(self):
+        """Libera el mapeo."""
+        self._mapa.close()
+
+
+# ruta del JSON -> Snapshot abierto
+_ABIERTOS = {}
+
+
+def snapshot(nombre_archivo, data_dir=None):
+    """Retorna el snapshot vigente del archivo JSON o None.
+
+    El snapshot esta vigente si existe y fue escrito a partir del JSON
+    actual, que debe existir.
+    """
+    data_dir = data_dir or persistencia.directorio_datos()
+    ruta_json = os.path.join(data_dir, nombre_archivo)
+    firma = firma_archivo(ruta_json)
+    if firma is None:
+        return None
+    abierto = _ABIERTOS.get(ruta_json)
+    if abierto is not None and firma != abierto.origen:
+        # El snapshot pudo regenerarse desde que se abrio
+        cerrar(ruta_json)
+        abierto = None
+    if abierto is None:
+        ruta = ruta_snapshot(ruta_json)
+        if not os.path.exists(ruta):
+            return None
+        try:
+            abierto = Snapshot(ruta)
+        except (OSError, ValueError, struct.error) as e:
+            print(f"ERROR: No se pudo abrir {ruta}: {e}")
+            return None
+        _ABIERTOS[ruta_json] = abierto
+    if firma != abierto.origen:
+        return None
+    return abierto
+
+
+def cerrar(ruta_json=None):
+    """Cierra el snapshot de una ruta JSON o todos si es None."""
+    rutas = list(_ABIERTOS) if ruta_json is None else [ruta_json]
+    for ruta in rutas:
+        abierto = _ABIERTOS.pop(ruta, None)
+        if abierto is not None:
+            abierto.cerrar()
+
+
+def main():
+    """Punto de entrada de linea de comandos."""
+    import argparse  # pylint: disable=import-outside-toplevel
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("archivos", nargs="+",
+                        help="Archivos JSON del directorio de datos")
+    parser.add_argument("--datos", default=None,
+                        help="Directorio de datos (por omision DATA_DIR)")
+    args = parser.parse_args()
+    data_dir = os.path.abspath(args.datos) if args.datos else None
+    for nombre in args.archivos:
+        try:
+            print(escribir_snapshot(nombre, data_dir))
+        except OSError as e:
+            print(f"ERROR: {e}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -35,3 +35,60 @@ class TipoHabitacion(Enum):
     JUNIOR_SUITE = "JUNIOR_SUITE"
     SUITE = "SUITE"
     SUITE_PRESIDENCIAL = "SUITE_PRESIDENCIAL"
+
+
+# ----------------------------------------------------------------------
+# Tablas precalculadas para parseo rapido y codigos compactos
+# ----------------------------------------------------------------------
+_CLASIFICACION_POR_VALOR = {m.value: m for m in ClasificacionHotel}
+_TIPO_POR_VALOR = {m.value: m for m in TipoHabitacion}
+
+# Codigo entero (un byte) de cada miembro, en orden de declaracion
+CLASIFICACIONES = tuple(ClasificacionHotel)
+TIPOS_HABITACION = tuple(TipoHabitacion)
+_CODIGO_CLASIFICACION = {m: i for i, m in enumerate(CLASIFICACIONES)}
+_CODIGO_TIPO = {m: i for i, m in enumerate(TIPOS_HABITACION)}
+
+
+def _parsear(tabla, enum, valor):
+    """Retorna el miembro de enum para valor usando la tabla dada.
+    Lanza ValueError con el mismo mensaje que enum(valor).
+    """
+    try:
+        return tabla[valor]
+    except (KeyError, TypeError):
+        if isinstance(valor, enum):
+            return valor
+        raise ValueError(
+            f"{valor!r} is not a valid {enum.__qualname__}"
+        ) from None
+
+
+def parsear_clasificacion(valor):
+    """Convierte un valor o miembro a ClasificacionHotel."""
+    return _parsear(_CLASIFICACION_POR_VALOR, ClasificacionHotel, valor)
+
+
+def parsear_tipo_habitacion(valor):
+    """Convierte un valor o miembro a TipoHabitacion."""
+    return _parsear(_TIPO_POR_VALOR, TipoHabitacion, valor)
+
+
+def codigo_clasificacion(clasificacion):
+    """Retorna el codigo entero compacto de una ClasificacionHotel."""
+    return _CODIGO_CLASIFICACION[parsear_clasificacion(clasificacion)]
+
+
+def codigo_tipo_habitacion(tipo):
+    """Retorna el codigo entero compacto de un TipoHabitacion."""
+    return _CODIGO_TIPO[parsear_tipo_habitacion(tipo)]
+
+
+def clasificacion_desde_codigo(codigo):
+    """Retorna la ClasificacionHotel de un codigo entero compacto."""
+    return CLASIFICACIONES[codigo]
+
+
+def tipo_habitacion_desde_codigo(codigo):
+    """Retorna el TipoHabitacion de un codigo entero compacto."""
+    return TIPOS_HABITACION[codigo]
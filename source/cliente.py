@@ -7,12 +7,19 @@ Created on Fri Feb 20 21:51:12 2026
 
 
 from persistencia import Persistencia
+from perfilador import perfilado
 from config import ARCHIVO_CLIENTES, SEPARADOR
 
 
 class Cliente(Persistencia):
     """Representa un cliente."""
 
+    CAMPOS_MODIFICABLES = frozenset({
+        "nombre", "sexo", "compania", "forma_pago", "estatus"
+    })
+    CAMPOS_INDEXADOS = ("compania", "estatus")
+    CAMPOS_TEXTO = ("nombre", "compania")
+
     def __init__(self, datos: dict):
         try:
             self.nombre = datos["nombre"]
@@ -54,14 +61,15 @@ class Cliente(Persistencia):
     # Metodos de clase
     # ------------------------------------------------------------------
     @classmethod
+    @perfilado("Cliente.buscar")
     def buscar(cls, rfc):
         """Busca un cliente por RFC, retorna dict o None si no existe."""
         cliente_temp = cls.__new__(cls)
         cliente_temp.rfc = rfc
-        archivo = cliente_temp._cargar()
-        return archivo.get(rfc)
+        return cliente_temp._buscar_registro(rfc)
 
     @classmethod
+    @perfilado("Cliente.crear")
     def crear(cls, datos: dict):
         """Crea un cliente y lo persiste en archivo.
 
@@ -74,10 +82,13 @@ class Cliente(Persistencia):
             print(f"ERROR: Ya existe un cliente con RFC {cliente.rfc}.")
             return None
         archivo[cliente.rfc] = cliente._a_dict()
-        cliente._guardar(archivo)
+        cliente._guardar(archivo, [
+            ("crear", cliente.rfc, None, archivo[cliente.rfc])
+        ])
         return cliente
 
     @classmethod
+    @perfilado("Cliente.eliminar")
     def eliminar(cls, rfc):
         """Elimina un cliente del archivo por RFC.
 
@@ -90,8 +101,8 @@ class Cliente(Persistencia):
         if rfc not in archivo:
             print(f"ERROR: No existe un cliente con RFC {rfc}.")
             return False
-        del archivo[rfc]
-        cliente._guardar(archivo)
+        antes = archivo.pop(rfc)
+        cliente._guardar(archivo, [("eliminar", rfc, antes, None)])
         return True
 
     # ------------------------------------------------------------------
@@ -109,23 +120,22 @@ class Cliente(Persistencia):
         print(f"Estatus:     {self.estatus}")
         print(SEPARADOR)
 
+    @perfilado("Cliente.modificar")
     def modificar(self, **kwargs):
         """Modifica los atributos del cliente y actualiza el archivo.
 
         Atributo no modificable: rfc (es la llave unica).
         """
-        campos_validos = {
-            "nombre", "sexo", "compania", "forma_pago", "estatus"
-        }
-        archivo = self._cargar()
-        if self.rfc not in archivo:
+        archivo, registro = self._leer_para_modificar(self.rfc)
+        if registro is None:
             print(f"ERROR: Cliente con RFC {self.rfc} no encontrado.")
             return False
+        campos = {}
         for campo, valor in kwargs.items():
-            if campo not in campos_validos:
+            if campo not in self.CAMPOS_MODIFICABLES:
                 print(f"ERROR: Atributo '{campo}' no es modificable.")
                 continue
             setattr(self, campo, valor)
-            archivo[self.rfc][campo] = valor
-        self._guardar(archivo)
+            campos[campo] = valor
+        self._parchar(archivo, registro, self.rfc, campos)
         return True
@@ -11,5 +11,8 @@ ARCHIVO_CLIENTES = "clientes.json"
 ARCHIVO_TIPOS_CUARTO = "tipos_cuarto.json"
 ARCHIVO_RESERVACIONES = "reservaciones.json"
 
+# Flujo de cambios de las entidades (JSON Lines)
+ARCHIVO_CAMBIOS = "cambios.log"
+
 # Formato de consola
 SEPARADOR = "-" * 40
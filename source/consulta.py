@@ -0,0 +1,309 @@
+# -*- coding: utf-8 -*-
+"""Consultas con filtro, orden, proyeccion y paginacion por cursor.
+Created on Tue Oct 20 15:07:22 2026
+
+@author: Efrén Alejandro
+
+Las consultas recorren el archivo en streaming (Persistencia._iterar) y
+solo retienen en memoria los registros de la pagina pedida. Los campos
+declarados en CAMPOS_INDEXADOS tienen un indice secundario valor -> llaves
+que se construye en un solo recorrido y se reconstruye cuando cambia el
+archivo; con el indice se omiten filtros y se termina el recorrido en
+cuanto se encontraron todos los candidatos.
+
+IndicesPorRuta guarda por ruta los indices de otros modulos (busqueda,
+indice_fechas) y los mantiene con cada guardado.
+"""
+import heapq
+import json
+import os
+from itertools import islice
+
+import deltas
+import persistencia
+
+
+# ruta -> (firma del archivo, {campo: {valor: set(llaves)}})
+_INDICES = {}
+
+
+def firma_archivo(ruta):
+    """Retorna (mtime_ns, tamano) del archivo o None si no existe."""
+    try:
+        estado = os.stat(ruta)
+    except OSError:
+        return None
+    return (estado.st_mtime_ns, estado.st_size)
+
+
+def firma_datos(ruta):
+    """Retorna la firma del archivo y de su delta o None si no existe."""
+    firma = firma_archivo(ruta)
+    if firma is None:
+        # Con el backend "arbol" el JSON no existe
+        import arbol_paginado  # pylint: disable=import-outside-toplevel
+        return firma_archivo(arbol_paginado.ruta_arbol(ruta))
+    return firma + (deltas.firma(ruta),)
+
+
+class IndicesPorRuta:
+    """Indices de entidad en memoria por ruta, vigentes por la firma.
+
+    construir(entidad) retorna un indice vacio con agregar(llave,
+    registro) y aplicar(cambios). obtener reconstruye el indice si la
+    firma del archivo cambio o hay cambios pendientes (que no se
+    guardan en la cache); al_guardar, registrado como observador, lo
+    mantiene con los cambios de cada guardado.
+    """
+
+    def __init__(self, construir):
+        self.construir = construir
+        # ruta -> (firma del archivo, indice)
+        self._indices = {}
+
+    def obtener(self, entidad):
+        """Retorna el indice vigente de la entidad."""
+        # pylint: disable=protected-access
+        instancia = entidad.__new__(entidad)
+        ruta = instancia._ruta_archivo()
+        firma = firma_datos(ruta)
+        vigente = self._indices.get(ruta)
+        pendiente = instancia._pendiente()
+        if (vigente is not None and vigente[0] == firma
+                and firma is not None and not pendiente):
+            return vigente[1]
+        construido = self.construir(entidad)
+        for llave, registro in instancia._iterar():
+            construido.agregar(llave, registro)
+        if not pendiente:
+            self._indices[ruta] = (firma, construido)
+        return construido
+
+    def invalidar(self, ruta):
+        """Descarta el indice de la ruta."""
+        self._indices.pop(ruta, None)
+
+    def al_guardar(self, ruta, cambios):
+        """Mantiene el indice de la ruta guardada (observador de guardado).
+        Sin cambios por registro el indice se descarta y se reconstruye
+        en el siguiente uso.
+        """
+        vigente = self._indices.get(ruta)
+        if vigente is None:
+            return
+        if not cambios:
+            self.invalidar(ruta)
+            return
+        vigente[1].aplicar(cambios)
+        self._indices[ruta] = (firma_datos(ruta), vigente[1])
+
+
+def invalidar(ruta, _cambios=()):
+    """Descarta los indices de la ruta guardada (observador de guardado)."""
+    _INDICES.pop(ruta, None)
+
+
+persistencia.observar(invalidar)
+
+
+def indices(instancia):
+    """Retorna los indices secundarios vigentes de la entidad."""
+    # pylint: disable=protected-access
+    campos = type(instancia).CAMPOS_INDEXADOS
+    ruta = instancia._ruta_archivo()
+    firma = firma_datos(ruta)
+    vigente = _INDICES.get(ruta)
+    pendiente = instancia._pendiente()
+    if (vigente is not None and vigente[0] == firma and firma is not None
+            and not pendiente):
+        return vigente[1]
+    construidos = {campo: {} for campo in campos}
+    for llave, registro in instancia._iterar():
+        for campo in campos:
+            valor = registro.get(campo)
+            try:
+                construidos[campo].setdefault(valor, set()).add(llave)
+            except TypeError:
+                continue
+    if not pendiente:
+        _INDICES[ruta] = (firma, construidos)
+    return construidos
+
+
+def _codificar_cursor(llave_orden):
+    """Codifica la llave de orden del ultimo registro como cursor."""
+    import base64  # pylint: disable=import-outside-toplevel
+    texto = json.dumps(list(llave_orden), ensure_ascii=False)
+    return base64.urlsafe_b64encode(texto.encode("utf-8")).decode("ascii")
+
+
+def _decodificar_cursor(cursor):
+    """Decodifica un cursor opaco a la llave de orden."""
+    import base64  # pylint: disable=import-outside-toplevel
+    try:
+        texto = base64.urlsafe_b64decode(cursor.encode("ascii"))
+        return tuple(json.loads(texto))
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Cursor invalido: {cursor}") from e
+
+
+class _Invertido:
+    """Envuelve una llave de orden para invertir su comparacion."""
+
+    __slots__ = ("llave",)
+
+    def __init__(self, llave):
+        self.llave = llave
+
+    def __lt__(self, otro):
+        return otro.llave < self.llave
+
+
+class Consulta:
+    """Constructor de consultas sobre los registros de una entidad."""
+
+    def __init__(self, entidad):
+        self._entidad = entidad
+        self._igualdades = {}
+        self._predicados = []
+        self._orden = None
+        self._descendente = False
+        self._limite = None
+        self._campos = None
+
+    # ------------------------------------------------------------------
+    # Construccion
+    # ------------------------------------------------------------------
+    def filtrar(self, predicado=None, **igualdades):
+        """Agrega un predicado sobre el registro y/o igualdades de campo."""
+        if predicado is not None:
+            self._predicados.append(predicado)
+        self._igualdades.update(igualdades)
+        return self
+
+    def ordenar(self, campo, descendente=False):
+        """Ordena por un campo; los empates se resuelven por llave."""
+        self._orden = campo
+        self._descendente = descendente
+        return self
+
+    def limitar(self, cantidad):
+        """Limita la cantidad de registros retornados."""
+        self._limite = cantidad
+        return self
+
+    def proyectar(self, *campos):
+        """Retorna solo los campos indicados de cada registro."""
+        self._campos = campos
+        return self
+
+    # ------------------------------------------------------------------
+    # Ejecucion
+    # ------------------------------------------------------------------
+    def _candidatos(self, instancia):
+        """Retorna las llaves posibles segun los indices, o None."""
+        indexados = [
+            (campo, valor) for campo, valor in self._igualdades.items()
+            if campo in self._entidad.CAMPOS_INDEXADOS
+        ]
+        if not indexados:
+            return None
+        tablas = indices(instancia)
+        conjuntos = sorted(
+            (tablas[campo].get(valor, set()) for campo, valor in indexados),
+            key=len
+        )
+        return set.intersection(*conjuntos)
+
+    def _coincidentes(self):
+        """Itera (llave, registro) que cumplen todos los filtros."""
+        # pylint: disable=protected-access
+        instancia = self._entidad.__new__(self._entidad)
+        candidatos = self._candidatos(instancia)
+        if candidatos is not None and not candidatos:
+            return
+        restantes = len(candidatos) if candidatos is not None else -1
+        igualdades = tuple(self._igualdades.items())
+        for llave, registro in instancia._iterar():
+            if candidatos is not None:
+                if llave not in candidatos:
+                    continue
+                restantes -= 1
+            if all(registro.get(c) == v for c, v in igualdades) and all(
+                predicado(registro) for predicado in self._predicados
+            ):
+                yield llave, registro
+            if restantes == 0:
+                return
+
+    def _llave_orden(self, llave, registro):
+        """Retorna la llave de orden de un registro.
+        Los registros sin el campo o con None quedan al final en ambos
+        sentidos y no se comparan contra valores.
+        """
+        if self._orden is None:
+            return (llave,)
+        valor = registro.get(self._orden)
+        return ((valor is None) != self._descendente, valor, llave)
+
+    def _proyectar(self, registro):
+        """Aplica la proyeccion de campos a un registro."""
+        if self._campos is None:
+            return registro
+        return {campo: registro.get(campo) for campo in self._campos}
+
+    def _primeros(self, cantidad, despues_de=None):
+        """Retorna los primeros registros en orden tras un cursor."""
+        elementos = (
+            (self._llave_orden(llave, registro), registro)
+            for llave, registro in self._coincidentes()
+        )
+        if despues_de is not None:
+            if self._descendente:
+                elementos = (e for e in elementos if e[0] < despues_de)
+            else:
+                elementos = (e for e in elementos if e[0] > despues_de)
+        if self._descendente:
+            def clave(elemento):
+                return _Invertido(elemento[0])
+        else:
+            def clave(elemento):
+                return elemento[0]
+        if cantidad is None:
+            return sorted(elementos, key=clave)
+        return heapq.nsmallest(cantidad, elementos, key=clave)
+
+    def __iter__(self):
+        """Itera los registros; sin orden explicito sigue el del archivo."""
+        if self._orden is None:
+            registros = (registro for _, registro in self._coincidentes())
+            return (self._proyectar(r)
+                    for r in islice(registros, self._limite))
+        return (self._proyectar(registro)
+                for _, registro in self._primeros(self._limite))
+
+    def todos(self):
+        """Retorna la lista de registros que cumplen la consulta."""
+        return list(self)
+
+    def primero(self):
+        """Retorna el primer registro de la consulta o None."""
+        return next(iter(self), None)
+
+    def contar(self):
+        """Retorna cuantos registros cumplen los filtros."""
+        return sum(1 for _ in self._coincidentes())
+
+    def pagina(self, tamano, cursor=None):
+        """Retorna (registros, cursor_siguiente) de una pagina.
+
+        Las paginas siguen el orden de la consulta (por llave si no se
+        indico) y el cursor es None en la ultima pagina.
+        """
+        despues_de = None if cursor is None else _decodificar_cursor(cursor)
+        elementos = self._primeros(tamano + 1, despues_de)
+        siguiente = None
+        if len(elementos) > tamano:
+            elementos = elementos[:tamano]
+            siguiente = _codificar_cursor(elementos[-1][0])
+        return [self._proyectar(r) for _, r in elementos], siguiente
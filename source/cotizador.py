@@ -0,0 +1,199 @@
+# -*- coding: utf-8 -*-
+"""Cotizacion de reservaciones sin escritura, con cache LRU/TTL.
+Created on Tue Oct 20 09:14:36 2026
+
+@author: Efrén Alejandro
+
+cotizar() hace el mismo calculo que Reservacion.crear (costos del
+catalogo, motor de tarifas si esta activo e importe) sin persistir nada.
+Las cotizaciones se guardan por solicitud normalizada y el catalogo de
+tipos de cuarto se lee una sola vez por directorio de datos. Ambos se
+invalidan cuando se guarda tipos_cuarto.json y dependen de la firma del
+archivo (consulta.firma_datos), asi un guardado de otro proceso tambien
+los descarta.
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+
+import persistencia
+from consulta import firma_datos
+from reservacion import Reservacion
+from tarifas import motor_actual
+from config import ARCHIVO_TIPOS_CUARTO
+
+
+class CacheLRU:
+    """Cache de capacidad fija con expiracion por tiempo de vida."""
+
+    def __init__(self, capacidad=1024, ttl=60.0):
+        self.capacidad = capacidad
+        self.ttl = ttl
+        self.aciertos = 0
+        self.fallos = 0
+        self._datos = OrderedDict()
+        self._candado = threading.Lock()
+
+    def __len__(self):
+        return len(self._datos)
+
+    def obtener(self, llave):
+        """Retorna el valor vigente de la llave o None."""
+        with self._candado:
+            entrada = self._datos.get(llave)
+            if entrada is None or entrada[1] < time.monotonic():
+                if entrada is not None:
+                    del self._datos[llave]
+                self.fallos += 1
+                return None
+            self._datos.move_to_end(llave)
+            self.aciertos += 1
+            return entrada[0]
+
+    def guardar(self, llave, valor):
+        """Guarda el valor y descarta el menos usado si se excede."""
+        with self._candado:
+            self._datos[llave] = (valor, time.monotonic() + self.ttl)
+            self._datos.move_to_end(llave)
+            while len(self._datos) > self.capacidad:
+                self._datos.popitem(last=False)
+
+    def limpiar(self):
+        """Descarta todas las entradas."""
+        with self._candado:
+            self._datos.clear()
+
+
+_CACHE = CacheLRU()
+# ruta de tipos_cuarto.json -> (firma del archivo, catalogo)
+_CATALOGOS = {}
+
+
+def configurar_cache(capacidad=1024, ttl=60.0):
+    """Reemplaza la cache de cotizaciones con nuevos limites."""
+    global _CACHE  # pylint: disable=global-statement
+    _CACHE = CacheLRU(capacidad, ttl)
+    return _CACHE
+
+
+def cache_actual():
+    """Retorna la cache de cotizaciones en uso."""
+    return _CACHE
+
+
+def invalidar():
+    """Descarta cotizaciones y catalogos en memoria."""
+    _CATALOGOS.clear()
+    _CACHE.limpiar()
+
+
+def _al_guardar(ruta, _cambios):
+    """Invalida la cache cuando se guarda el catalogo de tipos."""
+    if os.path.basename(ruta) == ARCHIVO_TIPOS_CUARTO:
+        invalidar()
+
+
+persistencia.observar(_al_guardar)
+
+
+def _en_memoria():
+    """Indica si hay datos pendientes que las caches no reflejan."""
+    return (persistencia.unidad_activa() is not None
+            or persistencia.escritura_diferida() is not None)
+
+
+def _ruta_catalogo():
+    """Retorna la ruta de tipos_cuarto.json del almacen actual."""
+    return os.path.join(persistencia.directorio_datos(),
+                        ARCHIVO_TIPOS_CUARTO)
+
+
+def _catalogo():
+    """Retorna el catalogo de tipos de cuarto del almacen actual.
+    Solo se guarda en memoria el del backend json, y se relee si cambio
+    la firma del archivo; el arbol ya mantiene sus paginas en cache.
+    """
+    if _en_memoria() or persistencia.backend_actual() != "json":
+        return persistencia.cargar_archivo(ARCHIVO_TIPOS_CUARTO)
+    ruta = _ruta_catalogo()
+    firma = firma_datos(ruta)
+    vigente = _CATALOGOS.get(ruta)
+    if vigente is None or vigente[0] != firma:
+        vigente = (firma, persistencia.cargar_archivo(ARCHIVO_TIPOS_CUARTO))
+        _CATALOGOS[ruta] = vigente
+    return vigente[1]
+
+
+def _normalizar(datos):
+    """Retorna la llave de cache de una solicitud de cotizacion."""
+    detalle = tuple(sorted(
+        (item["tipo"], item["cantidad"]) for item in datos["detalle"]
+    ))
+    motor = motor_actual()
+    return (persistencia.directorio_datos(), persistencia.backend_actual(),
+            firma_datos(_ruta_catalogo()), motor,
+            getattr(motor, "version", 0), datos["rfc_hotel"], detalle,
+            datos["fecha"], datos["noches"])
+
+
+def _calcular(datos):
+    """Costea el detalle como Reservacion.crear.
+    Retorna ({tipo: campos de costo del item}, importe).
+    """
+    # pylint: disable=protected-access
+    rfc_hotel = datos["rfc_hotel"]
+    Reservacion._validar_detalle(datos["detalle"], datos["noches"])
+    catalogo = _catalogo()
+    detalle = []
+    for item in datos["detalle"]:
+        tc = catalogo.get(f"{rfc_hotel}_{item['tipo']}")
+        if tc is None:
+            raise ValueError(
+                f"No existe tipo {item['tipo']} para hotel {rfc_hotel}."
+            )
+        detalle.append({"tipo": item["tipo"], "cantidad": item["cantidad"],
+                        "costo": tc["costo"]})
+    motor = motor_actual()
+    if motor is not None:
+        motor.aplicar(rfc_hotel, detalle, datos["fecha"], datos["noches"])
+    importe = Reservacion._calcular_importe(detalle, datos["noches"])
+    costeo = {
+        item["tipo"]: {campo: valor for campo, valor in item.items()
+                       if campo not in ("tipo", "cantidad")}
+        for item in detalle
+    }
+    return costeo, importe
+
+
+def cotizar(datos: dict):
+    """Cotiza una reservacion sin escribir en ningun archivo.
+
+    Recibe rfc_hotel, fecha, noches y detalle como Reservacion.crear.
+    Retorna un diccionario con el detalle costeado y el importe, o None
+    mostrando error en consola si la solicitud es invalida.
+    """
+    try:
+        if _en_memoria():
+            resultado = _calcular(datos)
+        else:
+            llave = _normalizar(datos)
+            resultado = _CACHE.obtener(llave)
+            if resultado is None:
+                resultado = _calcular(datos)
+                _CACHE.guardar(llave, resultado)
+    except (KeyError, ValueError) as e:
+        print(f"ERROR: Cotizacion invalida: {e}")
+        return None
+    costeo, importe = resultado
+    return {
+        "rfc_hotel": datos["rfc_hotel"],
+        "fecha": datos["fecha"],
+        "noches": datos["noches"],
+        "detalle": [
+            {"tipo": item["tipo"], "cantidad": item["cantidad"],
+             **costeo[item["tipo"]]}
+            for item in datos["detalle"]
+        ],
+        "importe": importe
+    }
@@ -0,0 +1,298 @@
+# -*- coding: utf-8 -*-
+"""Registro de cambios por campo (delta) de los archivos de entidad.
+Created on Wed Oct 21 13:40:18 2026
+
+@author: Efrén Alejandro
+
+Se habilita con la variable de entorno HOTELES_DELTAS=1 o con
+deltas.habilitar(). Entonces modificar no reescribe el archivo completo:
+agrega una linea JSON al archivo <archivo>.delta
+
+    {"base": [mtime_ns, tamano]}                        (encabezado)
+    {"llave": "CAM123456ABC", "campos": {"estatus": "inactivo"}}
+
+y lector_json mezcla el delta al leer. El encabezado guarda la firma del
+JSON sobre el que aplica; cuando Persistencia reescribe el JSON completo
+(crear, eliminar, operaciones masivas o compactacion) la firma cambia y
+el delta anterior deja de aplicar y se borra. Cuando el delta supera una
+fraccion del JSON se compacta reescribiendo el archivo.
+
+El delta se lee de forma incremental: solo se decodifican las lineas
+agregadas desde la lectura anterior. Una linea invalida se reporta y se
+salta; una ultima linea sin salto (escritura a medias) se ignora hasta
+que se complete.
+
+El delta evita reescribir el JSON, no leerlo: modificar busca el
+registro con Persistencia._buscar_registro, que usa el snapshot mmap
+vigente (catalogo_mmap) y sin el carga el JSON completo.
+
+Uso para medir modificar con y sin delta:
+    python deltas.py [--tamanos 1000 10000 100000]
+"""
+import json
+import os
+import sys
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+
+HABILITADO = os.environ.get("HOTELES_DELTAS", "0") not in ("", "0")
+SUFIJO = ".delta"
+
+# El delta se compacta al superar esta fraccion del JSON o el minimo
+FRACCION_COMPACTAR = 0.25
+MINIMO_COMPACTAR = 1 << 20
+
+_CANDADO = threading.Lock()
+
+# ruta del delta -> (identidad, posicion leida, {llave: campos})
+_LEIDOS = {}
+
+
+def habilitar(valor=True):
+    """Habilita o deshabilita la escritura de deltas en modificar."""
+    global HABILITADO  # pylint: disable=global-statement
+    HABILITADO = valor
+
+
+def ruta_delta(ruta_json):
+    """Retorna la ruta del delta de un archivo JSON."""
+    return ruta_json + SUFIJO
+
+
+def _base(ruta_json):
+    """Retorna [mtime_ns, tamano] del JSON o None si no existe."""
+    try:
+        estado = os.stat(ruta_json)
+    except FileNotFoundError:
+        return None
+    return [estado.st_mtime_ns, estado.st_size]
+
+
+def _base_encabezado(linea):
+    """Retorna la base de la linea de encabezado o None."""
+    try:
+        return json.loads(linea)["base"]
+    except (ValueError, KeyError, TypeError):
+        return None
+
+
+def firma(ruta_json):
+    """Retorna (mtime_ns, tamano) del delta o None si no existe."""
+    try:
+        estado = os.stat(ruta_delta(ruta_json))
+    except FileNotFoundError:
+        return None
+    return (estado.st_mtime_ns, estado.st_size)
+
+
+def leer(ruta_json):
+    """Retorna {llave: campos} del delta vigente del JSON.
+    El diccionario es compartido; no debe modificarse.
+    """
+    ruta = ruta_delta(ruta_json)
+    try:
+        f = open(ruta, "rb")  # pylint: disable=consider-using-with
+    except FileNotFoundError:
+        return {}
+    with f:
+        estado = os.fstat(f.fileno())
+        identidad = (estado.st_ino, _base(ruta_json))
+        leido = _LEIDOS.get(ruta)
+        if (leido is not None and leido[0] == identidad
+                and leido[1] <= estado.st_size):
+            _, posicion, parches = leido
+        else:
+            encabezado = f.readline()
+            if _base_encabezado(encabezado) != identidad[1]:
+                _LEIDOS.pop(ruta, None)
+                return {}
+            posicion, parches = len(encabezado), {}
+        f.seek(posicion)
+        nuevo = f.read()
+        fin = nuevo.rfind(b"\n") + 1
+        inicio = posicion
+        for linea in nuevo[:fin].splitlines(keepends=True):
+            try:
+                entrada = json.loads(linea)
+                parches.setdefault(entrada["llave"], {}).update(
+                    entrada["campos"]
+                )
+            except (ValueError, KeyError, TypeError):
+                print(f"ERROR: Linea de delta invalida en el byte "
+                      f"{inicio} de {ruta}.")
+            inicio += len(linea)
+        _LEIDOS[ruta] = (identidad, posicion + fin, parches)
+        return parches
+
+
+def aplicar(datos, ruta_json):
+    """Aplica el delta vigente a los registros cargados del JSON."""
+    for llave, campos in leer(ruta_json).items():
+        registro = datos.get(llave)
+        if isinstance(registro, dict):
+            registro.update(campos)
+    return datos
+
+
+def aplicar_registro(llave, registro, ruta_json):
+    """Retorna el registro con su delta aplicado, sin modificarlo."""
+    campos = leer(ruta_json).get(llave) if registro is not None else None
+    return dict(registro, **campos) if campos else registro
+
+
+def _abrir_bloqueado(ruta):
+    """Abre el delta para agregar con candado exclusivo del archivo.
+    Si otro proceso lo reemplazo mientras se esperaba el candado, el
+    descriptor apunta al inodo anterior y se vuelve a abrir.
+    """
+    while True:
+        f = open(ruta, "ab")  # pylint: disable=consider-using-with
+        if fcntl is None:
+            return f
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            if os.path.samestat(os.fstat(f.fileno()), os.stat(ruta)):
+                return f
+        except FileNotFoundError:
+            pass
+        # Cerrar libera el candado
+        f.close()
+
+
+def _preparar(ruta, base):
+    """Deja el delta con encabezado vigente y sin enlaces duros.
+    Un respaldo puede compartir el inodo; se copia antes de agregar.
+    Se llama con el candado del delta; retorna True si lo reemplazo.
+    """
+    enlaces = os.stat(ruta).st_nlink
+    with open(ruta, "rb") as f:
+        contenido = f.read()
+    vigente = _base_encabezado(contenido.split(b"\n", 1)[0]) == base
+    if vigente and enlaces == 1:
+        return False
+    if not vigente:
+        contenido = (json.dumps({"base": base}) + "\n").encode("utf-8")
+    temporal = f"{ruta}.{os.getpid()}.tmp"
+    with open(temporal, "wb") as f:
+        f.write(contenido)
+    os.replace(temporal, ruta)
+    return True
+
+
+def registrar(ruta_json, llave, campos):
+    """Agrega al delta los campos cambiados del registro.
+    Retorna el tamano del delta en bytes. La revision del encabezado, el
+    reemplazo y la adicion se hacen con el candado del archivo, asi otro
+    proceso no agrega a un inodo que se esta reemplazando.
+    """
+    ruta = ruta_delta(ruta_json)
+    linea = json.dumps({"llave": llave, "campos": campos},
+                       ensure_ascii=False) + "\n"
+    with _CANDADO:
+        while True:
+            with _abrir_bloqueado(ruta) as f:
+                if _preparar(ruta, _base(ruta_json)):
+                    # Se agrega al archivo nuevo, con su propio candado
+                    continue
+                f.write(linea.encode("utf-8"))
+                f.flush()
+                return f.tell()
+
+
+def debe_compactar(ruta_json, tamano_delta):
+    """Indica si el delta ya es grande respecto al JSON."""
+    base = _base(ruta_json)
+    tamano_json = base[1] if base else 0
+    return tamano_delta > max(MINIMO_COMPACTAR,
+                              FRACCION_COMPACTAR * tamano_json)
+
+
+def descartar(ruta_json):
+    """Borra el delta del JSON, ya incluido en una reescritura completa."""
+    ruta = ruta_delta(ruta_json)
+    _LEIDOS.pop(ruta, None)
+    try:
+        os.remove(ruta)
+    except FileNotFoundError:
+        pass
+
+
+def medir_modificar(tamanos=(1000, 10000, 100000), modificaciones=200):
+    """Mide Cliente.modificar reescribiendo el archivo y con delta.
+
+    Para cada tamano de almacen crea clientes en un directorio temporal
+    con su snapshot mmap; sin el, la busqueda del registro cargaria el
+    JSON completo en ambos modos. Retorna una lista de dicts con
+    registros, ms_completo y ms_delta por modificacion.
+    """
+    # pylint: disable=import-outside-toplevel
+    import shutil
+    import tempfile
+    import catalogo_mmap
+    from almacen import Almacen
+    from cliente import Cliente
+    anterior = HABILITADO
+    reporte = []
+    try:
+        for tamano in tamanos:
+            data_dir = tempfile.mkdtemp()
+            clientes = {
+                f"RFC{i:09d}": {
+                    "nombre": "Juan Pérez", "rfc": f"RFC{i:09d}",
+                    "sexo": "M", "compania": "Empresa SA",
+                    "forma_pago": "tarjeta", "estatus": "activo"
+                } for i in range(tamano)
+            }
+            with open(os.path.join(data_dir, "clientes.json"), "w",
+                      encoding="utf-8") as f:
+                json.dump(clientes, f, indent=4, ensure_ascii=False)
+            cliente = Cliente(clientes["RFC000000000"])
+            tiempos = {}
+            with Almacen(data_dir):
+                for modo, repeticiones in ((False, 3),
+                                           (True, modificaciones)):
+                    habilitar(modo)
+                    catalogo_mmap.escribir_snapshot("clientes.json",
+                                                    data_dir)
+                    inicio = time.perf_counter()
+                    for i in range(repeticiones):
+                        cliente.modificar(estatus=f"estatus{i}")
+                    tiempos[modo] = ((time.perf_counter() - inicio)
+                                     / repeticiones)
+            catalogo_mmap.cerrar()
+            shutil.rmtree(data_dir, ignore_errors=True)
+            reporte.append({
+                "registros": tamano,
+                "ms_completo": round(tiempos[False] * 1000, 3),
+                "ms_delta": round(tiempos[True] * 1000, 3),
+            })
+    finally:
+        habilitar(anterior)
+    return reporte
+
+
+def main():
+    """Punto de entrada de linea de comandos."""
+    import argparse  # pylint: disable=import-outside-toplevel
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tamanos", type=int, nargs="+",
+                        default=[1000, 10000, 100000])
+    parser.add_argument("--modificaciones", type=int, default=200)
+    args = parser.parse_args()
+    for fila in medir_modificar(args.tamanos, args.modificaciones):
+        print(f"{fila['registros']:>10} registros  "
+              f"completo {fila['ms_completo']:>10.3f} ms  "
+              f"delta {fila['ms_delta']:>8.3f} ms")
+
+
+if __name__ == "__main__":
+    # Persistencia debe ver este modulo y no una segunda copia importada
+    # como deltas, asi habilitar() aplica a sus modificaciones
+    sys.modules.setdefault("deltas", sys.modules[__name__])
+    main()
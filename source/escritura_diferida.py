@@ -0,0 +1,333 @@
+# -*- coding: utf-8 -*-
+"""Escritura diferida (write-behind) de los archivos de entidad.
+Created on Wed Oct 21 20:21:09 2026
+
+@author: Efrén Alejandro
+
+Uso:
+    with EscrituraDiferida(intervalo=0.05, lote=500):
+        Hotel.crear(datos_hotel)          # retorna sin escribir a disco
+        hotel.modificar(estatus="inactivo")
+
+Mientras esta activa, crear, modificar, cancelar y las operaciones
+masivas actualizan una copia en memoria de cada archivo (las busquedas
+y consultas la ven) y retornan de inmediato. Un hilo de fondo junta los
+guardados por archivo y los escribe con Persistencia._escribir, el mismo
+formato de _guardar, cada `intervalo` segundos o en cuanto se acumulan
+`lote` guardados. Los observadores (indices, busqueda, cambios) se
+notifican despues de escribir, con un cambio por llave y con el flujo
+de cambios bloqueado.
+
+A lo mas `capacidad` guardados quedan sin escribir; al llegar al limite
+los siguientes esperan a que el hilo escriba (contrapresion). flush()
+escribe lo pendiente y cerrar() ademas detiene el hilo; al salir del
+bloque with se cierra. Un archivo que no se pudo escribir se reintenta
+en el siguiente ciclo y cuenta en estadisticas()["errores"]; si el hilo
+termino, los guardados lanzan RuntimeError en lugar de esperarlo.
+
+Aplica al directorio de datos (almacen) donde se inicio y al backend
+json; el hilo de fondo escribe dentro de ese almacen. Los hilos propios
+que guardan deben correr en ese almacen (ver almacen.py): un hilo creado
+con threading.Thread no hereda el contexto y sus guardados irian
+directo a persistencia.DATA_DIR sin pasar por la cola. Mientras esta
+activa debe ser el unico escritor del directorio: las unidades de
+trabajo lanzan ValueError y otro proceso no debe escribir los mismos
+archivos. Un proceso que termina sin cerrar pierde lo que no se
+escribio.
+
+Uso para comparar la latencia de crear con escritura directa:
+    python escritura_diferida.py [--operaciones 500]
+"""
+import copy
+import os
+import threading
+import time
+
+import cambios as flujo_cambios
+import persistencia
+from almacen import Almacen
+from lector_json import leer_archivo_json
+from unidad_trabajo import _compactar
+
+
+INTERVALO = 0.05
+LOTE = 500
+CAPACIDAD = 10000
+
+
+class EscrituraDiferida:
+    """Cola de guardados por archivo escrita por un hilo de fondo."""
+
+    def __init__(self, data_dir=None, intervalo=INTERVALO, lote=LOTE,
+                 capacidad=CAPACIDAD):
+        if lote <= 0 or capacidad < lote:
+            raise ValueError("Se requiere 0 < lote <= capacidad.")
+        self.data_dir = data_dir
+        self.intervalo = intervalo
+        self.lote = lote
+        self.capacidad = capacidad
+        self._condicion = threading.Condition()
+        self._escritura = threading.Lock()
+        # nombre -> diccionario en memoria
+        self._datos = {}
+        # nombre -> [instancia, cambios o None si no se conocen]
+        self._pendientes = {}
+        self._en_escritura = set()
+        self._encolados = 0
+        self._en_vuelo = 0
+        self._hilo = None
+        self._cerrando = False
+        self._anterior = None
+        self._metricas = {"guardados": 0, "s_registro": 0.0,
+                          "escrituras": 0, "s_escritura": 0.0,
+                          "errores": 0}
+
+    def __enter__(self):
+        return self.iniciar()
+
+    def __exit__(self, *_):
+        self.cerrar()
+        return False
+
+    # ------------------------------------------------------------------
+    # Interfaz usada por Persistencia
+    # ------------------------------------------------------------------
+    def cargar(self, nombre_archivo):
+        """Retorna el diccionario en memoria del archivo."""
+        with self._condicion:
+            datos = self._datos.get(nombre_archivo)
+            if datos is None:
+                datos = leer_archivo_json(nombre_archivo, self.data_dir)
+                self._datos[nombre_archivo] = datos
+            return datos
+
+    def registrar(self, instancia, datos, cambios=()):
+        """Encola el guardado del archivo de la instancia.
+        Espera mientras haya `capacidad` guardados sin escribir.
+        """
+        inicio = time.perf_counter()
+        nombre = instancia.archivo
+        with self._condicion:
+            self._verificar_hilo()
+            while (self._encolados + self._en_vuelo >= self.capacidad
+                   and not self._cerrando):
+                self._condicion.wait(self.intervalo)
+                self._verificar_hilo()
+            self._datos[nombre] = datos
+            pendiente = self._pendientes.get(nombre)
+            if pendiente is None:
+                self._pendientes[nombre] = [instancia, list(cambios) or None]
+            elif pendiente[1] is None or not cambios:
+                pendiente[1] = None
+            else:
+                pendiente[1].extend(cambios)
+            self._encolados += 1
+            if self._encolados >= self.lote:
+                self._condicion.notify_all()
+            self._metricas["guardados"] += 1
+            self._metricas["s_registro"] += time.perf_counter() - inicio
+
+    def _verificar_hilo(self):
+        """Lanza RuntimeError si el hilo de fondo ya no escribe la cola."""
+        if not self._cerrando and (self._hilo is None
+                                   or not self._hilo.is_alive()):
+            raise RuntimeError(
+                f"La escritura diferida de {self.data_dir} no esta activa."
+            )
+
+    def pendiente(self, nombre_archivo):
+        """Indica si el archivo tiene guardados sin escribir."""
+        with self._condicion:
+            return (nombre_archivo in self._pendientes
+                    or nombre_archivo in self._en_escritura)
+
+    # ------------------------------------------------------------------
+    # Ciclo de vida
+    # ------------------------------------------------------------------
+    def iniciar(self):
+        """Activa la escritura diferida e inicia el hilo de fondo."""
+        if self._hilo is not None:
+            return self
+        self.data_dir = os.path.abspath(
+            self.data_dir or persistencia.directorio_datos()
+        )
+        self._cerrando = False
+        self._anterior = persistencia.fijar_escritura_diferida(self)
+        self._hilo = threading.Thread(target=self._ciclo, daemon=True,
+                                      name="escritura_diferida")
+        self._hilo.start()
+        return self
+
+    def _ciclo(self):
+        """Escribe lo pendiente cada intervalo o al completar un lote."""
+        while True:
+            with self._condicion:
+                self._condicion.wait_for(
+                    lambda: self._cerrando or self._encolados >= self.lote,
+                    timeout=self.intervalo
+                )
+                if self._cerrando:
+                    return
+            try:
+                self.flush()
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                # Lo pendiente sigue en la cola y se reintenta
+                print(f"ERROR: Escritura diferida: {e}")
+                with self._condicion:
+                    self._metricas["errores"] += 1
+
+    def flush(self):
+        """Escribe los guardados pendientes; retorna True si no hubo error.
+        Un archivo que no se pudo escribir queda pendiente. Cada archivo
+        se copia completo antes de soltar la cola: los registros en
+        memoria se modifican en su lugar mientras se escribe la copia.
+        """
+        with self._escritura, Almacen(self.data_dir):
+            with self._condicion:
+                copias = {nombre: copy.deepcopy(self._datos[nombre])
+                          for nombre in self._pendientes}
+                pendientes, self._pendientes = self._pendientes, {}
+                self._en_escritura = set(pendientes)
+                encolados, self._encolados = self._encolados, 0
+                self._en_vuelo += encolados
+            exito = True
+            try:
+                with flujo_cambios.bloqueado(self.data_dir):
+                    for nombre, (instancia, cambios) in pendientes.items():
+                        exito = self._escribir(nombre, instancia, cambios,
+                                               copias[nombre]) and exito
+            finally:
+                with self._condicion:
+                    self._en_escritura = set()
+                    self._en_vuelo -= encolados
+                    self._condicion.notify_all()
+        return exito
+
+    def _escribir(self, nombre, instancia, cambios, datos):
+        """Escribe un archivo y notifica; si falla lo regresa a la cola.
+        Un error de los observadores se cuenta pero el archivo ya quedo
+        escrito.
+        """
+        # pylint: disable=protected-access,broad-exception-caught
+        inicio = time.perf_counter()
+        try:
+            escrito = instancia._escribir(datos)
+        except Exception as e:
+            print(f"ERROR: No se pudo guardar {nombre}: {e}")
+            escrito = False
+        if not escrito:
+            with self._condicion:
+                self._metricas["errores"] += 1
+                actual = self._pendientes.get(nombre)
+                if actual is None:
+                    self._pendientes[nombre] = [instancia, cambios]
+                elif actual[1] is None or cambios is None:
+                    actual[1] = None
+                else:
+                    actual[1] = cambios + actual[1]
+            return False
+        with self._condicion:
+            self._metricas["escrituras"] += 1
+            self._metricas["s_escritura"] += time.perf_counter() - inicio
+        try:
+            persistencia._notificar(
+                os.path.join(self.data_dir, nombre),
+                _compactar(cambios) if cambios is not None else []
+            )
+        except Exception as e:
+            print(f"ERROR: Al notificar el guardado de {nombre}: {e}")
+            with self._condicion:
+                self._metricas["errores"] += 1
+            return False
+        return True
+
+    def cerrar(self):
+        """Escribe lo pendiente, detiene el hilo y desactiva la escritura.
+        Retorna True si no hubo error.
+        """
+        if self._hilo is None:
+            return True
+        with self._condicion:
+            self._cerrando = True
+            self._condicion.notify_all()
+        self._hilo.join()
+        self._hilo = None
+        exito = self.flush()
+        persistencia.fijar_escritura_diferida(self._anterior)
+        self._datos.clear()
+        return exito
+
+    def estadisticas(self):
+        """Retorna guardados, escrituras y latencias promedio en ms."""
+        with self._condicion:
+            metricas = dict(self._metricas)
+        return {
+            "guardados": metricas["guardados"],
+            "escrituras": metricas["escrituras"],
+            "errores": metricas["errores"],
+            "ms_registro": round(metricas["s_registro"] * 1000
+                                 / max(metricas["guardados"], 1), 4),
+            "ms_escritura": round(metricas["s_escritura"] * 1000
+                                  / max(metricas["escrituras"], 1), 4),
+        }
+
+
+def medir_latencia(operaciones=500):
+    """Mide Cliente.crear con escritura directa y diferida.
+    Retorna un dict con ms por operacion de cada modo y las estadisticas
+    de la escritura diferida.
+    """
+    # pylint: disable=import-outside-toplevel
+    import shutil
+    import tempfile
+    from cliente import Cliente
+
+    def datos(modo, i):
+        return {
+            "nombre": "Juan Pérez", "rfc": f"{modo}{i:09d}", "sexo": "M",
+            "compania": "Empresa SA", "forma_pago": "tarjeta",
+            "estatus": "activo"
+        }
+
+    data_dir = tempfile.mkdtemp()
+    try:
+        with Almacen(data_dir):
+            inicio = time.perf_counter()
+            for i in range(operaciones):
+                Cliente.crear(datos("SIN", i))
+            directo = time.perf_counter() - inicio
+            with EscrituraDiferida() as diferida:
+                inicio = time.perf_counter()
+                for i in range(operaciones):
+                    Cliente.crear(datos("DIF", i))
+                encolado = time.perf_counter() - inicio
+            total = time.perf_counter() - inicio
+    finally:
+        shutil.rmtree(data_dir, ignore_errors=True)
+    return {
+        "operaciones": operaciones,
+        "ms_directo": round(directo * 1000 / operaciones, 4),
+        "ms_diferido": round(encolado * 1000 / operaciones, 4),
+        "ms_diferido_con_cierre": round(total * 1000 / operaciones, 4),
+        "diferida": diferida.estadisticas(),
+    }
+
+
+def main():
+    """Punto de entrada de linea de comandos."""
+    import argparse  # pylint: disable=import-outside-toplevel
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--operaciones", type=int, default=500)
+    args = parser.parse_args()
+    reporte = medir_latencia(args.operaciones)
+    print(f"{reporte['operaciones']} altas de cliente")
+    print(f"  directo   {reporte['ms_directo']:>10.4f} ms por alta")
+    print(f"  diferido  {reporte['ms_diferido']:>10.4f} ms por alta "
+          f"({reporte['ms_diferido_con_cierre']:.4f} ms con cierre)")
+    estadisticas = reporte["diferida"]
+    print(f"  {estadisticas['escrituras']} escrituras de archivo, "
+          f"{estadisticas['ms_escritura']:.4f} ms cada una")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,8 +4,9 @@ Created on Fri Feb 20 21:47:30 2026
 
 @author: Efrén Alejandro
 """
-from catalogos import ClasificacionHotel
+from catalogos import parsear_clasificacion
 from persistencia import Persistencia
+from perfilador import perfilado
 from reservacion_bridge import crear_reservacion, cancelar_reservacion
 from config import ARCHIVO_HOTELES, SEPARADOR
 
@@ -13,6 +14,13 @@ from config import ARCHIVO_HOTELES, SEPARADOR
 class Hotel(Persistencia):
     """Representa un hotel."""
 
+    CAMPOS_MODIFICABLES = frozenset({
+        "nombre", "nombre_fiscal", "direccion",
+        "estado", "clasificacion", "estatus"
+    })
+    CAMPOS_INDEXADOS = ("estado", "clasificacion", "estatus")
+    CAMPOS_TEXTO = ("nombre", "nombre_fiscal", "direccion")
+
     def __init__(self, datos: dict):
         try:
             self.nombre = datos["nombre"]
@@ -20,7 +28,7 @@ class Hotel(Persistencia):
             self.rfc = datos["rfc"]
             self.direccion = datos["direccion"]
             self.estado = datos["estado"]
-            self.clasificacion = ClasificacionHotel(datos["clasificacion"])
+            self.clasificacion = parsear_clasificacion(datos["clasificacion"])
             self.estatus = datos["estatus"]
         except KeyError as e:
             print(f"ERROR: Campo requerido faltante: {e}")
@@ -29,6 +37,12 @@ class Hotel(Persistencia):
             print(f"ERROR: Valor invalido en clasificacion: {e}")
             raise
 
+    def _normalizar_cambio(self, campo, valor):
+        """Valida la clasificacion y la convierte a su valor persistido."""
+        if campo == "clasificacion":
+            return parsear_clasificacion(valor).value
+        return valor
+
     @property
     def archivo(self):
         """Archivo JSON donde se persisten los hoteles."""
@@ -52,14 +66,15 @@ class Hotel(Persistencia):
         }
 
     @classmethod
+    @perfilado("Hotel.buscar")
     def buscar(cls, rfc):
         """Busca un hotel por RFC, retorna dict o None si no existe."""
         hotel_temp = cls.__new__(cls)
         hotel_temp.rfc = rfc
-        archivo = hotel_temp._cargar()
-        return archivo.get(rfc)
+        return hotel_temp._buscar_registro(rfc)
 
     @classmethod
+    @perfilado("Hotel.crear")
     def crear(cls, datos: dict):
         """Crea un hotel y lo persiste en archivo.
         Si ya existe un hotel con el mismo RFC muestra error en consola
@@ -71,10 +86,13 @@ class Hotel(Persistencia):
             print(f"ERROR: Ya existe un hotel con RFC {hotel.rfc}.")
             return None
         archivo[hotel.rfc] = hotel._a_dict()
-        hotel._guardar(archivo)
+        hotel._guardar(archivo, [
+            ("crear", hotel.rfc, None, archivo[hotel.rfc])
+        ])
         return hotel
 
     @classmethod
+    @perfilado("Hotel.eliminar")
     def eliminar(cls, rfc):
         """Elimina un hotel del archivo por RFC.
         Si no existe el hotel muestra error en consola
@@ -86,8 +104,8 @@ class Hotel(Persistencia):
         if rfc not in archivo:
             print(f"ERROR: No existe un hotel con RFC {rfc}.")
             return False
-        del archivo[rfc]
-        hotel._guardar(archivo)
+        antes = archivo.pop(rfc)
+        hotel._guardar(archivo, [("eliminar", rfc, antes, None)])
         return True
 
     def mostrar_info(self):
@@ -102,27 +120,23 @@ class Hotel(Persistencia):
         print(f"Estatus:        {self.estatus}")
         print(SEPARADOR)
 
+    @perfilado("Hotel.modificar")
     def modificar(self, **kwargs):
         """Modifica los atributos del hotel y actualiza el archivo.
         Atributo no modificable: rfc (es la llave unica).
         """
-        campos_validos = {
-            "nombre", "nombre_fiscal", "direccion",
-            "estado", "clasificacion", "estatus"
-        }
-        archivo = self._cargar()
-        if self.rfc not in archivo:
+        archivo, registro = self._leer_para_modificar(self.rfc)
+        if registro is None:
             print(f"ERROR: Hotel con RFC {self.rfc} no encontrado.")
             return False
+        campos = {}
         for campo, valor in kwargs.items():
-            if campo not in campos_validos:
+            if campo not in self.CAMPOS_MODIFICABLES:
                 print(f"ERROR: Atributo '{campo}' no es modificable.")
                 continue
             setattr(self, campo, valor)
-            archivo[self.rfc][campo] = (
-                valor.value if hasattr(valor, "value") else valor
-            )
-        self._guardar(archivo)
+            campos[campo] = valor.value if hasattr(valor, "value") else valor
+        self._parchar(archivo, registro, self.rfc, campos)
         return True
 
     def reservar_cuarto(self, datos_reservacion):
@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+"""Registro acotado de claves de idempotencia recientes.
+Created on Wed Oct 21 17:12:06 2026
+
+@author: Efrén Alejandro
+
+Un cliente que reintenta una alta envia la misma clave de idempotencia;
+el registro recuerda que instancia creo cada clave y el reintento la
+recibe sin validar ni escribir de nuevo. Las claves viven VIGENCIA
+segundos y se guardan a lo mas CAPACIDAD; las mas antiguas se descartan
+primero. Como observador de guardado olvida las claves cuyo registro se
+elimina o cuyo archivo se reescribe sin cambios por registro.
+
+El registro vive en memoria del proceso: no deduplica entre procesos ni
+despues de reiniciar.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+
+CAPACIDAD = 10000
+VIGENCIA = 24 * 60 * 60
+
+
+class ClavesRecientes:
+    """Claves de idempotencia por archivo, con vigencia y capacidad."""
+
+    def __init__(self, capacidad=CAPACIDAD, vigencia=VIGENCIA,
+                 reloj=time.monotonic):
+        self.capacidad = capacidad
+        self.vigencia = vigencia
+        self._reloj = reloj
+        # (ruta, clave) -> (expira, llave, valor), en orden de registro
+        self._claves = OrderedDict()
+        # (ruta, llave) -> clave
+        self._por_llave = {}
+        # Se toma para consultar y crear como una sola operacion
+        self.candado = threading.RLock()
+
+    def __len__(self):
+        return len(self._claves)
+
+    def _olvidar(self, identidad):
+        """Quita una (ruta, clave) del registro."""
+        _, llave, _ = self._claves.pop(identidad)
+        self._por_llave.pop((identidad[0], llave), None)
+
+    def _purgar(self):
+        """Descarta las claves vencidas y las que exceden la capacidad."""
+        ahora = self._reloj()
+        while self._claves:
+            identidad, (expira, _, _) = next(iter(self._claves.items()))
+            if expira > ahora and len(self._claves) <= self.capacidad:
+                return
+            self._olvidar(identidad)
+
+    def obtener(self, ruta, clave):
+        """Retorna el valor registrado con la clave o None."""
+        with self.candado:
+            self._purgar()
+            entrada = self._claves.get((ruta, clave))
+            return None if entrada is None else entrada[2]
+
+    def registrar(self, ruta, clave, llave, valor):
+        """Recuerda que la clave creo el registro llave con el valor."""
+        with self.candado:
+            if (ruta, clave) in self._claves:
+                self._olvidar((ruta, clave))
+            self._claves[(ruta, clave)] = (
+                self._reloj() + self.vigencia, llave, valor
+            )
+            self._por_llave[(ruta, llave)] = clave
+            self._purgar()
+
+    def al_guardar(self, ruta, cambios):
+        """Olvida las claves de registros eliminados (observador)."""
+        with self.candado:
+            if not cambios:
+                for identidad in [i for i in self._claves if i[0] == ruta]:
+                    self._olvidar(identidad)
+                return
+            for _, llave, _, despues in cambios:
+                clave = self._por_llave.get((ruta, llave))
+                if despues is None and clave is not None:
+                    self._olvidar((ruta, clave))
@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+"""Identificadores de reservacion ordenados por tiempo (UUID version 7).
+Created on Wed Oct 21 17:55:30 2026
+
+@author: Efrén Alejandro
+
+Con identificadores.usar_esquema("uuid7") (o HOTELES_IDS=uuid7) las
+reservaciones nuevas reciben un UUID version 7 (RFC 9562):
+
+    48 bits   milisegundos desde 1970
+     4 bits   version (7)
+    12 bits   contador dentro del milisegundo
+     2 bits   variante
+    62 bits   aleatorios
+
+El contador hace los identificadores monotonos dentro del proceso aun
+con varias altas en el mismo milisegundo, y como texto se ordenan igual
+que por instante de creacion: las altas se agregan al final de un
+almacen ordenado (arbol_paginado) y rango_creacion() da los limites de
+un recorrido por fecha de alta. Siguen siendo UUID de 36 caracteres, asi
+los uuid4 existentes se aceptan sin cambios; a_binario() da la forma
+compacta de 16 bytes para indices.
+
+Uso para comparar el costo de generar identificadores:
+    python identificadores.py [--cantidad 200000]
+"""
+import datetime
+import os
+import threading
+import time
+
+
+ESQUEMAS = ("uuid4", "uuid7")
+ESQUEMA = os.environ.get("HOTELES_IDS", "uuid4")
+
+_CANDADO = threading.Lock()
+# (milisegundo, contador) del ultimo uuid7 generado
+_ULTIMO = [0, 0]
+
+
+def usar_esquema(nombre):
+    """Cambia el esquema de los identificadores nuevos."""
+    global ESQUEMA  # pylint: disable=global-statement
+    if nombre not in ESQUEMAS:
+        raise ValueError(f"Esquema de identificador invalido: {nombre}")
+    ESQUEMA = nombre
+
+
+def _texto(valor):
+    """Formatea un entero de 128 bits como UUID en texto."""
+    h = f"{valor:032x}"
+    return f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
+
+
+def uuid7():
+    """Retorna un UUID version 7 en texto, monotono en el proceso."""
+    aleatorio = int.from_bytes(os.urandom(8), "big") & ((1 << 62) - 1)
+    milisegundo = time.time_ns() // 1_000_000
+    with _CANDADO:
+        if milisegundo > _ULTIMO[0]:
+            _ULTIMO[0], _ULTIMO[1] = milisegundo, 0
+        else:
+            _ULTIMO[1] += 1
+            if _ULTIMO[1] > 0xFFF:
+                _ULTIMO[0], _ULTIMO[1] = _ULTIMO[0] + 1, 0
+        milisegundo, contador = _ULTIMO
+    return _texto(
+        (milisegundo << 80) | (0x7 << 76) | (contador << 64)
+        | (0b10 << 62) | aleatorio
+    )
+
+
+def uuid4():
+    """Retorna un UUID version 4 en texto, como str(uuid.uuid4())."""
+    valor = int.from_bytes(os.urandom(16), "big")
+    valor = (valor & ~(0xF << 76) & ~(0b11 << 62)) | (0x4 << 76) | (0b10 << 62)
+    return _texto(valor)
+
+
+def nuevo_id():
+    """Retorna un identificador nuevo con el esquema vigente."""
+    if ESQUEMA == "uuid7":
+        return uuid7()
+    return uuid4()
+
+
+def a_binario(identificador):
+    """Retorna los 16 bytes de un UUID en texto (cualquier version).
+    Lanza ValueError si no es un UUID.
+    """
+    import uuid  # pylint: disable=import-outside-toplevel
+    return uuid.UUID(identificador).bytes
+
+
+def desde_binario(datos):
+    """Retorna el UUID en texto de sus 16 bytes."""
+    return _texto(int.from_bytes(datos, "big"))
+
+
+def instante(identificador):
+    """Retorna el datetime UTC de creacion de un uuid7 o None."""
+    import uuid  # pylint: disable=import-outside-toplevel
+    try:
+        valor = uuid.UUID(identificador)
+    except (ValueError, AttributeError, TypeError):
+        return None
+    if valor.version != 7:
+        return None
+    return datetime.datetime.fromtimestamp(
+        (valor.int >> 80) / 1000, tz=datetime.timezone.utc
+    )
+
+
+def _milisegundo(momento):
+    """Convierte un datetime (sin zona: UTC) a milisegundos."""
+    if momento.tzinfo is None:
+        momento = momento.replace(tzinfo=datetime.timezone.utc)
+    return int(momento.timestamp() * 1000)
+
+
+def rango_creacion(desde, hasta):
+    """Retorna (minimo, limite) de los uuid7 creados en [desde, hasta).
+    Sirve como rango semiabierto sobre llaves ordenadas; los uuid4
+    pueden caer dentro y se descartan con instante().
+    """
+    return (_texto(_milisegundo(desde) << 80),
+            _texto(_milisegundo(hasta) << 80))
+
+
+def medir_generacion(cantidad=200000):
+    """Mide microsegundos por identificador de cada esquema."""
+    import uuid  # pylint: disable=import-outside-toplevel
+    reporte = {}
+    for nombre, generador in (("uuid.uuid4", lambda: str(uuid.uuid4())),
+                              ("uuid4", uuid4), ("uuid7", uuid7)):
+        inicio = time.perf_counter()
+        for _ in range(cantidad):
+            generador()
+        reporte[nombre] = round(
+            (time.perf_counter() - inicio) / cantidad * 1e6, 3
+        )
+    return reporte
+
+
+def main():
+    """Punto de entrada de linea de comandos."""
+    import argparse  # pylint: disable=import-outside-toplevel
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cantidad", type=int, default=200000)
+    args = parser.parse_args()
+    for nombre, micros in medir_generacion(args.cantidad).items():
+        print(f"{nombre}: {micros:.3f} us por identificador")
+
+
+if __name__ == "__main__":
+    main()
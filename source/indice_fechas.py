@@ -0,0 +1,183 @@
+# -*- coding: utf-8 -*-
+"""Indice de intervalos de fechas de las reservaciones.
+Created on Wed Oct 21 16:24:51 2026
+
+@author: Efrén Alejandro
+
+Cada reservacion ocupa el intervalo semiabierto [fecha, fecha + noches)
+de referencias.fecha. El indice se particiona por hotel y por duracion:
+la particion de nivel n guarda las estancias de 2**n a 2**(n+1) - 1
+noches en una lista ordenada por fecha de llegada. Una estancia de esa
+particion que traslapa [desde, hasta) llega en [desde - 2**(n+1) + 2,
+hasta), asi cada particion se resuelve con una busqueda binaria y un
+recorrido en el que a lo mas la mitad de la ventana se descarta:
+O(log N + k) por particion.
+
+Como busqueda.py, el indice se construye en un recorrido del archivo la
+primera vez que se consulta y despues se mantiene con los cambios que
+reporta cada guardado (Reservacion.crear y cancelar). El modulo se
+registra como observador de guardado al importarse.
+"""
+import datetime
+import heapq
+from bisect import bisect_left, insort
+
+import persistencia
+from consulta import IndicesPorRuta
+
+
+def _ordinal(fecha):
+    """Convierte una fecha ISO (o date) a su ordinal."""
+    if isinstance(fecha, str):
+        fecha = datetime.date.fromisoformat(fecha)
+    return fecha.toordinal()
+
+
+def _intervalo(registro):
+    """Retorna (hotel, inicio, fin, cuartos) del registro o None."""
+    try:
+        referencias = registro["referencias"]
+        inicio = _ordinal(referencias["fecha"])
+        noches = int(registro["noches"])
+        cuartos = sum(item["cantidad"] for item in registro["detalle"])
+        hotel = referencias["rfc_hotel"]
+    except (KeyError, TypeError, ValueError):
+        return None
+    if noches <= 0:
+        return None
+    return hotel, inicio, inicio + noches, cuartos
+
+
+class IndiceFechas:
+    """Particiones ordenadas por llegada, por hotel y nivel de duracion."""
+
+    def __init__(self):
+        # (hotel, nivel) -> [(inicio, llave, fin)] ordenada
+        self._particiones = {}
+        # hotel -> niveles con estancias
+        self._niveles = {}
+        # llave -> (hotel, nivel, entrada, cuartos)
+        self._entradas = {}
+
+    def __len__(self):
+        return len(self._entradas)
+
+    # ------------------------------------------------------------------
+    # Mantenimiento
+    # ------------------------------------------------------------------
+    def agregar(self, llave, registro):
+        """Indexa el intervalo de una reservacion.
+        Los registros sin fecha o noches validas no se indexan.
+        """
+        self.quitar(llave)
+        intervalo = _intervalo(registro)
+        if intervalo is None:
+            return
+        hotel, inicio, fin, cuartos = intervalo
+        nivel = (fin - inicio).bit_length() - 1
+        entrada = (inicio, llave, fin)
+        insort(self._particiones.setdefault((hotel, nivel), []), entrada)
+        self._niveles.setdefault(hotel, set()).add(nivel)
+        self._entradas[llave] = (hotel, nivel, entrada, cuartos)
+
+    def quitar(self, llave):
+        """Quita una reservacion del indice."""
+        anterior = self._entradas.pop(llave, None)
+        if anterior is None:
+            return
+        hotel, nivel, entrada, _ = anterior
+        particion = self._particiones[(hotel, nivel)]
+        del particion[bisect_left(particion, entrada)]
+        if not particion:
+            del self._particiones[(hotel, nivel)]
+            self._niveles[hotel].discard(nivel)
+            if not self._niveles[hotel]:
+                del self._niveles[hotel]
+
+    def aplicar(self, cambios):
+        """Aplica los cambios (operacion, llave, antes, despues)."""
+        for _, llave, _, despues in cambios:
+            if despues is None:
+                self.quitar(llave)
+            else:
+                self.agregar(llave, despues)
+
+    # ------------------------------------------------------------------
+    # Consulta
+    # ------------------------------------------------------------------
+    def _recorrer(self, rfc_hotel, desde, hasta, traslape):
+        """Itera (inicio, llave, fin) en orden de llegada.
+        Con traslape las estancias que cruzan [desde, hasta); sin el las
+        que llegan en [desde, hasta).
+        """
+        hoteles = (self._niveles if rfc_hotel is None
+                   else [rfc_hotel] if rfc_hotel in self._niveles else [])
+        recorridos = []
+        for hotel in hoteles:
+            for nivel in self._niveles[hotel]:
+                particion = self._particiones[(hotel, nivel)]
+                inicio = desde - (2 << nivel) + 2 if traslape else desde
+                recorridos.append(self._ventana(particion, inicio, desde,
+                                                hasta))
+        return heapq.merge(*recorridos)
+
+    @staticmethod
+    def _ventana(particion, inicio, desde, hasta):
+        """Itera las entradas con llegada en [inicio, hasta) y fin > desde."""
+        for i in range(bisect_left(particion, (inicio,)), len(particion)):
+            entrada = particion[i]
+            if entrada[0] >= hasta:
+                return
+            if entrada[2] > desde:
+                yield entrada
+
+    def traslapan(self, desde, hasta=None, rfc_hotel=None):
+        """Retorna las llaves de estancias que ocupan alguna noche de
+        [desde, hasta), en orden de llegada. Sin hasta es la noche de desde.
+        """
+        desde = _ordinal(desde)
+        hasta = desde + 1 if hasta is None else _ordinal(hasta)
+        return [llave for _, llave, _ in
+                self._recorrer(rfc_hotel, desde, hasta, True)]
+
+    def llegadas(self, desde, hasta, rfc_hotel=None):
+        """Retorna las llaves con llegada en [desde, hasta) en orden."""
+        return [llave for _, llave, _ in self._recorrer(
+            rfc_hotel, _ordinal(desde), _ordinal(hasta), False
+        )]
+
+    def ocupacion(self, rfc_hotel, desde, hasta):
+        """Retorna {fecha: cuartos ocupados} de cada noche de [desde, hasta).
+        Dividido entre la capacidad del hotel es la fraccion que recibe
+        MotorTarifas.actualizar_ocupacion.
+        """
+        desde, hasta = _ordinal(desde), _ordinal(hasta)
+        diferencias = [0] * (max(hasta - desde, 0) + 1)
+        for inicio, llave, fin in self._recorrer(rfc_hotel, desde, hasta,
+                                                 True):
+            cuartos = self._entradas[llave][3]
+            diferencias[max(inicio, desde) - desde] += cuartos
+            diferencias[min(fin, hasta) - desde] -= cuartos
+        ocupados = {}
+        acumulado = 0
+        for dia in range(hasta - desde):
+            acumulado += diferencias[dia]
+            ocupados[datetime.date.fromordinal(desde + dia)] = acumulado
+        return ocupados
+
+
+_INDICES = IndicesPorRuta(lambda _entidad: IndiceFechas())
+
+
+def indice(entidad):
+    """Retorna el indice de fechas vigente de la entidad."""
+    return _INDICES.obtener(entidad)
+
+
+def invalidar(ruta):
+    """Descarta el indice de fechas de la ruta."""
+    _INDICES.invalidar(ruta)
+
+
+# Se importa hasta el primer uso (reservacion.py), no con persistencia
+persistencia.observar(_INDICES.al_guardar)
@@ -0,0 +1,196 @@
+# -*- coding: utf-8 -*-
+"""Contadores e histogramas de latencia para las rutas criticas.
+Created on Mon Oct 19 09:10:12 2026
+
+@author: Efrén Alejandro
+
+Se habilita con la variable de entorno HOTELES_METRICAS=1. Deshabilitado,
+medir() regresa un objeto nulo compartido y el costo es una comparacion.
+"""
+import json
+import os
+import threading
+import time
+
+
+HABILITADO = os.environ.get("HOTELES_METRICAS", "0") not in ("", "0")
+
+# Limites superiores (milisegundos) de las cubetas del histograma
+LIMITES_MS = (0.1, 0.5, 1, 5, 10, 50, 100, 500, 1000, 5000)
+
+_CANDADO = threading.Lock()
+_ESTADISTICAS = {}
+
+
+class _Estadistica:
+    """Acumulados de una pareja (operacion, archivo)."""
+
+    __slots__ = ("llamadas", "errores", "bytes", "registros",
+                 "suma_ms", "cubetas")
+
+    def __init__(self):
+        self.llamadas = 0
+        self.errores = 0
+        self.bytes = 0
+        self.registros = 0
+        self.suma_ms = 0.0
+        self.cubetas = [0] * (len(LIMITES_MS) + 1)
+
+    def a_dict(self):
+        """Convierte la estadistica a diccionario serializable."""
+        return {
+            "llamadas": self.llamadas,
+            "errores": self.errores,
+            "bytes": self.bytes,
+            "registros": self.registros,
+            "suma_ms": round(self.suma_ms, 6),
+            "cubetas": dict(zip(
+                [str(lim) for lim in LIMITES_MS] + ["+Inf"], self.cubetas
+            ))
+        }
+
+
+class _Medicion:
+    """Contexto que mide una operacion y la registra al salir."""
+
+    __slots__ = ("operacion", "archivo", "bytes", "registros", "error",
+                 "_inicio")
+
+    def __init__(self, operacion, archivo):
+        self.operacion = operacion
+        self.archivo = archivo
+        self.bytes = 0
+        self.registros = 0
+        self.error = False
+        self._inicio = 0.0
+
+    def anotar(self, num_bytes=0, registros=0):
+        """Acumula bytes leidos/escritos y registros tocados."""
+        self.bytes += num_bytes
+        self.registros += registros
+
+    def fallar(self):
+        """Marca la operacion como error aunque no salga con excepcion."""
+        self.error = True
+
+    def __enter__(self):
+        self._inicio = time.perf_counter()
+        return self
+
+    def __exit__(self, tipo_exc, exc, traza):
+        duracion_ms = (time.perf_counter() - self._inicio) * 1000.0
+        registrar(self.operacion, self.archivo, duracion_ms,
+                  self.bytes, self.registros,
+                  tipo_exc is not None or self.error)
+        return False
+
+
+class _MedicionNula:
+    """Contexto sin efecto usado cuando la instrumentacion esta apagada."""
+
+    __slots__ = ()
+
+    def anotar(self, num_bytes=0, registros=0):
+        """No hace nada."""
+
+    def fallar(self):
+        """No hace nada."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo_exc, exc, traza):
+        return False
+
+
+_NULA = _MedicionNula()
+
+
+def habilitar(valor=True):
+    """Enciende o apaga la instrumentacion en tiempo de ejecucion."""
+    global HABILITADO  # pylint: disable=global-statement
+    HABILITADO = bool(valor)
+
+
+def medir(operacion, archivo=""):
+    """Retorna un contexto que mide la operacion sobre el archivo."""
+    if not HABILITADO:
+        return _NULA
+    return _Medicion(operacion, archivo)
+
+
+def registrar(operacion, archivo, duracion_ms, num_bytes=0,
+              registros=0, error=False):
+    """Registra una observacion de latencia para (operacion, archivo)."""
+    cubeta = len(LIMITES_MS)
+    for i, limite in enumerate(LIMITES_MS):
+        if duracion_ms <= limite:
+            cubeta = i
+            break
+    with _CANDADO:
+        est = _ESTADISTICAS.get((operacion, archivo))
+        if est is None:
+            est = _ESTADISTICAS[(operacion, archivo)] = _Estadistica()
+        est.llamadas += 1
+        est.errores += int(error)
+        est.bytes += num_bytes
+        est.registros += registros
+        est.suma_ms += duracion_ms
+        est.cubetas[cubeta] += 1
+
+
+def reiniciar():
+    """Descarta todas las metricas acumuladas."""
+    with _CANDADO:
+        _ESTADISTICAS.clear()
+
+
+def instantanea():
+    """Retorna una copia de las metricas como lista de diccionarios."""
+    with _CANDADO:
+        return [
+            {"operacion": op, "archivo": arch, **est.a_dict()}
+            for (op, arch), est in sorted(_ESTADISTICAS.items())
+        ]
+
+
+def exportar_json():
+    """Exporta las metricas como texto JSON."""
+    return json.dumps(instantanea(), indent=4, ensure_ascii=False)
+
+
+def _etiquetas(operacion, archivo, extra=""):
+    """Formatea las etiquetas de una serie Prometheus."""
+    base = f'operacion="{operacion}",archivo="{archivo}"'
+    return "{" + base + (f",{extra}" if extra else "") + "}"
+
+
+def exportar_prometheus():
+    """Exporta las metricas en formato de texto de Prometheus."""
+    lineas = []
+    metricas = instantanea()
+    for nombre, campo, tipo in (
+        ("hoteles_operaciones_total", "llamadas", "counter"),
+        ("hoteles_errores_total", "errores", "counter"),
+        ("hoteles_bytes_total", "bytes", "counter"),
+        ("hoteles_registros_total", "registros", "counter"),
+    ):
+        lineas.append(f"# TYPE {nombre} {tipo}")
+        for m in metricas:
+            etiquetas = _etiquetas(m["operacion"], m["archivo"])
+            lineas.append(f"{nombre}{etiquetas} {m[campo]}")
+    lineas.append("# TYPE hoteles_latencia_ms histogram")
+    for m in metricas:
+        acumulado = 0
+        for limite, cuenta in m["cubetas"].items():
+            acumulado += cuenta
+            etiquetas = _etiquetas(
+                m["operacion"], m["archivo"], f'le="{limite}"'
+            )
+            lineas.append(f"hoteles_latencia_ms_bucket{etiquetas} "
+                          f"{acumulado}")
+        etiquetas = _etiquetas(m["operacion"], m["archivo"])
+        lineas.append(f"hoteles_latencia_ms_sum{etiquetas} {m['suma_ms']}")
+        lineas.append(f"hoteles_latencia_ms_count{etiquetas} "
+                      f"{m['llamadas']}")
+    return "\n".join(lineas) + "\n"
@@ -0,0 +1,233 @@
+# -*- coding: utf-8 -*-
+"""Revision de integridad entre entidades y reparacion opcional.
+Created on Wed Oct 21 09:12:27 2026
+
+@author: Efrén Alejandro
+
+Uso:
+    python integridad.py [--datos DIR] [--reparar] [--salida hallazgos.jsonl]
+
+Recorre en streaming hoteles, clientes, tipos de cuarto y reservaciones,
+en ese orden, con el backend actual (JSON o arbol), guardando solo
+conjuntos de llaves validas; el tiempo es lineal en el total de
+registros. Reporta:
+
+    archivo_corrupto      el archivo no es JSON valido
+    llave_duplicada       la misma llave aparece dos veces en el archivo
+    referencia_huerfana   un tipo de cuarto o reservacion apunta a un
+                          hotel, cliente o tipo de cuarto inexistente
+    importe_incorrecto    importe distinto del calculado del detalle
+    nemotecnica_duplicada dos reservaciones con la misma referencia
+    registro_invalido     a una reservacion le faltan campos
+
+Con --reparar se toma un respaldo (respaldos.crear) y despues se
+recalculan los importes incorrectos y se eliminan los tipos de cuarto y
+reservaciones huerfanos. Los archivos corruptos y las nemotecnicas
+duplicadas solo se reportan.
+"""
+import argparse
+import contextlib
+import json
+import os
+import sys
+
+import persistencia
+import respaldos
+from almacen import Almacen
+from cliente import Cliente
+from hotel import Hotel
+from reservacion import Reservacion
+from tipo_cuarto import TipoCuarto
+from config import ARCHIVO_TIPOS_CUARTO, ARCHIVO_RESERVACIONES
+
+
+# Diferencia maxima aceptada entre el importe guardado y el calculado
+TOLERANCIA_IMPORTE = 0.005
+
+
+def _hallazgo(tipo, archivo, llave, detalle):
+    """Construye un hallazgo serializable."""
+    return {"tipo": tipo, "archivo": archivo, "llave": llave,
+            "detalle": detalle}
+
+
+def _recorrer(cls, hallazgos):
+    """Itera (llave, registro) de la entidad en el almacen actual
+    reportando corrupcion y duplicados.
+    """
+    instancia = cls.__new__(cls)
+    archivo = instancia.archivo
+    vistas = set()
+    try:
+        # pylint: disable=protected-access
+        for llave, registro in instancia._iterar():
+            if llave in vistas:
+                hallazgos.append(_hallazgo(
+                    "llave_duplicada", archivo, llave,
+                    "La llave aparece mas de una vez."
+                ))
+                continue
+            vistas.add(llave)
+            yield llave, registro
+    except ValueError as e:
+        hallazgos.append(_hallazgo("archivo_corrupto", archivo, None, str(e)))
+
+
+def _revisar_reservacion(llave, registro, llaves, hallazgos, reparaciones):
+    """Revisa referencias e importe de una reservacion."""
+    # pylint: disable=protected-access
+    hoteles, clientes, tipos, nemotecnicas = llaves
+    try:
+        referencias = registro["referencias"]
+        rfc_hotel = referencias["rfc_hotel"]
+        faltantes = []
+        if rfc_hotel not in hoteles:
+            faltantes.append(f"hotel {rfc_hotel}")
+        if referencias["rfc_cliente"] not in clientes:
+            faltantes.append(f"cliente {referencias['rfc_cliente']}")
+        for item in registro["detalle"]:
+            if f"{rfc_hotel}_{item['tipo']}" not in tipos:
+                faltantes.append(f"tipo {item['tipo']}")
+        importe = Reservacion._calcular_importe(
+            registro["detalle"], registro["noches"]
+        )
+        nemotecnica = referencias["nemotecnica"]
+    except (KeyError, TypeError) as e:
+        hallazgos.append(_hallazgo(
+            "registro_invalido", ARCHIVO_RESERVACIONES, llave,
+            f"Campo faltante o invalido: {e}"
+        ))
+        return
+    if faltantes:
+        hallazgos.append(_hallazgo(
+            "referencia_huerfana", ARCHIVO_RESERVACIONES, llave,
+            "No existe " + ", ".join(faltantes) + "."
+        ))
+        reparaciones[llave] = None
+    elif abs(registro.get("importe", 0) - importe) > TOLERANCIA_IMPORTE:
+        hallazgos.append(_hallazgo(
+            "importe_incorrecto", ARCHIVO_RESERVACIONES, llave,
+            f"Importe {registro.get('importe')}, calculado {importe}."
+        ))
+        reparaciones[llave] = importe
+    primera = nemotecnicas.setdefault(nemotecnica, llave)
+    if primera != llave:
+        hallazgos.append(_hallazgo(
+            "nemotecnica_duplicada", ARCHIVO_RESERVACIONES, llave,
+            f"Misma referencia {nemotecnica} que {primera}."
+        ))
+
+
+def revisar(data_dir=None):
+    """Revisa la integridad del directorio de datos.
+
+    Retorna (hallazgos, reparaciones) donde reparaciones tiene por
+    archivo {llave: None para eliminar o importe corregido}.
+    """
+    almacen = contextlib.nullcontext() if data_dir is None else Almacen(
+        data_dir, persistencia.backend_actual()
+    )
+    with almacen:
+        return _revisar()
+
+
+def _revisar():
+    """Revisa la integridad del almacen actual; ver revisar."""
+    hallazgos = []
+    hoteles = {llave for llave, _ in _recorrer(Hotel, hallazgos)}
+    clientes = {llave for llave, _ in _recorrer(Cliente, hallazgos)}
+    tipos = set()
+    reparaciones = {ARCHIVO_TIPOS_CUARTO: {}, ARCHIVO_RESERVACIONES: {}}
+    for llave, registro in _recorrer(TipoCuarto, hallazgos):
+        rfc_hotel = (registro.get("rfc_hotel")
+                     if isinstance(registro, dict) else None)
+        if rfc_hotel not in hoteles:
+            hallazgos.append(_hallazgo(
+                "referencia_huerfana", ARCHIVO_TIPOS_CUARTO, llave,
+                f"No existe hotel {rfc_hotel}."
+            ))
+            reparaciones[ARCHIVO_TIPOS_CUARTO][llave] = None
+            continue
+        tipos.add(llave)
+    llaves = (hoteles, clientes, tipos, {})
+    for llave, registro in _recorrer(Reservacion, hallazgos):
+        _revisar_reservacion(llave, registro, llaves, hallazgos,
+                             reparaciones[ARCHIVO_RESERVACIONES])
+    return hallazgos, reparaciones
+
+
+def _aplicar(cls, reparaciones):
+    """Aplica las reparaciones de un archivo con un solo guardado."""
+    # pylint: disable=protected-access
+    if not reparaciones:
+        return 0
+    instancia = cls.__new__(cls)
+    archivo = instancia._cargar()
+    cambios = []
+    for llave, importe in reparaciones.items():
+        antes = archivo.get(llave)
+        if antes is None:
+            continue
+        if importe is None:
+            del archivo[llave]
+            cambios.append(("eliminar", llave, antes, None))
+        else:
+            archivo[llave] = dict(antes, importe=importe)
+            cambios.append(("modificar", llave, antes, archivo[llave]))
+    if cambios:
+        instancia._guardar(archivo, cambios)
+    return len(cambios)
+
+
+def reparar(data_dir=None):
+    """Revisa, respalda y repara; retorna un resumen.
+
+    No modifica nada si algun archivo esta corrupto, porque cargarlo
+    completo lo perderia.
+    """
+    data_dir = data_dir or persistencia.directorio_datos()
+    hallazgos, reparaciones = revisar(data_dir)
+    resumen = {"hallazgos": hallazgos, "respaldo": None, "reparados": 0}
+    if any(h["tipo"] == "archivo_corrupto" for h in hallazgos):
+        print("ERROR: Hay archivos corruptos; no se reparo nada.")
+        return resumen
+    if not any(reparaciones.values()):
+        return resumen
+    resumen["respaldo"] = respaldos.crear(data_dir=data_dir)["nombre"]
+    with Almacen(data_dir, persistencia.backend_actual()):
+        resumen["reparados"] = (
+            _aplicar(TipoCuarto, reparaciones[ARCHIVO_TIPOS_CUARTO])
+            + _aplicar(Reservacion, reparaciones[ARCHIVO_RESERVACIONES])
+        )
+    return resumen
+
+
+def main():
+    """Punto de entrada de linea de comandos."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--datos", default=None,
+                        help="Directorio de datos (por omision DATA_DIR)")
+    parser.add_argument("--reparar", action="store_true")
+    parser.add_argument("--salida", default=None,
+                        help="Archivo JSON Lines para los hallazgos")
+    args = parser.parse_args()
+    data_dir = os.path.abspath(args.datos) if args.datos else None
+    if args.reparar:
+        resumen = reparar(data_dir)
+        hallazgos = resumen["hallazgos"]
+    else:
+        hallazgos, _ = revisar(data_dir)
+    lineas = [json.dumps(h, ensure_ascii=False) + "\n" for h in hallazgos]
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as f:
+            f.writelines(lineas)
+    else:
+        sys.stdout.writelines(lineas)
+    if args.reparar:
+        print(f"{resumen['reparados']} registros reparados; "
+              f"respaldo previo: {resumen['respaldo']}", file=sys.stderr)
+    sys.exit(1 if hallazgos and not args.reparar else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,13 @@ Created on Sun Feb 22 01:00:38 2026
 """
 import json
 import os
+import re
+import deltas
+from instrumentacion import medir
+
+
+_ESPACIOS = re.compile(r"[ \t\n\r]*")
+_DECODIFICADOR = json.JSONDecoder()
 
 
 def leer_archivo_json(nombre_archivo, data_dir):
@@ -13,9 +20,104 @@ def leer_archivo_json(nombre_archivo, data_dir):
     ruta = os.path.join(data_dir, nombre_archivo)
     if not os.path.exists(ruta):
         return {}
-    try:
-        with open(ruta, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except json.JSONDecodeError as e:
-        print(f"ERROR: Archivo {nombre_archivo} corrupto: {e}")
-        return {}
+    with medir("leer_json", nombre_archivo) as medicion:
+        try:
+            with open(ruta, "rb") as f:
+                contenido = f.read()
+            datos = json.loads(contenido)
+        except json.JSONDecodeError as e:
+            print(f"ERROR: Archivo {nombre_archivo} corrupto: {e}")
+            medicion.fallar()
+            datos = {}
+        else:
+            medicion.anotar(len(contenido), len(datos))
+            datos = deltas.aplicar(datos, ruta)
+    return datos
+
+
+class _Flujo:
+    """Buffer de texto que se rellena por bloques para decodificar JSON."""
+
+    def __init__(self, archivo, tamano_bloque):
+        self.archivo = archivo
+        self.tamano_bloque = tamano_bloque
+        self.buf = ""
+        self.pos = 0
+        self.fin = False
+
+    def _leer(self):
+        """Agrega un bloque al buffer; retorna False al final del archivo."""
+        bloque = self.archivo.read(self.tamano_bloque)
+        if not bloque:
+            self.fin = True
+            return False
+        self.buf = self.buf[self.pos:] + bloque
+        self.pos = 0
+        return True
+
+    def error(self, mensaje):
+        """Retorna un JSONDecodeError en la posicion actual."""
+        return json.JSONDecodeError(mensaje, self.buf, self.pos)
+
+    def caracter(self):
+        """Omite espacios y retorna el siguiente caracter ("" al final)."""
+        while True:
+            self.pos = _ESPACIOS.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._leer():
+                return ""
+
+    def valor(self):
+        """Decodifica el siguiente valor JSON completo del buffer."""
+        while True:
+            try:
+                valor, fin = _DECODIFICADOR.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if not self._leer():
+                    raise
+                continue
+            # Un numero al final del buffer puede estar truncado
+            if fin == len(self.buf) and self._leer():
+                continue
+            self.pos = fin
+            return valor
+
+    def consumir(self, esperado):
+        """Consume el caracter esperado o lanza JSONDecodeError."""
+        if self.caracter() != esperado:
+            raise self.error(f"Se esperaba '{esperado}'")
+        self.pos += 1
+
+
+def iterar_registros(nombre_archivo, data_dir, tamano_bloque=1 << 16):
+    """Itera (llave, registro) de un archivo JSON sin cargarlo completo.
+
+    El archivo debe contener un objeto de registros, como los que escribe
+    Persistencia; los registros incluyen su delta (deltas.py). Lanza
+    json.JSONDecodeError si el archivo esta corrupto.
+    """
+    ruta = os.path.join(data_dir, nombre_archivo)
+    if not os.path.exists(ruta):
+        return
+    parches = deltas.leer(ruta)
+    with open(ruta, "r", encoding="utf-8") as f:
+        flujo = _Flujo(f, tamano_bloque)
+        flujo.consumir("{")
+        if flujo.caracter() == "}":
+            return
+        while True:
+            flujo.caracter()
+            llave = flujo.valor()
+            if not isinstance(llave, str):
+                raise flujo.error("Se esperaba una llave de texto")
+            flujo.consumir(":")
+            flujo.caracter()
+            registro = flujo.valor()
+            if llave in parches and isinstance(registro, dict):
+                registro.update(parches[llave])
+            yield llave, registro
+            siguiente = flujo.caracter()
+            if siguiente == "}":
+                return
+            flujo.consumir(",")
@@ -0,0 +1,248 @@
+# -*- coding: utf-8 -*-
+"""Validacion y costeo en paralelo de lotes grandes de reservaciones.
+Created on Tue Oct 20 18:40:17 2026
+
+@author: Efrén Alejandro
+
+Uso:
+    python lotes.py reservaciones.jsonl --procesos 4
+    python lotes.py reservaciones.jsonl --escalamiento
+
+El lote se parte en particiones contiguas que se procesan en un
+ProcessPoolExecutor. El catalogo (hoteles, clientes y costos de tipos de
+cuarto) se lee una vez en el proceso principal y se deja en una variable
+del modulo antes de crear el pool: con fork los procesos lo heredan por
+copia en escritura sin serializarlo; con spawn se envia una sola vez por
+proceso en el inicializador. Cada particion corre dentro del almacen
+(directorio de datos y backend) de quien llamo: el almacen vive en una
+variable de contexto que los procesos creados con spawn no heredan, y el
+motor de tarifas lee el catalogo del almacen activo. Los resultados se
+ordenan por posicion en el lote y se confirman con un solo guardado.
+"""
+import argparse
+import contextlib
+import json
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import persistencia
+from almacen import Almacen
+from carga_masiva import leer_filas
+from reservacion import Reservacion
+from tarifas import configurar_motor, motor_actual
+from config import (ARCHIVO_HOTELES, ARCHIVO_CLIENTES,
+                    ARCHIVO_TIPOS_CUARTO)
+
+
+# Catalogo de solo lectura que usan los procesos: (hoteles, clientes,
+# costos por llave de tipo de cuarto)
+_CATALOGO = None
+
+
+def cargar_catalogo(data_dir=None):
+    """Lee el catalogo de hoteles, clientes y costos en memoria.
+    Lee del almacen actual, o de data_dir con el backend actual, con
+    persistencia.cargar_archivo (JSON o arbol).
+    """
+    almacen = contextlib.nullcontext() if data_dir is None else Almacen(
+        data_dir, persistencia.backend_actual()
+    )
+    with almacen:
+        tipos = persistencia.cargar_archivo(ARCHIVO_TIPOS_CUARTO)
+        return (
+            frozenset(persistencia.cargar_archivo(ARCHIVO_HOTELES)),
+            frozenset(persistencia.cargar_archivo(ARCHIVO_CLIENTES)),
+            {llave: tc["costo"] for llave, tc in tipos.items()},
+        )
+
+
+def _inicializar(catalogo, motor):
+    """Inicializa un proceso creado con spawn."""
+    global _CATALOGO  # pylint: disable=global-statement
+    _CATALOGO = catalogo
+    if motor is not None:
+        configurar_motor(motor)
+
+
+def _procesar(datos, catalogo):
+    """Valida y costea una solicitud; retorna el registro a persistir.
+    Hace las mismas validaciones que Reservacion.crear contra el
+    catalogo en memoria y lanza ValueError o KeyError si es invalida.
+    """
+    # pylint: disable=protected-access
+    hoteles, clientes, costos = catalogo
+    rfc_hotel = datos["rfc_hotel"]
+    if rfc_hotel not in hoteles:
+        raise ValueError(f"No existe hotel con RFC {rfc_hotel}.")
+    if datos["rfc_cliente"] not in clientes:
+        raise ValueError(
+            f"No existe cliente con RFC {datos['rfc_cliente']}."
+        )
+    for item in datos["detalle"]:
+        costo = costos.get(f"{rfc_hotel}_{item['tipo']}")
+        if costo is None:
+            raise ValueError(
+                f"No existe tipo {item['tipo']} para hotel {rfc_hotel}."
+            )
+        item["costo"] = costo
+    Reservacion._completar_datos(datos)
+    with contextlib.redirect_stdout(None):
+        return Reservacion(datos)._a_dict()
+
+
+def _procesar_particion(inicio, solicitudes, almacen):
+    """Procesa una particion dentro del almacen dado.
+    Retorna [(posicion, registro, error)].
+    """
+    resultados = []
+    with almacen:
+        for posicion, datos in enumerate(solicitudes, start=inicio):
+            try:
+                resultados.append(
+                    (posicion, _procesar(datos, _CATALOGO), None)
+                )
+            except (KeyError, TypeError, ValueError) as e:
+                resultados.append(
+                    (posicion, None, f"{type(e).__name__}: {e}")
+                )
+    return resultados
+
+
+def _particiones(solicitudes, procesos, tamano):
+    """Parte el lote en (inicio, solicitudes) contiguas."""
+    if tamano is None:
+        tamano = max(1, -(-len(solicitudes) // (procesos * 4)))
+    return [
+        (inicio, solicitudes[inicio:inicio + tamano])
+        for inicio in range(0, len(solicitudes), tamano)
+    ]
+
+
+def validar_lote(solicitudes, procesos=None, tamano_particion=None):
+    """Valida y costea el lote en paralelo sin persistir.
+
+    Retorna la lista ordenada por posicion de (posicion, registro,
+    error); registro es None cuando la solicitud fue rechazada.
+    """
+    global _CATALOGO  # pylint: disable=global-statement
+    procesos = procesos or os.cpu_count() or 1
+    _CATALOGO = cargar_catalogo()
+    almacen = Almacen(persistencia.directorio_datos(),
+                      persistencia.backend_actual())
+    if procesos == 1:
+        return _procesar_particion(0, solicitudes, almacen)
+    metodos = multiprocessing.get_all_start_methods()
+    if "fork" in metodos:
+        opciones = {"mp_context": multiprocessing.get_context("fork")}
+    else:
+        opciones = {"initializer": _inicializar,
+                    "initargs": (_CATALOGO, motor_actual())}
+    resultados = []
+    with ProcessPoolExecutor(max_workers=procesos, **opciones) as pool:
+        futuros = [
+            pool.submit(_procesar_particion, inicio, particion, almacen)
+            for inicio, particion in _particiones(
+                solicitudes, procesos, tamano_particion
+            )
+        ]
+        for futuro in futuros:
+            resultados.extend(futuro.result())
+    resultados.sort(key=lambda resultado: resultado[0])
+    return resultados
+
+
+def procesar_lote(solicitudes, procesos=None, tamano_particion=None):
+    """Valida, costea y confirma un lote de reservaciones.
+
+    Las reservaciones validas se agregan con un solo guardado en el orden
+    del lote. Retorna un resumen con los UUID creados y los rechazos.
+    """
+    resultados = validar_lote(solicitudes, procesos, tamano_particion)
+    instancia = Reservacion.__new__(Reservacion)
+    archivo = instancia._cargar()  # pylint: disable=protected-access
+    cambios = []
+    rechazados = []
+    for posicion, registro, error in resultados:
+        if registro is None:
+            rechazados.append({"posicion": posicion, "error": error})
+            continue
+        archivo[registro["uuid"]] = registro
+        cambios.append(("crear", registro["uuid"], None, registro))
+    if cambios:
+        instancia._guardar(  # pylint: disable=protected-access
+            archivo, cambios
+        )
+    return {
+        "confirmados": [cambio[1] for cambio in cambios],
+        "rechazados": rechazados,
+    }
+
+
+def medir_escalamiento(solicitudes, maximo=None, repeticiones=1):
+    """Mide validar_lote de 1 a `maximo` procesos.
+
+    Retorna una lista de dicts con procesos, segundos, aceleracion
+    (tiempo con 1 proceso / tiempo con n) y eficiencia (aceleracion / n).
+    """
+    maximo = maximo or os.cpu_count() or 1
+    reporte = []
+    base = None
+    for procesos in range(1, maximo + 1):
+        mejor = None
+        for _ in range(repeticiones):
+            copia = json.loads(json.dumps(solicitudes))
+            inicio = time.perf_counter()
+            validar_lote(copia, procesos)
+            transcurrido = time.perf_counter() - inicio
+            mejor = transcurrido if mejor is None else min(mejor, transcurrido)
+        base = mejor if base is None else base
+        aceleracion = base / mejor
+        reporte.append({
+            "procesos": procesos,
+            "segundos": round(mejor, 4),
+            "aceleracion": round(aceleracion, 2),
+            "eficiencia": round(aceleracion / procesos, 2),
+        })
+    return reporte
+
+
+def main():
+    """Punto de entrada de linea de comandos."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("ruta", help="Archivo JSON Lines con solicitudes")
+    parser.add_argument("--procesos", type=int, default=None)
+    parser.add_argument("--particion", type=int, default=None,
+                        help="Solicitudes por particion")
+    parser.add_argument("--escalamiento", action="store_true",
+                        help="Solo mide de 1 a --procesos sin confirmar")
+    parser.add_argument("--datos", default=None,
+                        help="Directorio de datos (por omision DATA_DIR)")
+    args = parser.parse_args()
+    almacen = contextlib.nullcontext() if args.datos is None else Almacen(
+        args.datos, persistencia.backend_actual()
+    )
+    try:
+        with almacen:
+            solicitudes = [
+                fila for _, fila in leer_filas(args.ruta, "jsonl")
+                if not isinstance(fila, Exception)
+            ]
+            if args.escalamiento:
+                for fila in medir_escalamiento(solicitudes, args.procesos):
+                    print(json.dumps(fila))
+                return
+            resumen = procesar_lote(solicitudes, args.procesos, args.particion)
+    except (OSError, ValueError) as e:
+        print(f"ERROR: {e}")
+        sys.exit(1)
+    print(json.dumps({
+        "confirmados": len(resumen["confirmados"]),
+        "rechazados": resumen["rechazados"],
+    }, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
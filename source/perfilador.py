@@ -0,0 +1,213 @@
+# -*- coding: utf-8 -*-
+"""Perfilado de operaciones de entidades con salida para flamegraph.
+Created on Mon Oct 19 11:02:47 2026
+
+@author: Efrén Alejandro
+
+Las operaciones decoradas con perfilado() se perfilan sin editar codigo
+usando variables de entorno:
+
+    HOTELES_PERFIL=Reservacion.crear,Hotel.modificar   (o "*")
+    HOTELES_PERFIL_MODO=muestreo | cprofile
+    HOTELES_PERFIL_SALIDA=perfil   (escribe perfil.folded o perfil.prof)
+
+El modo muestreo produce pilas colapsadas ("a;b;c cuenta") que aceptan
+flamegraph.pl, speedscope e inferno. El modo cprofile agrega un
+cProfile.Profile entre llamadas y escribe un archivo pstats.
+"""
+import atexit
+import functools
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+
+MODOS = ("muestreo", "cprofile")
+
+
+class Perfilador:
+    """Agrega perfiles de regiones de codigo entre multiples llamadas."""
+
+    def __init__(self, modo="muestreo", intervalo=0.001):
+        if modo not in MODOS:
+            raise ValueError(f"Modo de perfilado invalido: {modo}")
+        self.modo = modo
+        self.intervalo = intervalo
+        self.pilas = Counter()
+        self._candado = threading.Lock()
+        self._activos = {}
+        self._hilo = None
+        self._perfil = None
+        if modo == "cprofile":
+            import cProfile  # pylint: disable=import-outside-toplevel
+            self._perfil = cProfile.Profile()
+
+    # ------------------------------------------------------------------
+    # Regiones perfiladas
+    # ------------------------------------------------------------------
+    def perfilar(self, nombre):
+        """Retorna un contexto que perfila la region con el nombre dado."""
+        return _Region(self, nombre)
+
+    def _entrar(self, nombre, marco):
+        """Registra la entrada del hilo actual a una region."""
+        tid = threading.get_ident()
+        with self._candado:
+            activo = self._activos.get(tid)
+            if activo is not None:
+                activo[2] += 1
+                return
+            self._activos[tid] = [nombre, marco, 1]
+            if self._perfil is not None:
+                self._perfil.enable()
+            elif self._hilo is None:
+                self._hilo = threading.Thread(
+                    target=self._muestrear, name="perfilador", daemon=True
+                )
+                self._hilo.start()
+
+    def _salir(self):
+        """Registra la salida del hilo actual de su region."""
+        tid = threading.get_ident()
+        with self._candado:
+            activo = self._activos[tid]
+            activo[2] -= 1
+            if activo[2] == 0:
+                del self._activos[tid]
+                if self._perfil is not None:
+                    self._perfil.disable()
+
+    def _muestrear(self):
+        """Toma muestras de las pilas de los hilos en regiones activas."""
+        propio = threading.get_ident()
+        while True:
+            time.sleep(self.intervalo)
+            with self._candado:
+                if not self._activos:
+                    self._hilo = None
+                    return
+                activos = list(self._activos.items())
+            marcos = sys._current_frames()  # pylint: disable=protected-access
+            for tid, (nombre, entrada, _) in activos:
+                if tid == propio or tid not in marcos:
+                    continue
+                pila = _pila(marcos[tid], entrada)
+                self.pilas[";".join([nombre] + pila)] += 1
+
+    # ------------------------------------------------------------------
+    # Salida
+    # ------------------------------------------------------------------
+    def colapsado(self):
+        """Retorna las pilas en formato colapsado, una por linea."""
+        return "".join(
+            f"{pila} {cuenta}\n" for pila, cuenta in sorted(self.pilas.items())
+        )
+
+    def escribir_colapsado(self, ruta):
+        """Escribe las pilas colapsadas en el archivo dado."""
+        with open(ruta, "w", encoding="utf-8") as f:
+            f.write(self.colapsado())
+
+    def escribir_pstats(self, ruta):
+        """Escribe el perfil agregado de cProfile en formato pstats."""
+        if self._perfil is None:
+            raise ValueError("escribir_pstats requiere modo cprofile.")
+        self._perfil.dump_stats(ruta)
+
+    def escribir(self, prefijo):
+        """Escribe la salida correspondiente al modo y retorna la ruta."""
+        if self._perfil is not None:
+            ruta = f"{prefijo}.prof"
+            self.escribir_pstats(ruta)
+        else:
+            ruta = f"{prefijo}.folded"
+            self.escribir_colapsado(ruta)
+        return ruta
+
+
+class _Region:
+    """Contexto de una region perfilada."""
+
+    __slots__ = ("_perfilador", "_nombre")
+
+    def __init__(self, perfilador, nombre):
+        self._perfilador = perfilador
+        self._nombre = nombre
+
+    def __enter__(self):
+        # pylint: disable=protected-access
+        self._perfilador._entrar(self._nombre, sys._getframe(1))
+        return self._perfilador
+
+    def __exit__(self, tipo_exc, exc, traza):
+        self._perfilador._salir()  # pylint: disable=protected-access
+        return False
+
+
+def _pila(marco, entrada):
+    """Retorna las funciones desde la entrada a la region hasta la hoja."""
+    funciones = []
+    while marco is not None and marco is not entrada:
+        codigo = marco.f_code
+        modulo = os.path.splitext(os.path.basename(codigo.co_filename))[0]
+        nombre = getattr(codigo, "co_qualname", codigo.co_name)
+        funciones.append(f"{modulo}:{nombre}")
+        marco = marco.f_back
+    if marco is None:
+        return []
+    funciones.reverse()
+    return funciones
+
+
+# ----------------------------------------------------------------------
+# Configuracion global por variables de entorno
+# ----------------------------------------------------------------------
+_SELECCION = frozenset()
+_PERFILADOR = None
+
+
+def configurar(operaciones, modo="muestreo", intervalo=0.001):
+    """Selecciona las operaciones a perfilar y retorna el perfilador."""
+    global _SELECCION, _PERFILADOR  # pylint: disable=global-statement
+    _SELECCION = frozenset(operaciones)
+    _PERFILADOR = Perfilador(modo, intervalo) if _SELECCION else None
+    return _PERFILADOR
+
+
+def perfilador_actual():
+    """Retorna el perfilador global o None si no hay seleccion."""
+    return _PERFILADOR
+
+
+def perfilado(nombre):
+    """Decorador que perfila la funcion si su nombre esta seleccionado."""
+    def decorador(funcion):
+        @functools.wraps(funcion)
+        def envoltura(*args, **kwargs):
+            if _PERFILADOR is None or (
+                nombre not in _SELECCION and "*" not in _SELECCION
+            ):
+                return funcion(*args, **kwargs)
+            with _PERFILADOR.perfilar(nombre):
+                return funcion(*args, **kwargs)
+        return envoltura
+    return decorador
+
+
+def _escribir_al_salir():
+    """Escribe el perfil global al terminar el proceso."""
+    if _PERFILADOR is not None:
+        prefijo = os.environ.get("HOTELES_PERFIL_SALIDA", "perfil")
+        ruta = _PERFILADOR.escribir(prefijo)
+        print(f"Perfil escrito en {ruta}")
+
+
+if os.environ.get("HOTELES_PERFIL"):
+    configurar(
+        [op.strip() for op in os.environ["HOTELES_PERFIL"].split(",")],
+        os.environ.get("HOTELES_PERFIL_MODO", "muestreo"),
+        float(os.environ.get("HOTELES_PERFIL_INTERVALO", "0.001"))
+    )
+    atexit.register(_escribir_al_salir)
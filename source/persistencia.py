@@ -3,19 +3,172 @@
 Created on Fri Feb 20 22:25:43 2026
 
 @author: Efrén Alejandro
+
+Los modulos de consultas (consulta), busqueda de texto (busqueda),
+snapshots mmap (catalogo_mmap) y el backend "arbol" (arbol_paginado) se
+importan en su primer uso; consulta y busqueda registran sus
+observadores de guardado al importarse.
 """
+import contextvars
 import json
 import os
+import threading
 from abc import ABC, abstractmethod
-from lector_json import leer_archivo_json
+from lector_json import leer_archivo_json, iterar_registros
+import cambios as flujo_cambios
+import almacen
+import deltas
+from instrumentacion import medir
 
 
 DATA_DIR = os.path.join(os.path.dirname(__file__), "datos")
 
+# Formato de los archivos de entidad: "json" o "arbol" (arbol_paginado.py)
+BACKENDS = almacen.BACKENDS
+BACKEND = os.environ.get("HOTELES_BACKEND", "json")
+
+
+def usar_backend(nombre):
+    """Cambia el formato de los archivos de entidad.
+    Con "arbol" cada entidad se guarda en <archivo>.btree y buscar,
+    crear y eliminar leen y escriben solo las paginas necesarias.
+    """
+    global BACKEND  # pylint: disable=global-statement
+    if nombre not in BACKENDS:
+        raise ValueError(f"Backend invalido: {nombre}")
+    BACKEND = nombre
+
+
+def directorio_datos():
+    """Retorna el directorio de datos del almacen activo o DATA_DIR."""
+    activo = almacen.actual()
+    return DATA_DIR if activo is None else activo.data_dir
+
+
+def backend_actual():
+    """Retorna el backend del almacen activo o BACKEND."""
+    activo = almacen.actual()
+    return BACKEND if activo is None else activo.backend
+
+
+# Funciones observadoras de guardado: funcion(ruta, cambios)
+_OBSERVADORES = []
+
+
+def observar(funcion):
+    """Registra una funcion que se llama despues de cada guardado.
+    Recibe la ruta guardada y la lista de cambios por registro como
+    tuplas (operacion, llave, antes, despues); la lista esta vacia
+    cuando no se conocen los registros afectados.
+    """
+    if funcion not in _OBSERVADORES:
+        _OBSERVADORES.append(funcion)
+
+
+def dejar_de_observar(funcion):
+    """Elimina una funcion observadora de guardado."""
+    if funcion in _OBSERVADORES:
+        _OBSERVADORES.remove(funcion)
+
+
+def _notificar(ruta, cambios):
+    """Avisa a los observadores que la ruta fue guardada."""
+    for funcion in list(_OBSERVADORES):
+        funcion(ruta, cambios)
+
+
+observar(flujo_cambios.al_guardar)
+
+
+# Unidad de trabajo activa en el contexto (ver unidad_trabajo.py); como
+# el almacen, cada hilo y cada tarea asyncio tiene la suya
+_UNIDAD = contextvars.ContextVar("unidad_trabajo", default=None)
+
+
+def unidad_activa():
+    """Retorna la unidad de trabajo activa en el contexto o None."""
+    return _UNIDAD.get()
+
+
+def fijar_unidad(unidad):
+    """Activa una unidad de trabajo en el contexto; retorna la anterior.
+    Mientras hay una activa, _cargar lee de ella y _guardar le entrega
+    los datos en lugar de escribir el archivo.
+    """
+    anterior = _UNIDAD.get()
+    _UNIDAD.set(unidad)
+    return anterior
+
+
+# Escritura diferida del proceso (ver escritura_diferida.py)
+_DIFERIDA = None
+
+
+def fijar_escritura_diferida(diferida):
+    """Activa una escritura diferida en el proceso; retorna la anterior.
+    Mientras esta activa, los archivos de su directorio se leen de su
+    memoria y _guardar le entrega los datos para escribirlos despues.
+    """
+    global _DIFERIDA  # pylint: disable=global-statement
+    anterior = _DIFERIDA
+    _DIFERIDA = diferida
+    return anterior
+
+
+def escritura_diferida():
+    """Retorna la escritura diferida que aplica al almacen actual o None."""
+    diferida = _DIFERIDA
+    if (diferida is None or backend_actual() != "json"
+            or diferida.data_dir != os.path.abspath(directorio_datos())):
+        return None
+    return diferida
+
+
+def _en_memoria():
+    """Retorna la unidad de trabajo o escritura diferida vigente o None."""
+    unidad = unidad_activa()
+    return unidad if unidad is not None else escritura_diferida()
+
+
+def cargar_archivo(nombre_archivo):
+    """Carga un archivo de entidad del directorio de datos.
+    Dentro de una unidad de trabajo o con escritura diferida retorna su
+    version pendiente.
+    """
+    memoria = _en_memoria()
+    if memoria is not None:
+        return memoria.cargar(nombre_archivo)
+    data_dir = directorio_datos()
+    if backend_actual() == "arbol":
+        import arbol_paginado  # pylint: disable=import-outside-toplevel
+        return arbol_paginado.MapeoArbol(
+            arbol_paginado.abrir(os.path.join(data_dir, nombre_archivo))
+        )
+    return leer_archivo_json(nombre_archivo, data_dir)
+
+
+def _como_predicado(predicado):
+    """Convierte un diccionario de igualdades en funcion predicado."""
+    if callable(predicado):
+        return predicado
+    condiciones = tuple(predicado.items())
+    return lambda registro: all(
+        registro.get(campo) == valor for campo, valor in condiciones
+    )
+
 
 class Persistencia(ABC):
     """Clase base abstracta para persistencia de entidades en archivos JSON."""
 
+    # Campos que modificar y modificar_donde pueden cambiar
+    CAMPOS_MODIFICABLES = frozenset()
+
+    # Campos con indice secundario para consultar().filtrar()
+    CAMPOS_INDEXADOS = ()
+
+    # Campos con busqueda de texto para buscar_texto()
+    CAMPOS_TEXTO = ()
+
     @property
     @abstractmethod
     def archivo(self):
@@ -30,9 +183,14 @@ class Persistencia(ABC):
     def _a_dict(self):
         """Convierte la instancia a diccionario serializable."""
 
+    def _normalizar_cambio(self, campo, valor):
+        """Valida y convierte un valor modificado a su forma persistida."""
+        # pylint: disable=unused-argument
+        return valor
+
     def _ruta_archivo(self):
         """Retorna la ruta completa del archivo JSON."""
-        return os.path.join(DATA_DIR, self.archivo)
+        return os.path.join(directorio_datos(), self.archivo)
 
     def _cargar(self):
         # """Carga el archivo JSON y retorna el diccionario."""
@@ -45,14 +203,216 @@ class Persistencia(ABC):
         # except json.JSONDecodeError as e:
         #     print(f"ERROR: Archivo {self.archivo} corrupto: {e}")
         #     return {}
-        return leer_archivo_json(self.archivo, DATA_DIR)
+        return cargar_archivo(self.archivo)
 
-    def _guardar(self, datos):
-        """Guarda el diccionario en el archivo JSON."""
+    def _buscar_registro(self, llave):
+        """Retorna el registro de la llave o None si no existe.
+        Usa el snapshot mmap vigente del archivo si lo hay, sin cargar
+        ni parsear el JSON completo.
+        """
+        if _en_memoria() is not None or backend_actual() == "arbol":
+            return self._cargar().get(llave)
+        import catalogo_mmap  # pylint: disable=import-outside-toplevel
+        snapshot = catalogo_mmap.snapshot(self.archivo, directorio_datos())
+        if snapshot is not None:
+            return deltas.aplicar_registro(
+                llave, snapshot.buscar(llave), self._ruta_archivo()
+            )
+        return self._cargar().get(llave)
+
+    def _pendiente(self):
+        """Indica si el archivo tiene cambios sin confirmar en la unidad
+        de trabajo activa o sin escribir por la escritura diferida; los
+        indices en cache no los reflejan.
+        """
+        memoria = _en_memoria()
+        return memoria is not None and memoria.pendiente(self.archivo)
+
+    def _iterar(self):
+        """Itera (llave, registro) del archivo sin cargarlo completo."""
+        if _en_memoria() is not None:
+            return iter(list(self._cargar().items()))
+        if backend_actual() == "arbol":
+            return self._cargar().items()
+        return iterar_registros(self.archivo, directorio_datos())
+
+    def _guardar(self, datos, cambios=()):
+        """Guarda el diccionario en el archivo JSON.
+        Escribe un archivo temporal y lo renombra sobre el original, asi
+        el archivo nunca queda a medias y cada guardado es un inodo nuevo
+        (los respaldos por enlace duro no ven escrituras posteriores).
+        Dentro de una unidad de trabajo solo se registra en ella y con
+        escritura diferida se encola. Con el backend "arbol" solo se
+        escriben los registros de cambios. Se escribe y se notifica con
+        el flujo de cambios bloqueado (cambios.bloqueado).
+        """
+        unidad = unidad_activa()
+        if unidad is not None:
+            unidad.registrar(self.archivo, datos, cambios)
+            return
+        diferida = escritura_diferida()
+        if diferida is not None:
+            diferida.registrar(self, datos, cambios)
+            return
+        with flujo_cambios.bloqueado(directorio_datos()):
+            if backend_actual() == "arbol":
+                # pylint: disable=import-outside-toplevel
+                import arbol_paginado
+                if isinstance(datos, arbol_paginado.MapeoArbol):
+                    if self._confirmar_arbol(datos, cambios):
+                        _notificar(self._ruta_archivo(), list(cambios))
+                    return
+            if self._escribir(datos):
+                _notificar(self._ruta_archivo(), list(cambios))
+
+    def _confirmar_arbol(self, datos, cambios):
+        """Escribe en el arbol las paginas de los registros cambiados.
+        Retorna False si no se pudo escribir.
+        """
+        with medir("guardar_arbol", self.archivo) as medicion:
+            try:
+                datos.confirmar(cambios)
+            except (OSError, ValueError) as e:
+                print(f"ERROR: No se pudo guardar {self.archivo}: {e}")
+                return False
+            medicion.anotar(registros=len(cambios))
+        return True
+
+    def _escribir(self, datos):
+        """Reescribe el archivo JSON completo y descarta su delta.
+        Con el backend "arbol" reemplaza el contenido del arbol.
+        Retorna False si no se pudo escribir.
+        """
         ruta = self._ruta_archivo()
         os.makedirs(os.path.dirname(ruta), exist_ok=True)
-        try:
-            with open(ruta, "w", encoding="utf-8") as f:
-                json.dump(datos, f, indent=4, ensure_ascii=False)
-        except OSError as e:
-            print(f"ERROR: No se pudo guardar {self.archivo}: {e}")
+        if backend_actual() == "arbol":
+            import arbol_paginado  # pylint: disable=import-outside-toplevel
+            try:
+                arbol_paginado.reemplazar(ruta, datos)
+            except (OSError, ValueError) as e:
+                print(f"ERROR: No se pudo guardar {self.archivo}: {e}")
+                return False
+            return True
+        with medir("guardar_json", self.archivo) as medicion:
+            contenido = json.dumps(
+                datos, indent=4, ensure_ascii=False
+            ).encode("utf-8")
+            temporal = f"{ruta}.{os.getpid()}.{threading.get_ident()}.tmp"
+            try:
+                with open(temporal, "wb") as f:
+                    f.write(contenido)
+                os.replace(temporal, ruta)
+            except OSError as e:
+                print(f"ERROR: No se pudo guardar {self.archivo}: {e}")
+                return False
+            medicion.anotar(len(contenido), len(datos))
+        deltas.descartar(ruta)
+        return True
+
+    def _leer_para_modificar(self, llave):
+        """Retorna (archivo, registro) para modificar un registro.
+        Con deltas habilitados fuera de una unidad de trabajo no se carga
+        el archivo completo y archivo es None.
+        """
+        if (deltas.HABILITADO and backend_actual() == "json"
+                and _en_memoria() is None):
+            return None, self._buscar_registro(llave)
+        archivo = self._cargar()
+        return archivo, archivo.get(llave)
+
+    def _parchar(self, archivo, registro, llave, campos):
+        """Guarda los campos cambiados de un registro existente.
+        archivo y registro son los de _leer_para_modificar. Si archivo
+        es None solo se agrega una linea al delta, con costo independiente
+        del tamano del archivo, y el delta se compacta cuando crece.
+        """
+        antes = dict(registro)
+        if archivo is not None:
+            registro.update(campos)
+            self._guardar(archivo, [
+                ("modificar", llave, antes, dict(registro))
+            ])
+            return
+        ruta = self._ruta_archivo()
+        with flujo_cambios.bloqueado(directorio_datos()):
+            with medir("guardar_delta", self.archivo) as medicion:
+                try:
+                    tamano = deltas.registrar(ruta, llave, campos)
+                except OSError as e:
+                    print(f"ERROR: No se pudo guardar {self.archivo}: {e}")
+                    return
+                medicion.anotar(registros=1)
+            _notificar(ruta, [
+                ("modificar", llave, antes, dict(antes, **campos))
+            ])
+        if deltas.debe_compactar(ruta, tamano):
+            self._escribir(self._cargar())
+
+    @classmethod
+    def consultar(cls):
+        """Retorna una Consulta sobre los registros de la entidad."""
+        import consulta  # pylint: disable=import-outside-toplevel
+        return consulta.Consulta(cls)
+
+    @classmethod
+    def buscar_texto(cls, texto, limite=20, prefijo=True):
+        """Retorna las llaves cuyos CAMPOS_TEXTO contienen el texto.
+        Ignora acentos y mayusculas; con prefijo=True la ultima palabra
+        puede estar incompleta.
+        """
+        if not cls.CAMPOS_TEXTO:
+            print(f"ERROR: {cls.__name__} no tiene campos de texto.")
+            return []
+        import busqueda  # pylint: disable=import-outside-toplevel
+        return busqueda.indice(cls).buscar(texto, limite, prefijo)
+
+    # ------------------------------------------------------------------
+    # Operaciones masivas
+    # ------------------------------------------------------------------
+    @classmethod
+    def modificar_donde(cls, predicado, **kwargs):
+        """Modifica todos los registros que cumplen el predicado.
+
+        predicado es una funcion que recibe el registro (dict) o un
+        diccionario de igualdades campo -> valor. Los valores se validan
+        una sola vez antes de tocar el archivo, que se carga y se guarda
+        una sola vez. Retorna cuantos registros se modificaron.
+        """
+        instancia = cls.__new__(cls)
+        campos = {}
+        for campo, valor in kwargs.items():
+            if campo not in cls.CAMPOS_MODIFICABLES:
+                print(f"ERROR: Atributo '{campo}' no es modificable.")
+                continue
+            campos[campo] = instancia._normalizar_cambio(campo, valor)
+        if not campos:
+            return 0
+        cumple = _como_predicado(predicado)
+        archivo = instancia._cargar()
+        cambios = []
+        for llave, registro in archivo.items():
+            if cumple(registro):
+                antes = dict(registro)
+                registro.update(campos)
+                cambios.append(("modificar", llave, antes, dict(registro)))
+        if cambios:
+            instancia._guardar(archivo, cambios)
+        return len(cambios)
+
+    @classmethod
+    def eliminar_donde(cls, predicado):
+        """Elimina todos los registros que cumplen el predicado.
+        Guarda el archivo una sola vez y retorna cuantos se eliminaron.
+        """
+        instancia = cls.__new__(cls)
+        cumple = _como_predicado(predicado)
+        archivo = instancia._cargar()
+        cambios = [
+            ("eliminar", llave, registro, None)
+            for llave, registro in archivo.items() if cumple(registro)
+        ]
+        for _, llave, _, _ in cambios:
+            del archivo[llave]
+        if cambios:
+            instancia._guardar(archivo, cambios)
+        return len(cambios)
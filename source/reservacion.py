@@ -4,17 +4,26 @@ Created on Fri Feb 20 21:52:32 2026
 
 @author: Efrén Alejandro
 """
-import uuid
-from persistencia import Persistencia
+import indice_fechas
+from idempotencia import ClavesRecientes
+from identificadores import nuevo_id
+from persistencia import Persistencia, observar, unidad_activa
+from perfilador import perfilado
 from validador import (
     validar_hotel,
     validar_cliente,
     validar_tipos_cuarto,
     aplicar_costos_catalogo
 )
+from tarifas import motor_actual
 from config import ARCHIVO_RESERVACIONES, SEPARADOR
 
 
+# Claves de idempotencia de Reservacion.crear
+CLAVES = ClavesRecientes()
+observar(CLAVES.al_guardar)
+
+
 class Reservacion(Persistencia):
     """Representa una reservacion de hotel."""
     def __init__(self, datos: dict):
@@ -26,7 +35,7 @@ class Reservacion(Persistencia):
             self.detalle = datos["detalle"]
             self.importe = datos["importe"]
             self.es_pagado = datos["es_pagado"]
-            self.uuid = datos.get("uuid", str(uuid.uuid4()))
+            self.uuid = datos["uuid"] if "uuid" in datos else nuevo_id()
         except KeyError as e:
             print(f"ERROR: Campo requerido faltante: {e}")
             raise
@@ -58,11 +67,38 @@ class Reservacion(Persistencia):
 
     @staticmethod
     def _calcular_importe(detalle, noches):
-        """Calcula el importe total de la reservacion."""
-        return sum(
-            d["costo"] * d["cantidad"] * noches
+        """Calcula el importe total de la reservacion.
+        Los items costeados por el motor de tarifas usan su precio exacto
+        de la estancia; los demas, costo por noche.
+        """
+        return round(sum(
+            d.get("precio_estancia", d["costo"] * noches) * d["cantidad"]
             for d in detalle
+        ), 2)
+
+    @classmethod
+    def _completar_datos(cls, datos):
+        """Completa tarifas, importe, pago y referencias de una solicitud.
+        Espera el detalle ya costeado con el catalogo. Lanza ValueError
+        si el motor de tarifas rechaza la estancia.
+        """
+        motor = motor_actual()
+        if motor is not None:
+            motor.aplicar(datos["rfc_hotel"], datos["detalle"],
+                          datos["fecha"], datos["noches"])
+        datos["importe"] = cls._calcular_importe(
+            datos["detalle"], datos["noches"]
         )
+        datos["es_pagado"] = datos.get("es_pagado", False)
+        datos["referencias"] = {
+            "rfc_hotel": datos["rfc_hotel"],
+            "rfc_cliente": datos["rfc_cliente"],
+            "fecha": datos["fecha"],
+            "nemotecnica": (
+                f"{datos['rfc_hotel']}_{datos['rfc_cliente']}_{datos['fecha']}"
+            )
+        }
+        return datos
 
     # ------------------------------------------------------------------
     # Implementacion de propiedades abstractas
@@ -92,6 +128,7 @@ class Reservacion(Persistencia):
     # Metodos de clase
     # ------------------------------------------------------------------
     @classmethod
+    @perfilado("Reservacion.buscar")
     def buscar(cls, uuid_res):
         """Busca una reservacion por UUID, retorna dict o None si no existe."""
         res_temp = cls.__new__(cls)
@@ -100,6 +137,7 @@ class Reservacion(Persistencia):
         return archivo.get(uuid_res)
 
     @classmethod
+    @perfilado("Reservacion.buscar_por_referencia")
     def buscar_por_referencia(cls, nemotecnica):
         """Busca una reservacion por referencia nemotecnica.
         Retorna dict o None si no existe.
@@ -113,12 +151,63 @@ class Reservacion(Persistencia):
         return None
 
     @classmethod
-    def crear(cls, datos: dict):
+    def _cargar_llaves(cls, llaves):
+        """Retorna los registros de las llaves cargando el archivo una vez."""
+        archivo = cls.__new__(cls)._cargar()
+        return [archivo[llave] for llave in llaves if llave in archivo]
+
+    @classmethod
+    @perfilado("Reservacion.traslapan")
+    def traslapan(cls, desde, hasta=None, rfc_hotel=None):
+        """Retorna las reservaciones que ocupan alguna noche de
+        [desde, hasta) en orden de llegada; sin hasta, la noche de desde.
+        Usa el indice de fechas, sin recorrer todas las reservaciones.
+        """
+        return cls._cargar_llaves(
+            indice_fechas.indice(cls).traslapan(desde, hasta, rfc_hotel)
+        )
+
+    @classmethod
+    @perfilado("Reservacion.llegadas")
+    def llegadas(cls, desde, hasta, rfc_hotel=None):
+        """Retorna las reservaciones con llegada en [desde, hasta)."""
+        return cls._cargar_llaves(
+            indice_fechas.indice(cls).llegadas(desde, hasta, rfc_hotel)
+        )
+
+    @classmethod
+    @perfilado("Reservacion.ocupacion")
+    def ocupacion(cls, rfc_hotel, desde, hasta):
+        """Retorna {fecha: cuartos ocupados} del hotel por noche."""
+        return indice_fechas.indice(cls).ocupacion(rfc_hotel, desde, hasta)
+
+    @classmethod
+    @perfilado("Reservacion.crear")
+    def crear(cls, datos: dict, clave_idempotencia=None):
         """Crea una reservacion y la persiste en archivo.
         Valida existencia de hotel, cliente y tipos de cuarto.
         Aplica costos del catalogo al momento de crear.
         Calcula el importe automaticamente.
+        Un reintento con la misma clave_idempotencia retorna la
+        reservacion original sin validar ni escribir (idempotencia.py).
+        Dentro de una unidad de trabajo la clave no se registra.
         """
+        if clave_idempotencia is None:
+            return cls._crear_nueva(datos)
+        ruta = cls.__new__(cls)._ruta_archivo()
+        with CLAVES.candado:
+            original = CLAVES.obtener(ruta, clave_idempotencia)
+            if original is not None:
+                return original
+            reservacion = cls._crear_nueva(datos)
+            if reservacion is not None and unidad_activa() is None:
+                CLAVES.registrar(ruta, clave_idempotencia,
+                                 reservacion.uuid, reservacion)
+            return reservacion
+
+    @classmethod
+    def _crear_nueva(cls, datos):
+        """Valida, costea y guarda una reservacion nueva."""
         try:
             validar_hotel(datos["rfc_hotel"])
             validar_cliente(datos["rfc_cliente"])
@@ -130,27 +219,23 @@ class Reservacion(Persistencia):
         datos["detalle"] = aplicar_costos_catalogo(
             datos["rfc_hotel"], datos["detalle"]
         )
-        datos["importe"] = cls._calcular_importe(
-            datos["detalle"], datos["noches"]
-        )
-        datos["es_pagado"] = datos.get("es_pagado", False)
-        datos["referencias"] = {
-            "rfc_hotel": datos["rfc_hotel"],
-            "rfc_cliente": datos["rfc_cliente"],
-            "fecha": datos["fecha"],
-            "nemotecnica": (
-                f"{datos['rfc_hotel']}_{datos['rfc_cliente']}_{datos['fecha']}"
-            )
-        }
+        try:
+            cls._completar_datos(datos)
+        except ValueError as e:
+            print(f"ERROR: {e}")
+            return None
         reservacion = cls(datos)
         archivo = reservacion._cargar()
         archivo[reservacion.uuid] = reservacion._a_dict()
-        reservacion._guardar(archivo)
+        reservacion._guardar(archivo, [
+            ("crear", reservacion.uuid, None, archivo[reservacion.uuid])
+        ])
         return reservacion
 
     # ------------------------------------------------------------------
     # Metodos de instancia
     # ------------------------------------------------------------------
+    @perfilado("Reservacion.cancelar")
     def cancelar(self):
         """Cancela la reservacion eliminandola del archivo.
         Muestra error en consola si no existe y continua la ejecucion.
@@ -161,8 +246,8 @@ class Reservacion(Persistencia):
                 f"ERROR: No existe reservacion con UUID {self.uuid}."
             )
             return False
-        del archivo[self.uuid]
-        self._guardar(archivo)
+        antes = archivo.pop(self.uuid)
+        self._guardar(archivo, [("eliminar", self.uuid, antes, None)])
         return True
 
     def mostrar_info(self):
@@ -3,13 +3,38 @@
 Created on Sun Feb 22 00:18:10 2026
 
 @author: Efrén Alejandro
+
+Reservacion se importa en el primer uso (__getattr__ de modulo, PEP 562):
+hotel.py importa este puente y asi no carga reservacion, validador ni
+tarifas al iniciar.
 """
-from reservacion import Reservacion
 
 
-def crear_reservacion(datos):
-    """Crea una reservacion delegando a Reservacion.crear."""
-    return Reservacion.crear(datos)
+def __getattr__(nombre):
+    """Importa Reservacion la primera vez que se pide."""
+    if nombre != "Reservacion":
+        raise AttributeError(
+            f"module {__name__!r} has no attribute {nombre!r}"
+        )
+    # pylint: disable=import-outside-toplevel
+    from reservacion import Reservacion
+    globals()["Reservacion"] = Reservacion
+    return Reservacion
+
+
+def _reservacion():
+    """Retorna la clase Reservacion, importandola si hace falta."""
+    return globals().get("Reservacion") or __getattr__("Reservacion")
+
+
+def crear_reservacion(datos, clave_idempotencia=None):
+    """Crea una reservacion delegando a Reservacion.crear.
+    Un reintento con la misma clave_idempotencia retorna la original.
+    """
+    if clave_idempotencia is None:
+        return _reservacion().crear(datos)
+    return _reservacion().crear(datos,
+                                clave_idempotencia=clave_idempotencia)
 
 
 def cancelar_reservacion(reservacion):
@@ -0,0 +1,370 @@
+# -*- coding: utf-8 -*-
+"""Respaldos consistentes del directorio de datos y restauracion rapida.
+Created on Tue Oct 20 22:41:09 2026
+
+@author: Efrén Alejandro
+
+Uso:
+    python respaldos.py crear [nombre] [--datos DIR]
+    python respaldos.py listar
+    python respaldos.py restaurar nombre
+    python respaldos.py eliminar nombre
+
+Los respaldos viven en <datos>/respaldos. Cada archivo de entidad se
+guarda una sola vez en objetos/<sha256> y cada respaldo es un manifiesto
+instantaneas/<nombre>.json que apunta a sus objetos, asi dos respaldos
+comparten los archivos que no cambiaron. Como Persistencia._guardar
+reemplaza el archivo completo (inodo nuevo), el objeto se crea con un
+enlace duro al archivo vivo sin copiar datos; si el sistema no permite
+enlaces se copia. El corte es consistente: si algun archivo se
+reemplazo mientras se enlazaban los demas, el respaldo se repite. El
+hash de un inodo ya respaldado se recuerda en inodos.json para no volver
+a leer archivos que no cambiaron.
+
+Los deltas de modificar (deltas.py) tambien se respaldan; como se
+agregan en sitio, deltas.registrar copia el delta antes de agregar si
+esta enlazado a un respaldo. Los arboles del backend arbol (.btree) se
+modifican en sitio, asi que se copian en lugar de enlazarse, con los
+arboles abiertos del proceso sincronizados y retenidos mientras dura el
+respaldo o la restauracion.
+
+restaurar es atomica como conjunto con el protocolo de unidad_trabajo:
+prepara temporales .tx junto a los archivos vivos, escribe el archivo
+de intencion .transaccion.json con los renombrados y los archivos a
+eliminar y despues los aplica. Si el proceso muere antes de la
+intencion no cambia nada; si muere despues, unidad_trabajo.recuperar()
+termina la restauracion.
+"""
+import argparse
+import contextlib
+import hashlib
+import json
+import os
+import shutil
+import sys
+import threading
+import uuid
+from datetime import datetime, timezone
+
+import arbol_paginado
+import cambios as flujo_cambios
+import deltas
+import persistencia
+from almacen import Almacen
+from config import (ARCHIVO_HOTELES, ARCHIVO_CLIENTES, ARCHIVO_TIPOS_CUARTO,
+                    ARCHIVO_RESERVACIONES)
+from unidad_trabajo import (ARCHIVO_INTENCION, SUFIJO_TEMPORAL, _Candado,
+                            _escribir, _sincronizar_directorio, _terminar)
+
+
+ENTIDADES = (ARCHIVO_HOTELES, ARCHIVO_CLIENTES, ARCHIVO_TIPOS_CUARTO,
+             ARCHIVO_RESERVACIONES)
+# Cada archivo de entidad con su delta (deltas.py) y su arbol
+ARCHIVOS = ENTIDADES + tuple(
+    deltas.ruta_delta(archivo) for archivo in ENTIDADES
+) + tuple(arbol_paginado.ruta_arbol(archivo) for archivo in ENTIDADES)
+DIRECTORIO = "respaldos"
+INTENTOS = 5
+
+_CANDADO = threading.Lock()
+
+
+def _directorio(data_dir):
+    """Retorna el directorio de respaldos del directorio de datos."""
+    return os.path.join(data_dir or persistencia.directorio_datos(),
+                        DIRECTORIO)
+
+
+def _ruta_manifiesto(raiz, nombre):
+    """Retorna la ruta del manifiesto de un respaldo."""
+    return os.path.join(raiz, "instantaneas", f"{nombre}.json")
+
+
+def _escribir_json(ruta, datos):
+    """Escribe un JSON de forma atomica."""
+    temporal = f"{ruta}.{os.getpid()}.tmp"
+    with open(temporal, "w", encoding="utf-8") as f:
+        json.dump(datos, f, indent=4, ensure_ascii=False)
+    os.replace(temporal, ruta)
+
+
+def _leer_json(ruta, omision):
+    """Lee un JSON o retorna el valor por omision si no existe."""
+    try:
+        with open(ruta, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return omision
+
+
+def _inodo(estado):
+    """Retorna la identidad de un archivo a partir de su stat."""
+    return (f"{estado.st_dev}:{estado.st_ino}:{estado.st_size}:"
+            f"{estado.st_mtime_ns}")
+
+
+def _hash(ruta):
+    """Retorna el sha256 del contenido de un archivo."""
+    digesto = hashlib.sha256()
+    with open(ruta, "rb") as f:
+        for bloque in iter(lambda: f.read(1 << 20), b""):
+            digesto.update(bloque)
+    return digesto.hexdigest()
+
+
+def _enlazar(origen, destino):
+    """Enlaza origen en destino; copia si no se permiten enlaces.
+    Retorna True si se creo un enlace duro.
+    """
+    try:
+        os.link(origen, destino)
+        return True
+    except OSError:
+        # copy2 conserva el mtime, que es la base del delta
+        shutil.copy2(origen, destino)
+        return False
+
+
+def _copiar(origen, destino):
+    """Copia origen en destino conservando el mtime y la lleva a disco."""
+    shutil.copy2(origen, destino)
+    with open(destino, "rb") as f:
+        os.fsync(f.fileno())
+
+
+def _en_sitio(archivo):
+    """Indica si el archivo se modifica en sitio y no se puede enlazar."""
+    return archivo.endswith(arbol_paginado.EXTENSION)
+
+
+def _capturar(ruta, objetos, hashes, copiar=False):
+    """Guarda el archivo vivo como objeto; retorna (hash, inodo).
+    El inodo es el del archivo vivo capturado, o None si se reemplazo
+    mientras se copiaba. Con copiar=True nunca se enlaza.
+    """
+    temporal = os.path.join(objetos, f".{os.getpid()}.tmp")
+    if os.path.exists(temporal):
+        os.remove(temporal)
+    antes = _inodo(os.stat(ruta))
+    if copiar:
+        _copiar(ruta, temporal)
+        inodo = antes if _inodo(os.stat(ruta)) == antes else None
+    elif _enlazar(ruta, temporal):
+        inodo = _inodo(os.stat(temporal))
+    else:
+        inodo = antes if _inodo(os.stat(ruta)) == antes else None
+    digesto = hashes.get(inodo) or _hash(temporal)
+    if inodo is not None:
+        hashes[inodo] = digesto
+    destino = os.path.join(objetos, digesto)
+    if os.path.exists(destino):
+        os.remove(temporal)
+    else:
+        os.replace(temporal, destino)
+    return digesto, inodo
+
+
+def _inodos_vivos(data_dir):
+    """Retorna {archivo: inodo} de los archivos de entidad existentes."""
+    vivos = {}
+    for archivo in ARCHIVOS:
+        try:
+            vivos[archivo] = _inodo(os.stat(os.path.join(data_dir, archivo)))
+        except FileNotFoundError:
+            continue
+    return vivos
+
+
+def _arboles_retenidos(data_dir):
+    """Retiene los arboles abiertos de las entidades del directorio."""
+    return arbol_paginado.retenidos(
+        os.path.join(data_dir, archivo) for archivo in ENTIDADES
+    )
+
+
+def crear(nombre=None, data_dir=None):
+    """Crea un respaldo consistente y retorna su manifiesto.
+
+    Lanza ValueError si el nombre ya existe o si no se logra un corte
+    consistente tras varios intentos por escrituras concurrentes.
+    """
+    data_dir = data_dir or persistencia.directorio_datos()
+    raiz = _directorio(data_dir)
+    objetos = os.path.join(raiz, "objetos")
+    os.makedirs(objetos, exist_ok=True)
+    os.makedirs(os.path.join(raiz, "instantaneas"), exist_ok=True)
+    fecha = datetime.now(timezone.utc)
+    nombre = nombre or fecha.strftime("%Y%m%dT%H%M%S%fZ")
+    ruta_manifiesto = _ruta_manifiesto(raiz, nombre)
+    if os.path.exists(ruta_manifiesto):
+        raise ValueError(f"Ya existe el respaldo {nombre}.")
+    with _CANDADO, _arboles_retenidos(data_dir):
+        ruta_hashes = os.path.join(raiz, "inodos.json")
+        hashes = _leer_json(ruta_hashes, {})
+        for _ in range(INTENTOS):
+            antes = _inodos_vivos(data_dir)
+            archivos = {}
+            capturados = {}
+            for archivo in antes:
+                try:
+                    archivos[archivo], capturados[archivo] = _capturar(
+                        os.path.join(data_dir, archivo), objetos, hashes,
+                        _en_sitio(archivo)
+                    )
+                except FileNotFoundError:
+                    break
+            if capturados == antes == _inodos_vivos(data_dir):
+                break
+        else:
+            raise ValueError("No se logro un corte consistente.")
+        vigentes = set(capturados.values())
+        _escribir_json(ruta_hashes, {
+            inodo: digesto for inodo, digesto in hashes.items()
+            if inodo in vigentes
+        })
+    manifiesto = {
+        "nombre": nombre,
+        "fecha": fecha.isoformat(),
+        "archivos": archivos,
+    }
+    _escribir_json(ruta_manifiesto, manifiesto)
+    return manifiesto
+
+
+def listar(data_dir=None):
+    """Retorna los manifiestos de los respaldos ordenados por fecha."""
+    directorio = os.path.join(_directorio(data_dir), "instantaneas")
+    if not os.path.isdir(directorio):
+        return []
+    manifiestos = [
+        _leer_json(os.path.join(directorio, nombre), None)
+        for nombre in os.listdir(directorio) if nombre.endswith(".json")
+    ]
+    return sorted(manifiestos, key=lambda m: m["fecha"])
+
+
+def restaurar(nombre, data_dir=None):
+    """Reemplaza los archivos de entidad por los del respaldo.
+
+    El conjunto se reemplaza de forma atomica (ver el docstring del
+    modulo); los archivos que no existian en el respaldo se eliminan.
+    Lanza ValueError si el respaldo no existe.
+    """
+    data_dir = data_dir or persistencia.directorio_datos()
+    raiz = _directorio(data_dir)
+    manifiesto = _leer_json(_ruta_manifiesto(raiz, nombre), None)
+    if manifiesto is None:
+        raise ValueError(f"No existe el respaldo {nombre}.")
+    with flujo_cambios.bloqueado(data_dir):
+        with _arboles_retenidos(data_dir), _Candado(data_dir):
+            _aplicar(manifiesto, raiz, data_dir)
+        for archivo in ENTIDADES:
+            # Las caches e indices no conocen los registros afectados
+            persistencia._notificar(  # pylint: disable=protected-access
+                os.path.join(data_dir, archivo), []
+            )
+    return manifiesto
+
+
+def _aplicar(manifiesto, raiz, data_dir):
+    """Prepara los temporales y la intencion del respaldo y la aplica.
+    Si falla antes de escribir la intencion borra los temporales.
+    Requiere el candado de unidad_trabajo.
+    """
+    # Una intencion pendiente se termina antes de preparar la nueva
+    _terminar(data_dir)
+    identificador = uuid.uuid4().hex
+    temporales = {}
+    try:
+        for archivo, digesto in manifiesto["archivos"].items():
+            objeto = os.path.join(raiz, "objetos", digesto)
+            ruta = os.path.join(data_dir, archivo)
+            # Renombrar sobre el mismo inodo no hace nada
+            if os.path.exists(ruta) and os.path.samefile(objeto, ruta):
+                continue
+            temporal = f"{archivo}.{identificador}{SUFIJO_TEMPORAL}"
+            temporales[archivo] = temporal
+            if _en_sitio(archivo):
+                _copiar(objeto, os.path.join(data_dir, temporal))
+            else:
+                _enlazar(objeto, os.path.join(data_dir, temporal))
+        eliminar = [
+            archivo for archivo in ARCHIVOS
+            if archivo not in manifiesto["archivos"]
+            and os.path.exists(os.path.join(data_dir, archivo))
+        ]
+        ruta_intencion = os.path.join(data_dir, ARCHIVO_INTENCION)
+        _escribir(f"{ruta_intencion}.{identificador}", json.dumps({
+            "id": identificador, "archivos": temporales,
+            "eliminar": eliminar
+        }).encode("utf-8"))
+        os.replace(f"{ruta_intencion}.{identificador}", ruta_intencion)
+    except OSError:
+        for temporal in temporales.values():
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(os.path.join(data_dir, temporal))
+        raise
+    _sincronizar_directorio(data_dir)
+    _terminar(data_dir)
+
+
+def eliminar(nombre, data_dir=None):
+    """Elimina un respaldo y los objetos que ningun otro usa."""
+    raiz = _directorio(data_dir)
+    ruta = _ruta_manifiesto(raiz, nombre)
+    if not os.path.exists(ruta):
+        raise ValueError(f"No existe el respaldo {nombre}.")
+    os.remove(ruta)
+    return recolectar(data_dir)
+
+
+def recolectar(data_dir=None):
+    """Borra los objetos sin manifiesto; retorna cuantos se borraron."""
+    objetos = os.path.join(_directorio(data_dir), "objetos")
+    if not os.path.isdir(objetos):
+        return 0
+    usados = {
+        digesto for manifiesto in listar(data_dir)
+        for digesto in manifiesto["archivos"].values()
+    }
+    borrados = 0
+    for nombre in os.listdir(objetos):
+        if nombre not in usados and not nombre.startswith("."):
+            os.remove(os.path.join(objetos, nombre))
+            borrados += 1
+    return borrados
+
+
+def main():
+    """Punto de entrada de linea de comandos."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("accion",
+                        choices=("crear", "listar", "restaurar", "eliminar"))
+    parser.add_argument("nombre", nargs="?", default=None)
+    parser.add_argument("--datos", default=None,
+                        help="Directorio de datos (por omision DATA_DIR)")
+    args = parser.parse_args()
+    almacen = contextlib.nullcontext() if args.datos is None else Almacen(
+        args.datos, persistencia.backend_actual()
+    )
+    try:
+        with almacen:
+            if args.accion == "crear":
+                print(json.dumps(crear(args.nombre), indent=4))
+            elif args.accion == "listar":
+                for manifiesto in listar():
+                    print(f"{manifiesto['nombre']}  {manifiesto['fecha']}")
+            elif args.nombre is None:
+                raise ValueError(f"{args.accion} requiere el nombre.")
+            elif args.accion == "restaurar":
+                restaurar(args.nombre)
+                print(f"Respaldo {args.nombre} restaurado.")
+            else:
+                print(f"{eliminar(args.nombre)} objetos liberados.")
+    except (OSError, ValueError) as e:
+        print(f"ERROR: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
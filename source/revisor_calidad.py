@@ -18,7 +18,30 @@ MODULOS = [
     "tipo_cuarto.py",
     "validador.py",
     "lector_json.py",
-    "config.py"
+    "config.py",
+    "instrumentacion.py",
+    "perfilador.py",
+    "traza.py",
+    "tarifas.py",
+    "cotizador.py",
+    "carga_masiva.py",
+    "consulta.py",
+    "busqueda.py",
+    "lotes.py",
+    "catalogo_mmap.py",
+    "cambios.py",
+    "respaldos.py",
+    "integridad.py",
+    "unidad_trabajo.py",
+    "sesion.py",
+    "deltas.py",
+    "arbol_paginado.py",
+    "indice_fechas.py",
+    "idempotencia.py",
+    "identificadores.py",
+    "arranque.py",
+    "almacen.py",
+    "escritura_diferida.py"
 ]
 
 SOURCE_DIR = os.path.join(os.path.dirname(__file__))
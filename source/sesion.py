@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+"""Sesion con mapa de identidad y escritura diferida de entidades.
+Created on Wed Oct 21 12:31:07 2026
+
+@author: Efrén Alejandro
+
+Uso:
+    with Sesion() as sesion:
+        hotel = sesion.obtener(Hotel, "CAM123456ABC")
+        hotel.modificar(estatus="inactivo")
+        sesion.obtener(Hotel, "CAM123456ABC") is hotel   # True
+
+La sesion abre una UnidadTrabajo: cada archivo se lee una sola vez, los
+modificar/crear/eliminar quedan en memoria (las busquedas los ven) y
+flush() o la salida del bloque los escribe juntos. Cada (entidad, llave)
+se construye una sola vez y obtener retorna siempre el mismo objeto.
+Con una excepcion dentro del bloque se descartan los cambios y el mapa.
+"""
+from unidad_trabajo import UnidadTrabajo
+
+
+class Sesion:
+    """Mapa de identidad sobre una unidad de trabajo."""
+
+    def __init__(self, data_dir=None):
+        self._unidad = UnidadTrabajo(data_dir)
+        self._activa = None
+        self._identidades = {}
+
+    def __enter__(self):
+        self._activa = self._unidad.__enter__()
+        return self
+
+    def __exit__(self, tipo_excepcion, *args):
+        if tipo_excepcion is not None:
+            self._identidades.clear()
+        self._activa = None
+        return self._unidad.__exit__(tipo_excepcion, *args)
+
+    # ------------------------------------------------------------------
+    # Mapa de identidad
+    # ------------------------------------------------------------------
+    def obtener(self, entidad, llave):
+        """Retorna la instancia de la llave, o None si no existe.
+        La llave es el id de la entidad (rfc, rfc_tipo o uuid).
+        """
+        # pylint: disable=protected-access
+        identidad = (entidad, llave)
+        if identidad in self._identidades:
+            return self._identidades[identidad]
+        registro = entidad.__new__(entidad)._buscar_registro(llave)
+        if registro is None:
+            return None
+        try:
+            instancia = entidad(dict(registro))
+        except (KeyError, ValueError):
+            return None
+        self._identidades[identidad] = instancia
+        return instancia
+
+    def crear(self, entidad, datos):
+        """Crea la entidad con su crear() y la agrega al mapa."""
+        instancia = entidad.crear(datos)
+        if instancia is not None:
+            self._identidades[(entidad, instancia.id)] = instancia
+        return instancia
+
+    def eliminar(self, instancia):
+        """Elimina el registro de la instancia y la quita del mapa."""
+        # pylint: disable=protected-access
+        archivo = instancia._cargar()
+        if instancia.id not in archivo:
+            print(f"ERROR: No existe {type(instancia).__name__} "
+                  f"{instancia.id}.")
+            return False
+        antes = archivo.pop(instancia.id)
+        instancia._guardar(archivo, [("eliminar", instancia.id, antes, None)])
+        self._identidades.pop((type(instancia), instancia.id), None)
+        return True
+
+    def sucios(self):
+        """Retorna las instancias del mapa con cambios sin escribir."""
+        if self._activa is None:
+            return []
+        pendientes = self._activa.pendientes()
+        sucias = []
+        for (_, llave), instancia in self._identidades.items():
+            if instancia.archivo not in pendientes:
+                continue
+            llaves = pendientes[instancia.archivo]
+            if llaves is None or llave in llaves:
+                sucias.append(instancia)
+        return sucias
+
+    def flush(self):
+        """Escribe los cambios pendientes; la sesion sigue abierta.
+        Dentro de una unidad externa la escritura queda a cargo de esta.
+        Retorna True si no hubo error.
+        """
+        if self._activa is not self._unidad:
+            return True
+        return self._unidad.confirmar()
@@ -0,0 +1,204 @@
+# -*- coding: utf-8 -*-
+"""Motor de tarifas dinamicas por noche sobre los costos de TipoCuarto.
+Created on Mon Oct 19 16:03:18 2026
+
+@author: Efrén Alejandro
+
+Cada (hotel, tipo) tiene un calendario precalculado de tarifas por noche
+(temporada, fin de semana y sobreprecio por ocupacion aplicados al costo
+del catalogo) y un arreglo de sumas prefijas. El precio de una estancia
+de cualquier longitud es una resta de dos prefijos.
+"""
+import datetime
+import os
+from itertools import accumulate
+
+import persistencia
+from config import ARCHIVO_TIPOS_CUARTO
+
+
+def _fecha(valor):
+    """Convierte una fecha ISO (o date) a datetime.date."""
+    if isinstance(valor, datetime.date):
+        return valor
+    return datetime.date.fromisoformat(valor)
+
+
+class ReglasTarifa:
+    """Factores multiplicativos que se aplican al costo base por noche.
+
+    temporadas: lista de (inicio, fin, factor) con fechas inclusivas.
+    dias_fin_de_semana: dias (date.weekday) cuya noche es fin de semana.
+    niveles_ocupacion: lista de (umbral, factor); aplica el factor del
+    umbral mas alto que la ocupacion alcanza.
+    """
+
+    def __init__(self, temporadas=(), factor_fin_de_semana=1.0,
+                 dias_fin_de_semana=(4, 5), niveles_ocupacion=()):
+        self.temporadas = [
+            (_fecha(inicio), _fecha(fin), factor)
+            for inicio, fin, factor in temporadas
+        ]
+        self.factor_fin_de_semana = factor_fin_de_semana
+        self.dias_fin_de_semana = frozenset(dias_fin_de_semana)
+        self.niveles_ocupacion = sorted(niveles_ocupacion)
+
+    def factor(self, fecha, ocupacion=0.0):
+        """Retorna el factor total para la noche de la fecha dada."""
+        total = 1.0
+        for inicio, fin, factor in self.temporadas:
+            if inicio <= fecha <= fin:
+                total *= factor
+        if fecha.weekday() in self.dias_fin_de_semana:
+            total *= self.factor_fin_de_semana
+        for umbral, factor in reversed(self.niveles_ocupacion):
+            if ocupacion >= umbral:
+                total *= factor
+                break
+        return total
+
+
+class CalendarioTarifas:
+    """Tarifas por noche y sumas prefijas de un (hotel, tipo)."""
+
+    def __init__(self, costo_base, reglas, inicio, dias, ocupacion=None):
+        self.costo_base = costo_base
+        self.reglas = reglas
+        self.inicio = _fecha(inicio)
+        self.ocupacion = ocupacion or {}
+        self.tarifas = [
+            self._tarifa_noche(self.inicio + datetime.timedelta(days=i))
+            for i in range(dias)
+        ]
+        self.prefijos = [0.0] + list(accumulate(self.tarifas))
+
+    def _tarifa_noche(self, fecha):
+        """Evalua las reglas para una noche, redondeada a centavos."""
+        factor = self.reglas.factor(fecha, self.ocupacion.get(fecha, 0.0))
+        return round(self.costo_base * factor, 2)
+
+    def tarifa(self, fecha):
+        """Retorna la tarifa de la noche de la fecha dada."""
+        fecha = _fecha(fecha)
+        i = (fecha - self.inicio).days
+        if 0 <= i < len(self.tarifas):
+            return self.tarifas[i]
+        return self._tarifa_noche(fecha)
+
+    def precio_estancia(self, fecha, noches):
+        """Retorna el precio de noches consecutivas desde la fecha.
+        Dentro del calendario es O(1); las noches fuera del rango
+        precalculado se evaluan una por una.
+        """
+        if noches <= 0:
+            raise ValueError(f"Las noches deben ser mayor a cero: {noches}")
+        fecha = _fecha(fecha)
+        inicio = (fecha - self.inicio).days
+        fin = inicio + noches
+        desde = min(max(inicio, 0), len(self.tarifas))
+        hasta = min(max(fin, 0), len(self.tarifas))
+        total = self.prefijos[hasta] - self.prefijos[desde]
+        for i in range(inicio, min(desde, fin)):
+            total += self._tarifa_noche(
+                self.inicio + datetime.timedelta(days=i)
+            )
+        for i in range(max(hasta, inicio), fin):
+            total += self._tarifa_noche(
+                self.inicio + datetime.timedelta(days=i)
+            )
+        return round(total, 2)
+
+
+class MotorTarifas:
+    """Construye y mantiene calendarios de tarifas por (hotel, tipo)."""
+
+    def __init__(self, reglas=None, inicio=None, dias=731,
+                 reglas_por_hotel=None):
+        hoy = datetime.date.today()
+        self.reglas = reglas or ReglasTarifa()
+        self.reglas_por_hotel = reglas_por_hotel or {}
+        self.inicio = _fecha(inicio) if inicio else datetime.date(
+            hoy.year, 1, 1
+        )
+        self.dias = dias
+        # Aumenta con cada invalidacion; las caches de cotizaciones la
+        # usan en su llave
+        self.version = 0
+        self._ocupacion = {}
+        self._calendarios = {}
+
+    def calendario(self, rfc_hotel, tipo):
+        """Retorna el calendario de (hotel, tipo) o None si no existe."""
+        llave = (persistencia.directorio_datos(), rfc_hotel, tipo)
+        cal = self._calendarios.get(llave)
+        if cal is None:
+            catalogo = persistencia.cargar_archivo(ARCHIVO_TIPOS_CUARTO)
+            tc = catalogo.get(f"{rfc_hotel}_{tipo}")
+            if tc is None:
+                return None
+            cal = CalendarioTarifas(
+                tc["costo"],
+                self.reglas_por_hotel.get(rfc_hotel, self.reglas),
+                self.inicio, self.dias,
+                self._ocupacion.get(rfc_hotel)
+            )
+            self._calendarios[llave] = cal
+        return cal
+
+    def actualizar_ocupacion(self, rfc_hotel, fecha, fraccion):
+        """Registra la ocupacion (0 a 1) de una noche del hotel."""
+        self._ocupacion.setdefault(rfc_hotel, {})[_fecha(fecha)] = fraccion
+        self.invalidar(rfc_hotel)
+
+    def invalidar(self, rfc_hotel=None):
+        """Descarta calendarios del hotel dado o de todos los hoteles."""
+        self.version += 1
+        if rfc_hotel is None:
+            self._calendarios.clear()
+            return
+        for llave in [k for k in self._calendarios if k[1] == rfc_hotel]:
+            del self._calendarios[llave]
+
+    def precio_estancia(self, rfc_hotel, tipo, fecha, noches):
+        """Retorna el precio por cuarto de la estancia completa."""
+        cal = self.calendario(rfc_hotel, tipo)
+        if cal is None:
+            raise ValueError(
+                f"No existe tipo {tipo} para hotel {rfc_hotel}."
+            )
+        return cal.precio_estancia(fecha, noches)
+
+    def aplicar(self, rfc_hotel, detalle, fecha, noches):
+        """Fija en cada item el precio exacto de la estancia por cuarto
+        (precio_estancia, base del importe) y su costo promedio por noche
+        redondeado, solo informativo.
+        """
+        for item in detalle:
+            precio = self.precio_estancia(rfc_hotel, item["tipo"], fecha,
+                                          noches)
+            item["precio_estancia"] = precio
+            item["costo"] = round(precio / noches, 2)
+        return detalle
+
+
+_MOTOR = None
+
+
+def configurar_motor(motor):
+    """Activa un motor de tarifas para Reservacion.crear (None apaga)."""
+    global _MOTOR  # pylint: disable=global-statement
+    _MOTOR = motor
+
+
+def motor_actual():
+    """Retorna el motor de tarifas activo o None."""
+    return _MOTOR
+
+
+def _al_guardar(ruta, _cambios):
+    """Invalida los calendarios del motor activo si cambia el catalogo."""
+    if _MOTOR is not None and os.path.basename(ruta) == ARCHIVO_TIPOS_CUARTO:
+        _MOTOR.invalidar()
+
+
+persistencia.observar(_al_guardar)
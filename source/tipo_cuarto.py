@@ -4,17 +4,22 @@ Created on Fri Feb 20 21:54:43 2026
 
 @author: Efrén Alejandro
 """
-from catalogos import TipoHabitacion
+from catalogos import parsear_tipo_habitacion
 from persistencia import Persistencia
+from perfilador import perfilado
 from config import ARCHIVO_TIPOS_CUARTO, SEPARADOR
 
 
 class TipoCuarto(Persistencia):
     """Catalogo de tipos de cuarto por hotel."""
+
+    CAMPOS_MODIFICABLES = frozenset({"costo"})
+    CAMPOS_INDEXADOS = ("rfc_hotel", "tipo")
+
     def __init__(self, datos: dict):
         try:
             self.rfc_hotel = datos["rfc_hotel"]
-            self.tipo = TipoHabitacion(datos["tipo"])
+            self.tipo = parsear_tipo_habitacion(datos["tipo"])
             self.costo = self._validar_costo(datos["costo"])
         except KeyError as e:
             print(f"ERROR: Campo requerido faltante: {e}")
@@ -37,6 +42,12 @@ class TipoCuarto(Persistencia):
             )
         return costo
 
+    def _normalizar_cambio(self, campo, valor):
+        """Valida el costo antes de persistirlo."""
+        if campo == "costo":
+            return self._validar_costo(valor)
+        return valor
+
     # ------------------------------------------------------------------
     # Implementacion de propiedades abstractas
     # ------------------------------------------------------------------
@@ -62,14 +73,15 @@ class TipoCuarto(Persistencia):
     # Metodos de clase
     # ------------------------------------------------------------------
     @classmethod
+    @perfilado("TipoCuarto.buscar")
     def buscar(cls, rfc_hotel, tipo):
         """Busca un tipo de cuarto, retorna dict o None si no existe."""
         tc_temp = cls.__new__(cls)
         tc_temp.rfc_hotel = rfc_hotel
-        archivo = tc_temp._cargar()
-        return archivo.get(f"{rfc_hotel}_{tipo}")
+        return tc_temp._buscar_registro(f"{rfc_hotel}_{tipo}")
 
     @classmethod
+    @perfilado("TipoCuarto.crear")
     def crear(cls, datos: dict):
         """Crea un tipo de cuarto y lo persiste en archivo.
         Si ya existe el mismo tipo para el mismo hotel muestra error
@@ -84,17 +96,20 @@ class TipoCuarto(Persistencia):
             )
             return None
         archivo[tipo_cuarto.id] = tipo_cuarto._a_dict()
-        tipo_cuarto._guardar(archivo)
+        tipo_cuarto._guardar(archivo, [
+            ("crear", tipo_cuarto.id, None, archivo[tipo_cuarto.id])
+        ])
         return tipo_cuarto
 
     @classmethod
+    @perfilado("TipoCuarto.eliminar")
     def eliminar(cls, rfc_hotel, tipo):
         """Elimina un tipo de cuarto del archivo.
         Si no existe muestra error en consola y continua la ejecucion.
         """
         tipo_cuarto = cls.__new__(cls)
         tipo_cuarto.rfc_hotel = rfc_hotel
-        tipo_cuarto.tipo = TipoHabitacion(tipo)
+        tipo_cuarto.tipo = parsear_tipo_habitacion(tipo)
         archivo = tipo_cuarto._cargar()
         llave = f"{rfc_hotel}_{tipo}"
         if llave not in archivo:
@@ -103,8 +118,8 @@ class TipoCuarto(Persistencia):
                 f"para hotel {rfc_hotel}."
             )
             return False
-        del archivo[llave]
-        tipo_cuarto._guardar(archivo)
+        antes = archivo.pop(llave)
+        tipo_cuarto._guardar(archivo, [("eliminar", llave, antes, None)])
         return True
 
     # ------------------------------------------------------------------
@@ -118,22 +133,23 @@ class TipoCuarto(Persistencia):
         print(f"Costo:      {self.costo}")
         print(SEPARADOR)
 
+    @perfilado("TipoCuarto.modificar")
     def modificar(self, **kwargs):
         """Modifica los atributos del tipo de cuarto y actualiza archivo.
         Atributos no modificables: rfc_hotel y tipo (son la llave unica).
         """
-        campos_validos = {"costo"}
-        archivo = self._cargar()
-        if self.id not in archivo:
+        archivo, registro = self._leer_para_modificar(self.id)
+        if registro is None:
             print(f"ERROR: TipoCuarto {self.id} no encontrado.")
             return False
+        campos = {}
         for campo, valor in kwargs.items():
-            if campo not in campos_validos:
+            if campo not in self.CAMPOS_MODIFICABLES:
                 print(f"ERROR: Atributo '{campo}' no es modificable.")
                 continue
             if campo == "costo":
                 valor = self._validar_costo(valor)
             setattr(self, campo, valor)
-            archivo[self.id][campo] = valor
-        self._guardar(archivo)
+            campos[campo] = valor
+        self._parchar(archivo, registro, self.id, campos)
         return True
@@ -0,0 +1,389 @@
+# -*- coding: utf-8 -*-
+"""Grabacion y reproduccion de cargas de trabajo sobre las entidades.
+Created on Mon Oct 19 13:20:31 2026
+
+@author: Efrén Alejandro
+
+La grabadora envuelve temporalmente los metodos de las entidades y escribe
+una linea JSON compacta por llamada (gzip si la ruta termina en .gz). La
+reproduccion ejecuta la traza contra el almacenamiento configurado, a
+maxima velocidad o respetando el ritmo grabado, y reporta throughput y
+distribucion de latencias.
+
+Reservacion.crear genera un uuid nuevo, asi que la grabadora guarda el
+uuid resultante ("r") y la reproduccion lo pasa en los datos de crear;
+las operaciones posteriores sobre esa reservacion lo encuentran igual.
+Las consultas se graban al ejecutarse, con su plan (igualdades, orden,
+limite, proyeccion y metodo de ejecucion), y se rearman al reproducir.
+"""
+import argparse
+import contextlib
+import gzip
+import inspect
+import io
+import json
+import threading
+import time
+import types
+
+import persistencia
+from almacen import BACKENDS, Almacen
+from cliente import Cliente
+from consulta import Consulta
+from hotel import Hotel
+from reservacion import Reservacion
+from tipo_cuarto import TipoCuarto
+
+
+# Operacion -> (clase, metodo, es_de_instancia)
+OPERACIONES = {
+    "Hotel.crear": (Hotel, "crear", False),
+    "Hotel.buscar": (Hotel, "buscar", False),
+    "Hotel.eliminar": (Hotel, "eliminar", False),
+    "Hotel.modificar": (Hotel, "modificar", True),
+    "Hotel.buscar_texto": (Hotel, "buscar_texto", False),
+    "Hotel.consultar": (Hotel, "consultar", False),
+    "Cliente.crear": (Cliente, "crear", False),
+    "Cliente.buscar": (Cliente, "buscar", False),
+    "Cliente.eliminar": (Cliente, "eliminar", False),
+    "Cliente.modificar": (Cliente, "modificar", True),
+    "Cliente.buscar_texto": (Cliente, "buscar_texto", False),
+    "Cliente.consultar": (Cliente, "consultar", False),
+    "TipoCuarto.crear": (TipoCuarto, "crear", False),
+    "TipoCuarto.buscar": (TipoCuarto, "buscar", False),
+    "TipoCuarto.eliminar": (TipoCuarto, "eliminar", False),
+    "TipoCuarto.modificar": (TipoCuarto, "modificar", True),
+    "TipoCuarto.consultar": (TipoCuarto, "consultar", False),
+    "Reservacion.crear": (Reservacion, "crear", False),
+    "Reservacion.buscar": (Reservacion, "buscar", False),
+    "Reservacion.buscar_por_referencia": (
+        Reservacion, "buscar_por_referencia", False
+    ),
+    "Reservacion.cancelar": (Reservacion, "cancelar", True),
+    "Reservacion.consultar": (Reservacion, "consultar", False),
+}
+
+
+def _serializable(valor):
+    """Convierte enums y otros valores no JSON a su forma persistida."""
+    if hasattr(valor, "value"):
+        return valor.value
+    raise TypeError(f"Valor no serializable en traza: {valor!r}")
+
+
+def _abrir(ruta, modo):
+    """Abre la traza en texto, comprimida si la ruta termina en .gz."""
+    if ruta.endswith(".gz"):
+        return gzip.open(ruta, modo + "t", encoding="utf-8")
+    return open(ruta, modo, encoding="utf-8")
+
+
+class Grabadora:
+    """Graba las llamadas a las entidades en un archivo de traza."""
+
+    def __init__(self, ruta, operaciones=None):
+        self.ruta = ruta
+        self.operaciones = list(operaciones or OPERACIONES)
+        self._archivo = None
+        self._inicio = 0.0
+        self._originales = {}
+        self._candado = threading.Lock()
+
+    def __enter__(self):
+        self.iniciar()
+        return self
+
+    def __exit__(self, tipo_exc, exc, traza):
+        self.detener()
+        return False
+
+    def iniciar(self):
+        """Instala las envolturas y abre el archivo de traza."""
+        self._archivo = _abrir(self.ruta, "w")
+        self._inicio = time.perf_counter()
+        for operacion in self.operaciones:
+            cls, metodo, instancia = OPERACIONES[operacion]
+            original = inspect.getattr_static(cls, metodo)
+            # Los metodos heredados de Persistencia se quitan al detener
+            self._originales[operacion] = (
+                original if metodo in vars(cls) else None
+            )
+            setattr(cls, metodo,
+                    self._envolver(operacion, metodo, original, instancia))
+
+    def detener(self):
+        """Restaura los metodos originales y cierra la traza."""
+        for operacion, original in self._originales.items():
+            cls, metodo, _ = OPERACIONES[operacion]
+            if original is None:
+                delattr(cls, metodo)
+            else:
+                setattr(cls, metodo, original)
+        self._originales.clear()
+        if self._archivo is not None:
+            self._archivo.close()
+            self._archivo = None
+
+    def _envolver(self, operacion, metodo, original, instancia):
+        """Crea la envoltura que graba cada llamada a la operacion."""
+        grabadora = self
+        if instancia:
+            def envoltura(obj, *args, **kwargs):
+                entrada = grabadora.entrada(operacion, args, kwargs)
+                entrada["i"] = json.loads(json.dumps(
+                    obj._a_dict(),  # pylint: disable=protected-access
+                    default=_serializable
+                ))
+                return grabadora.llamar(entrada,
+                                        types.MethodType(original, obj),
+                                        args, kwargs)
+            return envoltura
+
+        if metodo == "consultar":
+            def consultar(cls):
+                return ConsultaGrabada(cls, grabadora, operacion)
+            return classmethod(consultar)
+
+        def envoltura_clase(cls, *args, **kwargs):
+            entrada = grabadora.entrada(operacion, args, kwargs)
+            return grabadora.llamar(entrada,
+                                    types.MethodType(original.__func__, cls),
+                                    args, kwargs)
+        return classmethod(envoltura_clase)
+
+    def entrada(self, operacion, args, kwargs):
+        """Captura los argumentos antes de que la operacion los modifique."""
+        entrada = {
+            "t": round(time.perf_counter() - self._inicio, 6),
+            "op": operacion,
+            "a": json.loads(json.dumps(args, default=_serializable)),
+        }
+        if kwargs:
+            entrada["k"] = json.loads(
+                json.dumps(kwargs, default=_serializable)
+            )
+        return entrada
+
+    def llamar(self, entrada, funcion, args, kwargs):
+        """Ejecuta la operacion, mide su duracion y escribe la entrada."""
+        inicio = time.perf_counter()
+        try:
+            resultado = funcion(*args, **kwargs)
+            if getattr(resultado, "uuid", None) is not None:
+                entrada["r"] = resultado.uuid
+            return resultado
+        except Exception:
+            entrada["e"] = 1
+            raise
+        finally:
+            entrada["d"] = round(time.perf_counter() - inicio, 6)
+            linea = json.dumps(entrada, ensure_ascii=False,
+                               separators=(",", ":"))
+            with self._candado:
+                if self._archivo is not None:
+                    self._archivo.write(linea + "\n")
+
+
+class ConsultaGrabada(Consulta):
+    """Consulta que graba su plan y su ejecucion en la traza.
+
+    Consultar solo arma la consulta; la entrada se escribe al ejecutarla
+    (todos, primero, contar, pagina o al iterarla) con las igualdades,
+    el orden, el limite y la proyeccion. Los predicados son funciones y
+    no se pueden grabar: la entrada lleva "x" y la reproduccion la omite.
+    """
+
+    def __init__(self, entidad, grabadora, operacion):
+        super().__init__(entidad)
+        self.grabadora = grabadora
+        self.operacion = operacion
+        self._ejecutando = False
+
+    def plan(self, ejecucion, *args):
+        """Retorna el plan serializable de la consulta."""
+        return {
+            "igualdades": self._igualdades,
+            "orden": self._orden,
+            "descendente": self._descendente,
+            "limite": self._limite,
+            "campos": (list(self._campos) if self._campos is not None
+                       else None),
+            "ejecutar": ejecucion,
+            "args": list(args),
+        }
+
+    def _grabar(self, ejecucion, funcion, *args):
+        """Ejecuta la consulta y graba su plan, salvo llamadas internas."""
+        if self._ejecutando:
+            return funcion(*args)
+        entrada = self.grabadora.entrada(
+            self.operacion, (self.plan(ejecucion, *args),), {}
+        )
+        if self._predicados:
+            entrada["x"] = 1
+        self._ejecutando = True
+        try:
+            return self.grabadora.llamar(entrada, funcion, args, {})
+        finally:
+            self._ejecutando = False
+
+    def __iter__(self):
+        if self._ejecutando:
+            return super().__iter__()
+        return iter(self._grabar("todos", super().todos))
+
+    def todos(self):
+        return self._grabar("todos", super().todos)
+
+    def primero(self):
+        return self._grabar("primero", super().primero)
+
+    def contar(self):
+        return self._grabar("contar", super().contar)
+
+    def pagina(self, tamano, cursor=None):
+        return self._grabar("pagina", super().pagina, tamano, cursor)
+
+
+def leer_traza(ruta):
+    """Itera las entradas de un archivo de traza."""
+    with _abrir(ruta, "r") as f:
+        for linea in f:
+            if linea.strip():
+                yield json.loads(linea)
+
+
+def _percentil(ordenados, fraccion):
+    """Retorna el percentil por rango mas cercano de una lista ordenada."""
+    if not ordenados:
+        return 0.0
+    indice = min(len(ordenados) - 1, int(fraccion * len(ordenados)))
+    return ordenados[indice]
+
+
+def _resumen(latencias):
+    """Resume una lista de latencias en segundos como milisegundos."""
+    ordenadas = sorted(latencias)
+    return {
+        "n": len(ordenadas),
+        "p50_ms": round(_percentil(ordenadas, 0.50) * 1000, 4),
+        "p90_ms": round(_percentil(ordenadas, 0.90) * 1000, 4),
+        "p99_ms": round(_percentil(ordenadas, 0.99) * 1000, 4),
+        "max_ms": round(ordenadas[-1] * 1000, 4) if ordenadas else 0.0,
+    }
+
+
+def _consulta(cls, plan):
+    """Arma la consulta grabada y retorna la funcion que la ejecuta."""
+    consulta = cls.consultar().filtrar(**plan["igualdades"])
+    if plan["orden"] is not None:
+        consulta.ordenar(plan["orden"], plan["descendente"])
+    if plan["limite"] is not None:
+        consulta.limitar(plan["limite"])
+    if plan["campos"] is not None:
+        consulta.proyectar(*plan["campos"])
+    return getattr(consulta, plan["ejecutar"]), plan["args"]
+
+
+def _ejecutar(entrada):
+    """Ejecuta una entrada de la traza.
+    Retorna (latencia, exito); las entidades reportan un fallo
+    retornando False, o None en operaciones que no son busquedas ni
+    consultas.
+    """
+    cls, metodo, instancia = OPERACIONES[entrada["op"]]
+    args = entrada.get("a", [])
+    kwargs = entrada.get("k", {})
+    if metodo == "consultar":
+        funcion, args = _consulta(cls, args[0])
+        inicio = time.perf_counter()
+        funcion(*args)
+        return time.perf_counter() - inicio, True
+    if "r" in entrada and args:
+        # Reproduce el mismo uuid que genero la llamada grabada
+        args = [dict(args[0], uuid=entrada["r"])] + list(args[1:])
+    if instancia:
+        funcion = getattr(cls(entrada["i"]), metodo)
+    else:
+        funcion = getattr(cls, metodo)
+    inicio = time.perf_counter()
+    resultado = funcion(*args, **kwargs)
+    latencia = time.perf_counter() - inicio
+    if resultado is False:
+        return latencia, False
+    return latencia, resultado is not None or metodo.startswith("buscar")
+
+
+def reproducir(ruta, ritmo=False, data_dir=None, silencioso=True,
+               backend=None):
+    """Reproduce una traza y retorna un reporte de rendimiento.
+
+    Con ritmo=True respeta los tiempos grabados; si no, ejecuta a
+    maxima velocidad. data_dir y backend ("json" o "arbol") redirigen
+    temporalmente el almacenamiento; por omision se usan los actuales.
+    Las consultas con predicados no se pueden reproducir y se cuentan
+    en "omitidas".
+    """
+    if data_dir is None and backend is None:
+        almacen = contextlib.nullcontext()
+    else:
+        almacen = Almacen(data_dir or persistencia.directorio_datos(),
+                          backend or persistencia.backend_actual())
+    latencias = {}
+    errores = 0
+    omitidas = 0
+    salida = (contextlib.redirect_stdout(io.StringIO()) if silencioso
+              else contextlib.nullcontext())
+    inicio = time.perf_counter()
+    with almacen, salida:
+        for entrada in leer_traza(ruta):
+            if ritmo:
+                espera = entrada["t"] - (time.perf_counter() - inicio)
+                if espera > 0:
+                    time.sleep(espera)
+            if entrada.get("x"):
+                omitidas += 1
+                continue
+            try:
+                latencia, exito = _ejecutar(entrada)
+            except (KeyError, ValueError, TypeError):
+                errores += 1
+                continue
+            if not exito:
+                errores += 1
+            latencias.setdefault(entrada["op"], []).append(latencia)
+    duracion = time.perf_counter() - inicio
+    total = sum(len(lista) for lista in latencias.values())
+    return {
+        "operaciones": total,
+        "errores": errores,
+        "omitidas": omitidas,
+        "duracion_s": round(duracion, 6),
+        "throughput_ops_s": round(total / duracion, 2) if duracion else 0.0,
+        "total": _resumen(
+            [lat for lista in latencias.values() for lat in lista]
+        ),
+        "por_operacion": {
+            op: _resumen(lista) for op, lista in sorted(latencias.items())
+        },
+    }
+
+
+def main():
+    """Punto de entrada de linea de comandos para reproducir trazas."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("traza", help="Archivo .jsonl o .jsonl.gz")
+    parser.add_argument("--ritmo", action="store_true",
+                        help="Respetar los tiempos grabados")
+    parser.add_argument("--datos", default=None,
+                        help="Directorio de datos contra el cual reproducir")
+    parser.add_argument("--backend", choices=BACKENDS, default=None,
+                        help="Backend de almacenamiento de la reproduccion")
+    args = parser.parse_args()
+    reporte = reproducir(args.traza, args.ritmo, args.datos,
+                         backend=args.backend)
+    print(json.dumps(reporte, indent=4, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
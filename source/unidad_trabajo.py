@@ -0,0 +1,324 @@
+# -*- coding: utf-8 -*-
+"""Unidades de trabajo atomicas sobre varios archivos de entidad.
+Created on Wed Oct 21 11:06:52 2026
+
+@author: Efrén Alejandro
+
+Uso:
+    with UnidadTrabajo():
+        Hotel.crear(datos_hotel)
+        TipoCuarto.crear(datos_tipo)
+        TipoCuarto.crear(otro_tipo)
+
+Dentro del bloque cada archivo se carga una sola vez y los _guardar de
+todas las entidades quedan en memoria; las validaciones (validador) ven
+los registros pendientes. Al salir sin excepcion se confirma: cada
+archivo tocado se escribe una sola vez a un temporal con fsync, se
+escribe el archivo de intencion .transaccion.json (punto de
+confirmacion) y los temporales se renombran sobre los originales. Si el
+proceso muere antes de la intencion no cambia nada; si muere despues,
+recuperar() termina los renombrados. Con una excepcion dentro del bloque
+los cambios se descartan.
+
+Los observadores de guardado (indices, busqueda, cambios) se notifican
+despues de confirmar, una vez por archivo con un cambio por llave.
+Las unidades anidadas se unen a la externa. La unidad activa es del
+contexto, como el almacen: otros hilos y otras tareas asyncio no la ven.
+Solo aplican al backend json (ver persistencia.usar_backend).
+"""
+import json
+import os
+import threading
+import uuid
+
+import cambios as flujo_cambios
+import deltas
+import persistencia
+from almacen import Almacen
+from lector_json import leer_archivo_json
+from instrumentacion import medir
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+
+ARCHIVO_INTENCION = ".transaccion.json"
+ARCHIVO_CANDADO = ".transaccion.lock"
+SUFIJO_TEMPORAL = ".tx"
+
+_CANDADO = threading.Lock()
+
+
+def _sincronizar_directorio(data_dir):
+    """Hace fsync del directorio para persistir los renombrados."""
+    if not hasattr(os, "O_DIRECTORY"):  # pragma: no cover - Windows
+        return
+    descriptor = os.open(data_dir, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(descriptor)
+    finally:
+        os.close(descriptor)
+
+
+def _escribir(ruta, contenido):
+    """Escribe bytes en la ruta y los lleva a disco."""
+    with open(ruta, "wb") as f:
+        f.write(contenido)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def _compactar(cambios):
+    """Deja un cambio por llave con el primer antes y el ultimo despues.
+    Una llave creada y eliminada en la misma unidad desaparece.
+    """
+    por_llave = {}
+    for _, llave, antes, despues in cambios:
+        if llave in por_llave:
+            antes = por_llave[llave][0]
+        por_llave[llave] = (antes, despues)
+    compactos = []
+    for llave, (antes, despues) in por_llave.items():
+        if antes is None and despues is None:
+            continue
+        if antes is None:
+            operacion = "crear"
+        elif despues is None:
+            operacion = "eliminar"
+        else:
+            operacion = "modificar"
+        compactos.append((operacion, llave, antes, despues))
+    return compactos
+
+
+class _Candado:
+    """Candado entre procesos sobre el directorio de datos."""
+
+    def __init__(self, data_dir):
+        self._ruta = os.path.join(data_dir, ARCHIVO_CANDADO)
+        self._archivo = None
+
+    def __enter__(self):
+        _CANDADO.acquire()
+        try:
+            self._archivo = open(  # pylint: disable=consider-using-with
+                self._ruta, "a+b"
+            )
+            if fcntl is not None:
+                fcntl.flock(self._archivo, fcntl.LOCK_EX)
+        except OSError:
+            _CANDADO.release()
+            raise
+        return self
+
+    def __exit__(self, *_):
+        try:
+            if fcntl is not None:
+                fcntl.flock(self._archivo, fcntl.LOCK_UN)
+            self._archivo.close()
+        finally:
+            _CANDADO.release()
+
+
+def _terminar(data_dir):
+    """Aplica la intencion pendiente del directorio, si la hay.
+    La intencion lleva {"id", "archivos": {nombre: temporal}} y, al
+    restaurar un respaldo, "eliminar": [nombre]. Retorna los archivos
+    renombrados o eliminados. Requiere el candado.
+    """
+    ruta_intencion = os.path.join(data_dir, ARCHIVO_INTENCION)
+    try:
+        with open(ruta_intencion, "r", encoding="utf-8") as f:
+            intencion = json.load(f)
+    except FileNotFoundError:
+        return []
+    aplicados = []
+    for nombre, temporal in intencion["archivos"].items():
+        temporal = os.path.join(data_dir, temporal)
+        if os.path.exists(temporal):
+            os.replace(temporal, os.path.join(data_dir, nombre))
+            # Un respaldo restaura el delta junto con su archivo
+            if deltas.ruta_delta(nombre) not in intencion["archivos"]:
+                deltas.descartar(os.path.join(data_dir, nombre))
+            aplicados.append(nombre)
+    for nombre in intencion.get("eliminar", []):
+        ruta = os.path.join(data_dir, nombre)
+        if os.path.exists(ruta):
+            os.remove(ruta)
+            aplicados.append(nombre)
+    _sincronizar_directorio(data_dir)
+    os.remove(ruta_intencion)
+    return aplicados
+
+
+def recuperar(data_dir=None):
+    """Termina una confirmacion interrumpida y borra temporales huerfanos.
+    Retorna los archivos que se completaron.
+    """
+    data_dir = data_dir or persistencia.directorio_datos()
+    if not os.path.isdir(data_dir):
+        return []
+    with flujo_cambios.bloqueado(data_dir):
+        with _Candado(data_dir):
+            aplicados = _terminar(data_dir)
+            for nombre in os.listdir(data_dir):
+                if nombre.endswith(SUFIJO_TEMPORAL):
+                    os.remove(os.path.join(data_dir, nombre))
+        for nombre in aplicados:
+            # pylint: disable=protected-access
+            persistencia._notificar(os.path.join(data_dir, nombre), [])
+    return aplicados
+
+
+class UnidadTrabajo:
+    """Acumula los guardados de varias entidades y los confirma juntos."""
+
+    def __init__(self, data_dir=None):
+        self.data_dir = data_dir
+        self._datos = {}
+        # nombre -> cambios acumulados, None si algun guardado no los dio
+        self._cambios = {}
+        self._externa = None
+        self._almacen = None
+
+    # ------------------------------------------------------------------
+    # Interfaz usada por Persistencia
+    # ------------------------------------------------------------------
+    def cargar(self, nombre_archivo):
+        """Retorna el diccionario de trabajo del archivo."""
+        datos = self._datos.get(nombre_archivo)
+        if datos is None:
+            datos = leer_archivo_json(nombre_archivo, self.data_dir)
+            self._datos[nombre_archivo] = datos
+        return datos
+
+    def registrar(self, nombre_archivo, datos, cambios=()):
+        """Registra un guardado pendiente del archivo."""
+        self._datos[nombre_archivo] = datos
+        acumulados = self._cambios.get(nombre_archivo, [])
+        if acumulados is None or not cambios:
+            self._cambios[nombre_archivo] = None
+        else:
+            acumulados.extend(cambios)
+            self._cambios[nombre_archivo] = acumulados
+
+    def pendiente(self, nombre_archivo):
+        """Indica si el archivo tiene guardados sin confirmar."""
+        return nombre_archivo in self._cambios
+
+    def pendientes(self):
+        """Retorna {archivo: llaves cambiadas} sin confirmar.
+        Las llaves son None si algun guardado no informo sus cambios.
+        """
+        return {
+            nombre: None if cambios is None else {c[1] for c in cambios}
+            for nombre, cambios in self._cambios.items()
+        }
+
+    # ------------------------------------------------------------------
+    # Ciclo de vida
+    # ------------------------------------------------------------------
+    def __enter__(self):
+        externa = persistencia.unidad_activa()
+        if externa is not None:
+            self._externa = externa
+            return externa
+        if persistencia.backend_actual() != "json":
+            raise ValueError("La unidad de trabajo requiere el backend json.")
+        if self.data_dir is not None:
+            self._almacen = Almacen(self.data_dir).__enter__()
+        if persistencia.escritura_diferida() is not None:
+            self._salir_almacen()
+            raise ValueError("La unidad de trabajo no aplica con escritura "
+                             "diferida activa.")
+        self.data_dir = persistencia.directorio_datos()
+        if os.path.exists(os.path.join(self.data_dir, ARCHIVO_INTENCION)):
+            recuperar(self.data_dir)
+        persistencia.fijar_unidad(self)
+        return self
+
+    def __exit__(self, tipo_excepcion, *_):
+        if self._externa is not None:
+            return False
+        persistencia.fijar_unidad(None)
+        try:
+            if tipo_excepcion is None:
+                self.confirmar()
+            else:
+                self.descartar()
+        finally:
+            self._salir_almacen()
+        return False
+
+    def _salir_almacen(self):
+        """Desactiva el almacen de data_dir, si se activo."""
+        if self._almacen is not None:
+            self._almacen.__exit__(None, None, None)
+            self._almacen = None
+
+    def descartar(self):
+        """Descarta todos los cambios pendientes."""
+        self._datos.clear()
+        self._cambios.clear()
+
+    def confirmar(self):
+        """Escribe todos los archivos tocados de forma atomica.
+        Retorna True si se confirmo. Si falla la escritura de los
+        temporales no se modifica ningun archivo de datos. Se escribe y
+        se notifica con el flujo de cambios bloqueado.
+        """
+        with flujo_cambios.bloqueado(self.data_dir):
+            return self._confirmar()
+
+    def _confirmar(self):
+        """Confirma la unidad; ver confirmar."""
+        if not self._cambios:
+            self.descartar()
+            return True
+        os.makedirs(self.data_dir, exist_ok=True)
+        identificador = uuid.uuid4().hex
+        temporales = {}
+        try:
+            with _Candado(self.data_dir):
+                for nombre in self._cambios:
+                    temporal = f"{nombre}.{identificador}{SUFIJO_TEMPORAL}"
+                    temporales[nombre] = temporal
+                    with medir("guardar_json", nombre) as medicion:
+                        contenido = json.dumps(
+                            self._datos[nombre], indent=4, ensure_ascii=False
+                        ).encode("utf-8")
+                        _escribir(os.path.join(self.data_dir, temporal),
+                                  contenido)
+                        medicion.anotar(len(contenido),
+                                        len(self._datos[nombre]))
+                ruta_intencion = os.path.join(self.data_dir,
+                                              ARCHIVO_INTENCION)
+                _escribir(f"{ruta_intencion}.{identificador}", json.dumps({
+                    "id": identificador, "archivos": temporales
+                }).encode("utf-8"))
+                os.replace(f"{ruta_intencion}.{identificador}",
+                           ruta_intencion)
+                _sincronizar_directorio(self.data_dir)
+                _terminar(self.data_dir)
+        except OSError as e:
+            print(f"ERROR: No se pudo confirmar la unidad de trabajo: {e}")
+            if not os.path.exists(os.path.join(self.data_dir,
+                                               ARCHIVO_INTENCION)):
+                for temporal in temporales.values():
+                    ruta = os.path.join(self.data_dir, temporal)
+                    if os.path.exists(ruta):
+                        os.remove(ruta)
+            self.descartar()
+            return False
+        for nombre, cambios in self._cambios.items():
+            if cambios is not None:
+                cambios = _compactar(cambios)
+                if not cambios:
+                    continue
+            # pylint: disable=protected-access
+            persistencia._notificar(os.path.join(self.data_dir, nombre),
+                                    cambios or [])
+        self.descartar()
+        return True
@@ -5,43 +5,51 @@ Created on Sat Feb 21 22:58:45 2026
 @author: Efrén Alejandro
 """
 import persistencia
-from lector_json import leer_archivo_json
+from instrumentacion import medir
 from config import (ARCHIVO_HOTELES, ARCHIVO_CLIENTES,
                     ARCHIVO_TIPOS_CUARTO)
 
 
 def validar_hotel(rfc_hotel):
     """Valida que el hotel exista en el archivo."""
-    archivo = leer_archivo_json(ARCHIVO_HOTELES, persistencia.DATA_DIR)
-    if rfc_hotel not in archivo:
-        raise ValueError(f"No existe hotel con RFC {rfc_hotel}.")
+    with medir("validar_hotel", ARCHIVO_HOTELES) as medicion:
+        archivo = persistencia.cargar_archivo(ARCHIVO_HOTELES)
+        medicion.anotar(registros=1)
+        if rfc_hotel not in archivo:
+            raise ValueError(f"No existe hotel con RFC {rfc_hotel}.")
 
 
 def validar_cliente(rfc_cliente):
     """Valida que el cliente exista en el archivo."""
-    archivo = leer_archivo_json(ARCHIVO_CLIENTES, persistencia.DATA_DIR)
-    if rfc_cliente not in archivo:
-        raise ValueError(f"No existe cliente con RFC {rfc_cliente}.")
+    with medir("validar_cliente", ARCHIVO_CLIENTES) as medicion:
+        archivo = persistencia.cargar_archivo(ARCHIVO_CLIENTES)
+        medicion.anotar(registros=1)
+        if rfc_cliente not in archivo:
+            raise ValueError(f"No existe cliente con RFC {rfc_cliente}.")
 
 
 def validar_tipos_cuarto(rfc_hotel, detalle):
     """Valida que cada tipo de cuarto del detalle exista para el hotel."""
-    archivo = leer_archivo_json(ARCHIVO_TIPOS_CUARTO, persistencia.DATA_DIR)
-    for item in detalle:
-        llave = f"{rfc_hotel}_{item['tipo']}"
-        if llave not in archivo:
-            raise ValueError(
-                f"No existe tipo {item['tipo']} "
-                f"para hotel {rfc_hotel}."
-            )
+    with medir("validar_tipos_cuarto", ARCHIVO_TIPOS_CUARTO) as medicion:
+        archivo = persistencia.cargar_archivo(ARCHIVO_TIPOS_CUARTO)
+        medicion.anotar(registros=len(detalle))
+        for item in detalle:
+            llave = f"{rfc_hotel}_{item['tipo']}"
+            if llave not in archivo:
+                raise ValueError(
+                    f"No existe tipo {item['tipo']} "
+                    f"para hotel {rfc_hotel}."
+                )
 
 
 def aplicar_costos_catalogo(rfc_hotel, detalle):
     """Aplica costos del catalogo oficial al detalle de la reservacion."""
-    archivo = leer_archivo_json(ARCHIVO_TIPOS_CUARTO, persistencia.DATA_DIR)
-    for item in detalle:
-        llave = f"{rfc_hotel}_{item['tipo']}"
-        tc = archivo.get(llave)
-        if tc is not None:
-            item["costo"] = tc["costo"]
+    with medir("aplicar_costos_catalogo", ARCHIVO_TIPOS_CUARTO) as medicion:
+        archivo = persistencia.cargar_archivo(ARCHIVO_TIPOS_CUARTO)
+        medicion.anotar(registros=len(detalle))
+        for item in detalle:
+            llave = f"{rfc_hotel}_{item['tipo']}"
+            tc = archivo.get(llave)
+            if tc is not None:
+                item["costo"] = tc["costo"]
     return detalle
@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Wed Oct 21 19:58:36 2026
+
+@author: Efrén Alejandro
+"""
+# flake8: noqa: E402
+import os
+import sys
+
+sys.path.insert(  # pylint: disable=wrong-import-position
+    0,
+    os.path.abspath(
+        os.path.join(os.path.dirname(__file__), "..", "..", "source")
+    )
+)
+
+import contextvars
+import shutil
+import threading
+import unittest
+
+import arbol_paginado
+import persistencia
+from almacen import Almacen
+from hotel import Hotel
+from unidad_trabajo import UnidadTrabajo
+
+
+TEST_DATA_DIR = os.path.join(os.path.dirname(__file__), "datos")
+DIR_A = os.path.join(TEST_DATA_DIR, "grupo_a")
+DIR_B = os.path.join(TEST_DATA_DIR, "grupo_b")
+
+
+def datos_hotel(nombre, rfc="CAM123456ABC"):
+    """Retorna un diccionario de hotel."""
+    return {
+        "nombre": nombre, "nombre_fiscal": f"{nombre} SA",
+        "rfc": rfc, "direccion": "Calle 1", "estado": "Jalisco",
+        "clasificacion": "5E", "estatus": "activo"
+    }
+
+
+class TestAlmacen(unittest.TestCase):
+    """Pruebas para los almacenes por grupo de hoteles."""
+
+    def setUp(self):
+        persistencia.DATA_DIR = TEST_DATA_DIR
+        for directorio in (DIR_A, DIR_B):
+            shutil.rmtree(directorio, ignore_errors=True)
+            os.makedirs(directorio)
+
+    def tearDown(self):
+        arbol_paginado.cerrar()
+        for directorio in (DIR_A, DIR_B):
+            shutil.rmtree(directorio, ignore_errors=True)
+
+    def test_almacenes_aislados_y_anidados(self):
+        """Verifica rutas, caches y backend por almacen."""
+        grupo_a = Almacen(DIR_A)
+        grupo_b = Almacen(DIR_B, backend="arbol")
+        with grupo_a:
+            Hotel.crear(datos_hotel("Playa"))
+            with grupo_b:
+                Hotel.crear(datos_hotel("Sierra"))
+                self.assertEqual(persistencia.backend_actual(), "arbol")
+            self.assertEqual(persistencia.directorio_datos(),
+                             os.path.abspath(DIR_A))
+            self.assertEqual(Hotel.buscar_texto("playa"), ["CAM123456ABC"])
+        self.assertEqual(persistencia.directorio_datos(), TEST_DATA_DIR)
+        self.assertEqual(grupo_b.ejecutar(Hotel.buscar_texto, "playa"), [])
+        self.assertEqual(
+            grupo_b.ejecutar(Hotel.buscar, "CAM123456ABC")["nombre"], "Sierra"
+        )
+        self.assertTrue(os.path.exists(grupo_a.ruta("hoteles.json")))
+        self.assertTrue(os.path.exists(arbol_paginado.ruta_arbol(
+            grupo_b.ruta("hoteles.json")
+        )))
+        with self.assertRaises(ValueError):
+            Almacen(DIR_A, backend="sqlite")
+
+    def test_hilos_concurrentes(self):
+        """Verifica que cada hilo usa su propio almacen."""
+        errores = []
+
+        def trabajar(directorio, nombre):
+            with Almacen(directorio):
+                for i in range(20):
+                    Hotel.crear(datos_hotel(nombre, f"RFC{i:09d}"))
+                    registro = Hotel.buscar(f"RFC{i:09d}")
+                    if registro is None or registro["nombre"] != nombre:
+                        errores.append((nombre, i))
+
+        hilos = [threading.Thread(target=trabajar, args=(DIR_A, "Playa")),
+                 threading.Thread(target=trabajar, args=(DIR_B, "Sierra"))]
+        for hilo in hilos:
+            hilo.start()
+        for hilo in hilos:
+            hilo.join()
+        self.assertEqual(errores, [])
+        self.assertEqual(
+            Almacen(DIR_A).ejecutar(Hotel.consultar().contar), 20
+        )
+
+    def test_hilo_no_hereda_almacen(self):
+        """Verifica que un hilo necesita copiar el contexto del almacen."""
+        vistos = []
+
+        def ver():
+            vistos.append(persistencia.directorio_datos())
+
+        with Almacen(DIR_A):
+            hilos = [threading.Thread(target=ver),
+                     threading.Thread(target=contextvars.copy_context().run,
+                                      args=(ver,))]
+            for hilo in hilos:
+                hilo.start()
+                hilo.join()
+        self.assertEqual(vistos, [TEST_DATA_DIR, os.path.abspath(DIR_A)])
+
+    def test_unidad_trabajo_no_cambia_global(self):
+        """Verifica que UnidadTrabajo(data_dir) no toca DATA_DIR."""
+        with UnidadTrabajo(DIR_A):
+            self.assertEqual(persistencia.DATA_DIR, TEST_DATA_DIR)
+            Hotel.crear(datos_hotel("Playa"))
+        self.assertTrue(os.path.exists(os.path.join(DIR_A, "hoteles.json")))
+        self.assertEqual(persistencia.directorio_datos(), TEST_DATA_DIR)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Wed Oct 21 15:58:12 2026
+
+@author: Efrén Alejandro
+"""
+# flake8: noqa: E402
+import os
+import sys
+
+sys.path.insert(  # pylint: disable=wrong-import-position
+    0,
+    os.path.abspath(
+        os.path.join(os.path.dirname(__file__), "..", "..", "source")
+    )
+)
+
+import math
+import unittest
+
+import arbol_paginado
+import persistencia
+from arbol_paginado import ArbolPaginado
+from cliente import Cliente
+from unidad_trabajo import UnidadTrabajo
+
+
+TEST_DATA_DIR = os.path.join(os.path.dirname(__file__), "datos")
+ARCHIVO_ARBOL = os.path.join(TEST_DATA_DIR, "prueba.btree")
+ARCHIVO_CLIENTES = arbol_paginado.ruta_arbol(
+    os.path.join(TEST_DATA_DIR, "clientes.json")
+)
+ARCHIVOS = [ARCHIVO_ARBOL, ARCHIVO_CLIENTES]
+
+
+def datos_cliente(rfc="PEJJ800101ABC"):
+    """Retorna un diccionario de cliente."""
+    return {
+        "nombre": "Juan Pérez", "rfc": rfc, "sexo": "M",
+        "compania": "Empresa SA", "forma_pago": "tarjeta",
+        "estatus": "activo"
+    }
+
+
+class TestArbolPaginado(unittest.TestCase):
+    """Pruebas para el archivo paginado con arbol B+."""
+
+    def setUp(self):
+        persistencia.DATA_DIR = TEST_DATA_DIR
+        os.makedirs(TEST_DATA_DIR, exist_ok=True)
+        self._limpiar()
+
+    def tearDown(self):
+        persistencia.usar_backend("json")
+        arbol_paginado.cerrar()
+        self._limpiar()
+
+    @staticmethod
+    def _limpiar():
+        """Elimina archivos de prueba."""
+        for archivo in ARCHIVOS:
+            if os.path.exists(archivo):
+                os.remove(archivo)
+
+    @staticmethod
+    def _llenar(arbol, cantidad):
+        """Inserta cantidad de llaves en orden aleatorio fijo."""
+        for i in range(cantidad):
+            j = (i * 7919) % cantidad
+            arbol.poner(f"K{j:06d}", f"valor {j}".encode("utf-8") * 3,
+                        sincronizar=False)
+        arbol.sincronizar()
+
+    def test_insercion_con_divisiones_y_reapertura(self):
+        """Verifica muchas llaves en varias paginas tras reabrir."""
+        arbol = ArbolPaginado(ARCHIVO_ARBOL, tamano_pagina=512)
+        self._llenar(arbol, 2000)
+        arbol.poner("K000010", b"x" * 1000)
+        arbol.cerrar()
+        arbol = ArbolPaginado(ARCHIVO_ARBOL, capacidad_cache=8)
+        self.assertEqual(len(arbol), 2000)
+        self.assertEqual(arbol.obtener("K001234"), b"valor 1234" * 3)
+        self.assertEqual(arbol.obtener("K000010"), b"x" * 1000)
+        self.assertIsNone(arbol.obtener("K999999"))
+        arbol.cerrar()
+
+    def test_rango_ordenado(self):
+        """Verifica el recorrido por rango semiabierto en orden."""
+        arbol = ArbolPaginado(ARCHIVO_ARBOL, tamano_pagina=512)
+        self._llenar(arbol, 1000)
+        llaves = [llave for llave, _ in arbol.rango("K000100", "K000400")]
+        self.assertEqual(llaves, [f"K{i:06d}" for i in range(100, 400)])
+        self.assertEqual(len(list(arbol.rango())), 1000)
+        self.assertEqual(len(list(arbol.rango(hasta="K000010"))), 10)
+        arbol.cerrar()
+
+    def test_eliminar_reutiliza_paginas(self):
+        """Verifica que las paginas liberadas se reutilizan."""
+        arbol = ArbolPaginado(ARCHIVO_ARBOL, tamano_pagina=512)
+        self._llenar(arbol, 1000)
+        tamano = os.path.getsize(ARCHIVO_ARBOL)
+        for i in range(0, 1000, 2):
+            self.assertTrue(arbol.quitar(f"K{i:06d}", sincronizar=False))
+        for i in range(0, 600):
+            arbol.quitar(f"K{i:06d}", sincronizar=False)
+        self.assertFalse(arbol.quitar("K000000"))
+        self.assertEqual(len(arbol), 200)
+        self.assertEqual([llave for llave, _ in arbol.rango()][:2],
+                         ["K000601", "K000603"])
+        self._llenar(arbol, 1000)
+        self.assertEqual(len(arbol), 1000)
+        self.assertLessEqual(os.path.getsize(ARCHIVO_ARBOL), tamano * 1.2)
+        arbol.cerrar()
+
+    def test_buscar_lee_log_n_paginas(self):
+        """Verifica que buscar sin cache lee pocas paginas."""
+        arbol = ArbolPaginado(ARCHIVO_ARBOL, tamano_pagina=512)
+        self._llenar(arbol, 5000)
+        arbol.cerrar()
+        arbol = ArbolPaginado(ARCHIVO_ARBOL, capacidad_cache=1)
+        antes = arbol.lecturas
+        arbol.obtener("K003333")
+        self.assertLessEqual(arbol.lecturas - antes,
+                             math.ceil(math.log(5000, 4)))
+        arbol.cerrar()
+
+    def test_backend_de_persistencia(self):
+        """Verifica crear, buscar, modificar y eliminar con el arbol."""
+        persistencia.usar_backend("arbol")
+        cliente = Cliente.crear(datos_cliente())
+        Cliente.crear(datos_cliente("OTRO800101ABC"))
+        self.assertIsNone(Cliente.crear(datos_cliente()))
+        self.assertFalse(os.path.exists(
+            os.path.join(TEST_DATA_DIR, "clientes.json")
+        ))
+        self.assertTrue(cliente.modificar(estatus="inactivo"))
+        self.assertEqual(Cliente.buscar("PEJJ800101ABC")["estatus"],
+                         "inactivo")
+        self.assertEqual(
+            Cliente.consultar().filtrar(estatus="inactivo").contar(), 1
+        )
+        self.assertTrue(Cliente.eliminar("OTRO800101ABC"))
+        self.assertIsNone(Cliente.buscar("OTRO800101ABC"))
+        self.assertEqual(Cliente.modificar_donde({"sexo": "M"},
+                                                 compania="Otra SA"), 1)
+        arbol_paginado.cerrar()
+        self.assertEqual(Cliente.buscar("PEJJ800101ABC")["compania"],
+                         "Otra SA")
+        with self.assertRaises(ValueError):
+            persistencia.usar_backend("sqlite")
+        with self.assertRaises(ValueError):
+            with UnidadTrabajo():
+                pass
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Wed Oct 21 19:03:27 2026
+
+@author: Efrén Alejandro
+"""
+# flake8: noqa: E402
+import os
+import sys
+
+sys.path.insert(  # pylint: disable=wrong-import-position
+    0,
+    os.path.abspath(
+        os.path.join(os.path.dirname(__file__), "..", "..", "source")
+    )
+)
+
+import unittest
+
+import arranque
+import reservacion_bridge
+from reservacion import Reservacion
+
+
+class TestArranque(unittest.TestCase):
+    """Pruebas para la medicion de arranque e importaciones perezosas."""
+
+    def test_hotel_no_carga_modulos_perezosos(self):
+        """Verifica que importar hotel no carga los modulos de uso raro."""
+        salida = arranque._correr([  # pylint: disable=protected-access
+            "-c",
+            "import sys, hotel; print(' '.join(sorted(m for m in ("
+            "'reservacion', 'validador', 'tarifas', 'indice_fechas', "
+            "'argparse', 'uuid', 'tempfile', 'arbol_paginado', "
+            "'catalogo_mmap', 'busqueda', 'consulta', 'mmap', "
+            "'unicodedata') if m in sys.modules)))"
+        ]).stdout
+        self.assertEqual(salida.strip(), "")
+
+    def test_perfil_y_medicion(self):
+        """Verifica el perfil de -X importtime y la medicion."""
+        perfil = arranque.perfil_importacion("hotel", limite=50)
+        nombres = [nombre for nombre, _, _ in perfil]
+        self.assertEqual(nombres[0], "hotel")
+        self.assertIn("persistencia", nombres)
+        self.assertGreaterEqual(perfil[0][2], perfil[-1][2])
+        fila = arranque.medir_arranque(["config"], repeticiones=1)[0]
+        self.assertEqual(fila["modulo"], "config")
+        self.assertGreater(fila["ms_total"], 0)
+
+    def test_puente_importa_reservacion_al_usarse(self):
+        """Verifica el atributo perezoso del puente (PEP 562)."""
+        self.assertIs(reservacion_bridge.Reservacion, Reservacion)
+        with self.assertRaises(AttributeError):
+            reservacion_bridge.NoExiste  # pylint: disable=pointless-statement
+
+
+if __name__ == "__main__":
+    unittest.main()
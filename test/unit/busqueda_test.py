@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Tue Oct 20 17:48:30 2026
+
+@author: Efrén Alejandro
+"""
+# flake8: noqa: E402
+import os
+import sys
+
+sys.path.insert(  # pylint: disable=wrong-import-position
+    0,
+    os.path.abspath(
+        os.path.join(os.path.dirname(__file__), "..", "..", "source")
+    )
+)
+
+import unittest
+from unittest.mock import patch
+
+import busqueda
+import persistencia
+from cliente import Cliente
+from hotel import Hotel
+from tipo_cuarto import TipoCuarto
+
+
+TEST_DATA_DIR = os.path.join(os.path.dirname(__file__), "datos")
+ARCHIVO_CLIENTES = os.path.join(TEST_DATA_DIR, "clientes.json")
+ARCHIVO_HOTELES = os.path.join(TEST_DATA_DIR, "hoteles.json")
+
+
+def datos_cliente(nombre, rfc, compania="Empresa SA de CV"):
+    """Retorna un diccionario de cliente con nombre y RFC dados."""
+    return {
+        "nombre": nombre, "rfc": rfc, "sexo": "M", "compania": compania,
+        "forma_pago": "tarjeta", "estatus": "activo"
+    }
+
+
+class TestTokenizar(unittest.TestCase):
+    """Pruebas para plegar y tokenizar."""
+
+    def test_pliega_acentos_y_mayusculas(self):
+        """Verifica que se eliminan acentos y mayusculas."""
+        self.assertEqual(busqueda.tokenizar("José Núñez-PEÑA"),
+                         ["jose", "nunez", "pena"])
+
+    def test_valor_no_texto(self):
+        """Verifica que un valor que no es texto no produce tokens."""
+        self.assertEqual(busqueda.tokenizar(None), [])
+
+
+class TestTrie(unittest.TestCase):
+    """Pruebas para Trie."""
+
+    def test_prefijo_en_orden_y_poda(self):
+        """Verifica el recorrido por prefijo y la poda al quitar."""
+        trie = busqueda.Trie()
+        for token in ("marta", "mar", "mario", "luis"):
+            trie.agregar(token)
+        self.assertEqual(list(trie.con_prefijo("mar")),
+                         ["mar", "mario", "marta"])
+        trie.quitar("mario")
+        trie.quitar("mar")
+        self.assertEqual(list(trie.con_prefijo("ma")), ["marta"])
+        self.assertEqual(list(trie.con_prefijo("x")), [])
+
+
+class TestBuscarTexto(unittest.TestCase):
+    """Pruebas para Persistencia.buscar_texto."""
+
+    def setUp(self):
+        persistencia.DATA_DIR = TEST_DATA_DIR
+        os.makedirs(TEST_DATA_DIR, exist_ok=True)
+        for archivo in (ARCHIVO_CLIENTES, ARCHIVO_HOTELES):
+            if os.path.exists(archivo):
+                os.remove(archivo)
+            busqueda.invalidar(archivo)
+        Cliente.crear(datos_cliente("Juan Pérez", "PEJJ800101ABC"))
+        Cliente.crear(datos_cliente("María Pereda", "PEMM900202XYZ",
+                                    "Hoteles Ñandú SA"))
+        Cliente.crear(datos_cliente("Pedro López", "LOPP700303QWE"))
+
+    def tearDown(self):
+        for archivo in (ARCHIVO_CLIENTES, ARCHIVO_HOTELES):
+            if os.path.exists(archivo):
+                os.remove(archivo)
+
+    def test_busqueda_sin_acentos(self):
+        """Verifica que se encuentra un nombre acentuado sin acentos."""
+        self.assertEqual(Cliente.buscar_texto("perez", prefijo=False),
+                         ["PEJJ800101ABC"])
+        self.assertEqual(Cliente.buscar_texto("nandu"), ["PEMM900202XYZ"])
+
+    def test_busqueda_por_prefijo(self):
+        """Verifica la busqueda mientras se escribe."""
+        self.assertEqual(Cliente.buscar_texto("Pe"),
+                         ["LOPP700303QWE", "PEMM900202XYZ", "PEJJ800101ABC"])
+        self.assertEqual(Cliente.buscar_texto("maria per"),
+                         ["PEMM900202XYZ"])
+        self.assertEqual(Cliente.buscar_texto("Pe", limite=1),
+                         ["LOPP700303QWE"])
+
+    def test_indice_se_mantiene_con_cambios(self):
+        """Verifica crear, modificar y eliminar sin reconstruir."""
+        Cliente.buscar_texto("juan")
+        with patch.object(Cliente, "_iterar") as mock_iterar:
+            Cliente.crear(datos_cliente("Juana Ruiz", "RUJJ850505RTY"))
+            cliente = Cliente(datos_cliente("Juan Pérez", "PEJJ800101ABC"))
+            cliente.modificar(nombre="Juan Gómez")
+            Cliente.eliminar("PEMM900202XYZ")
+            self.assertEqual(Cliente.buscar_texto("juan"),
+                             ["PEJJ800101ABC", "RUJJ850505RTY"])
+            self.assertEqual(Cliente.buscar_texto("gomez"),
+                             ["PEJJ800101ABC"])
+            self.assertEqual(Cliente.buscar_texto("maria"), [])
+            mock_iterar.assert_not_called()
+
+    def test_busqueda_en_hoteles(self):
+        """Verifica la busqueda por direccion de hotel."""
+        Hotel.crear({
+            "nombre": "Hotel Camino Real", "nombre_fiscal": "Camino SA",
+            "rfc": "CAM123456ABC", "direccion": "Av. Revolución 100",
+            "estado": "Jalisco", "clasificacion": "5E", "estatus": "activo"
+        })
+        self.assertEqual(Hotel.buscar_texto("revolucion"), ["CAM123456ABC"])
+
+    def test_entidad_sin_campos_de_texto(self):
+        """Verifica el error en entidades sin campos de texto."""
+        with patch("builtins.print") as mock_print:
+            self.assertEqual(TipoCuarto.buscar_texto("doble"), [])
+            self.assertIn("ERROR", mock_print.call_args[0][0])
+
+
+if __name__ == "__main__":
+    unittest.main()
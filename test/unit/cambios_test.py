@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Tue Oct 20 22:04:19 2026
+
+@author: Efrén Alejandro
+"""
+# flake8: noqa: E402
+import os
+import sys
+
+sys.path.insert(  # pylint: disable=wrong-import-position
+    0,
+    os.path.abspath(
+        os.path.join(os.path.dirname(__file__), "..", "..", "source")
+    )
+)
+
+import unittest
+from unittest.mock import patch
+
+import cambios
+import persistencia
+from cliente import Cliente
+from hotel import Hotel
+
+
+TEST_DATA_DIR = os.path.join(os.path.dirname(__file__), "datos")
+ARCHIVO_CLIENTES = os.path.join(TEST_DATA_DIR, "clientes.json")
+ARCHIVO_HOTELES = os.path.join(TEST_DATA_DIR, "hoteles.json")
+ARCHIVO_CAMBIOS = cambios.ruta_flujo(TEST_DATA_DIR)
+ARCHIVOS = [ARCHIVO_CLIENTES, ARCHIVO_HOTELES, ARCHIVO_CAMBIOS]
+
+
+def datos_cliente(rfc="PEJJ800101ABC"):
+    """Retorna un diccionario de cliente."""
+    return {
+        "nombre": "Juan Pérez", "rfc": rfc, "sexo": "M",
+        "compania": "Empresa SA", "forma_pago": "tarjeta",
+        "estatus": "activo"
+    }
+
+
+class TestCambios(unittest.TestCase):
+    """Pruebas para el flujo de cambios."""
+
+    def setUp(self):
+        persistencia.DATA_DIR = TEST_DATA_DIR
+        os.makedirs(TEST_DATA_DIR, exist_ok=True)
+        for archivo in ARCHIVOS:
+            if os.path.exists(archivo):
+                os.remove(archivo)
+        cambios.habilitar(True)
+
+    def tearDown(self):
+        cambios.habilitar(False)
+        for archivo in ARCHIVOS:
+            if os.path.exists(archivo):
+                os.remove(archivo)
+
+    def test_eventos_de_crear_modificar_eliminar(self):
+        """Verifica eventos ordenados con antes y despues."""
+        cliente = Cliente.crear(datos_cliente())
+        cliente.modificar(estatus="inactivo")
+        Cliente.eliminar(cliente.rfc)
+        eventos = cambios.Lector(TEST_DATA_DIR).leer()
+        self.assertEqual([e["seq"] for e in eventos], [1, 2, 3])
+        self.assertEqual([e["operacion"] for e in eventos],
+                         ["crear", "modificar", "eliminar"])
+        self.assertEqual(eventos[0]["entidad"], "clientes")
+        self.assertIsNone(eventos[0]["antes"])
+        self.assertEqual(eventos[1]["antes"]["estatus"], "activo")
+        self.assertEqual(eventos[1]["despues"]["estatus"], "inactivo")
+        self.assertIsNone(eventos[2]["despues"])
+
+    def test_lector_continua_desde_posicion(self):
+        """Verifica que un lector nuevo lee solo los eventos posteriores."""
+        Cliente.crear(datos_cliente("AAA"))
+        lector = cambios.Lector(TEST_DATA_DIR)
+        self.assertEqual(len(lector.leer()), 1)
+        Cliente.crear(datos_cliente("BBB"))
+        Hotel.crear({
+            "nombre": "Hotel", "nombre_fiscal": "Hotel SA",
+            "rfc": "CAM123456ABC", "direccion": "Calle 1",
+            "estado": "Jalisco", "clasificacion": "5E", "estatus": "activo"
+        })
+        siguiente = cambios.Lector(TEST_DATA_DIR, lector.posicion)
+        eventos = siguiente.leer()
+        self.assertEqual([(e["seq"], e["entidad"]) for e in eventos],
+                         [(2, "clientes"), (3, "hoteles")])
+        self.assertEqual(siguiente.leer(), [])
+
+    def test_linea_incompleta_se_deja_pendiente(self):
+        """Verifica que una linea sin terminar no se consume."""
+        Cliente.crear(datos_cliente())
+        with open(ARCHIVO_CAMBIOS, "ab") as f:
+            f.write(b'{"seq": 2, "entid')
+        lector = cambios.Lector(TEST_DATA_DIR)
+        self.assertEqual(len(lector.leer()), 1)
+        self.assertEqual(lector.posicion,
+                         os.path.getsize(ARCHIVO_CAMBIOS) - 17)
+
+    def test_emitir_descarta_linea_rota(self):
+        """Verifica que tras una adicion interrumpida se sigue emitiendo."""
+        Cliente.crear(datos_cliente("AAA"))
+        with open(ARCHIVO_CAMBIOS, "ab") as f:
+            f.write(b'{"seq": 2, "entid')
+        Cliente.crear(datos_cliente("BBB"))
+        lector = cambios.Lector(TEST_DATA_DIR)
+        eventos = lector.leer()
+        self.assertEqual([(e["seq"], e["llave"]) for e in eventos],
+                         [(1, "AAA"), (2, "BBB")])
+        self.assertEqual(lector.corruptas, 0)
+        self.assertEqual(lector.posicion, os.path.getsize(ARCHIVO_CAMBIOS))
+
+    def test_linea_corrupta_se_reporta_y_salta(self):
+        """Verifica que una linea invalida intermedia no detiene la lectura."""
+        Cliente.crear(datos_cliente("AAA"))
+        with open(ARCHIVO_CAMBIOS, "ab") as f:
+            f.write(b'{"seq": 2, "entid\n')
+        Cliente.crear(datos_cliente("BBB"))
+        lector = cambios.Lector(TEST_DATA_DIR)
+        with patch("builtins.print") as mock_print:
+            eventos = lector.leer()
+        self.assertEqual([e["llave"] for e in eventos], ["AAA", "BBB"])
+        self.assertEqual(lector.corruptas, 1)
+        self.assertIn("ERROR", mock_print.call_args[0][0])
+
+    def test_guardado_masivo_y_reemplazo(self):
+        """Verifica secuencias consecutivas y el evento reemplazar."""
+        Cliente.crear(datos_cliente("AAA"))
+        Cliente.crear(datos_cliente("BBB"))
+        Cliente.modificar_donde({"estatus": "activo"}, estatus="inactivo")
+        cambios.emitir(TEST_DATA_DIR, "clientes", [])
+        eventos = cambios.Lector(TEST_DATA_DIR, desde_seq=2).leer()
+        self.assertEqual([e["seq"] for e in eventos], [3, 4, 5])
+        self.assertEqual(eventos[-1]["operacion"], "reemplazar")
+        self.assertIsNone(eventos[-1]["llave"])
+
+    @unittest.skipIf(cambios.fcntl is None, "Requiere fcntl")
+    def test_escritura_con_flujo_bloqueado(self):
+        """Verifica que el archivo se escribe con el flujo bloqueado."""
+        bloqueado = []
+        original = Cliente._escribir  # pylint: disable=protected-access
+
+        def escribir(instancia, datos):
+            with open(ARCHIVO_CAMBIOS, "ab") as f:
+                try:
+                    cambios.fcntl.flock(
+                        f, cambios.fcntl.LOCK_EX | cambios.fcntl.LOCK_NB
+                    )
+                except BlockingIOError:
+                    bloqueado.append(True)
+                else:
+                    bloqueado.append(False)
+            return original(instancia, datos)
+
+        with patch.object(Cliente, "_escribir", escribir):
+            Cliente.crear(datos_cliente())
+        self.assertEqual(bloqueado, [True])
+        eventos = cambios.Lector(TEST_DATA_DIR).leer()
+        self.assertEqual([e["seq"] for e in eventos], [1])
+
+    def test_deshabilitado_no_escribe(self):
+        """Verifica que sin habilitar no se crea el archivo de cambios."""
+        cambios.habilitar(False)
+        Cliente.crear(datos_cliente())
+        self.assertFalse(os.path.exists(ARCHIVO_CAMBIOS))
+
+
+if __name__ == "__main__":
+    unittest.main()
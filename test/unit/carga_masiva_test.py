@@ -0,0 +1,221 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Tue Oct 20 12:18:44 2026
+
+@author: Efrén Alejandro
+"""
+# flake8: noqa: E402
+import os
+import sys
+
+sys.path.insert(  # pylint: disable=wrong-import-position
+    0,
+    os.path.abspath(
+        os.path.join(os.path.dirname(__file__), "..", "..", "source")
+    )
+)
+
+import json
+import shutil
+import unittest
+from unittest.mock import MagicMock, patch
+
+import carga_masiva
+import persistencia
+from carga_masiva import OpcionesImportacion
+from hotel import Hotel
+
+
+TEST_DATA_DIR = os.path.join(os.path.dirname(__file__), "datos")
+ARCHIVO_HOTELES = os.path.join(TEST_DATA_DIR, "hoteles.json")
+ARCHIVO_TIPOS = os.path.join(TEST_DATA_DIR, "tipos_cuarto.json")
+ARCHIVO_ENTRADA_CSV = os.path.join(TEST_DATA_DIR, "entrada_prueba.csv")
+ARCHIVO_ENTRADA_JSONL = os.path.join(TEST_DATA_DIR, "entrada_prueba.jsonl")
+ARCHIVO_ERRORES = os.path.join(TEST_DATA_DIR, "errores_prueba.jsonl")
+ARCHIVO_SALIDA = os.path.join(TEST_DATA_DIR, "salida_prueba.csv")
+
+ARCHIVOS = [ARCHIVO_HOTELES, ARCHIVO_TIPOS, ARCHIVO_ENTRADA_CSV,
+            ARCHIVO_ENTRADA_JSONL, ARCHIVO_ERRORES, ARCHIVO_SALIDA]
+
+ENCABEZADO = "nombre,nombre_fiscal,rfc,direccion,estado,clasificacion,estatus"
+
+
+def escribir(ruta, lineas):
+    """Escribe las lineas dadas en la ruta."""
+    with open(ruta, "w", encoding="utf-8") as f:
+        f.write("\n".join(lineas) + "\n")
+
+
+def leer_json(ruta):
+    """Lee un archivo JSON."""
+    with open(ruta, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+class TestImportar(unittest.TestCase):
+    """Pruebas para carga_masiva.importar."""
+
+    def setUp(self):
+        persistencia.DATA_DIR = TEST_DATA_DIR
+        os.makedirs(TEST_DATA_DIR, exist_ok=True)
+        for archivo in ARCHIVOS:
+            if os.path.exists(archivo):
+                os.remove(archivo)
+        self.progreso = MagicMock()
+
+    def tearDown(self):
+        for archivo in ARCHIVOS:
+            if os.path.exists(archivo):
+                os.remove(archivo)
+
+    def test_importa_csv_valido(self):
+        """Verifica que se importan todas las filas validas."""
+        escribir(ARCHIVO_ENTRADA_CSV, [ENCABEZADO] + [
+            f"Hotel {i},Fiscal {i},RFC{i:04d},Calle {i},Jalisco,5E,activo"
+            for i in range(25)
+        ])
+        resumen = carga_masiva.importar(
+            "hoteles", ARCHIVO_ENTRADA_CSV,
+            opciones=OpcionesImportacion(lote=10, progreso=self.progreso)
+        )
+        self.assertEqual(resumen, {"confirmados": 25, "rechazados": 0})
+        self.assertEqual(len(leer_json(ARCHIVO_HOTELES)), 25)
+        self.assertEqual(self.progreso.call_count, 3)
+
+    def test_lote_crece_con_el_archivo(self):
+        """Verifica que cada guardado al menos duplica el archivo."""
+        escribir(ARCHIVO_ENTRADA_CSV, [ENCABEZADO] + [
+            f"Hotel {i},Fiscal {i},RFC{i:04d},Calle {i},Jalisco,5E,activo"
+            for i in range(100)
+        ])
+        with patch.object(Hotel, "_guardar", autospec=True,
+                          side_effect=Hotel._guardar) as mock_guardar:
+            resumen = carga_masiva.importar(
+                "hoteles", ARCHIVO_ENTRADA_CSV,
+                opciones=OpcionesImportacion(lote=10, progreso=self.progreso)
+            )
+        self.assertEqual(resumen, {"confirmados": 100, "rechazados": 0})
+        self.assertEqual(
+            [len(llamada.args[2]) for llamada in mock_guardar.call_args_list],
+            [10, 10, 20, 40, 20]
+        )
+        self.assertEqual(len(leer_json(ARCHIVO_HOTELES)), 100)
+
+    def test_rechaza_invalidos_y_duplicados(self):
+        """Verifica que filas invalidas y duplicadas van a errores."""
+        Hotel.crear({
+            "nombre": "Existente", "nombre_fiscal": "Existente SA",
+            "rfc": "RFC0000", "direccion": "Calle", "estado": "Jalisco",
+            "clasificacion": "5E", "estatus": "activo"
+        })
+        escribir(ARCHIVO_ENTRADA_CSV, [
+            ENCABEZADO,
+            "Hotel A,Fiscal,RFC0000,Calle,Jalisco,5E,activo",
+            "Hotel B,Fiscal,RFC0001,Calle,Jalisco,9E,activo",
+            "Hotel C,Fiscal,RFC0002,Calle,Jalisco,GT,activo",
+            "Hotel D,Fiscal,RFC0002,Calle,Jalisco,GT,activo",
+        ])
+        resumen = carga_masiva.importar(
+            "hoteles", ARCHIVO_ENTRADA_CSV,
+            opciones=OpcionesImportacion(ruta_errores=ARCHIVO_ERRORES,
+                                         progreso=self.progreso)
+        )
+        self.assertEqual(resumen, {"confirmados": 1, "rechazados": 3})
+        with open(ARCHIVO_ERRORES, "r", encoding="utf-8") as f:
+            errores = [json.loads(linea) for linea in f]
+        self.assertEqual([e["linea"] for e in errores], [2, 3, 5])
+        self.assertIn("duplicada", errores[0]["error"])
+        self.assertIn("ValueError", errores[1]["error"])
+
+    def test_convierte_costo_de_csv(self):
+        """Verifica que el costo del CSV se guarda como numero."""
+        escribir(ARCHIVO_ENTRADA_CSV, [
+            "rfc_hotel,tipo,costo", "CAM123456ABC,DOBLE,1500.50"
+        ])
+        carga_masiva.importar(
+            "tipos_cuarto", ARCHIVO_ENTRADA_CSV,
+            opciones=OpcionesImportacion(progreso=self.progreso)
+        )
+        datos = leer_json(ARCHIVO_TIPOS)
+        self.assertEqual(datos["CAM123456ABC_DOBLE"]["costo"], 1500.50)
+
+    def test_importa_jsonl_con_linea_corrupta(self):
+        """Verifica que una linea JSON invalida se rechaza y continua."""
+        escribir(ARCHIVO_ENTRADA_JSONL, [
+            json.dumps({"rfc_hotel": "CAM123456ABC", "tipo": "SUITE",
+                        "costo": 3000}),
+            "{no es json",
+            json.dumps({"rfc_hotel": "CAM123456ABC", "tipo": "DOBLE",
+                        "costo": -1}),
+        ])
+        resumen = carga_masiva.importar(
+            "tipos_cuarto", ARCHIVO_ENTRADA_JSONL,
+            opciones=OpcionesImportacion(progreso=self.progreso)
+        )
+        self.assertEqual(resumen, {"confirmados": 1, "rechazados": 2})
+
+    def test_entidad_desconocida(self):
+        """Verifica que una entidad desconocida lanza ValueError."""
+        with self.assertRaises(ValueError):
+            carga_masiva.importar("otros", ARCHIVO_ENTRADA_CSV)
+
+
+class TestExportar(unittest.TestCase):
+    """Pruebas para carga_masiva.exportar."""
+
+    def setUp(self):
+        persistencia.DATA_DIR = TEST_DATA_DIR
+        os.makedirs(TEST_DATA_DIR, exist_ok=True)
+        for archivo in ARCHIVOS:
+            if os.path.exists(archivo):
+                os.remove(archivo)
+
+    def tearDown(self):
+        for archivo in ARCHIVOS:
+            if os.path.exists(archivo):
+                os.remove(archivo)
+
+    def test_exportar_e_importar_csv(self):
+        """Verifica que exportar y reimportar conserva los registros."""
+        Hotel.crear({
+            "nombre": "Hotel Río", "nombre_fiscal": "Río SA",
+            "rfc": "RIO123", "direccion": "Calle, 1", "estado": "Jalisco",
+            "clasificacion": "4E", "estatus": "activo"
+        })
+        original = leer_json(ARCHIVO_HOTELES)
+        total = carga_masiva.exportar("hoteles", ARCHIVO_SALIDA)
+        self.assertEqual(total, 1)
+        os.remove(ARCHIVO_HOTELES)
+        carga_masiva.importar(
+            "hoteles", ARCHIVO_SALIDA,
+            opciones=OpcionesImportacion(progreso=MagicMock())
+        )
+        self.assertEqual(leer_json(ARCHIVO_HOTELES), original)
+
+    def test_main_usa_almacen_de_datos(self):
+        """Verifica que --datos no cambia persistencia.DATA_DIR."""
+        otro = os.path.join(TEST_DATA_DIR, "otro_almacen")
+        escribir(ARCHIVO_ENTRADA_CSV, [
+            ENCABEZADO, "Hotel A,Fiscal,RFC0000,Calle,Jalisco,5E,activo"
+        ])
+        argv = ["carga_masiva.py", "importar", "hoteles",
+                ARCHIVO_ENTRADA_CSV, "--datos", otro]
+        try:
+            with patch("sys.argv", argv), patch("builtins.print"), \
+                    patch("sys.stderr"):
+                carga_masiva.main()
+            self.assertIn("RFC0000",
+                          leer_json(os.path.join(otro, "hoteles.json")))
+        finally:
+            shutil.rmtree(otro, ignore_errors=True)
+        self.assertEqual(persistencia.directorio_datos(), TEST_DATA_DIR)
+        self.assertFalse(os.path.exists(ARCHIVO_HOTELES))
+
+    def test_reservaciones_csv_no_soportado(self):
+        """Verifica que reservaciones solo se exporta como jsonl."""
+        with self.assertRaises(ValueError):
+            carga_masiva.exportar("reservaciones", ARCHIVO_SALIDA)
+
+
+if __name__ == "__main__":
+    unittest.main()
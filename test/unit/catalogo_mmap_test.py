@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Tue Oct 20 20:48:13 2026
+
+@author: Efrén Alejandro
+"""
+# flake8: noqa: E402
+import os
+import sys
+
+sys.path.insert(  # pylint: disable=wrong-import-position
+    0,
+    os.path.abspath(
+        os.path.join(os.path.dirname(__file__), "..", "..", "source")
+    )
+)
+
+import unittest
+from unittest.mock import patch
+
+import catalogo_mmap
+import persistencia
+from cliente import Cliente
+from tipo_cuarto import TipoCuarto
+
+
+TEST_DATA_DIR = os.path.join(os.path.dirname(__file__), "datos")
+ARCHIVO_CLIENTES = os.path.join(TEST_DATA_DIR, "clientes.json")
+ARCHIVO_TIPOS = os.path.join(TEST_DATA_DIR, "tipos_cuarto.json")
+ARCHIVOS = [
+    ARCHIVO_CLIENTES, ARCHIVO_TIPOS,
+    catalogo_mmap.ruta_snapshot(ARCHIVO_CLIENTES),
+    catalogo_mmap.ruta_snapshot(ARCHIVO_TIPOS),
+]
+
+
+def datos_cliente(i):
+    """Retorna los datos del cliente i."""
+    return {
+        "nombre": f"Cliente Ñ{i}", "rfc": f"RFC{i:03d}", "sexo": "F",
+        "compania": "Empresa", "forma_pago": "tarjeta", "estatus": "activo"
+    }
+
+
+class TestSnapshot(unittest.TestCase):
+    """Pruebas para catalogo_mmap."""
+
+    def setUp(self):
+        persistencia.DATA_DIR = TEST_DATA_DIR
+        os.makedirs(TEST_DATA_DIR, exist_ok=True)
+        catalogo_mmap.cerrar()
+        for archivo in ARCHIVOS:
+            if os.path.exists(archivo):
+                os.remove(archivo)
+        for i in range(0, 50, 2):
+            Cliente.crear(datos_cliente(i))
+        catalogo_mmap.escribir_snapshot("clientes.json")
+
+    def tearDown(self):
+        catalogo_mmap.cerrar()
+        for archivo in ARCHIVOS:
+            if os.path.exists(archivo):
+                os.remove(archivo)
+
+    def test_busqueda_binaria(self):
+        """Verifica llaves existentes, inexistentes y el orden."""
+        snap = catalogo_mmap.snapshot("clientes.json")
+        self.assertEqual(len(snap), 25)
+        self.assertEqual(snap.buscar("RFC024"), datos_cliente(24))
+        self.assertIsNone(snap.buscar("RFC023"))
+        self.assertIsNone(snap.buscar("RFC999999999"))
+        self.assertNotIn("RFC", snap)
+        llaves = list(snap.llaves())
+        self.assertEqual(llaves, sorted(llaves))
+
+    def test_buscar_usa_snapshot_sin_cargar_json(self):
+        """Verifica que buscar no parsea el JSON con snapshot vigente."""
+        with patch.object(Cliente, "_cargar") as mock_cargar:
+            self.assertEqual(Cliente.buscar("RFC010"), datos_cliente(10))
+            self.assertIsNone(Cliente.buscar("RFC011"))
+            mock_cargar.assert_not_called()
+
+    def test_snapshot_obsoleto_se_ignora(self):
+        """Verifica que tras modificar el JSON se lee el JSON."""
+        Cliente.crear(datos_cliente(11))
+        self.assertIsNone(catalogo_mmap.snapshot("clientes.json"))
+        self.assertEqual(Cliente.buscar("RFC011"), datos_cliente(11))
+        catalogo_mmap.escribir_snapshot("clientes.json")
+        snap = catalogo_mmap.snapshot("clientes.json")
+        self.assertEqual(snap.buscar("RFC011"), datos_cliente(11))
+
+    def test_sin_snapshot_usa_json(self):
+        """Verifica el respaldo al JSON si no hay snapshot."""
+        TipoCuarto.crear({
+            "rfc_hotel": "CAM123456ABC", "tipo": "DOBLE", "costo": 1500.00
+        })
+        self.assertIsNone(catalogo_mmap.snapshot("tipos_cuarto.json"))
+        self.assertEqual(
+            TipoCuarto.buscar("CAM123456ABC", "DOBLE")["costo"], 1500.00
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 15:12:40 2026
+
+@author: Efrén Alejandro
+"""
+# flake8: noqa: E402
+import os
+import sys
+
+sys.path.insert(  # pylint: disable=wrong-import-position
+    0,
+    os.path.abspath(
+        os.path.join(os.path.dirname(__file__), "..", "..", "source")
+    )
+)
+
+import unittest
+
+from catalogos import (
+    ClasificacionHotel,
+    TipoHabitacion,
+    parsear_clasificacion,
+    parsear_tipo_habitacion,
+    codigo_clasificacion,
+    codigo_tipo_habitacion,
+    clasificacion_desde_codigo,
+    tipo_habitacion_desde_codigo
+)
+
+
+class TestParsearClasificacion(unittest.TestCase):
+    """Pruebas para parsear_clasificacion."""
+
+    def test_parsea_todos_los_valores(self):
+        """Verifica que coincide con el constructor del enum."""
+        for miembro in ClasificacionHotel:
+            self.assertIs(
+                parsear_clasificacion(miembro.value),
+                ClasificacionHotel(miembro.value)
+            )
+
+    def test_acepta_miembro(self):
+        """Verifica que un miembro se regresa sin cambios."""
+        self.assertIs(
+            parsear_clasificacion(ClasificacionHotel.GRAN_TURISMO),
+            ClasificacionHotel.GRAN_TURISMO
+        )
+
+    def test_valor_invalido_lanza_value_error(self):
+        """Verifica que un valor invalido lanza ValueError."""
+        with self.assertRaises(ValueError):
+            parsear_clasificacion("9E")
+
+    def test_valor_no_hashable_lanza_value_error(self):
+        """Verifica que un valor no hashable lanza ValueError."""
+        with self.assertRaises(ValueError):
+            parsear_clasificacion(["5E"])
+
+
+class TestParsearTipoHabitacion(unittest.TestCase):
+    """Pruebas para parsear_tipo_habitacion."""
+
+    def test_parsea_todos_los_valores(self):
+        """Verifica que coincide con el constructor del enum."""
+        for miembro in TipoHabitacion:
+            self.assertIs(
+                parsear_tipo_habitacion(miembro.value),
+                TipoHabitacion(miembro.value)
+            )
+
+    def test_valor_invalido_lanza_value_error(self):
+        """Verifica que un valor invalido lanza ValueError."""
+        with self.assertRaises(ValueError):
+            parsear_tipo_habitacion("CABANA")
+
+
+class TestCodigos(unittest.TestCase):
+    """Pruebas para los codigos enteros compactos."""
+
+    def test_ida_y_vuelta_clasificacion(self):
+        """Verifica que codigo y miembro son inversos."""
+        for miembro in ClasificacionHotel:
+            codigo = codigo_clasificacion(miembro)
+            self.assertLess(codigo, 256)
+            self.assertIs(clasificacion_desde_codigo(codigo), miembro)
+
+    def test_ida_y_vuelta_tipo(self):
+        """Verifica que codigo y miembro son inversos."""
+        for miembro in TipoHabitacion:
+            codigo = codigo_tipo_habitacion(miembro.value)
+            self.assertLess(codigo, 256)
+            self.assertIs(tipo_habitacion_desde_codigo(codigo), miembro)
+
+    def test_codigos_estables(self):
+        """Verifica que los codigos siguen el orden de declaracion."""
+        self.assertEqual(codigo_clasificacion("SC"), 0)
+        self.assertEqual(codigo_tipo_habitacion("SENCILLA"), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
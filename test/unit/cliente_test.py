@@ -317,5 +317,39 @@ class TestClienteArchivocorrupto(unittest.TestCase):
             )
 
 
+
+class TestClienteOperacionesMasivas(unittest.TestCase):
+    """Pruebas para Cliente.modificar_donde y Cliente.eliminar_donde."""
+
+    def setUp(self):
+        persistencia.DATA_DIR = TEST_DATA_DIR
+        os.makedirs(TEST_DATA_DIR, exist_ok=True)
+        if os.path.exists(ARCHIVO_TEST):
+            os.remove(ARCHIVO_TEST)
+        for i in range(4):
+            datos = datos_cliente_valido()
+            datos["rfc"] = f"CLI{i:03d}"
+            datos["compania"] = "Empresa SA" if i % 2 else "Otra SA"
+            Cliente.crear(datos)
+
+    def tearDown(self):
+        if os.path.exists(ARCHIVO_TEST):
+            os.remove(ARCHIVO_TEST)
+
+    def test_modificar_donde_estatus(self):
+        """Verifica que se desactivan los clientes de una compania."""
+        total = Cliente.modificar_donde({"compania": "Empresa SA"},
+                                        estatus="inactivo")
+        self.assertEqual(total, 2)
+        self.assertEqual(Cliente.buscar("CLI001")["estatus"], "inactivo")
+        self.assertEqual(Cliente.buscar("CLI000")["estatus"], "activo")
+
+    def test_eliminar_donde(self):
+        """Verifica que se eliminan los clientes que coinciden."""
+        total = Cliente.eliminar_donde({"compania": "Otra SA"})
+        self.assertEqual(total, 2)
+        with open(ARCHIVO_TEST, "r", encoding="utf-8") as f:
+            self.assertEqual(sorted(json.load(f)), ["CLI001", "CLI003"])
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,181 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Tue Oct 20 16:21:09 2026
+
+@author: Efrén Alejandro
+"""
+# flake8: noqa: E402
+import os
+import sys
+
+sys.path.insert(  # pylint: disable=wrong-import-position
+    0,
+    os.path.abspath(
+        os.path.join(os.path.dirname(__file__), "..", "..", "source")
+    )
+)
+
+import json
+import unittest
+
+import consulta
+import persistencia
+from cliente import Cliente
+from lector_json import iterar_registros
+
+
+TEST_DATA_DIR = os.path.join(os.path.dirname(__file__), "datos")
+ARCHIVO_CLIENTES = os.path.join(TEST_DATA_DIR, "clientes.json")
+
+
+def escribir_clientes(total):
+    """Escribe un archivo de clientes de prueba."""
+    datos = {
+        f"RFC{i:04d}": {
+            "nombre": f"Cliente {i:04d}", "rfc": f"RFC{i:04d}",
+            "sexo": "F" if i % 2 else "M",
+            "compania": f"Compania {i % 3}", "forma_pago": "efectivo",
+            "estatus": "activo" if i % 5 else "inactivo"
+        }
+        for i in range(total)
+    }
+    with open(ARCHIVO_CLIENTES, "w", encoding="utf-8") as f:
+        json.dump(datos, f, indent=4, ensure_ascii=False)
+    return datos
+
+
+class TestIterarRegistros(unittest.TestCase):
+    """Pruebas para lector_json.iterar_registros."""
+
+    def setUp(self):
+        os.makedirs(TEST_DATA_DIR, exist_ok=True)
+
+    def tearDown(self):
+        if os.path.exists(ARCHIVO_CLIENTES):
+            os.remove(ARCHIVO_CLIENTES)
+
+    def test_igual_a_json_load_con_bloques_pequenos(self):
+        """Verifica el mismo resultado que json.load con bloques cortos."""
+        datos = escribir_clientes(40)
+        datos["RFC0001"]["saldo"] = [1.5e3, -2, None, True, "ñ\\\"x"]
+        with open(ARCHIVO_CLIENTES, "w", encoding="utf-8") as f:
+            json.dump(datos, f, ensure_ascii=False)
+        leidos = dict(iterar_registros("clientes.json", TEST_DATA_DIR,
+                                       tamano_bloque=7))
+        self.assertEqual(leidos, datos)
+
+    def test_archivo_inexistente_no_itera(self):
+        """Verifica que un archivo inexistente no produce registros."""
+        self.assertEqual(
+            list(iterar_registros("clientes.json", TEST_DATA_DIR)), []
+        )
+
+    def test_archivo_corrupto_lanza_error(self):
+        """Verifica que un archivo truncado lanza JSONDecodeError."""
+        with open(ARCHIVO_CLIENTES, "w", encoding="utf-8") as f:
+            f.write('{"a": {"b": 1}, "c": ')
+        with self.assertRaises(json.JSONDecodeError):
+            list(iterar_registros("clientes.json", TEST_DATA_DIR))
+
+
+class TestConsulta(unittest.TestCase):
+    """Pruebas para Persistencia.consultar."""
+
+    def setUp(self):
+        persistencia.DATA_DIR = TEST_DATA_DIR
+        os.makedirs(TEST_DATA_DIR, exist_ok=True)
+        consulta.invalidar(ARCHIVO_CLIENTES)
+        self.datos = escribir_clientes(30)
+
+    def tearDown(self):
+        if os.path.exists(ARCHIVO_CLIENTES):
+            os.remove(ARCHIVO_CLIENTES)
+
+    def test_filtrar_por_campo_indexado(self):
+        """Verifica el filtro por igualdad en campos indexados."""
+        registros = Cliente.consultar().filtrar(
+            compania="Compania 1", estatus="activo"
+        ).todos()
+        esperados = [
+            r for r in self.datos.values()
+            if r["compania"] == "Compania 1" and r["estatus"] == "activo"
+        ]
+        self.assertEqual(registros, esperados)
+
+    def test_filtrar_con_predicado_y_campo_no_indexado(self):
+        """Verifica el filtro con predicado y campo sin indice."""
+        total = Cliente.consultar().filtrar(
+            lambda r: r["nombre"].endswith("7"), sexo="F"
+        ).contar()
+        self.assertEqual(total, 3)
+
+    def test_ordenar_limitar_y_proyectar(self):
+        """Verifica orden descendente, limite y proyeccion."""
+        registros = (Cliente.consultar().ordenar("nombre", descendente=True)
+                     .limitar(2).proyectar("rfc").todos())
+        self.assertEqual(registros, [{"rfc": "RFC0029"}, {"rfc": "RFC0028"}])
+
+    def test_ordenar_con_nulos_al_final(self):
+        """Verifica que None o un campo ausente no rompen el orden."""
+        self.datos["RFC0003"]["compania"] = None
+        del self.datos["RFC0005"]["compania"]
+        with open(ARCHIVO_CLIENTES, "w", encoding="utf-8") as f:
+            json.dump(self.datos, f, ensure_ascii=False)
+        consulta.invalidar(ARCHIVO_CLIENTES)
+        for descendente in (False, True):
+            registros = (Cliente.consultar()
+                         .ordenar("compania", descendente=descendente)
+                         .proyectar("rfc").todos())
+            self.assertEqual(len(registros), 30)
+            self.assertEqual(
+                sorted(r["rfc"] for r in registros[-2:]),
+                ["RFC0003", "RFC0005"]
+            )
+        registros, cursor = (Cliente.consultar().ordenar("compania")
+                             .pagina(29))
+        siguiente, _ = (Cliente.consultar().ordenar("compania")
+                        .pagina(5, cursor))
+        self.assertEqual(len(registros) + len(siguiente), 30)
+
+    def test_primero_sin_coincidencias(self):
+        """Verifica que primero retorna None sin coincidencias."""
+        self.assertIsNone(
+            Cliente.consultar().filtrar(compania="Otra").primero()
+        )
+
+    def test_paginacion_por_cursor(self):
+        """Verifica que las paginas recorren todos los registros en orden."""
+        vistos = []
+        cursor = None
+        paginas = 0
+        while True:
+            registros, cursor = (Cliente.consultar()
+                                 .filtrar(estatus="activo")
+                                 .ordenar("compania")
+                                 .pagina(5, cursor))
+            vistos.extend(registros)
+            paginas += 1
+            if cursor is None:
+                break
+        esperados = sorted(
+            (r for r in self.datos.values() if r["estatus"] == "activo"),
+            key=lambda r: (r["compania"], r["rfc"])
+        )
+        self.assertEqual(vistos, esperados)
+        self.assertEqual(paginas, 5)
+
+    def test_cursor_invalido(self):
+        """Verifica que un cursor invalido lanza ValueError."""
+        with self.assertRaises(ValueError):
+            Cliente.consultar().pagina(5, "no-es-cursor")
+
+    def test_indice_se_actualiza_al_guardar(self):
+        """Verifica que el indice refleja cambios guardados."""
+        Cliente.consultar().filtrar(compania="Compania 0").contar()
+        Cliente.modificar_donde({"rfc": "RFC0001"}, compania="Compania 0")
+        total = Cliente.consultar().filtrar(compania="Compania 0").contar()
+        self.assertEqual(total, 11)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,182 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Tue Oct 20 10:02:11 2026
+
+@author: Efrén Alejandro
+"""
+# flake8: noqa: E402
+import os
+import sys
+
+sys.path.insert(  # pylint: disable=wrong-import-position
+    0,
+    os.path.abspath(
+        os.path.join(os.path.dirname(__file__), "..", "..", "source")
+    )
+)
+
+import json
+import time
+import unittest
+from unittest.mock import patch
+
+import cotizador
+import persistencia
+from tarifas import MotorTarifas, ReglasTarifa, configurar_motor
+from tipo_cuarto import TipoCuarto
+from unidad_trabajo import UnidadTrabajo
+
+
+TEST_DATA_DIR = os.path.join(os.path.dirname(__file__), "datos")
+ARCHIVO_TIPOS = os.path.join(TEST_DATA_DIR, "tipos_cuarto.json")
+ARCHIVO_RESERVACIONES = os.path.join(TEST_DATA_DIR, "reservaciones.json")
+
+
+def solicitud():
+    """Retorna una solicitud de cotizacion valida."""
+    return {
+        "rfc_hotel": "CAM123456ABC",
+        "fecha": "2026-03-01",
+        "noches": 3,
+        "detalle": [
+            {"tipo": "DOBLE", "cantidad": 2},
+            {"tipo": "SUITE", "cantidad": 1}
+        ]
+    }
+
+
+class TestCacheLRU(unittest.TestCase):
+    """Pruebas para CacheLRU."""
+
+    def test_descarta_menos_usado(self):
+        """Verifica que se descarta la entrada menos usada."""
+        cache = cotizador.CacheLRU(capacidad=2)
+        cache.guardar("a", 1)
+        cache.guardar("b", 2)
+        cache.obtener("a")
+        cache.guardar("c", 3)
+        self.assertIsNone(cache.obtener("b"))
+        self.assertEqual(cache.obtener("a"), 1)
+        self.assertEqual(len(cache), 2)
+
+    def test_expira_por_ttl(self):
+        """Verifica que una entrada expira al vencer su tiempo de vida."""
+        cache = cotizador.CacheLRU(ttl=10.0)
+        cache.guardar("a", 1)
+        with patch("cotizador.time.monotonic",
+                   return_value=time.monotonic() + 11.0):
+            self.assertIsNone(cache.obtener("a"))
+
+
+class TestCotizar(unittest.TestCase):
+    """Pruebas para cotizar."""
+
+    def setUp(self):
+        persistencia.DATA_DIR = TEST_DATA_DIR
+        os.makedirs(TEST_DATA_DIR, exist_ok=True)
+        for archivo in (ARCHIVO_TIPOS, ARCHIVO_RESERVACIONES):
+            if os.path.exists(archivo):
+                os.remove(archivo)
+        cotizador.configurar_cache()
+        cotizador.invalidar()
+        TipoCuarto.crear({
+            "rfc_hotel": "CAM123456ABC", "tipo": "DOBLE", "costo": 1500.00
+        })
+        self.suite = TipoCuarto.crear({
+            "rfc_hotel": "CAM123456ABC", "tipo": "SUITE", "costo": 3000.00
+        })
+
+    def tearDown(self):
+        configurar_motor(None)
+        for archivo in (ARCHIVO_TIPOS, ARCHIVO_RESERVACIONES):
+            if os.path.exists(archivo):
+                os.remove(archivo)
+
+    def test_importe_igual_a_reservacion(self):
+        """Verifica el mismo calculo que Reservacion.crear."""
+        cotizacion = cotizador.cotizar(solicitud())
+        self.assertEqual(cotizacion["importe"], 18000.00)
+        self.assertEqual(cotizacion["detalle"][0]["costo"], 1500.00)
+
+    def test_no_escribe_archivos(self):
+        """Verifica que cotizar no persiste reservaciones."""
+        cotizador.cotizar(solicitud())
+        self.assertFalse(os.path.exists(ARCHIVO_RESERVACIONES))
+
+    def test_segunda_cotizacion_no_lee_archivo(self):
+        """Verifica que una cotizacion repetida no relee el catalogo."""
+        cotizador.cotizar(solicitud())
+        with patch("persistencia.cargar_archivo") as mock_leer:
+            cotizador.cotizar(solicitud())
+            mock_leer.assert_not_called()
+        self.assertEqual(cotizador.cache_actual().aciertos, 1)
+
+    def test_llave_ignora_orden_del_detalle(self):
+        """Verifica que el orden del detalle no cambia la llave."""
+        cotizador.cotizar(solicitud())
+        datos = solicitud()
+        datos["detalle"].reverse()
+        cotizacion = cotizador.cotizar(datos)
+        self.assertEqual(cotizador.cache_actual().aciertos, 1)
+        self.assertEqual(cotizacion["detalle"][0]["tipo"], "SUITE")
+
+    def test_modificar_costo_invalida_cache(self):
+        """Verifica que TipoCuarto.modificar invalida las cotizaciones."""
+        cotizador.cotizar(solicitud())
+        self.suite.modificar(costo=4000.00)
+        cotizacion = cotizador.cotizar(solicitud())
+        self.assertEqual(cotizacion["importe"], 21000.00)
+
+    def test_guardado_externo_invalida_cache(self):
+        """Verifica que un cambio de otro proceso al catalogo se ve."""
+        cotizador.cotizar(solicitud())
+        with open(ARCHIVO_TIPOS, "r", encoding="utf-8") as f:
+            tipos = json.load(f)
+        tipos["CAM123456ABC_SUITE"]["costo"] = 40000.00
+        with open(ARCHIVO_TIPOS, "w", encoding="utf-8") as f:
+            json.dump(tipos, f, indent=4)
+        cotizacion = cotizador.cotizar(solicitud())
+        self.assertEqual(cotizacion["importe"], 129000.00)
+
+    def test_motor_y_ocupacion_cambian_llave(self):
+        """Verifica que cambiar el motor o su ocupacion no usa la cache."""
+        sin_motor = cotizador.cotizar(solicitud())["importe"]
+        motor = MotorTarifas(ReglasTarifa(
+            niveles_ocupacion=[(0.5, 2.0)], dias_fin_de_semana=()
+        ), inicio="2026-01-01", dias=365)
+        configurar_motor(motor)
+        self.assertEqual(cotizador.cotizar(solicitud())["importe"], sin_motor)
+        motor.actualizar_ocupacion("CAM123456ABC", "2026-03-01", 0.9)
+        cotizacion = cotizador.cotizar(solicitud())
+        # La primera de tres noches cuesta el doble
+        self.assertEqual(cotizacion["importe"], round(sin_motor * 4 / 3, 2))
+        self.assertEqual(cotizador.cache_actual().aciertos, 0)
+
+    def test_unidad_trabajo_usa_catalogo_pendiente(self):
+        """Verifica que se cotiza con cambios sin confirmar."""
+        cotizador.cotizar(solicitud())
+        with UnidadTrabajo() as unidad:
+            self.suite.modificar(costo=4000.00)
+            cotizacion = cotizador.cotizar(solicitud())
+            unidad.descartar()
+        self.assertEqual(cotizacion["importe"], 21000.00)
+        self.assertEqual(cotizador.cotizar(solicitud())["importe"], 18000.00)
+
+    def test_tipo_inexistente_retorna_none(self):
+        """Verifica que un tipo inexistente muestra error y retorna None."""
+        datos = solicitud()
+        datos["detalle"].append({"tipo": "DELUXE", "cantidad": 1})
+        with patch("builtins.print") as mock_print:
+            self.assertIsNone(cotizador.cotizar(datos))
+            self.assertIn("ERROR", mock_print.call_args[0][0])
+
+    def test_noches_invalidas_retorna_none(self):
+        """Verifica que noches invalidas retornan None."""
+        datos = solicitud()
+        datos["noches"] = 0
+        with patch("builtins.print"):
+            self.assertIsNone(cotizador.cotizar(datos))
+
+
+if __name__ == "__main__":
+    unittest.main()
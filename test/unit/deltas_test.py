@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Wed Oct 21 14:36:02 2026
+
+@author: Efrén Alejandro
+"""
+# flake8: noqa: E402
+import os
+import sys
+
+sys.path.insert(  # pylint: disable=wrong-import-position
+    0,
+    os.path.abspath(
+        os.path.join(os.path.dirname(__file__), "..", "..", "source")
+    )
+)
+
+import json
+import shutil
+import unittest
+from unittest.mock import patch
+
+import catalogo_mmap
+import deltas
+import persistencia
+import respaldos
+from cliente import Cliente
+from lector_json import iterar_registros
+
+
+TEST_DATA_DIR = os.path.join(os.path.dirname(__file__), "datos")
+ARCHIVO_CLIENTES = os.path.join(TEST_DATA_DIR, "clientes.json")
+ARCHIVO_DELTA = deltas.ruta_delta(ARCHIVO_CLIENTES)
+ARCHIVOS = [ARCHIVO_CLIENTES, ARCHIVO_DELTA,
+            catalogo_mmap.ruta_snapshot(ARCHIVO_CLIENTES)]
+
+
+def datos_cliente(rfc="PEJJ800101ABC"):
+    """Retorna un diccionario de cliente."""
+    return {
+        "nombre": "Juan Pérez", "rfc": rfc, "sexo": "M",
+        "compania": "Empresa SA", "forma_pago": "tarjeta",
+        "estatus": "activo"
+    }
+
+
+def leer_crudo():
+    """Lee el JSON de clientes sin aplicar el delta."""
+    with open(ARCHIVO_CLIENTES, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+class TestDeltas(unittest.TestCase):
+    """Pruebas para la persistencia por delta."""
+
+    def setUp(self):
+        persistencia.DATA_DIR = TEST_DATA_DIR
+        os.makedirs(TEST_DATA_DIR, exist_ok=True)
+        self._limpiar()
+        self.cliente = Cliente.crear(datos_cliente())
+        Cliente.crear(datos_cliente("OTRO800101ABC"))
+        deltas.habilitar(True)
+
+    def tearDown(self):
+        deltas.habilitar(False)
+        catalogo_mmap.cerrar()
+        self._limpiar()
+        shutil.rmtree(os.path.join(TEST_DATA_DIR, respaldos.DIRECTORIO),
+                      ignore_errors=True)
+
+    @staticmethod
+    def _limpiar():
+        """Elimina archivos de prueba."""
+        for archivo in ARCHIVOS:
+            if os.path.exists(archivo):
+                os.remove(archivo)
+
+    def test_modificar_solo_agrega_al_delta(self):
+        """Verifica que el JSON no se reescribe y las lecturas ven el cambio."""
+        with open(ARCHIVO_CLIENTES, "rb") as f:
+            original = f.read()
+        with patch.object(Cliente, "_guardar") as mock_guardar:
+            self.assertTrue(self.cliente.modificar(estatus="inactivo"))
+            mock_guardar.assert_not_called()
+        with open(ARCHIVO_CLIENTES, "rb") as f:
+            self.assertEqual(f.read(), original)
+        self.assertEqual(Cliente.buscar("PEJJ800101ABC")["estatus"],
+                         "inactivo")
+        registros = dict(iterar_registros("clientes.json", TEST_DATA_DIR))
+        self.assertEqual(registros["PEJJ800101ABC"]["estatus"], "inactivo")
+        self.assertEqual(
+            Cliente.consultar().filtrar(estatus="inactivo").contar(), 1
+        )
+
+    def test_linea_corrupta_se_salta(self):
+        """Verifica que una linea invalida no impide leer el delta."""
+        self.cliente.modificar(estatus="inactivo")
+        with open(ARCHIVO_DELTA, "ab") as f:
+            f.write(b'{"llave": "PEJJ800101ABC", "cam\n')
+        with patch("builtins.print") as mock_print:
+            self.cliente.modificar(compania="Otra SA")
+            registro = Cliente.buscar("PEJJ800101ABC")
+            self.assertIn("invalida", mock_print.call_args[0][0])
+        self.assertEqual(registro["estatus"], "inactivo")
+        self.assertEqual(registro["compania"], "Otra SA")
+
+    def test_guardado_completo_incorpora_y_borra_delta(self):
+        """Verifica que crear reescribe con el delta mezclado."""
+        self.cliente.modificar(compania="Nueva SA")
+        self.assertTrue(os.path.exists(ARCHIVO_DELTA))
+        Cliente.crear(datos_cliente("TERC800101ABC"))
+        self.assertFalse(os.path.exists(ARCHIVO_DELTA))
+        self.assertEqual(leer_crudo()["PEJJ800101ABC"]["compania"],
+                         "Nueva SA")
+
+    def test_delta_de_otra_base_no_aplica(self):
+        """Verifica que un JSON reescrito ignora el delta anterior."""
+        self.cliente.modificar(estatus="inactivo")
+        datos = leer_crudo()
+        datos["PEJJ800101ABC"]["sexo"] = "F"
+        with open(ARCHIVO_CLIENTES, "w", encoding="utf-8") as f:
+            json.dump(datos, f, indent=4)
+        registro = Cliente.buscar("PEJJ800101ABC")
+        self.assertEqual(registro["estatus"], "activo")
+        self.assertEqual(registro["sexo"], "F")
+
+    def test_snapshot_mmap_aplica_delta(self):
+        """Verifica la busqueda por snapshot con delta posterior."""
+        catalogo_mmap.escribir_snapshot("clientes.json", TEST_DATA_DIR)
+        self.cliente.modificar(estatus="inactivo")
+        self.assertIsNotNone(
+            catalogo_mmap.snapshot("clientes.json", TEST_DATA_DIR)
+        )
+        self.assertEqual(Cliente.buscar("PEJJ800101ABC")["estatus"],
+                         "inactivo")
+
+    def test_compacta_al_crecer(self):
+        """Verifica que un delta grande se compacta en el JSON."""
+        with patch("deltas.MINIMO_COMPACTAR", 0), \
+                patch("deltas.FRACCION_COMPACTAR", 0.01):
+            self.cliente.modificar(estatus="inactivo")
+        self.assertFalse(os.path.exists(ARCHIVO_DELTA))
+        self.assertEqual(leer_crudo()["PEJJ800101ABC"]["estatus"],
+                         "inactivo")
+
+    @unittest.skipIf(deltas.fcntl is None, "Requiere fcntl")
+    def test_reemplazo_concurrente_no_pierde_lineas(self):
+        """Verifica que se reintenta si otro proceso reemplazo el delta."""
+        self.cliente.modificar(estatus="inactivo")
+        flock = deltas.fcntl.flock
+        reemplazos = []
+
+        def flock_con_reemplazo(f, operacion):
+            # Simula otro proceso que reemplaza el delta mientras se
+            # espera el candado, con una linea que no debe perderse
+            if not reemplazos:
+                with open(ARCHIVO_DELTA, "rb") as original:
+                    contenido = original.read()
+                with open(ARCHIVO_DELTA + ".otro", "wb") as otro:
+                    otro.write(contenido + json.dumps({
+                        "llave": "OTRO800101ABC",
+                        "campos": {"compania": "Otra SA"}
+                    }).encode("utf-8") + b"\n")
+                os.replace(ARCHIVO_DELTA + ".otro", ARCHIVO_DELTA)
+                reemplazos.append(True)
+            return flock(f, operacion)
+
+        with patch("deltas.fcntl.flock", side_effect=flock_con_reemplazo):
+            self.cliente.modificar(compania="Nueva SA")
+        self.assertEqual(Cliente.buscar("OTRO800101ABC")["compania"],
+                         "Otra SA")
+        registro = Cliente.buscar("PEJJ800101ABC")
+        self.assertEqual((registro["estatus"], registro["compania"]),
+                         ("inactivo", "Nueva SA"))
+
+    def test_respaldo_conserva_delta(self):
+        """Verifica que el respaldo incluye el delta y no ve cambios."""
+        self.cliente.modificar(estatus="inactivo")
+        respaldos.crear("con_delta")
+        self.cliente.modificar(estatus="suspendido")
+        respaldos.restaurar("con_delta")
+        self.assertEqual(Cliente.buscar("PEJJ800101ABC")["estatus"],
+                         "inactivo")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,182 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Wed Oct 21 20:21:09 2026
+
+@author: Efrén Alejandro
+"""
+# flake8: noqa: E402
+import os
+import sys
+
+sys.path.insert(  # pylint: disable=wrong-import-position
+    0,
+    os.path.abspath(
+        os.path.join(os.path.dirname(__file__), "..", "..", "source")
+    )
+)
+
+import io
+import json
+import threading
+import unittest
+from contextlib import redirect_stdout
+from unittest.mock import patch
+
+import persistencia
+from cliente import Cliente
+from escritura_diferida import EscrituraDiferida
+from unidad_trabajo import UnidadTrabajo
+
+
+TEST_DATA_DIR = os.path.join(os.path.dirname(__file__), "datos")
+ARCHIVO_CLIENTES = os.path.join(TEST_DATA_DIR, "clientes.json")
+
+
+def datos_cliente(rfc):
+    """Retorna un diccionario de cliente."""
+    return {
+        "nombre": "Juan Pérez", "rfc": rfc, "sexo": "M",
+        "compania": "Empresa SA", "forma_pago": "tarjeta",
+        "estatus": "activo"
+    }
+
+
+def leer_clientes():
+    """Lee el archivo de clientes escrito en disco."""
+    if not os.path.exists(ARCHIVO_CLIENTES):
+        return {}
+    with open(ARCHIVO_CLIENTES, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+class TestEscrituraDiferida(unittest.TestCase):
+    """Pruebas para la escritura diferida."""
+
+    def setUp(self):
+        persistencia.DATA_DIR = TEST_DATA_DIR
+        if os.path.exists(ARCHIVO_CLIENTES):
+            os.remove(ARCHIVO_CLIENTES)
+
+    def tearDown(self):
+        persistencia.fijar_escritura_diferida(None)
+        if os.path.exists(ARCHIVO_CLIENTES):
+            os.remove(ARCHIVO_CLIENTES)
+
+    def test_crear_modificar_y_flush(self):
+        """Verifica que se escribe al hacer flush y se lee de memoria."""
+        with EscrituraDiferida(intervalo=60) as diferida:
+            cliente = Cliente.crear(datos_cliente("PEJJ800101ABC"))
+            cliente.modificar(compania="Otra SA")
+            self.assertEqual(leer_clientes(), {})
+            self.assertEqual(
+                Cliente.buscar("PEJJ800101ABC")["compania"], "Otra SA"
+            )
+            with self.assertRaises(ValueError):
+                with UnidadTrabajo():
+                    pass
+            self.assertTrue(diferida.flush())
+            self.assertEqual(
+                leer_clientes()["PEJJ800101ABC"]["compania"], "Otra SA"
+            )
+            estadisticas = diferida.estadisticas()
+            self.assertEqual(estadisticas["guardados"], 2)
+            self.assertEqual(estadisticas["escrituras"], 1)
+        self.assertIsNone(persistencia.escritura_diferida())
+
+    def test_lote_y_cierre(self):
+        """Verifica la escritura por lote y que cerrar escribe el resto."""
+        diferida = EscrituraDiferida(intervalo=60, lote=3).iniciar()
+        for i in range(3):
+            Cliente.crear(datos_cliente(f"RFC{i:09d}"))
+        with diferida._condicion:  # pylint: disable=protected-access
+            diferida._condicion.wait_for(  # pylint: disable=protected-access
+                lambda: diferida.estadisticas()["escrituras"] == 1, timeout=5
+            )
+        self.assertEqual(len(leer_clientes()), 3)
+        Cliente.crear(datos_cliente("RFC000000003"))
+        self.assertTrue(diferida.cerrar())
+        self.assertEqual(len(leer_clientes()), 4)
+        self.assertIsNone(persistencia.escritura_diferida())
+
+    def test_contrapresion(self):
+        """Verifica que los guardados esperan al llegar a la capacidad."""
+        diferida = EscrituraDiferida(intervalo=60, lote=2, capacidad=2)
+        diferida.iniciar()
+        with diferida._escritura:  # pylint: disable=protected-access
+            Cliente.crear(datos_cliente("RFC000000000"))
+            Cliente.crear(datos_cliente("RFC000000001"))
+            hilo = threading.Thread(
+                target=Cliente.crear, args=(datos_cliente("RFC000000002"),)
+            )
+            hilo.start()
+            hilo.join(0.2)
+            self.assertTrue(hilo.is_alive())
+        hilo.join(5)
+        self.assertFalse(hilo.is_alive())
+        diferida.cerrar()
+        self.assertEqual(len(leer_clientes()), 3)
+        with self.assertRaises(ValueError):
+            EscrituraDiferida(lote=5, capacidad=2)
+
+    def test_error_al_escribir_no_detiene_el_hilo(self):
+        """Verifica que una excepcion al escribir se reintenta."""
+        fallas = []
+        original = Cliente._escribir  # pylint: disable=protected-access
+
+        def escribir(instancia, datos):
+            if not fallas:
+                fallas.append(1)
+                raise RuntimeError("disco")
+            return original(instancia, datos)
+
+        diferida = EscrituraDiferida(intervalo=0.01).iniciar()
+        with patch.object(Cliente, "_escribir", escribir), \
+                redirect_stdout(io.StringIO()):
+            Cliente.crear(datos_cliente("PEJJ800101ABC"))
+            # pylint: disable=protected-access
+            with diferida._condicion:
+                diferida._condicion.wait_for(
+                    lambda: diferida.estadisticas()["escrituras"] == 1,
+                    timeout=5
+                )
+            self.assertTrue(diferida._hilo.is_alive())
+            self.assertTrue(diferida.cerrar())
+        self.assertEqual(diferida.estadisticas()["errores"], 1)
+        self.assertIn("PEJJ800101ABC", leer_clientes())
+
+    def test_hilo_terminado_falla_rapido(self):
+        """Verifica que guardar sin hilo de fondo lanza RuntimeError."""
+        # pylint: disable=protected-access
+        diferida = EscrituraDiferida(intervalo=60).iniciar()
+        with diferida._condicion:
+            diferida._cerrando = True
+            diferida._condicion.notify_all()
+        diferida._hilo.join(5)
+        diferida._cerrando = False
+        with self.assertRaises(RuntimeError):
+            Cliente.crear(datos_cliente("PEJJ800101ABC"))
+        diferida.cerrar()
+
+    def test_escribe_copia_del_archivo(self):
+        """Verifica que modificar en memoria no altera lo que se escribe."""
+        original = Cliente._escribir  # pylint: disable=protected-access
+        escritos = []
+
+        def escribir(instancia, datos):
+            registro = diferida.cargar("clientes.json")["PEJJ800101ABC"]
+            registro["compania"] = "Cambiada"
+            escritos.append(datos["PEJJ800101ABC"]["compania"])
+            return original(instancia, datos)
+
+        with EscrituraDiferida(intervalo=60) as diferida:
+            Cliente.crear(datos_cliente("PEJJ800101ABC"))
+            with patch.object(Cliente, "_escribir", escribir):
+                self.assertTrue(diferida.flush())
+        self.assertEqual(escritos, ["Empresa SA"])
+        self.assertEqual(
+            leer_clientes()["PEJJ800101ABC"]["compania"], "Empresa SA"
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
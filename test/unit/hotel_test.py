@@ -436,5 +436,75 @@ class TestHotelCancelarReservacion(unittest.TestCase):
             self.assertFalse(resultado)
 
 
+
+class TestHotelOperacionesMasivas(unittest.TestCase):
+    """Pruebas para Hotel.modificar_donde y Hotel.eliminar_donde."""
+
+    def setUp(self):
+        persistencia.DATA_DIR = TEST_DATA_DIR
+        os.makedirs(TEST_DATA_DIR, exist_ok=True)
+        if os.path.exists(ARCHIVO_TEST):
+            os.remove(ARCHIVO_TEST)
+        for i, estado in enumerate(["Jalisco", "Jalisco", "Sonora"]):
+            datos = datos_hotel_valido()
+            datos["rfc"] = f"HOT{i:03d}"
+            datos["estado"] = estado
+            Hotel.crear(datos)
+
+    def tearDown(self):
+        if os.path.exists(ARCHIVO_TEST):
+            os.remove(ARCHIVO_TEST)
+
+    def test_modificar_donde_diccionario(self):
+        """Verifica que se modifican solo los hoteles que coinciden."""
+        total = Hotel.modificar_donde({"estado": "Jalisco"},
+                                      estatus="inactivo")
+        self.assertEqual(total, 2)
+        with open(ARCHIVO_TEST, "r", encoding="utf-8") as f:
+            datos = json.load(f)
+        self.assertEqual(datos["HOT000"]["estatus"], "inactivo")
+        self.assertEqual(datos["HOT002"]["estatus"], "activo")
+
+    def test_modificar_donde_guarda_una_vez(self):
+        """Verifica que se escribe el archivo una sola vez."""
+        with patch.object(Hotel, "_guardar") as mock_guardar:
+            Hotel.modificar_donde(lambda r: True, estatus="inactivo")
+            mock_guardar.assert_called_once()
+
+    def test_modificar_donde_clasificacion_enum(self):
+        """Verifica que la clasificacion se persiste como valor."""
+        Hotel.modificar_donde(
+            {"rfc": "HOT002"},
+            clasificacion=ClasificacionHotel.TRES_ESTRELLAS
+        )
+        self.assertEqual(Hotel.buscar("HOT002")["clasificacion"], "3E")
+
+    def test_modificar_donde_clasificacion_invalida(self):
+        """Verifica que una clasificacion invalida no modifica nada."""
+        with self.assertRaises(ValueError):
+            Hotel.modificar_donde(lambda r: True, clasificacion="9E")
+        self.assertEqual(Hotel.buscar("HOT000")["clasificacion"], "5E")
+
+    def test_modificar_donde_campo_no_modificable(self):
+        """Verifica que rfc no es modificable en masa."""
+        with patch("builtins.print") as mock_print:
+            total = Hotel.modificar_donde(lambda r: True, rfc="OTRO")
+            self.assertIn("ERROR", mock_print.call_args[0][0])
+        self.assertEqual(total, 0)
+
+    def test_eliminar_donde(self):
+        """Verifica que se eliminan los hoteles que cumplen el predicado."""
+        total = Hotel.eliminar_donde(lambda r: r["estado"] == "Jalisco")
+        self.assertEqual(total, 2)
+        self.assertIsNone(Hotel.buscar("HOT000"))
+        self.assertIsNotNone(Hotel.buscar("HOT002"))
+
+    def test_eliminar_donde_sin_coincidencias_no_guarda(self):
+        """Verifica que sin coincidencias no se reescribe el archivo."""
+        with patch.object(Hotel, "_guardar") as mock_guardar:
+            total = Hotel.eliminar_donde({"estado": "Yucatan"})
+            mock_guardar.assert_not_called()
+        self.assertEqual(total, 0)
+
 if __name__ == "__main__":
     unittest.main()
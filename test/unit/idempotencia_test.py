@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Wed Oct 21 17:34:40 2026
+
+@author: Efrén Alejandro
+"""
+# flake8: noqa: E402
+import os
+import sys
+
+sys.path.insert(  # pylint: disable=wrong-import-position
+    0,
+    os.path.abspath(
+        os.path.join(os.path.dirname(__file__), "..", "..", "source")
+    )
+)
+
+import json
+import unittest
+from unittest.mock import patch
+
+import persistencia
+import reservacion
+from idempotencia import ClavesRecientes
+from hotel import Hotel
+from cliente import Cliente
+from tipo_cuarto import TipoCuarto
+from reservacion import Reservacion
+from reservacion_bridge import crear_reservacion
+
+
+TEST_DATA_DIR = os.path.join(os.path.dirname(__file__), "datos")
+ARCHIVO_RESERVACIONES = os.path.join(TEST_DATA_DIR, "reservaciones.json")
+ARCHIVOS = [
+    os.path.join(TEST_DATA_DIR, nombre) for nombre in (
+        "reservaciones.json", "hoteles.json", "clientes.json",
+        "tipos_cuarto.json"
+    )
+]
+
+
+def datos_reservacion():
+    """Retorna la solicitud de una reservacion."""
+    return {
+        "rfc_hotel": "CAM123456ABC", "rfc_cliente": "PEJJ800101ABC",
+        "fecha": "2026-03-01", "noches": 3,
+        "detalle": [{"tipo": "DOBLE", "cantidad": 2, "costo": 0}]
+    }
+
+
+class Reloj:
+    """Reloj manual para las pruebas de vigencia."""
+
+    def __init__(self):
+        self.ahora = 0.0
+
+    def __call__(self):
+        return self.ahora
+
+
+class TestClavesRecientes(unittest.TestCase):
+    """Pruebas para el registro de claves."""
+
+    def test_vigencia_capacidad_y_eliminacion(self):
+        """Verifica vencimiento, limite y olvido al eliminar."""
+        reloj = Reloj()
+        claves = ClavesRecientes(capacidad=2, vigencia=10, reloj=reloj)
+        claves.registrar("r", "a", "L1", "uno")
+        reloj.ahora = 5
+        claves.registrar("r", "b", "L2", "dos")
+        self.assertEqual(claves.obtener("r", "a"), "uno")
+        self.assertIsNone(claves.obtener("otra", "a"))
+        reloj.ahora = 11
+        self.assertIsNone(claves.obtener("r", "a"))
+        self.assertEqual(claves.obtener("r", "b"), "dos")
+        claves.registrar("r", "c", "L3", "tres")
+        claves.registrar("r", "d", "L4", "cuatro")
+        self.assertEqual(len(claves), 2)
+        self.assertIsNone(claves.obtener("r", "b"))
+        claves.al_guardar("r", [("eliminar", "L3", {}, None)])
+        self.assertIsNone(claves.obtener("r", "c"))
+        claves.al_guardar("r", [])
+        self.assertEqual(len(claves), 0)
+
+
+class TestCrearIdempotente(unittest.TestCase):
+    """Pruebas para Reservacion.crear con clave de idempotencia."""
+
+    def setUp(self):
+        persistencia.DATA_DIR = TEST_DATA_DIR
+        os.makedirs(TEST_DATA_DIR, exist_ok=True)
+        self._limpiar()
+        Hotel.crear({
+            "nombre": "Hotel", "nombre_fiscal": "Hotel SA",
+            "rfc": "CAM123456ABC", "direccion": "Calle 1",
+            "estado": "Jalisco", "clasificacion": "5E", "estatus": "activo"
+        })
+        Cliente.crear({
+            "nombre": "Juan Perez", "rfc": "PEJJ800101ABC", "sexo": "M",
+            "compania": "Empresa SA", "forma_pago": "tarjeta",
+            "estatus": "activo"
+        })
+        TipoCuarto.crear({"rfc_hotel": "CAM123456ABC", "tipo": "DOBLE",
+                          "costo": 1500.00})
+
+    def tearDown(self):
+        self._limpiar()
+
+    @staticmethod
+    def _limpiar():
+        """Elimina archivos de prueba."""
+        for archivo in ARCHIVOS:
+            if os.path.exists(archivo):
+                os.remove(archivo)
+        reservacion.CLAVES.al_guardar(ARCHIVO_RESERVACIONES, [])
+
+    def test_reintento_retorna_original_sin_escribir(self):
+        """Verifica una sola reservacion con la misma clave."""
+        original = crear_reservacion(datos_reservacion(), "solicitud-1")
+        with patch("reservacion.validar_hotel") as mock_validar, \
+                patch.object(Reservacion, "_guardar") as mock_guardar:
+            repetida = crear_reservacion(datos_reservacion(), "solicitud-1")
+            mock_validar.assert_not_called()
+            mock_guardar.assert_not_called()
+        self.assertIs(repetida, original)
+        otra = Reservacion.crear(datos_reservacion(), "solicitud-2")
+        self.assertIsNot(otra, original)
+        with open(ARCHIVO_RESERVACIONES, "r", encoding="utf-8") as f:
+            self.assertEqual(len(json.load(f)), 2)
+
+    def test_cancelada_o_fallida_no_se_recuerda(self):
+        """Verifica que una cancelacion o un error liberan la clave."""
+        original = Reservacion.crear(datos_reservacion(), "solicitud-1")
+        original.cancelar()
+        nueva = Reservacion.crear(datos_reservacion(), "solicitud-1")
+        self.assertNotEqual(nueva.uuid, original.uuid)
+        invalida = dict(datos_reservacion(), rfc_hotel="NOEXISTE")
+        self.assertIsNone(Reservacion.crear(invalida, "solicitud-3"))
+        self.assertIsNotNone(
+            Reservacion.crear(datos_reservacion(), "solicitud-3")
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
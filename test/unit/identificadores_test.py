@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Wed Oct 21 18:14:03 2026
+
+@author: Efrén Alejandro
+"""
+# flake8: noqa: E402
+import os
+import sys
+
+sys.path.insert(  # pylint: disable=wrong-import-position
+    0,
+    os.path.abspath(
+        os.path.join(os.path.dirname(__file__), "..", "..", "source")
+    )
+)
+
+import datetime
+import unittest
+import uuid
+from unittest.mock import patch
+
+import identificadores
+from arbol_paginado import ArbolPaginado
+from reservacion import Reservacion
+
+
+TEST_DATA_DIR = os.path.join(os.path.dirname(__file__), "datos")
+ARCHIVO_ARBOL = os.path.join(TEST_DATA_DIR, "identificadores.btree")
+
+
+def datos_reservacion():
+    """Retorna datos completos para instanciar Reservacion."""
+    return {
+        "referencias": {
+            "rfc_hotel": "CAM123456ABC", "rfc_cliente": "PEJJ800101ABC",
+            "fecha": "2026-03-01",
+            "nemotecnica": "CAM123456ABC_PEJJ800101ABC_2026-03-01"
+        },
+        "noches": 3,
+        "detalle": [{"tipo": "DOBLE", "cantidad": 2, "costo": 1500.00}],
+        "importe": 9000.00,
+        "es_pagado": False
+    }
+
+
+class TestIdentificadores(unittest.TestCase):
+    """Pruebas para los identificadores ordenados por tiempo."""
+
+    def tearDown(self):
+        identificadores.usar_esquema("uuid4")
+        if os.path.exists(ARCHIVO_ARBOL):
+            os.remove(ARCHIVO_ARBOL)
+
+    def test_uuid7_valido_y_monotono(self):
+        """Verifica version, variante y orden en el mismo milisegundo."""
+        with patch("identificadores._ULTIMO", [0, 0]), \
+                patch("identificadores.time.time_ns",
+                      return_value=1_700_000_000_000_000_000):
+            generados = [identificadores.uuid7() for _ in range(5000)]
+        self.assertEqual(generados, sorted(generados))
+        self.assertEqual(len(set(generados)), 5000)
+        valor = uuid.UUID(generados[0])
+        self.assertEqual(valor.version, 7)
+        self.assertEqual(valor.variant, uuid.RFC_4122)
+        self.assertEqual(identificadores.instante(generados[0]).year, 2023)
+
+    def test_binario_acepta_uuid4(self):
+        """Verifica la forma de 16 bytes de uuid4 y uuid7."""
+        for texto in (str(uuid.uuid4()), identificadores.uuid7()):
+            binario = identificadores.a_binario(texto)
+            self.assertEqual(len(binario), 16)
+            self.assertEqual(identificadores.desde_binario(binario), texto)
+        self.assertIsNone(identificadores.instante(str(uuid.uuid4())))
+        with self.assertRaises(ValueError):
+            identificadores.a_binario("no-es-uuid")
+        with self.assertRaises(ValueError):
+            identificadores.usar_esquema("ulid")
+
+    def test_reservacion_y_rango_de_creacion(self):
+        """Verifica el esquema en Reservacion y el recorrido por alta."""
+        self.assertEqual(uuid.UUID(Reservacion(datos_reservacion()).uuid)
+                         .version, 4)
+        identificadores.usar_esquema("uuid7")
+        os.makedirs(TEST_DATA_DIR, exist_ok=True)
+        arbol = ArbolPaginado(ARCHIVO_ARBOL, tamano_pagina=512)
+        momentos = [datetime.datetime(2026, 1, dia) for dia in (1, 2, 3)]
+        creadas = []
+        for momento in momentos:
+            with patch("identificadores._ULTIMO", [0, 0]), \
+                    patch("identificadores.time.time_ns",
+                          return_value=int(momento.replace(
+                              tzinfo=datetime.timezone.utc
+                          ).timestamp()) * 10 ** 9):
+                creadas.append(Reservacion(datos_reservacion()).uuid)
+            arbol.poner(creadas[-1], b"{}")
+        arbol.poner(str(uuid.uuid4()), b"{}")
+        desde, hasta = identificadores.rango_creacion(momentos[1],
+                                                      momentos[2])
+        encontradas = [
+            llave for llave, _ in arbol.rango(desde, hasta)
+            if identificadores.instante(llave) is not None
+        ]
+        self.assertEqual(encontradas, [creadas[1]])
+        self.assertEqual(Reservacion(dict(datos_reservacion(),
+                                          uuid="fijo")).uuid, "fijo")
+        arbol.cerrar()
+
+
+if __name__ == "__main__":
+    unittest.main()
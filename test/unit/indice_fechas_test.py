@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Wed Oct 21 16:51:19 2026
+
+@author: Efrén Alejandro
+"""
+# flake8: noqa: E402
+import os
+import sys
+
+sys.path.insert(  # pylint: disable=wrong-import-position
+    0,
+    os.path.abspath(
+        os.path.join(os.path.dirname(__file__), "..", "..", "source")
+    )
+)
+
+import datetime
+import random
+import unittest
+from unittest.mock import patch
+
+import indice_fechas
+import persistencia
+from indice_fechas import IndiceFechas
+from hotel import Hotel
+from cliente import Cliente
+from tipo_cuarto import TipoCuarto
+from reservacion import Reservacion
+
+
+TEST_DATA_DIR = os.path.join(os.path.dirname(__file__), "datos")
+ARCHIVOS = [
+    os.path.join(TEST_DATA_DIR, nombre) for nombre in (
+        "reservaciones.json", "hoteles.json", "clientes.json",
+        "tipos_cuarto.json"
+    )
+]
+
+
+def registro(fecha, noches, hotel="CAM123456ABC", cantidad=1):
+    """Retorna un registro de reservacion minimo."""
+    return {
+        "referencias": {"rfc_hotel": hotel, "fecha": fecha},
+        "noches": noches,
+        "detalle": [{"tipo": "DOBLE", "cantidad": cantidad}]
+    }
+
+
+def datos_reservacion(fecha, noches):
+    """Retorna la solicitud de una reservacion."""
+    return {
+        "rfc_hotel": "CAM123456ABC", "rfc_cliente": "PEJJ800101ABC",
+        "fecha": fecha, "noches": noches,
+        "detalle": [{"tipo": "DOBLE", "cantidad": 2, "costo": 0}]
+    }
+
+
+class TestIndiceFechas(unittest.TestCase):
+    """Pruebas para el indice de intervalos de fechas."""
+
+    def setUp(self):
+        persistencia.DATA_DIR = TEST_DATA_DIR
+        os.makedirs(TEST_DATA_DIR, exist_ok=True)
+        self._limpiar()
+
+    def tearDown(self):
+        self._limpiar()
+
+    @staticmethod
+    def _limpiar():
+        """Elimina archivos de prueba."""
+        for archivo in ARCHIVOS:
+            if os.path.exists(archivo):
+                os.remove(archivo)
+            indice_fechas.invalidar(archivo)
+
+    def test_traslape_igual_a_recorrido_completo(self):
+        """Compara el indice con un recorrido en estancias aleatorias."""
+        azar = random.Random(7)
+        base = datetime.date(2026, 1, 1)
+        registros = {}
+        indice = IndiceFechas()
+        for i in range(500):
+            fecha = base + datetime.timedelta(days=azar.randrange(365))
+            registros[f"R{i:04d}"] = registro(
+                fecha.isoformat(), azar.choice([1, 2, 3, 7, 30, 90]),
+                hotel=azar.choice(["H1", "H2"])
+            )
+            indice.agregar(f"R{i:04d}", registros[f"R{i:04d}"])
+        for llave in list(registros)[::5]:
+            indice.quitar(llave)
+            del registros[llave]
+        for _ in range(50):
+            desde = base + datetime.timedelta(days=azar.randrange(365))
+            hasta = desde + datetime.timedelta(days=azar.randrange(1, 20))
+            esperadas = sorted(
+                (r["referencias"]["fecha"], llave)
+                for llave, r in registros.items()
+                if r["referencias"]["rfc_hotel"] == "H1"
+                and r["referencias"]["fecha"] < hasta.isoformat()
+                and datetime.date.fromisoformat(r["referencias"]["fecha"])
+                + datetime.timedelta(days=r["noches"]) > desde
+            )
+            self.assertEqual(indice.traslapan(desde, hasta, "H1"),
+                             [llave for _, llave in esperadas])
+
+    def test_llegadas_y_ocupacion(self):
+        """Verifica llegadas por rango y cuartos ocupados por noche."""
+        indice = IndiceFechas()
+        indice.agregar("A", registro("2026-03-01", 3, cantidad=2))
+        indice.agregar("B", registro("2026-03-02", 1))
+        indice.agregar("C", registro("2026-03-05", 2, hotel="OTRO"))
+        indice.agregar("X", {"noches": 1})
+        self.assertEqual(len(indice), 3)
+        self.assertEqual(indice.llegadas("2026-03-02", "2026-03-06"),
+                         ["B", "C"])
+        self.assertEqual(indice.traslapan("2026-03-03"), ["A"])
+        self.assertEqual(indice.traslapan("2026-03-04"), [])
+        self.assertEqual(
+            list(indice.ocupacion("CAM123456ABC", "2026-03-01",
+                                  "2026-03-05").values()),
+            [2, 3, 2, 0]
+        )
+
+    def test_reservacion_mantiene_indice(self):
+        """Verifica que crear y cancelar actualizan el indice sin recorrer."""
+        Hotel.crear({
+            "nombre": "Hotel", "nombre_fiscal": "Hotel SA",
+            "rfc": "CAM123456ABC", "direccion": "Calle 1",
+            "estado": "Jalisco", "clasificacion": "5E", "estatus": "activo"
+        })
+        Cliente.crear({
+            "nombre": "Juan Perez", "rfc": "PEJJ800101ABC", "sexo": "M",
+            "compania": "Empresa SA", "forma_pago": "tarjeta",
+            "estatus": "activo"
+        })
+        TipoCuarto.crear({"rfc_hotel": "CAM123456ABC", "tipo": "DOBLE",
+                          "costo": 1500.00})
+        primera = Reservacion.crear(datos_reservacion("2026-03-01", 3))
+        self.assertEqual(
+            [r["uuid"] for r in Reservacion.traslapan("2026-03-02")],
+            [primera.uuid]
+        )
+        with patch.object(Reservacion, "_iterar") as mock_iterar:
+            segunda = Reservacion.crear(datos_reservacion("2026-03-03", 2))
+            primera.cancelar()
+            self.assertEqual(
+                [r["uuid"] for r in Reservacion.llegadas("2026-03-01",
+                                                         "2026-04-01")],
+                [segunda.uuid]
+            )
+            self.assertEqual(
+                Reservacion.ocupacion("CAM123456ABC", "2026-03-02",
+                                      "2026-03-05"),
+                {datetime.date(2026, 3, 2): 0, datetime.date(2026, 3, 3): 2,
+                 datetime.date(2026, 3, 4): 2}
+            )
+            mock_iterar.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 09:41:05 2026
+
+@author: Efrén Alejandro
+"""
+# flake8: noqa: E402
+import os
+import sys
+
+sys.path.insert(  # pylint: disable=wrong-import-position
+    0,
+    os.path.abspath(
+        os.path.join(os.path.dirname(__file__), "..", "..", "source")
+    )
+)
+
+import io
+import json
+import unittest
+from contextlib import redirect_stdout
+
+import instrumentacion
+import persistencia
+from hotel import Hotel
+from validador import validar_hotel
+
+
+TEST_DATA_DIR = os.path.join(os.path.dirname(__file__), "datos")
+ARCHIVO_HOTELES = os.path.join(TEST_DATA_DIR, "hoteles.json")
+
+
+def datos_hotel_valido():
+    """Retorna un diccionario con datos validos de hotel."""
+    return {
+        "nombre": "Hotel Camino Real",
+        "nombre_fiscal": "Camino Real SA de CV",
+        "rfc": "CAM123456ABC",
+        "direccion": "Av. Principal 100",
+        "estado": "Jalisco",
+        "clasificacion": "5E",
+        "estatus": "activo"
+    }
+
+
+def buscar_metrica(operacion, archivo):
+    """Retorna la metrica de (operacion, archivo) o None."""
+    for metrica in instrumentacion.instantanea():
+        if (metrica["operacion"], metrica["archivo"]) == (operacion,
+                                                          archivo):
+            return metrica
+    return None
+
+
+class TestInstrumentacionDeshabilitada(unittest.TestCase):
+    """Pruebas con la instrumentacion apagada."""
+
+    def setUp(self):
+        instrumentacion.habilitar(False)
+        instrumentacion.reiniciar()
+
+    def test_medir_retorna_objeto_nulo(self):
+        """Verifica que medir no acumula nada si esta apagada."""
+        with instrumentacion.medir("op", "a.json") as medicion:
+            medicion.anotar(10, 1)
+        self.assertEqual(instrumentacion.instantanea(), [])
+
+
+class TestInstrumentacionHabilitada(unittest.TestCase):
+    """Pruebas con la instrumentacion encendida."""
+
+    def setUp(self):
+        persistencia.DATA_DIR = TEST_DATA_DIR
+        os.makedirs(TEST_DATA_DIR, exist_ok=True)
+        if os.path.exists(ARCHIVO_HOTELES):
+            os.remove(ARCHIVO_HOTELES)
+        instrumentacion.habilitar(True)
+        instrumentacion.reiniciar()
+
+    def tearDown(self):
+        instrumentacion.habilitar(False)
+        instrumentacion.reiniciar()
+        if os.path.exists(ARCHIVO_HOTELES):
+            os.remove(ARCHIVO_HOTELES)
+
+    def test_guardar_registra_bytes_y_registros(self):
+        """Verifica que _guardar registra bytes escritos y registros."""
+        Hotel.crear(datos_hotel_valido())
+        metrica = buscar_metrica("guardar_json", "hoteles.json")
+        self.assertEqual(metrica["llamadas"], 1)
+        self.assertEqual(metrica["registros"], 1)
+        self.assertEqual(
+            metrica["bytes"], os.path.getsize(ARCHIVO_HOTELES)
+        )
+
+    def test_leer_registra_bytes(self):
+        """Verifica que la lectura registra los bytes leidos."""
+        Hotel.crear(datos_hotel_valido())
+        Hotel.buscar("CAM123456ABC")
+        metrica = buscar_metrica("leer_json", "hoteles.json")
+        self.assertEqual(metrica["llamadas"], 1)
+        self.assertEqual(
+            metrica["bytes"], os.path.getsize(ARCHIVO_HOTELES)
+        )
+
+    def test_validacion_fallida_cuenta_error(self):
+        """Verifica que una validacion fallida se cuenta como error."""
+        with self.assertRaises(ValueError):
+            validar_hotel("RFC_INEXISTENTE")
+        metrica = buscar_metrica("validar_hotel", "hoteles.json")
+        self.assertEqual(metrica["errores"], 1)
+
+    def test_leer_corrupto_cuenta_error(self):
+        """Verifica que un archivo corrupto se registra como error."""
+        with open(ARCHIVO_HOTELES, "w", encoding="utf-8") as f:
+            f.write("{corrupto")
+        with redirect_stdout(io.StringIO()):
+            self.assertIsNone(Hotel.buscar("CAM123456ABC"))
+        metrica = buscar_metrica("leer_json", "hoteles.json")
+        self.assertEqual(metrica["llamadas"], 1)
+        self.assertEqual(metrica["errores"], 1)
+
+    def test_histograma_acumula_cubetas(self):
+        """Verifica que la observacion cae en la cubeta correcta."""
+        instrumentacion.registrar("op", "a.json", 0.7)
+        metrica = buscar_metrica("op", "a.json")
+        self.assertEqual(metrica["cubetas"]["1"], 1)
+        self.assertEqual(sum(metrica["cubetas"].values()), 1)
+
+    def test_exportar_json_valido(self):
+        """Verifica que la exportacion JSON es parseable."""
+        instrumentacion.registrar("op", "a.json", 2.0, 100, 3)
+        datos = json.loads(instrumentacion.exportar_json())
+        self.assertEqual(datos[0]["bytes"], 100)
+
+    def test_exportar_prometheus(self):
+        """Verifica el formato de texto de Prometheus."""
+        instrumentacion.registrar("op", "a.json", 2.0, 100, 3)
+        texto = instrumentacion.exportar_prometheus()
+        self.assertIn(
+            'hoteles_bytes_total{operacion="op",archivo="a.json"} 100',
+            texto
+        )
+        self.assertIn(
+            'hoteles_latencia_ms_bucket{operacion="op",archivo="a.json",'
+            'le="+Inf"} 1',
+            texto
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Wed Oct 21 09:58:40 2026
+
+@author: Efrén Alejandro
+"""
+# flake8: noqa: E402
+import os
+import sys
+
+sys.path.insert(  # pylint: disable=wrong-import-position
+    0,
+    os.path.abspath(
+        os.path.join(os.path.dirname(__file__), "..", "..", "source")
+    )
+)
+
+import json
+import shutil
+import unittest
+from unittest.mock import patch
+
+import arbol_paginado
+import integridad
+import persistencia
+import respaldos
+
+
+TEST_DATA_DIR = os.path.join(os.path.dirname(__file__), "datos")
+ARCHIVO_HOTELES = os.path.join(TEST_DATA_DIR, "hoteles.json")
+ARCHIVO_CLIENTES = os.path.join(TEST_DATA_DIR, "clientes.json")
+ARCHIVO_TIPOS = os.path.join(TEST_DATA_DIR, "tipos_cuarto.json")
+ARCHIVO_RESERVACIONES = os.path.join(TEST_DATA_DIR, "reservaciones.json")
+ARCHIVOS = [ARCHIVO_HOTELES, ARCHIVO_CLIENTES, ARCHIVO_TIPOS,
+            ARCHIVO_RESERVACIONES]
+
+
+def escribir(ruta, datos):
+    """Escribe un diccionario como JSON."""
+    with open(ruta, "w", encoding="utf-8") as f:
+        json.dump(datos, f, indent=4)
+
+
+def leer(ruta):
+    """Lee un archivo JSON."""
+    with open(ruta, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def reservacion(uuid, rfc_hotel="HOT1", rfc_cliente="CLI1", importe=3000):
+    """Retorna una reservacion de una DOBLE por dos noches."""
+    return {
+        "uuid": uuid,
+        "referencias": {
+            "rfc_hotel": rfc_hotel, "rfc_cliente": rfc_cliente,
+            "fecha": "2026-03-01",
+            "nemotecnica": f"{rfc_hotel}_{rfc_cliente}_{uuid}"
+        },
+        "noches": 2,
+        "detalle": [{"tipo": "DOBLE", "cantidad": 1, "costo": 1500}],
+        "importe": importe,
+        "es_pagado": False
+    }
+
+
+class TestIntegridad(unittest.TestCase):
+    """Pruebas para integridad."""
+
+    def setUp(self):
+        persistencia.DATA_DIR = TEST_DATA_DIR
+        os.makedirs(TEST_DATA_DIR, exist_ok=True)
+        escribir(ARCHIVO_HOTELES, {"HOT1": {"rfc": "HOT1"}})
+        escribir(ARCHIVO_CLIENTES, {"CLI1": {"rfc": "CLI1"}})
+        escribir(ARCHIVO_TIPOS, {
+            "HOT1_DOBLE": {"rfc_hotel": "HOT1", "tipo": "DOBLE",
+                           "costo": 1500},
+            "HOT9_DOBLE": {"rfc_hotel": "HOT9", "tipo": "DOBLE",
+                           "costo": 1500},
+        })
+        duplicada = reservacion("r4")
+        duplicada["referencias"]["nemotecnica"] = "HOT1_CLI1_r1"
+        escribir(ARCHIVO_RESERVACIONES, {
+            "r1": reservacion("r1"),
+            "r2": reservacion("r2", importe=2500),
+            "r3": reservacion("r3", rfc_cliente="CLI9"),
+            "r4": duplicada,
+        })
+
+    def tearDown(self):
+        for archivo in ARCHIVOS:
+            if os.path.exists(archivo):
+                os.remove(archivo)
+        shutil.rmtree(os.path.join(TEST_DATA_DIR, respaldos.DIRECTORIO),
+                      ignore_errors=True)
+
+    def test_reporta_inconsistencias(self):
+        """Verifica huerfanos, importes y nemotecnicas duplicadas."""
+        hallazgos, _ = integridad.revisar()
+        encontrados = sorted((h["tipo"], h["llave"]) for h in hallazgos)
+        self.assertEqual(encontrados, [
+            ("importe_incorrecto", "r2"),
+            ("nemotecnica_duplicada", "r4"),
+            ("referencia_huerfana", "HOT9_DOBLE"),
+            ("referencia_huerfana", "r3"),
+        ])
+
+    def test_revisa_backend_arbol(self):
+        """Verifica que con el backend arbol se recorre el arbol."""
+        for archivo in ARCHIVOS:
+            arbol_paginado.importar(os.path.basename(archivo),
+                                    TEST_DATA_DIR)
+            os.remove(archivo)
+        persistencia.usar_backend("arbol")
+        try:
+            hallazgos, reparaciones = integridad.revisar()
+        finally:
+            persistencia.usar_backend("json")
+            arbol_paginado.cerrar()
+            for archivo in ARCHIVOS:
+                os.remove(arbol_paginado.ruta_arbol(archivo))
+        encontrados = sorted((h["tipo"], h["llave"]) for h in hallazgos)
+        self.assertEqual(encontrados, [
+            ("importe_incorrecto", "r2"),
+            ("nemotecnica_duplicada", "r4"),
+            ("referencia_huerfana", "HOT9_DOBLE"),
+            ("referencia_huerfana", "r3"),
+        ])
+        self.assertEqual(reparaciones["tipos_cuarto.json"],
+                         {"HOT9_DOBLE": None})
+
+    def test_archivo_corrupto_y_llave_duplicada(self):
+        """Verifica que se reportan corrupcion y llaves repetidas."""
+        with open(ARCHIVO_CLIENTES, "w", encoding="utf-8") as f:
+            f.write('{"CLI1": {}, "CLI1": {}, "CLI2": ')
+        hallazgos, _ = integridad.revisar()
+        tipos = [(h["tipo"], h["archivo"]) for h in hallazgos
+                 if h["archivo"] == "clientes.json"]
+        self.assertEqual(tipos, [("llave_duplicada", "clientes.json"),
+                                 ("archivo_corrupto", "clientes.json")])
+
+    def test_reparar_respalda_y_corrige(self):
+        """Verifica que reparar respalda y deja el directorio limpio."""
+        resumen = integridad.reparar()
+        self.assertEqual(resumen["reparados"], 3)
+        self.assertIsNotNone(resumen["respaldo"])
+        reservaciones = leer(ARCHIVO_RESERVACIONES)
+        self.assertEqual(sorted(reservaciones), ["r1", "r2", "r4"])
+        self.assertEqual(reservaciones["r2"]["importe"], 3000)
+        self.assertNotIn("HOT9_DOBLE", leer(ARCHIVO_TIPOS))
+        hallazgos, _ = integridad.revisar()
+        self.assertEqual([h["tipo"] for h in hallazgos],
+                         ["nemotecnica_duplicada"])
+
+    def test_no_repara_con_archivo_corrupto(self):
+        """Verifica que un archivo corrupto impide la reparacion."""
+        with open(ARCHIVO_HOTELES, "w", encoding="utf-8") as f:
+            f.write("{")
+        with patch("builtins.print") as mock_print:
+            resumen = integridad.reparar()
+            self.assertIn("ERROR", mock_print.call_args[0][0])
+        self.assertEqual(resumen["reparados"], 0)
+        self.assertEqual(len(leer(ARCHIVO_RESERVACIONES)), 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
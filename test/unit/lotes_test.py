@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Tue Oct 20 19:22:51 2026
+
+@author: Efrén Alejandro
+"""
+# flake8: noqa: E402
+import os
+import sys
+
+sys.path.insert(  # pylint: disable=wrong-import-position
+    0,
+    os.path.abspath(
+        os.path.join(os.path.dirname(__file__), "..", "..", "source")
+    )
+)
+
+import json
+import unittest
+from unittest.mock import patch
+
+import arbol_paginado
+import lotes
+import persistencia
+from almacen import Almacen
+from hotel import Hotel
+from cliente import Cliente
+from tipo_cuarto import TipoCuarto
+from reservacion import Reservacion
+
+
+TEST_DATA_DIR = os.path.join(os.path.dirname(__file__), "datos")
+ARCHIVO_RESERVACIONES = os.path.join(TEST_DATA_DIR, "reservaciones.json")
+ARCHIVO_HOTELES = os.path.join(TEST_DATA_DIR, "hoteles.json")
+ARCHIVO_CLIENTES = os.path.join(TEST_DATA_DIR, "clientes.json")
+ARCHIVO_TIPOS = os.path.join(TEST_DATA_DIR, "tipos_cuarto.json")
+
+ARCHIVOS = [ARCHIVO_RESERVACIONES, ARCHIVO_HOTELES, ARCHIVO_CLIENTES,
+            ARCHIVO_TIPOS]
+
+
+def solicitud(noches=3, tipo="DOBLE", rfc_cliente="PEJJ800101ABC"):
+    """Retorna una solicitud de reservacion."""
+    return {
+        "rfc_hotel": "CAM123456ABC", "rfc_cliente": rfc_cliente,
+        "fecha": "2026-03-01", "noches": noches,
+        "detalle": [{"tipo": tipo, "cantidad": 2}]
+    }
+
+
+class TestProcesarLote(unittest.TestCase):
+    """Pruebas para lotes.procesar_lote."""
+
+    def setUp(self):
+        persistencia.DATA_DIR = TEST_DATA_DIR
+        os.makedirs(TEST_DATA_DIR, exist_ok=True)
+        for archivo in ARCHIVOS:
+            if os.path.exists(archivo):
+                os.remove(archivo)
+        Hotel.crear({
+            "nombre": "Hotel Prueba", "nombre_fiscal": "Prueba SA",
+            "rfc": "CAM123456ABC", "direccion": "Calle 1",
+            "estado": "Jalisco", "clasificacion": "5E", "estatus": "activo"
+        })
+        Cliente.crear({
+            "nombre": "Juan Perez", "rfc": "PEJJ800101ABC", "sexo": "M",
+            "compania": "Empresa SA", "forma_pago": "tarjeta",
+            "estatus": "activo"
+        })
+        TipoCuarto.crear({
+            "rfc_hotel": "CAM123456ABC", "tipo": "DOBLE", "costo": 1500.00
+        })
+        self.lote = [solicitud(noches=n + 1) for n in range(20)]
+        self.lote[3] = solicitud(tipo="SUITE")
+        self.lote[11] = solicitud(rfc_cliente="NOEXISTE")
+        self.lote[17] = solicitud(noches=0)
+
+    def tearDown(self):
+        for archivo in ARCHIVOS:
+            if os.path.exists(archivo):
+                os.remove(archivo)
+
+    def test_paralelo_igual_a_secuencial(self):
+        """Verifica que el resultado no depende de los procesos."""
+        paralelo = lotes.validar_lote(
+            json.loads(json.dumps(self.lote)), procesos=2,
+            tamano_particion=3
+        )
+        secuencial = lotes.validar_lote(
+            json.loads(json.dumps(self.lote)), procesos=1
+        )
+        self.assertEqual([r[0] for r in paralelo], list(range(20)))
+        self.assertEqual(
+            [(p, r and r["importe"], e) for p, r, e in paralelo],
+            [(p, r and r["importe"], e) for p, r, e in secuencial]
+        )
+
+    def test_confirma_con_un_guardado(self):
+        """Verifica un solo guardado con las validas en orden."""
+        with patch.object(Reservacion, "_guardar",
+                          autospec=True) as mock_guardar:
+            resumen = lotes.procesar_lote(self.lote, procesos=2)
+        mock_guardar.assert_called_once()
+        cambios = mock_guardar.call_args[0][2]
+        self.assertEqual([c[1] for c in cambios], resumen["confirmados"])
+        self.assertEqual(len(resumen["confirmados"]), 17)
+        self.assertEqual([r["posicion"] for r in resumen["rechazados"]],
+                         [3, 11, 17])
+
+    def test_mismo_registro_que_crear(self):
+        """Verifica el mismo importe y referencias que Reservacion.crear."""
+        resumen = lotes.procesar_lote([solicitud()], procesos=1)
+        guardada = Reservacion.buscar(resumen["confirmados"][0])
+        creada = Reservacion.crear(solicitud())
+        self.assertEqual(guardada["importe"], creada.importe)
+        self.assertEqual(guardada["referencias"], creada.referencias)
+
+    def test_particion_corre_en_almacen_del_llamador(self):
+        """Verifica que los trabajadores entran al almacen recibido."""
+        vistos = []
+
+        def procesar(datos, _catalogo):
+            vistos.append(persistencia.directorio_datos())
+            return datos
+
+        otro = os.path.join(TEST_DATA_DIR, "otro_almacen")
+        with patch("lotes._procesar", side_effect=procesar):
+            lotes._procesar_particion(  # pylint: disable=protected-access
+                0, [solicitud()], Almacen(otro)
+            )
+        self.assertEqual(vistos, [os.path.abspath(otro)])
+        self.assertEqual(persistencia.directorio_datos(), TEST_DATA_DIR)
+
+    def test_catalogo_con_backend_arbol(self):
+        """Verifica que el catalogo se lee del arbol con ese backend."""
+        with Almacen(TEST_DATA_DIR, "arbol"):
+            try:
+                Hotel.crear({
+                    "nombre": "Hotel Arbol", "nombre_fiscal": "Arbol SA",
+                    "rfc": "ARB123456ABC", "direccion": "Calle 2",
+                    "estado": "Jalisco", "clasificacion": "4E",
+                    "estatus": "activo"
+                })
+                TipoCuarto.crear({
+                    "rfc_hotel": "ARB123456ABC", "tipo": "SUITE",
+                    "costo": 900.00
+                })
+                hoteles, clientes, costos = lotes.cargar_catalogo()
+            finally:
+                arbol_paginado.cerrar()
+                for archivo in ARCHIVOS:
+                    ruta = arbol_paginado.ruta_arbol(archivo)
+                    if os.path.exists(ruta):
+                        os.remove(ruta)
+        self.assertEqual(hoteles, frozenset({"ARB123456ABC"}))
+        self.assertEqual(clientes, frozenset())
+        self.assertEqual(costos, {"ARB123456ABC_SUITE": 900.00})
+
+
+class TestEscalamiento(unittest.TestCase):
+    """Pruebas para lotes.medir_escalamiento."""
+
+    def test_reporte_por_procesos(self):
+        """Verifica el formato del reporte de escalamiento."""
+        with patch("lotes.validar_lote"):
+            reporte = lotes.medir_escalamiento([solicitud()], maximo=3)
+        self.assertEqual([r["procesos"] for r in reporte], [1, 2, 3])
+        self.assertEqual(reporte[0]["aceleracion"], 1.0)
+        self.assertEqual(reporte[0]["eficiencia"], 1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 11:48:20 2026
+
+@author: Efrén Alejandro
+"""
+# flake8: noqa: E402
+import os
+import sys
+
+sys.path.insert(  # pylint: disable=wrong-import-position
+    0,
+    os.path.abspath(
+        os.path.join(os.path.dirname(__file__), "..", "..", "source")
+    )
+)
+
+import pstats
+import time
+import unittest
+
+import perfilador
+import persistencia
+from hotel import Hotel
+
+
+TEST_DATA_DIR = os.path.join(os.path.dirname(__file__), "datos")
+ARCHIVO_HOTELES = os.path.join(TEST_DATA_DIR, "hoteles.json")
+ARCHIVO_PERFIL = os.path.join(TEST_DATA_DIR, "perfil_prueba")
+
+
+def trabajo_ocupado(segundos):
+    """Consume CPU durante los segundos indicados."""
+    fin = time.perf_counter() + segundos
+    total = 0
+    while time.perf_counter() < fin:
+        total += 1
+    return total
+
+
+def datos_hotel_valido():
+    """Retorna un diccionario con datos validos de hotel."""
+    return {
+        "nombre": "Hotel Camino Real",
+        "nombre_fiscal": "Camino Real SA de CV",
+        "rfc": "CAM123456ABC",
+        "direccion": "Av. Principal 100",
+        "estado": "Jalisco",
+        "clasificacion": "5E",
+        "estatus": "activo"
+    }
+
+
+class TestPerfilador(unittest.TestCase):
+    """Pruebas para la clase Perfilador."""
+
+    def setUp(self):
+        os.makedirs(TEST_DATA_DIR, exist_ok=True)
+
+    def tearDown(self):
+        for extension in (".folded", ".prof"):
+            if os.path.exists(ARCHIVO_PERFIL + extension):
+                os.remove(ARCHIVO_PERFIL + extension)
+
+    def test_modo_invalido_lanza_error(self):
+        """Verifica que un modo desconocido lanza ValueError."""
+        with self.assertRaises(ValueError):
+            perfilador.Perfilador("otro")
+
+    def test_muestreo_produce_pilas_colapsadas(self):
+        """Verifica que las pilas inician con el nombre de la region."""
+        perf = perfilador.Perfilador(intervalo=0.001)
+        with perf.perfilar("region"):
+            trabajo_ocupado(0.1)
+        lineas = perf.colapsado().splitlines()
+        self.assertTrue(lineas)
+        for linea in lineas:
+            pila, cuenta = linea.rsplit(" ", 1)
+            self.assertTrue(pila.startswith("region"))
+            self.assertGreater(int(cuenta), 0)
+        self.assertTrue(
+            any("trabajo_ocupado" in linea for linea in lineas)
+        )
+
+    def test_muestreo_agrega_entre_llamadas(self):
+        """Verifica que las muestras se acumulan entre regiones."""
+        perf = perfilador.Perfilador(intervalo=0.001)
+        with perf.perfilar("region"):
+            trabajo_ocupado(0.05)
+        primera = sum(perf.pilas.values())
+        with perf.perfilar("region"):
+            trabajo_ocupado(0.05)
+        self.assertGreater(sum(perf.pilas.values()), primera)
+
+    def test_escribir_colapsado(self):
+        """Verifica que se escribe el archivo .folded."""
+        perf = perfilador.Perfilador()
+        with perf.perfilar("region"):
+            trabajo_ocupado(0.05)
+        ruta = perf.escribir(ARCHIVO_PERFIL)
+        self.assertTrue(ruta.endswith(".folded"))
+        self.assertTrue(os.path.exists(ruta))
+
+    def test_pstats_requiere_cprofile(self):
+        """Verifica que escribir_pstats falla en modo muestreo."""
+        perf = perfilador.Perfilador()
+        with self.assertRaises(ValueError):
+            perf.escribir_pstats(ARCHIVO_PERFIL + ".prof")
+
+
+class TestPerfilado(unittest.TestCase):
+    """Pruebas para el decorador perfilado sobre entidades."""
+
+    def setUp(self):
+        persistencia.DATA_DIR = TEST_DATA_DIR
+        os.makedirs(TEST_DATA_DIR, exist_ok=True)
+        if os.path.exists(ARCHIVO_HOTELES):
+            os.remove(ARCHIVO_HOTELES)
+
+    def tearDown(self):
+        perfilador.configurar([])
+        for ruta in (ARCHIVO_HOTELES, ARCHIVO_PERFIL + ".prof"):
+            if os.path.exists(ruta):
+                os.remove(ruta)
+
+    def test_sin_configurar_no_perfila(self):
+        """Verifica que sin seleccion no existe perfilador global."""
+        perfilador.configurar([])
+        Hotel.crear(datos_hotel_valido())
+        self.assertIsNone(perfilador.perfilador_actual())
+
+    def test_cprofile_agrega_operacion_seleccionada(self):
+        """Verifica que Hotel.crear aparece en el perfil agregado."""
+        perf = perfilador.configurar(["Hotel.crear"], modo="cprofile")
+        Hotel.crear(datos_hotel_valido())
+        ruta = perf.escribir(ARCHIVO_PERFIL)
+        funciones = {
+            funcion for _, _, funcion in pstats.Stats(ruta).stats
+        }
+        self.assertIn("crear", funciones)
+        self.assertIn("_guardar", funciones)
+
+    def test_conserva_docstring(self):
+        """Verifica que el decorador conserva metadatos de la funcion."""
+        self.assertIn("Crea un hotel", Hotel.crear.__doc__)
+
+
+if __name__ == "__main__":
+    unittest.main()
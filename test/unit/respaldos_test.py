@@ -0,0 +1,221 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Tue Oct 20 23:15:52 2026
+
+@author: Efrén Alejandro
+"""
+# flake8: noqa: E402
+import os
+import sys
+
+sys.path.insert(  # pylint: disable=wrong-import-position
+    0,
+    os.path.abspath(
+        os.path.join(os.path.dirname(__file__), "..", "..", "source")
+    )
+)
+
+import shutil
+import unittest
+from unittest.mock import patch
+
+import arbol_paginado
+import persistencia
+import respaldos
+import unidad_trabajo
+from cliente import Cliente
+from hotel import Hotel
+
+
+TEST_DATA_DIR = os.path.join(os.path.dirname(__file__), "datos")
+ARCHIVO_CLIENTES = os.path.join(TEST_DATA_DIR, "clientes.json")
+ARCHIVO_HOTELES = os.path.join(TEST_DATA_DIR, "hoteles.json")
+DIRECTORIO_RESPALDOS = os.path.join(TEST_DATA_DIR, respaldos.DIRECTORIO)
+
+
+def datos_cliente(rfc):
+    """Retorna un diccionario de cliente."""
+    return {
+        "nombre": "Juan Pérez", "rfc": rfc, "sexo": "M",
+        "compania": "Empresa SA", "forma_pago": "tarjeta",
+        "estatus": "activo"
+    }
+
+
+def datos_hotel():
+    """Retorna un diccionario de hotel."""
+    return {
+        "nombre": "Hotel", "nombre_fiscal": "Hotel SA",
+        "rfc": "CAM123456ABC", "direccion": "Calle 1", "estado": "Jalisco",
+        "clasificacion": "5E", "estatus": "activo"
+    }
+
+
+def objetos():
+    """Retorna los objetos guardados en el directorio de respaldos."""
+    return sorted(os.listdir(os.path.join(DIRECTORIO_RESPALDOS, "objetos")))
+
+
+class TestRespaldos(unittest.TestCase):
+    """Pruebas para respaldos."""
+
+    def setUp(self):
+        persistencia.DATA_DIR = TEST_DATA_DIR
+        os.makedirs(TEST_DATA_DIR, exist_ok=True)
+        self._limpiar()
+        Cliente.crear(datos_cliente("AAA"))
+        Hotel.crear(datos_hotel())
+
+    def tearDown(self):
+        self._limpiar()
+
+    @staticmethod
+    def _limpiar():
+        """Elimina archivos de entidad y respaldos de prueba."""
+        for archivo in (ARCHIVO_CLIENTES, ARCHIVO_HOTELES):
+            for ruta in (archivo, arbol_paginado.ruta_arbol(archivo)):
+                if os.path.exists(ruta):
+                    os.remove(ruta)
+        shutil.rmtree(DIRECTORIO_RESPALDOS, ignore_errors=True)
+
+    def assertSinTemporales(self):  # pylint: disable=invalid-name
+        """Verifica que restaurar no deja temporales ni intencion."""
+        self.assertEqual([
+            nombre for nombre in os.listdir(TEST_DATA_DIR)
+            if nombre.endswith(unidad_trabajo.SUFIJO_TEMPORAL)
+            or nombre.startswith(unidad_trabajo.ARCHIVO_INTENCION)
+        ], [])
+
+    def test_respaldo_usa_enlaces_y_deduplica(self):
+        """Verifica enlaces duros y objetos compartidos entre respaldos."""
+        primero = respaldos.crear("uno")
+        self.assertEqual(set(primero["archivos"]),
+                         {"clientes.json", "hoteles.json"})
+        objeto = os.path.join(DIRECTORIO_RESPALDOS, "objetos",
+                              primero["archivos"]["clientes.json"])
+        self.assertTrue(os.path.samefile(objeto, ARCHIVO_CLIENTES))
+        Cliente.crear(datos_cliente("BBB"))
+        segundo = respaldos.crear("dos")
+        self.assertEqual(primero["archivos"]["hoteles.json"],
+                         segundo["archivos"]["hoteles.json"])
+        self.assertEqual(len(objetos()), 3)
+
+    def test_guardar_no_altera_respaldo(self):
+        """Verifica que escrituras posteriores no cambian el respaldo."""
+        respaldos.crear("uno")
+        Cliente.crear(datos_cliente("BBB"))
+        respaldos.restaurar("uno")
+        self.assertIsNone(Cliente.buscar("BBB"))
+        self.assertIsNotNone(Cliente.buscar("AAA"))
+        # Los archivos vivos ya son los objetos del respaldo
+        respaldos.restaurar("uno")
+        self.assertSinTemporales()
+
+    def test_restaurar_elimina_archivos_nuevos(self):
+        """Verifica que un archivo ausente en el respaldo se elimina."""
+        os.remove(ARCHIVO_HOTELES)
+        respaldos.crear("sin_hoteles")
+        Hotel.crear(datos_hotel())
+        respaldos.restaurar("sin_hoteles")
+        self.assertFalse(os.path.exists(ARCHIVO_HOTELES))
+        self.assertSinTemporales()
+
+    def test_sin_enlaces_copia(self):
+        """Verifica la copia cuando el sistema no permite enlaces."""
+        with patch("respaldos.os.link", side_effect=OSError("EXDEV")):
+            manifiesto = respaldos.crear("copia")
+        objeto = os.path.join(DIRECTORIO_RESPALDOS, "objetos",
+                              manifiesto["archivos"]["clientes.json"])
+        self.assertFalse(os.path.samefile(objeto, ARCHIVO_CLIENTES))
+        # pylint: disable=protected-access
+        self.assertEqual(respaldos._hash(objeto),
+                         respaldos._hash(ARCHIVO_CLIENTES))
+
+    def test_corte_inconsistente_se_repite(self):
+        """Verifica que una escritura durante el respaldo lo repite."""
+        original = respaldos._capturar  # pylint: disable=protected-access
+        llamadas = []
+
+        def capturar_con_escritura(*args):
+            llamadas.append(args[0])
+            if len(llamadas) == 1:
+                Cliente.crear(datos_cliente("CCC"))
+            return original(*args)
+
+        with patch("respaldos._capturar", side_effect=capturar_con_escritura):
+            respaldos.crear("concurrente")
+        self.assertGreater(len(llamadas), 2)
+        respaldos.restaurar("concurrente")
+        self.assertIsNotNone(Cliente.buscar("CCC"))
+        self.assertSinTemporales()
+
+    def test_restauracion_interrumpida_se_recupera(self):
+        """Verifica que recuperar termina una restauracion interrumpida."""
+        os.remove(ARCHIVO_HOTELES)
+        respaldos.crear("uno")
+        Cliente.crear(datos_cliente("BBB"))
+        Hotel.crear(datos_hotel())
+        with patch("respaldos._terminar",
+                   side_effect=[[], RuntimeError("caida")]):
+            with self.assertRaises(RuntimeError):
+                respaldos.restaurar("uno")
+        # Ningun archivo cambio antes de aplicar la intencion
+        self.assertIsNotNone(Cliente.buscar("BBB"))
+        self.assertTrue(os.path.exists(ARCHIVO_HOTELES))
+        self.assertEqual(
+            sorted(unidad_trabajo.recuperar(TEST_DATA_DIR)),
+            ["clientes.json", "hoteles.json"]
+        )
+        self.assertIsNone(Cliente.buscar("BBB"))
+        self.assertIsNotNone(Cliente.buscar("AAA"))
+        self.assertFalse(os.path.exists(ARCHIVO_HOTELES))
+        self.assertSinTemporales()
+
+    def test_falla_antes_de_la_intencion_no_cambia_nada(self):
+        """Verifica que un error al preparar no toca los archivos vivos."""
+        respaldos.crear("uno")
+        Cliente.crear(datos_cliente("BBB"))
+        with patch("respaldos._escribir", side_effect=OSError("disco")):
+            with self.assertRaises(OSError):
+                respaldos.restaurar("uno")
+        self.assertIsNotNone(Cliente.buscar("BBB"))
+        self.assertSinTemporales()
+
+    def test_backend_arbol_copia_los_arboles(self):
+        """Verifica que los .btree se respaldan y restauran copiados."""
+        persistencia.usar_backend("arbol")
+        try:
+            Cliente.crear(datos_cliente("ZZZ"))
+            manifiesto = respaldos.crear("arbol")
+            ruta_arbol = arbol_paginado.ruta_arbol(ARCHIVO_CLIENTES)
+            objeto = os.path.join(
+                DIRECTORIO_RESPALDOS, "objetos",
+                manifiesto["archivos"]["clientes.json.btree"]
+            )
+            self.assertFalse(os.path.samefile(objeto, ruta_arbol))
+            # pylint: disable=protected-access
+            contenido = respaldos._hash(objeto)
+            Cliente.crear(datos_cliente("YYY"))
+            self.assertEqual(respaldos._hash(objeto), contenido)
+            respaldos.restaurar("arbol")
+            self.assertIsNone(Cliente.buscar("YYY"))
+            self.assertIsNotNone(Cliente.buscar("ZZZ"))
+            self.assertFalse(os.path.samefile(objeto, ruta_arbol))
+            self.assertSinTemporales()
+        finally:
+            arbol_paginado.cerrar()
+            persistencia.usar_backend("json")
+
+    def test_eliminar_libera_objetos(self):
+        """Verifica que eliminar borra solo objetos sin referencias."""
+        respaldos.crear("uno")
+        Cliente.crear(datos_cliente("BBB"))
+        respaldos.crear("dos")
+        self.assertEqual(respaldos.eliminar("uno"), 1)
+        self.assertEqual([m["nombre"] for m in respaldos.listar()], ["dos"])
+        with self.assertRaises(ValueError):
+            respaldos.restaurar("uno")
+
+
+if __name__ == "__main__":
+    unittest.main()
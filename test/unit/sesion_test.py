@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Wed Oct 21 12:58:44 2026
+
+@author: Efrén Alejandro
+"""
+# flake8: noqa: E402
+import os
+import sys
+
+sys.path.insert(  # pylint: disable=wrong-import-position
+    0,
+    os.path.abspath(
+        os.path.join(os.path.dirname(__file__), "..", "..", "source")
+    )
+)
+
+import json
+import unittest
+from unittest.mock import patch
+
+import cambios
+import persistencia
+from sesion import Sesion
+from hotel import Hotel
+from tipo_cuarto import TipoCuarto
+from lector_json import leer_archivo_json
+
+
+TEST_DATA_DIR = os.path.join(os.path.dirname(__file__), "datos")
+ARCHIVO_HOTELES = os.path.join(TEST_DATA_DIR, "hoteles.json")
+ARCHIVO_TIPOS = os.path.join(TEST_DATA_DIR, "tipos_cuarto.json")
+ARCHIVO_CAMBIOS = cambios.ruta_flujo(TEST_DATA_DIR)
+ARCHIVOS = [ARCHIVO_HOTELES, ARCHIVO_TIPOS, ARCHIVO_CAMBIOS]
+
+
+def datos_hotel(rfc="CAM123456ABC"):
+    """Retorna un diccionario de hotel."""
+    return {
+        "nombre": "Hotel", "nombre_fiscal": "Hotel SA",
+        "rfc": rfc, "direccion": "Calle 1", "estado": "Jalisco",
+        "clasificacion": "5E", "estatus": "activo"
+    }
+
+
+def leer(ruta):
+    """Lee un archivo JSON."""
+    with open(ruta, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+class TestSesion(unittest.TestCase):
+    """Pruebas para Sesion."""
+
+    def setUp(self):
+        persistencia.DATA_DIR = TEST_DATA_DIR
+        os.makedirs(TEST_DATA_DIR, exist_ok=True)
+        for archivo in ARCHIVOS:
+            if os.path.exists(archivo):
+                os.remove(archivo)
+        Hotel.crear(datos_hotel())
+
+    def tearDown(self):
+        cambios.habilitar(False)
+        persistencia.fijar_unidad(None)
+        for archivo in ARCHIVOS:
+            if os.path.exists(archivo):
+                os.remove(archivo)
+
+    def test_mapa_de_identidad_y_una_sola_lectura(self):
+        """Verifica el mismo objeto y una sola carga del archivo."""
+        with patch("unidad_trabajo.leer_archivo_json",
+                   side_effect=leer_archivo_json) as lector:
+            with Sesion() as sesion:
+                hotel = sesion.obtener(Hotel, "CAM123456ABC")
+                hotel.modificar(estatus="inactivo")
+                self.assertIs(sesion.obtener(Hotel, "CAM123456ABC"), hotel)
+                self.assertEqual(Hotel.buscar("CAM123456ABC")["estatus"],
+                                 "inactivo")
+                self.assertIsNone(sesion.obtener(Hotel, "NOEXISTE"))
+        self.assertEqual(lector.call_count, 1)
+        self.assertEqual(leer(ARCHIVO_HOTELES)["CAM123456ABC"]["estatus"],
+                         "inactivo")
+
+    def test_flush_escribe_sucios_una_vez(self):
+        """Verifica que flush escribe y limpia las instancias sucias."""
+        with Sesion() as sesion:
+            hotel = sesion.obtener(Hotel, "CAM123456ABC")
+            nuevo = sesion.crear(Hotel, datos_hotel("OTR123456ABC"))
+            self.assertEqual(sesion.sucios(), [nuevo])
+            hotel.modificar(estado="Sonora")
+            hotel.modificar(estatus="inactivo")
+            self.assertEqual(sesion.sucios(), [hotel, nuevo])
+            self.assertNotIn("OTR123456ABC", leer(ARCHIVO_HOTELES))
+            self.assertTrue(sesion.flush())
+            self.assertEqual(sesion.sucios(), [])
+            self.assertIn("OTR123456ABC", leer(ARCHIVO_HOTELES))
+            self.assertIs(sesion.obtener(Hotel, "OTR123456ABC"), nuevo)
+
+    def test_cambios_por_llave_se_compactan(self):
+        """Verifica un evento por llave con el primer antes."""
+        cambios.habilitar(True)
+        with Sesion() as sesion:
+            hotel = sesion.obtener(Hotel, "CAM123456ABC")
+            hotel.modificar(estado="Sonora")
+            hotel.modificar(estatus="inactivo")
+            temporal = sesion.crear(TipoCuarto, {
+                "rfc_hotel": "CAM123456ABC", "tipo": "DOBLE", "costo": 1
+            })
+            self.assertTrue(sesion.eliminar(temporal))
+        eventos = cambios.Lector(TEST_DATA_DIR).leer()
+        self.assertEqual(len(eventos), 1)
+        self.assertEqual(eventos[0]["antes"]["estado"], "Jalisco")
+        self.assertEqual(eventos[0]["despues"]["estatus"], "inactivo")
+        self.assertEqual(leer(ARCHIVO_TIPOS), {})
+
+    def test_excepcion_descarta_cambios_y_mapa(self):
+        """Verifica que una excepcion no escribe nada."""
+        sesion = Sesion()
+        with self.assertRaises(RuntimeError):
+            with sesion:
+                sesion.obtener(Hotel, "CAM123456ABC").modificar(
+                    estatus="inactivo"
+                )
+                raise RuntimeError("falla")
+        self.assertEqual(leer(ARCHIVO_HOTELES)["CAM123456ABC"]["estatus"],
+                         "activo")
+        self.assertEqual(sesion.sucios(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,262 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 16:41:27 2026
+
+@author: Efrén Alejandro
+"""
+# flake8: noqa: E402
+import os
+import sys
+
+sys.path.insert(  # pylint: disable=wrong-import-position
+    0,
+    os.path.abspath(
+        os.path.join(os.path.dirname(__file__), "..", "..", "source")
+    )
+)
+
+import datetime
+import unittest
+
+import cotizador
+import persistencia
+from hotel import Hotel
+from cliente import Cliente
+from tipo_cuarto import TipoCuarto
+from reservacion import Reservacion
+from tarifas import (
+    ReglasTarifa,
+    CalendarioTarifas,
+    MotorTarifas,
+    configurar_motor
+)
+
+
+TEST_DATA_DIR = os.path.join(os.path.dirname(__file__), "datos")
+ARCHIVOS = [
+    os.path.join(TEST_DATA_DIR, nombre) for nombre in (
+        "hoteles.json", "clientes.json", "tipos_cuarto.json",
+        "reservaciones.json"
+    )
+]
+
+# 2026-03-06 es viernes
+VIERNES = datetime.date(2026, 3, 6)
+
+
+def limpiar_archivos():
+    """Elimina los archivos de datos de prueba."""
+    for archivo in ARCHIVOS:
+        if os.path.exists(archivo):
+            os.remove(archivo)
+
+
+def suma_por_noche(calendario, fecha, noches):
+    """Calcula el precio de la estancia noche por noche."""
+    return round(sum(
+        calendario.tarifa(fecha + datetime.timedelta(days=i))
+        for i in range(noches)
+    ), 2)
+
+
+class TestReglasTarifa(unittest.TestCase):
+    """Pruebas para ReglasTarifa."""
+
+    def test_sin_reglas_factor_uno(self):
+        """Verifica que sin reglas el factor es 1."""
+        self.assertEqual(ReglasTarifa().factor(VIERNES), 1.0)
+
+    def test_fin_de_semana(self):
+        """Verifica el factor de fin de semana para viernes y jueves."""
+        reglas = ReglasTarifa(factor_fin_de_semana=1.5)
+        self.assertEqual(reglas.factor(VIERNES), 1.5)
+        self.assertEqual(
+            reglas.factor(VIERNES - datetime.timedelta(days=1)), 1.0
+        )
+
+    def test_temporada_inclusiva(self):
+        """Verifica que la temporada incluye sus extremos."""
+        reglas = ReglasTarifa(
+            temporadas=[("2026-03-01", "2026-03-06", 2.0)],
+            dias_fin_de_semana=()
+        )
+        self.assertEqual(reglas.factor(VIERNES), 2.0)
+        self.assertEqual(
+            reglas.factor(VIERNES + datetime.timedelta(days=1)), 1.0
+        )
+
+    def test_nivel_de_ocupacion_mas_alto(self):
+        """Verifica que aplica el nivel de ocupacion mas alto alcanzado."""
+        reglas = ReglasTarifa(
+            dias_fin_de_semana=(),
+            niveles_ocupacion=[(0.9, 1.5), (0.7, 1.2)]
+        )
+        self.assertEqual(reglas.factor(VIERNES, 0.5), 1.0)
+        self.assertEqual(reglas.factor(VIERNES, 0.8), 1.2)
+        self.assertEqual(reglas.factor(VIERNES, 0.95), 1.5)
+
+
+class TestCalendarioTarifas(unittest.TestCase):
+    """Pruebas para CalendarioTarifas."""
+
+    def setUp(self):
+        reglas = ReglasTarifa(
+            temporadas=[("2026-03-10", "2026-03-20", 1.3)],
+            factor_fin_de_semana=1.25
+        )
+        self.cal = CalendarioTarifas(
+            1000.0, reglas, "2026-03-01", 60,
+            {datetime.date(2026, 3, 4): 1.0}
+        )
+
+    def test_estancia_igual_a_suma_por_noche(self):
+        """Verifica que el rango de prefijos coincide con la suma."""
+        for noches in (1, 3, 7, 20):
+            self.assertEqual(
+                self.cal.precio_estancia(VIERNES, noches),
+                suma_por_noche(self.cal, VIERNES, noches)
+            )
+
+    def test_estancia_fuera_del_calendario(self):
+        """Verifica estancias antes, despues y cruzando el calendario."""
+        casos = [
+            (datetime.date(2026, 2, 1), 5),
+            (datetime.date(2026, 2, 25), 10),
+            (datetime.date(2026, 4, 25), 10),
+            (datetime.date(2026, 6, 1), 3),
+        ]
+        for fecha, noches in casos:
+            self.assertEqual(
+                self.cal.precio_estancia(fecha, noches),
+                suma_por_noche(self.cal, fecha, noches)
+            )
+
+    def test_acepta_fecha_iso(self):
+        """Verifica que acepta la fecha como texto ISO."""
+        self.assertEqual(
+            self.cal.precio_estancia("2026-03-06", 2),
+            self.cal.precio_estancia(VIERNES, 2)
+        )
+
+    def test_noches_invalidas(self):
+        """Verifica que noches no positivas lanzan ValueError."""
+        with self.assertRaises(ValueError):
+            self.cal.precio_estancia(VIERNES, 0)
+
+
+class TestMotorTarifas(unittest.TestCase):
+    """Pruebas para MotorTarifas con el catalogo persistido."""
+
+    def setUp(self):
+        persistencia.DATA_DIR = TEST_DATA_DIR
+        os.makedirs(TEST_DATA_DIR, exist_ok=True)
+        limpiar_archivos()
+        Hotel.crear({
+            "nombre": "Hotel Prueba",
+            "nombre_fiscal": "Prueba SA",
+            "rfc": "CAM123456ABC",
+            "direccion": "Calle 1",
+            "estado": "Jalisco",
+            "clasificacion": "5E",
+            "estatus": "activo"
+        })
+        Cliente.crear({
+            "nombre": "Juan Perez",
+            "rfc": "PEJJ800101ABC",
+            "sexo": "M",
+            "compania": "Empresa SA",
+            "forma_pago": "tarjeta",
+            "estatus": "activo"
+        })
+        TipoCuarto.crear({
+            "rfc_hotel": "CAM123456ABC",
+            "tipo": "DOBLE",
+            "costo": 1000.00
+        })
+        self.motor = MotorTarifas(
+            ReglasTarifa(factor_fin_de_semana=1.5), inicio="2026-01-01"
+        )
+
+    def tearDown(self):
+        configurar_motor(None)
+        limpiar_archivos()
+
+    def test_precio_estancia_fin_de_semana(self):
+        """Verifica viernes, sabado y domingo con factor 1.5."""
+        self.assertEqual(
+            self.motor.precio_estancia(
+                "CAM123456ABC", "DOBLE", VIERNES, 3
+            ),
+            4000.00
+        )
+
+    def test_tipo_inexistente_lanza_error(self):
+        """Verifica que un tipo inexistente lanza ValueError."""
+        with self.assertRaises(ValueError):
+            self.motor.precio_estancia("CAM123456ABC", "SUITE", VIERNES, 1)
+
+    def test_ocupacion_invalida_calendario(self):
+        """Verifica que la ocupacion afecta al calendario reconstruido."""
+        motor = MotorTarifas(
+            ReglasTarifa(dias_fin_de_semana=(),
+                         niveles_ocupacion=[(0.8, 2.0)]),
+            inicio="2026-01-01"
+        )
+        self.assertEqual(
+            motor.precio_estancia("CAM123456ABC", "DOBLE", VIERNES, 1),
+            1000.00
+        )
+        motor.actualizar_ocupacion("CAM123456ABC", VIERNES, 0.85)
+        self.assertEqual(
+            motor.precio_estancia("CAM123456ABC", "DOBLE", VIERNES, 1),
+            2000.00
+        )
+
+    def test_reservacion_usa_motor_configurado(self):
+        """Verifica que Reservacion.crear aplica la tarifa dinamica."""
+        configurar_motor(self.motor)
+        reservacion = Reservacion.crear({
+            "rfc_hotel": "CAM123456ABC",
+            "rfc_cliente": "PEJJ800101ABC",
+            "fecha": "2026-03-06",
+            "noches": 3,
+            "detalle": [{"tipo": "DOBLE", "cantidad": 2}]
+        })
+        self.assertEqual(reservacion.importe, 8000.00)
+        self.assertEqual(reservacion.detalle[0]["costo"], 1333.33)
+
+    def test_importe_igual_a_precio_estancia(self):
+        """Verifica el importe cuando el promedio no es centavo exacto."""
+        configurar_motor(self.motor)
+        # Viernes 1500 + sabado 1500 + domingo 1000: promedio 1333.333...
+        precio = self.motor.precio_estancia("CAM123456ABC", "DOBLE",
+                                            VIERNES, 3)
+        datos = {
+            "rfc_hotel": "CAM123456ABC",
+            "fecha": VIERNES.isoformat(),
+            "noches": 3,
+            "detalle": [{"tipo": "DOBLE", "cantidad": 3}]
+        }
+        cotizacion = cotizador.cotizar(datos)
+        reservacion = Reservacion.crear(dict(
+            datos, rfc_cliente="PEJJ800101ABC",
+            detalle=[{"tipo": "DOBLE", "cantidad": 3}]
+        ))
+        self.assertEqual(reservacion.importe, precio * 3)
+        self.assertEqual(cotizacion["importe"], reservacion.importe)
+        self.assertEqual(reservacion.detalle[0]["precio_estancia"], precio)
+
+    def test_reservacion_sin_motor_usa_costo_plano(self):
+        """Verifica que sin motor se conserva el costo del catalogo."""
+        reservacion = Reservacion.crear({
+            "rfc_hotel": "CAM123456ABC",
+            "rfc_cliente": "PEJJ800101ABC",
+            "fecha": "2026-03-06",
+            "noches": 3,
+            "detalle": [{"tipo": "DOBLE", "cantidad": 2}]
+        })
+        self.assertEqual(reservacion.importe, 6000.00)
+
+
+if __name__ == "__main__":
+    unittest.main()
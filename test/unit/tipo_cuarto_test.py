@@ -400,5 +400,48 @@ class TestTipoCuartoArchivocorrupto(unittest.TestCase):
             )
 
 
+class TestTipoCuartoOperacionesMasivas(unittest.TestCase):
+    """Pruebas para TipoCuarto.modificar_donde y eliminar_donde."""
+
+    def setUp(self):
+        persistencia.DATA_DIR = TEST_DATA_DIR
+        os.makedirs(TEST_DATA_DIR, exist_ok=True)
+        if os.path.exists(ARCHIVO_TEST):
+            os.remove(ARCHIVO_TEST)
+        for rfc in ("HOTEL1", "HOTEL2"):
+            for tipo in ("DOBLE", "SUITE"):
+                TipoCuarto.crear({"rfc_hotel": rfc, "tipo": tipo,
+                                  "costo": 1000.00})
+
+    def tearDown(self):
+        if os.path.exists(ARCHIVO_TEST):
+            os.remove(ARCHIVO_TEST)
+
+    def test_modificar_donde_costo(self):
+        """Verifica el cambio de precio de todos los cuartos de un tipo."""
+        total = TipoCuarto.modificar_donde({"tipo": "SUITE"}, costo=2500.00)
+        self.assertEqual(total, 2)
+        self.assertEqual(
+            TipoCuarto.buscar("HOTEL2", "SUITE")["costo"], 2500.00
+        )
+        self.assertEqual(
+            TipoCuarto.buscar("HOTEL2", "DOBLE")["costo"], 1000.00
+        )
+
+    def test_modificar_donde_costo_invalido(self):
+        """Verifica que un costo invalido lanza error y no persiste."""
+        with self.assertRaises(ValueError):
+            TipoCuarto.modificar_donde(lambda r: True, costo=-1)
+        self.assertEqual(
+            TipoCuarto.buscar("HOTEL1", "DOBLE")["costo"], 1000.00
+        )
+
+    def test_eliminar_donde_por_hotel(self):
+        """Verifica que se eliminan todos los tipos de un hotel."""
+        total = TipoCuarto.eliminar_donde({"rfc_hotel": "HOTEL1"})
+        self.assertEqual(total, 2)
+        self.assertIsNone(TipoCuarto.buscar("HOTEL1", "DOBLE"))
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,271 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 14:05:52 2026
+
+@author: Efrén Alejandro
+"""
+# flake8: noqa: E402
+import os
+import sys
+
+sys.path.insert(  # pylint: disable=wrong-import-position
+    0,
+    os.path.abspath(
+        os.path.join(os.path.dirname(__file__), "..", "..", "source")
+    )
+)
+
+import json
+import shutil
+import unittest
+from unittest.mock import patch
+
+import arbol_paginado
+import persistencia
+import traza
+from catalogos import ClasificacionHotel
+from cliente import Cliente
+from hotel import Hotel
+from reservacion import Reservacion
+from tipo_cuarto import TipoCuarto
+
+
+TEST_DATA_DIR = os.path.join(os.path.dirname(__file__), "datos")
+DIR_ORIGEN = os.path.join(TEST_DATA_DIR, "traza_origen")
+DIR_REPRODUCCION = os.path.join(TEST_DATA_DIR, "traza_reproduccion")
+ARCHIVO_TRAZA = os.path.join(TEST_DATA_DIR, "traza_prueba.jsonl")
+
+
+def grabar_carga(ruta):
+    """Graba una carga de trabajo representativa en la ruta dada."""
+    with traza.Grabadora(ruta):
+        hotel = Hotel.crear({
+            "nombre": "Hotel Prueba",
+            "nombre_fiscal": "Prueba SA",
+            "rfc": "CAM123456ABC",
+            "direccion": "Calle 1",
+            "estado": "Jalisco",
+            "clasificacion": "5E",
+            "estatus": "activo"
+        })
+        Cliente.crear({
+            "nombre": "Juan Perez",
+            "rfc": "PEJJ800101ABC",
+            "sexo": "M",
+            "compania": "Empresa SA",
+            "forma_pago": "tarjeta",
+            "estatus": "activo"
+        })
+        TipoCuarto.crear({
+            "rfc_hotel": "CAM123456ABC",
+            "tipo": "DOBLE",
+            "costo": 1500.00
+        })
+        hotel.modificar(clasificacion=ClasificacionHotel.TRES_ESTRELLAS)
+        reservacion = Reservacion.crear({
+            "rfc_hotel": "CAM123456ABC",
+            "rfc_cliente": "PEJJ800101ABC",
+            "fecha": "2026-03-01",
+            "noches": 2,
+            "detalle": [{"tipo": "DOBLE", "cantidad": 1}]
+        })
+        Reservacion.buscar(reservacion.uuid)
+        Cliente.buscar("PEJJ800101ABC")
+
+
+def leer(ruta):
+    """Lee un archivo JSON de datos."""
+    with open(ruta, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+class TestGrabadora(unittest.TestCase):
+    """Pruebas para la grabacion de trazas."""
+
+    def setUp(self):
+        shutil.rmtree(DIR_ORIGEN, ignore_errors=True)
+        os.makedirs(DIR_ORIGEN)
+        persistencia.DATA_DIR = DIR_ORIGEN
+
+    def tearDown(self):
+        shutil.rmtree(DIR_ORIGEN, ignore_errors=True)
+        for ruta in (ARCHIVO_TRAZA, ARCHIVO_TRAZA + ".gz"):
+            if os.path.exists(ruta):
+                os.remove(ruta)
+
+    def test_graba_una_linea_por_llamada(self):
+        """Verifica que cada llamada produce una entrada en la traza."""
+        grabar_carga(ARCHIVO_TRAZA)
+        entradas = list(traza.leer_traza(ARCHIVO_TRAZA))
+        self.assertEqual(
+            [e["op"] for e in entradas],
+            ["Hotel.crear", "Cliente.crear", "TipoCuarto.crear",
+             "Hotel.modificar", "Reservacion.crear", "Reservacion.buscar",
+             "Cliente.buscar"]
+        )
+
+    def test_graba_argumentos_antes_de_la_llamada(self):
+        """Verifica que se graban los datos originales de Reservacion."""
+        grabar_carga(ARCHIVO_TRAZA)
+        entrada = list(traza.leer_traza(ARCHIVO_TRAZA))[4]
+        self.assertNotIn("importe", entrada["a"][0])
+
+    def test_graba_enums_como_valor(self):
+        """Verifica que los enums se graban con su valor persistido."""
+        grabar_carga(ARCHIVO_TRAZA)
+        entrada = list(traza.leer_traza(ARCHIVO_TRAZA))[3]
+        self.assertEqual(entrada["k"], {"clasificacion": "3E"})
+        self.assertEqual(entrada["i"]["rfc"], "CAM123456ABC")
+
+    def test_restaura_metodos_originales(self):
+        """Verifica que al detener se restauran los metodos."""
+        original = Hotel.__dict__["crear"]
+        grabar_carga(ARCHIVO_TRAZA)
+        self.assertIs(Hotel.__dict__["crear"], original)
+
+    def test_graba_busqueda_y_consulta(self):
+        """Verifica que se graban buscar_texto y el plan de consultar."""
+        with traza.Grabadora(ARCHIVO_TRAZA):
+            Cliente.buscar_texto("juan")
+            consulta = Cliente.consultar().filtrar(estatus="activo")
+            consulta.ordenar("nombre").limitar(5).todos()
+            Cliente.consultar().filtrar(lambda r: True).contar()
+        self.assertNotIn("buscar_texto", Cliente.__dict__)
+        self.assertNotIn("consultar", Cliente.__dict__)
+        entradas = list(traza.leer_traza(ARCHIVO_TRAZA))
+        self.assertEqual(
+            [e["op"] for e in entradas],
+            ["Cliente.buscar_texto", "Cliente.consultar",
+             "Cliente.consultar"]
+        )
+        plan = entradas[1]["a"][0]
+        self.assertEqual(plan["igualdades"], {"estatus": "activo"})
+        self.assertEqual(plan["orden"], "nombre")
+        self.assertEqual(plan["limite"], 5)
+        self.assertEqual(plan["ejecutar"], "todos")
+        self.assertEqual(entradas[2].get("x"), 1)
+
+    def test_traza_comprimida(self):
+        """Verifica que la traza .gz se puede leer de vuelta."""
+        grabar_carga(ARCHIVO_TRAZA + ".gz")
+        entradas = list(traza.leer_traza(ARCHIVO_TRAZA + ".gz"))
+        self.assertEqual(len(entradas), 7)
+
+
+class TestReproducir(unittest.TestCase):
+    """Pruebas para la reproduccion de trazas."""
+
+    def setUp(self):
+        for directorio in (DIR_ORIGEN, DIR_REPRODUCCION):
+            shutil.rmtree(directorio, ignore_errors=True)
+            os.makedirs(directorio)
+        persistencia.DATA_DIR = DIR_ORIGEN
+        grabar_carga(ARCHIVO_TRAZA)
+
+    def tearDown(self):
+        for directorio in (DIR_ORIGEN, DIR_REPRODUCCION):
+            shutil.rmtree(directorio, ignore_errors=True)
+        if os.path.exists(ARCHIVO_TRAZA):
+            os.remove(ARCHIVO_TRAZA)
+
+    def test_reproduce_mismo_estado(self):
+        """Verifica que la reproduccion produce el mismo almacenamiento."""
+        traza.reproducir(ARCHIVO_TRAZA, data_dir=DIR_REPRODUCCION)
+        for archivo in ("hoteles.json", "clientes.json",
+                        "tipos_cuarto.json"):
+            self.assertEqual(
+                leer(os.path.join(DIR_ORIGEN, archivo)),
+                leer(os.path.join(DIR_REPRODUCCION, archivo))
+            )
+        reservaciones = leer(
+            os.path.join(DIR_REPRODUCCION, "reservaciones.json")
+        )
+        self.assertEqual(len(reservaciones), 1)
+
+    def test_reporte_de_rendimiento(self):
+        """Verifica el contenido del reporte de reproduccion."""
+        reporte = traza.reproducir(ARCHIVO_TRAZA, data_dir=DIR_REPRODUCCION)
+        self.assertEqual(reporte["operaciones"], 7)
+        self.assertEqual(reporte["errores"], 0)
+        self.assertGreater(reporte["throughput_ops_s"], 0)
+        self.assertIn("Reservacion.crear", reporte["por_operacion"])
+        self.assertEqual(reporte["total"]["n"], 7)
+
+    def test_reproduce_cancelacion(self):
+        """Verifica que cancelar encuentra la reservacion reproducida."""
+        with traza.Grabadora(ARCHIVO_TRAZA):
+            reservacion = Reservacion.crear({
+                "rfc_hotel": "CAM123456ABC",
+                "rfc_cliente": "PEJJ800101ABC",
+                "fecha": "2026-04-01",
+                "noches": 1,
+                "detalle": [{"tipo": "DOBLE", "cantidad": 1}]
+            })
+            reservacion.cancelar()
+        shutil.copytree(DIR_ORIGEN, DIR_REPRODUCCION, dirs_exist_ok=True)
+        reporte = traza.reproducir(ARCHIVO_TRAZA, data_dir=DIR_REPRODUCCION)
+        self.assertEqual(reporte["errores"], 0)
+        reproducidas = leer(
+            os.path.join(DIR_REPRODUCCION, "reservaciones.json")
+        )
+        self.assertNotIn(reservacion.uuid, reproducidas)
+        self.assertEqual(
+            reproducidas, leer(os.path.join(DIR_ORIGEN, "reservaciones.json"))
+        )
+
+    def test_cuenta_fallos_reportados(self):
+        """Verifica que un retorno False o None cuenta como error."""
+        with traza.Grabadora(ARCHIVO_TRAZA):
+            Hotel.eliminar("NOEXISTE")
+            Cliente.crear({
+                "nombre": "Ana Ruiz", "rfc": "RUAA900101ABC", "sexo": "F",
+                "compania": "Empresa SA", "forma_pago": "tarjeta",
+                "estatus": "activo"
+            })
+            Cliente.buscar("NOEXISTE")
+        reporte = traza.reproducir(ARCHIVO_TRAZA, data_dir=DIR_REPRODUCCION)
+        self.assertEqual(reporte["operaciones"], 3)
+        self.assertEqual(reporte["errores"], 1)
+
+    def test_restaura_data_dir(self):
+        """Verifica que la reproduccion restaura el directorio de datos."""
+        traza.reproducir(ARCHIVO_TRAZA, data_dir=DIR_REPRODUCCION)
+        self.assertEqual(persistencia.DATA_DIR, DIR_ORIGEN)
+
+    def test_reproduce_consultas_con_backend(self):
+        """Verifica que las consultas se reproducen en el backend dado."""
+        with traza.Grabadora(ARCHIVO_TRAZA):
+            Hotel.buscar_texto("prueba")
+            Hotel.consultar().filtrar(estatus="activo").pagina(1)
+            Hotel.consultar().filtrar(lambda r: True).todos()
+        shutil.copytree(DIR_ORIGEN, DIR_REPRODUCCION, dirs_exist_ok=True)
+        try:
+            reporte = traza.reproducir(ARCHIVO_TRAZA,
+                                       data_dir=DIR_REPRODUCCION,
+                                       backend="arbol")
+        finally:
+            arbol_paginado.cerrar()
+        self.assertEqual(reporte["operaciones"], 2)
+        self.assertEqual(reporte["errores"], 0)
+        self.assertEqual(reporte["omitidas"], 1)
+        self.assertIn("Hotel.consultar", reporte["por_operacion"])
+        self.assertTrue(os.path.exists(arbol_paginado.ruta_arbol(
+            os.path.join(DIR_REPRODUCCION, "hoteles.json")
+        )))
+        self.assertEqual(persistencia.backend_actual(), "json")
+
+    def test_ritmo_respeta_tiempos(self):
+        """Verifica que con ritmo se espera el tiempo grabado."""
+        entradas = list(traza.leer_traza(ARCHIVO_TRAZA))
+        with open(ARCHIVO_TRAZA, "w", encoding="utf-8") as f:
+            for i, entrada in enumerate(entradas):
+                entrada["t"] = i * 10.0
+                f.write(json.dumps(entrada) + "\n")
+        with patch("traza.time.sleep") as mock_sleep:
+            traza.reproducir(ARCHIVO_TRAZA, ritmo=True,
+                             data_dir=DIR_REPRODUCCION)
+        self.assertEqual(mock_sleep.call_count, len(entradas) - 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
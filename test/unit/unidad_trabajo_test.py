@@ -0,0 +1,215 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Wed Oct 21 11:48:15 2026
+
+@author: Efrén Alejandro
+"""
+# flake8: noqa: E402
+import os
+import sys
+
+sys.path.insert(  # pylint: disable=wrong-import-position
+    0,
+    os.path.abspath(
+        os.path.join(os.path.dirname(__file__), "..", "..", "source")
+    )
+)
+
+import asyncio
+import json
+import unittest
+from unittest.mock import patch
+
+import persistencia
+import unidad_trabajo
+from unidad_trabajo import UnidadTrabajo
+from cliente import Cliente
+from hotel import Hotel
+from reservacion import Reservacion
+from tipo_cuarto import TipoCuarto
+
+
+TEST_DATA_DIR = os.path.join(os.path.dirname(__file__), "datos")
+ARCHIVO_HOTELES = os.path.join(TEST_DATA_DIR, "hoteles.json")
+ARCHIVO_CLIENTES = os.path.join(TEST_DATA_DIR, "clientes.json")
+ARCHIVO_TIPOS = os.path.join(TEST_DATA_DIR, "tipos_cuarto.json")
+ARCHIVO_RESERVACIONES = os.path.join(TEST_DATA_DIR, "reservaciones.json")
+ARCHIVO_INTENCION = os.path.join(TEST_DATA_DIR,
+                                 unidad_trabajo.ARCHIVO_INTENCION)
+ARCHIVOS = [ARCHIVO_HOTELES, ARCHIVO_CLIENTES, ARCHIVO_TIPOS,
+            ARCHIVO_RESERVACIONES, ARCHIVO_INTENCION,
+            os.path.join(TEST_DATA_DIR, unidad_trabajo.ARCHIVO_CANDADO)]
+
+
+def datos_hotel():
+    """Retorna un diccionario de hotel."""
+    return {
+        "nombre": "Hotel", "nombre_fiscal": "Hotel SA",
+        "rfc": "CAM123456ABC", "direccion": "Calle 1", "estado": "Jalisco",
+        "clasificacion": "5E", "estatus": "activo"
+    }
+
+
+def datos_cliente():
+    """Retorna un diccionario de cliente."""
+    return {
+        "nombre": "Juan Pérez", "rfc": "PEJJ800101ABC", "sexo": "M",
+        "compania": "Empresa SA", "forma_pago": "tarjeta",
+        "estatus": "activo"
+    }
+
+
+def leer(ruta):
+    """Lee un archivo JSON."""
+    with open(ruta, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+class TestUnidadTrabajo(unittest.TestCase):
+    """Pruebas para UnidadTrabajo."""
+
+    def setUp(self):
+        persistencia.DATA_DIR = TEST_DATA_DIR
+        os.makedirs(TEST_DATA_DIR, exist_ok=True)
+        self._limpiar()
+
+    def tearDown(self):
+        persistencia.fijar_unidad(None)
+        self._limpiar()
+
+    @staticmethod
+    def _limpiar():
+        """Elimina archivos de prueba y temporales."""
+        for archivo in ARCHIVOS:
+            if os.path.exists(archivo):
+                os.remove(archivo)
+        for nombre in os.listdir(TEST_DATA_DIR):
+            if nombre.endswith(unidad_trabajo.SUFIJO_TEMPORAL):
+                os.remove(os.path.join(TEST_DATA_DIR, nombre))
+
+    def test_confirma_varios_archivos_con_una_escritura(self):
+        """Verifica que cada archivo se escribe una vez al confirmar."""
+        original = unidad_trabajo._escribir  # pylint: disable=protected-access
+        with patch("unidad_trabajo._escribir",
+                   side_effect=original) as escribir:
+            with UnidadTrabajo():
+                Hotel.crear(datos_hotel())
+                Cliente.crear(datos_cliente())
+                for tipo in ("SENCILLA", "DOBLE"):
+                    TipoCuarto.crear({"rfc_hotel": "CAM123456ABC",
+                                      "tipo": tipo, "costo": 1000})
+                self.assertFalse(os.path.exists(ARCHIVO_TIPOS))
+        # Tres archivos de entidad y la intencion
+        self.assertEqual(escribir.call_count, 4)
+        self.assertEqual(sorted(leer(ARCHIVO_TIPOS)),
+                         ["CAM123456ABC_DOBLE", "CAM123456ABC_SENCILLA"])
+        self.assertIn("CAM123456ABC", leer(ARCHIVO_HOTELES))
+        self.assertFalse(os.path.exists(ARCHIVO_INTENCION))
+
+    def test_validaciones_ven_registros_pendientes(self):
+        """Verifica que una reservacion valida contra datos pendientes."""
+        with UnidadTrabajo():
+            Hotel.crear(datos_hotel())
+            Cliente.crear(datos_cliente())
+            TipoCuarto.crear({"rfc_hotel": "CAM123456ABC",
+                              "tipo": "DOBLE", "costo": 1500})
+            reservacion = Reservacion.crear({
+                "rfc_hotel": "CAM123456ABC", "rfc_cliente": "PEJJ800101ABC",
+                "fecha": "2026-03-01", "noches": 2,
+                "detalle": [{"tipo": "DOBLE", "cantidad": 1}]
+            })
+            self.assertIsNotNone(reservacion)
+            self.assertIsNotNone(Hotel.buscar("CAM123456ABC"))
+        self.assertEqual(
+            leer(ARCHIVO_RESERVACIONES)[reservacion.uuid]["importe"], 3000
+        )
+
+    def test_excepcion_descarta_todo(self):
+        """Verifica que una excepcion no deja cambios en disco."""
+        Hotel.crear(datos_hotel())
+        with self.assertRaises(RuntimeError):
+            with UnidadTrabajo():
+                Hotel.eliminar("CAM123456ABC")
+                Cliente.crear(datos_cliente())
+                raise RuntimeError("falla")
+        self.assertIn("CAM123456ABC", leer(ARCHIVO_HOTELES))
+        self.assertFalse(os.path.exists(ARCHIVO_CLIENTES))
+        self.assertIsNone(persistencia.unidad_activa())
+
+    def test_falla_al_escribir_no_modifica_archivos(self):
+        """Verifica que un error antes de la intencion no aplica nada."""
+        Hotel.crear(datos_hotel())
+        original = unidad_trabajo._escribir  # pylint: disable=protected-access
+        llamadas = []
+
+        def escribir_y_fallar(ruta, contenido):
+            llamadas.append(ruta)
+            if len(llamadas) == 2:
+                raise OSError("disco lleno")
+            original(ruta, contenido)
+
+        with patch("unidad_trabajo._escribir", side_effect=escribir_y_fallar):
+            with patch("builtins.print") as mock_print:
+                with UnidadTrabajo():
+                    Hotel.eliminar("CAM123456ABC")
+                    Cliente.crear(datos_cliente())
+                self.assertIn("ERROR", mock_print.call_args[0][0])
+        self.assertIn("CAM123456ABC", leer(ARCHIVO_HOTELES))
+        self.assertFalse(os.path.exists(ARCHIVO_CLIENTES))
+        self.assertFalse(any(n.endswith(unidad_trabajo.SUFIJO_TEMPORAL)
+                             for n in os.listdir(TEST_DATA_DIR)))
+
+    def test_recuperar_termina_confirmacion_interrumpida(self):
+        """Verifica que recuperar aplica una intencion ya escrita."""
+        with patch("unidad_trabajo._terminar"):
+            with UnidadTrabajo():
+                Hotel.crear(datos_hotel())
+                Cliente.crear(datos_cliente())
+        self.assertTrue(os.path.exists(ARCHIVO_INTENCION))
+        self.assertFalse(os.path.exists(ARCHIVO_HOTELES))
+        huerfano = os.path.join(TEST_DATA_DIR,
+                                "hoteles.json.viejo" +
+                                unidad_trabajo.SUFIJO_TEMPORAL)
+        with open(huerfano, "w", encoding="utf-8") as f:
+            f.write("{}")
+        aplicados = unidad_trabajo.recuperar()
+        self.assertEqual(sorted(aplicados), ["clientes.json", "hoteles.json"])
+        self.assertIsNotNone(Cliente.buscar("PEJJ800101ABC"))
+        self.assertFalse(os.path.exists(huerfano))
+        self.assertFalse(os.path.exists(ARCHIVO_INTENCION))
+
+    def test_unidad_anidada_se_une_a_la_externa(self):
+        """Verifica que la unidad interna confirma con la externa."""
+        with UnidadTrabajo() as externa:
+            with UnidadTrabajo() as interna:
+                Hotel.crear(datos_hotel())
+            self.assertIs(interna, externa)
+            self.assertFalse(os.path.exists(ARCHIVO_HOTELES))
+        self.assertIn("CAM123456ABC", leer(ARCHIVO_HOTELES))
+
+    def test_tareas_asyncio_no_comparten_unidad(self):
+        """Verifica que la unidad de una tarea no captura a otra."""
+        async def con_unidad(creado):
+            with UnidadTrabajo():
+                Hotel.crear(datos_hotel())
+                await creado.wait()
+                # El cliente de la otra tarea ya esta en disco
+                self.assertIn("PEJJ800101ABC", leer(ARCHIVO_CLIENTES))
+                self.assertFalse(os.path.exists(ARCHIVO_HOTELES))
+
+        async def sin_unidad(creado):
+            await asyncio.sleep(0)
+            self.assertIsNone(persistencia.unidad_activa())
+            Cliente.crear(datos_cliente())
+            creado.set()
+
+        async def ambas():
+            creado = asyncio.Event()
+            await asyncio.gather(con_unidad(creado), sin_unidad(creado))
+
+        asyncio.run(ambas())
+        self.assertIn("CAM123456ABC", leer(ARCHIVO_HOTELES))
+
+
+if __name__ == "__main__":
+    unittest.main()